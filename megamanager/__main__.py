@@ -12,6 +12,17 @@ def get_args():
 
     parser = ArgumentParser(description='MEGA Manager is a MEGA cloud storage management and optimization application.')
 
+    parser.add_argument('--adaptiveConcurrency', dest='adaptiveConcurrency', action='store_true', default=False,
+                        help='If true, workers of each pipeline transfer lane are tuned per account while syncing, '
+                             'starting from the levels tuned by the last run.')
+
+    parser.add_argument('--applyPlacement', dest='applyPlacement', action='store_true', default=False,
+                        help='If true, only add path mappings of the last --planPlacement plan to the config file.')
+
+    parser.add_argument('--benchmarkProfiles', dest='benchmarkProfiles', default=None,
+                        help='Encode given sample video file with every encode profile and report encode speed, '
+                             'output size and SSIM/PSNR.')
+
     parser.add_argument('--compressAll', dest='compressAll', action='store_true', default=False,
                         help='If true, this will compressAll local image and video files.')
 
@@ -21,24 +32,77 @@ def get_args():
     parser.add_argument('--compressVideos', dest='compressVideos', action='store_true', default=False,
                         help='If true, this will __compressAll local video files.')
 
+    parser.add_argument('--compressLocal', dest='compressLocal', action='store_true', default=False,
+                        help='If true, files to compress are found by scanning local path mappings instead of listing '
+                             'remote files. Works offline and includes files not uploaded yet.')
+
+    parser.add_argument('--compressMaxBytes', dest='compressMaxBytes', type=int, default=None,
+                        help='Stop compressing once this many bytes of files have been compressed. Files left are '
+                             'compressed on the next run. Only for batch compression, not allowed with --pipeline, '
+                             '--incremental, --daemon or a storage backend other than megatools.')
+
+    parser.add_argument('--compressMaxSeconds', dest='compressMaxSeconds', type=int, default=None,
+                        help='Stop compressing after this many seconds. Files left are compressed on the next run. '
+                             'Only for batch compression, not allowed with --pipeline, --incremental, --daemon or a '
+                             'storage backend other than megatools.')
+
+    parser.add_argument('--compressMinSaving', dest='compressMinSaving', type=float, default=10.0,
+                        help='Minimum estimated saving in percent for a video file to be compressed. Default: 10.0')
+
+    parser.add_argument('--compressPredictMinSize', dest='compressPredictMinSize', type=int, default=500,
+                        help='Video files of at least this size in megabytes have short slices encoded to predict '
+                             'their compressed size before the full encode. Default: 500')
+
     parser.add_argument('--configPath', dest='configPath', default='megamanager/megaManager.cfg',
                         help='Set MEGA Manager config file location. Default: "megamanager/megaManager.cfg"')
 
+    parser.add_argument('--daemon', dest='daemon', action='store_true', default=False,
+                        help='If true, run until interrupted, watching local paths and syncing each local file as it '
+                             'changes. Every path mapping is synced whole at start and every DAEMON_REFRESH_SECONDS.')
+
     parser.add_argument('--download', dest='download', action='store_true', default=False,
                         help='If true, items will be downloaded from MEGA')
 
     parser.add_argument('--downSpeed', dest='downSpeed', type=int, default=None,
                         help='Total download speed limit.')
 
+    parser.add_argument('--encodeProfile', dest='encodeProfile', default=None,
+                        help='Encode profile to compress videos with, overriding path mapping encode profiles.')
+
+    parser.add_argument('--findDuplicates', dest='findDuplicates', action='store_true', default=False,
+                        help='If true, only report local files holding the same content, across every local path of '
+                             'every profile.')
+
+    parser.add_argument('--incremental', dest='incremental', action='store_true', default=False,
+                        help='If true, only local files new or modified since they were last synced are uploaded, '
+                             'planned from the local index without comparing remote directory trees.')
+
     parser.add_argument('--log', dest='logLevel', default='INFO',
                         help='Set logging level')
 
+    parser.add_argument('--metricsTextfile', dest='metricsTextfile', default=None,
+                        help='Path of Prometheus text file to export command timing metrics to at end of run, ie: in '
+                             'node_exporter textfile collector directory. Default is "data/command_metrics.prom".')
+
+    parser.add_argument('--pipeline', dest='pipeline', action='store_true', default=False,
+                        help='If true, download, compression, upload and remote removal run as a per-file pipeline. '
+                             'Files are compressed only once downloaded and uploaded only once compressed.')
+
+    parser.add_argument('--planPlacement', dest='planPlacement', action='store_true', default=False,
+                        help='If true, only plan which account each new directory under PLACEMENT_ROOTS goes to, by '
+                             'free space of accounts, and write plan to "data/placement_plan.json" for review.')
+
     parser.add_argument('--removeIncomplete', dest='removeIncomplete', action='store_true', default=False,
                         help='If true, this will allow for local downloaded files that are incomplete to be removed.')
 
     parser.add_argument('--removeRemote', dest='removeRemote', action='store_true', default=False,
                         help='If true, this will allow for remote files to be removed.')
 
+    parser.add_argument('--shards', dest='shards', type=int, default=None,
+                        help='Split each path mapping into this many shards of about the same size, transferred by '
+                             'parallel megacopy jobs sharing the --downSpeed and --upSpeed limits. Meant for '
+                             'first-time syncs of large path mappings.')
+
     parser.add_argument('--upload', dest='upload', action='store_true', default=False,
                         help='If true, items will be uploaded to MEGA')
 
@@ -0,0 +1,124 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+# Compression Queue class. Used to order files to compress by expected bytes saved.
+###
+
+from heapq import heappop, heappush
+from libs.lib import Lib
+from logging import getLogger
+from os import path
+from threading import Lock
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+
+class CompressionQueue(object):
+    def __init__(self, filePath, logLevel='DEBUG'):
+        """
+        Priority queue of files to compress, ordered by expected bytes saved (file size times predicted compression
+        ratio). Queue is persisted to file so a run cut short by its budget resumes where it stopped.
+
+        Args:
+            filePath (str): File path queue is persisted to.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__filePath = filePath
+        self.__logLevel = logLevel
+
+        self.__entries = {}
+        self.__heap = []
+        self.__lock = Lock()
+
+        self.__lib = Lib(logLevel=logLevel)
+
+    def __len__(self):
+        """
+        Number of files in queue.
+
+        Returns:
+            Integer: number of files in queue.
+        """
+
+        return len(self.__entries)
+
+    def load(self):
+        """
+        Load queue from file, keeping any files already pushed.
+        """
+
+        logger = getLogger('CompressionQueue.load')
+        logger.setLevel(self.__logLevel)
+
+        entries = self.__lib.load_file_as_dict(filePath=self.__filePath)
+        for filePath, entry in entries.items():
+            if filePath not in self.__entries:
+                self.push(filePath=filePath, fileType=entry['fileType'], fileSize=entry['fileSize'],
+                          ratio=entry['ratio'], encodeProfile=entry.get('encodeProfile'))
+
+        logger.debug(' Loaded %d files to compress from "%s".' % (len(entries), self.__filePath))
+
+    def pop(self):
+        """
+        Pop file with the largest expected bytes saved.
+
+        Returns:
+            Tuple: file path and entry dictionary with keys "fileType", "fileSize", "ratio" and "encodeProfile".
+                (None, None) if queue is empty.
+        """
+
+        logger = getLogger('CompressionQueue.pop')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            while self.__heap:
+                negativeSaving, filePath = heappop(self.__heap)
+                entry = self.__entries.get(filePath)
+
+                # Skip heap items left behind when a file was pushed again with a different saving.
+                if entry and -negativeSaving == entry['fileSize'] * entry['ratio']:
+                    del self.__entries[filePath]
+                    return filePath, entry
+
+        return None, None
+
+    def push(self, filePath, fileType, fileSize, ratio, encodeProfile=None):
+        """
+        Push file to queue. File already in queue is replaced.
+
+        Args:
+            filePath (str): File path of file to compress.
+            fileType (str): "image" or "video".
+            fileSize (int): File size in bytes.
+            ratio (float): Predicted fraction of file size saved by compression.
+            encodeProfile (str): Encode profile name to compress video with.
+        """
+
+        logger = getLogger('CompressionQueue.push')
+        logger.setLevel(self.__logLevel)
+
+        entry = {'fileType': fileType, 'fileSize': fileSize, 'ratio': ratio, 'encodeProfile': encodeProfile}
+
+        with self.__lock:
+            self.__entries[filePath] = entry
+            heappush(self.__heap, (-fileSize * ratio, filePath))
+
+    def save(self):
+        """
+        Save queue to file.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('CompressionQueue.save')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            entries = dict(self.__entries)
+
+        return self.__lib.dump_dict_into_file(itemDict=entries, filePath=self.__filePath)
@@ -0,0 +1,192 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+# Encode Profile class. Used for ffmpeg video encode settings.
+###
+
+from logging import getLogger
+from os import path
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+DEFAULT_ENCODE_PROFILE = 'default'
+
+
+class EncodeProfile(object):
+    def __init__(self, name, preset='medium', crf=23, maxWidth=720, maxHeight=None, audioCopy=False,
+                 container='mp4', threads=1, logLevel='DEBUG'):
+        """
+        Class used to keep track of video encode settings used when compressing video files.
+
+        Args:
+            name (str): Unique encode profile name.
+            preset (str): x264 preset ie: "veryfast", "medium" or "slow".
+            crf (int): x264 constant rate factor. Lower is better quality and larger output.
+            maxWidth (int): Maximum output width. Videos wider than this are scaled down. None for no limit.
+            maxHeight (int): Maximum output height. Videos higher than this are scaled down. None for no limit.
+            audioCopy (bool): If true audio stream is copied as is, otherwise it is re-encoded.
+            container (str): Output container file extension ie: "mp4" or "mkv".
+            threads (int): Number of ffmpeg encoder threads.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__name = name
+        self.__preset = preset
+        self.__crf = crf
+        self.__maxWidth = maxWidth
+        self.__maxHeight = maxHeight
+        self.__audioCopy = audioCopy
+        self.__container = container
+        self.__threads = threads
+        self.__logLevel = logLevel
+
+    @property
+    def audioCopy(self):
+        """
+        Getter for encode profile audio copy setting.
+
+        Returns:
+            Boolean: Returns whether audio stream is copied as is.
+        """
+
+        logger = getLogger('EncodeProfile.audioCopy')
+        logger.setLevel(self.__logLevel)
+
+        return self.__audioCopy
+
+    @property
+    def container(self):
+        """
+        Getter for encode profile output container.
+
+        Returns:
+            String: Returns output container file extension.
+        """
+
+        logger = getLogger('EncodeProfile.container')
+        logger.setLevel(self.__logLevel)
+
+        return self.__container
+
+    @property
+    def crf(self):
+        """
+        Getter for encode profile constant rate factor.
+
+        Returns:
+            Integer: Returns constant rate factor.
+        """
+
+        logger = getLogger('EncodeProfile.crf')
+        logger.setLevel(self.__logLevel)
+
+        return self.__crf
+
+    @property
+    def maxHeight(self):
+        """
+        Getter for encode profile maximum output height.
+
+        Returns:
+            Integer: Returns maximum output height.
+        """
+
+        logger = getLogger('EncodeProfile.maxHeight')
+        logger.setLevel(self.__logLevel)
+
+        return self.__maxHeight
+
+    @property
+    def maxWidth(self):
+        """
+        Getter for encode profile maximum output width.
+
+        Returns:
+            Integer: Returns maximum output width.
+        """
+
+        logger = getLogger('EncodeProfile.maxWidth')
+        logger.setLevel(self.__logLevel)
+
+        return self.__maxWidth
+
+    @property
+    def name(self):
+        """
+        Getter for encode profile name.
+
+        Returns:
+            String: Returns encode profile name.
+        """
+
+        logger = getLogger('EncodeProfile.name')
+        logger.setLevel(self.__logLevel)
+
+        return self.__name
+
+    @property
+    def preset(self):
+        """
+        Getter for encode profile x264 preset.
+
+        Returns:
+            String: Returns x264 preset.
+        """
+
+        logger = getLogger('EncodeProfile.preset')
+        logger.setLevel(self.__logLevel)
+
+        return self.__preset
+
+    @property
+    def settingsKey(self):
+        """
+        Getter for encode profile settings key. Changes whenever a setting affecting encode output or time changes, so
+        results cached under it are not reused for a profile redefined under the same name.
+
+        Returns:
+            String: Returns encode profile name and settings.
+        """
+
+        logger = getLogger('EncodeProfile.settingsKey')
+        logger.setLevel(self.__logLevel)
+
+        return '%s:%s:%s:%s:%s:%s:%s:%s' % (self.__name, self.__preset, self.__crf, self.__maxWidth, self.__maxHeight,
+                                             self.__audioCopy, self.__container, self.__threads)
+
+    @property
+    def threads(self):
+        """
+        Getter for encode profile ffmpeg thread count.
+
+        Returns:
+            Integer: Returns ffmpeg thread count.
+        """
+
+        logger = getLogger('EncodeProfile.threads')
+        logger.setLevel(self.__logLevel)
+
+        return self.__threads
+
+
+def get_default_encode_profiles(logLevel='DEBUG'):
+    """
+    Get built in encode profiles. The "default" profile matches the encode settings MEGA Manager always used.
+
+    Args:
+        logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+
+    Returns:
+        Dictionary: Encode profile names mapped to EncodeProfile objects.
+    """
+
+    profiles = [
+        EncodeProfile(name=DEFAULT_ENCODE_PROFILE, logLevel=logLevel),
+        EncodeProfile(name='fast', preset='veryfast', crf=24, audioCopy=True, logLevel=logLevel),
+        EncodeProfile(name='small', preset='slow', crf=28, maxWidth=640, logLevel=logLevel),
+        EncodeProfile(name='quality', preset='slow', crf=20, maxWidth=1280, audioCopy=True, logLevel=logLevel),
+    ]
+    return dict((profile.name, profile) for profile in profiles)
@@ -1,4 +1,25 @@
+from .accountParking_lib import AccountParking_Lib
+from .chunkedDownload_lib import ChunkedDownload_Lib
+from .chunkedUpload_lib import ChunkedUpload_Lib
 from .compressImages_lib import CompressImages_Lib
+from .concurrencyTuner_lib import ConcurrencyTuner_Lib
+from .duplicateIndex_lib import DuplicateIndex_Lib
 from .lib import Lib
+from .localIndex_lib import LocalIndex_Lib
+from .localStorage_lib import LocalStorage_Lib
+from .localWatcher_lib import CHANGE_CHANGED, CHANGE_REMOVED, CHANGE_RESCAN, LocalWatcher_Lib
 from .ffmpeg_lib import FFMPEG_Lib
+from .fingerprint_lib import Fingerprint_Lib
+from .httpConnectionPool_lib import HttpConnectionPool_Lib
+from .megaApi_lib import MegaApi_Lib, MegaApiError
+from .megaCrypto_lib import MegaCrypto_Lib
 from .megaTools_lib import MegaTools_Lib
+from .metrics_lib import Metrics_Lib
+from .placementPlanner_lib import PlacementPlanner_Lib
+from .processWatchdog_lib import ProcessWatchdog_Lib
+from .remoteState_lib import RemoteState_Lib
+from .sessionCache_lib import SessionCache_Lib
+from .shardPlanner_lib import ShardPlanner_Lib, UNIT_TYPE_DIR, UNIT_TYPE_FILES
+from .storageBackend_lib import FILE_TYPE_DIR, FILE_TYPE_FILE, StorageBackend_Lib
+from .taskScheduler_lib import DependencyError, Task, TaskScheduler_Lib
+from .transferLanes_lib import TransferLanes_Lib, TransferSkippedError
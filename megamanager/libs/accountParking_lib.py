@@ -0,0 +1,124 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from json import dump, load
+from logging import getLogger
+from os import makedirs, path, remove, rename
+from threading import Lock
+from time import localtime, strftime, time
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+
+class AccountParking_Lib(object):
+    def __init__(self, filePath, logLevel='DEBUG'):
+        """
+        Keeps accounts that hit a transfer quota or rate limit parked until their retry time, so no more transfers are
+        started for them meanwhile. Parked accounts are kept in a file, so the next run does not retry them early.
+
+        Args:
+            filePath (str): File path to keep parked accounts in.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__filePath = filePath
+        self.__logLevel = logLevel
+
+        self.__lock = Lock()
+        self.__parked = None
+
+    def _load_parked(self):
+        """
+        Load parked accounts file, once. Must be called with lock held.
+
+        Returns:
+            Dictionary: of username to dictionary with "until", seconds since epoch, and "reason".
+        """
+
+        logger = getLogger('AccountParking_Lib._load_parked')
+        logger.setLevel(self.__logLevel)
+
+        if self.__parked is None:
+            self.__parked = {}
+            if path.isfile(self.__filePath):
+                try:
+                    with open(self.__filePath, 'r') as parkedFile:
+                        self.__parked = load(parkedFile)
+                except (IOError, ValueError) as e:
+                    logger.warning(' Exception: %s' % str(e))
+        return self.__parked
+
+    def _save_parked(self):
+        """
+        Write parked accounts file atomically. Must be called with lock held.
+        """
+
+        logger = getLogger('AccountParking_Lib._save_parked')
+        logger.setLevel(self.__logLevel)
+
+        tempFilePath = self.__filePath + '.tmp'
+        try:
+            parkedDir = path.dirname(self.__filePath)
+            if parkedDir and not path.isdir(parkedDir):
+                makedirs(parkedDir)
+            with open(tempFilePath, 'w') as parkedFile:
+                dump(self.__parked, parkedFile, separators=(',', ':'), sort_keys=True)
+            if path.exists(self.__filePath):
+                remove(self.__filePath)
+            rename(tempFilePath, self.__filePath)
+        except (IOError, OSError) as e:
+            logger.warning(' Exception: %s' % str(e))
+
+    def get_parked_until(self, username):
+        """
+        Get time account is parked until.
+
+        Args:
+            username (str): username of account
+
+        Returns:
+            Float: seconds since epoch account is parked until. None if account is not parked.
+        """
+
+        logger = getLogger('AccountParking_Lib.get_parked_until')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            parked = self._load_parked()
+            if username not in parked:
+                return None
+            if parked[username]['until'] <= time():
+                del parked[username]
+                self._save_parked()
+                logger.info(' Account "%s" is no longer parked.' % username)
+                return None
+            return parked[username]['until']
+
+    def park(self, username, seconds, reason):
+        """
+        Park account for given seconds, unless it is parked for longer already.
+
+        Args:
+            username (str): username of account
+            seconds (float): Seconds to park account for, ie: retry time given by MEGA.
+            reason (str): Why account is parked, ie: "transfer quota exceeded".
+        """
+
+        logger = getLogger('AccountParking_Lib.park')
+        logger.setLevel(self.__logLevel)
+
+        until = time() + seconds
+        with self.__lock:
+            parked = self._load_parked()
+            if username in parked and parked[username]['until'] >= until:
+                return
+            parked[username] = {'until': until, 'reason': reason}
+            self._save_parked()
+
+        logger.warning(' Account "%s" parked until %s, %s.' % (username, strftime('%Y-%m-%d %H:%M:%S',
+                                                                                  localtime(until)), reason))
@@ -0,0 +1,285 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from .httpConnectionPool_lib import HttpConnectionPool_Lib
+from .megaCrypto_lib import MegaCrypto_Lib
+from .taskScheduler_lib import TaskScheduler_Lib
+from hashlib import sha256
+from json import dump, load
+from logging import getLogger
+from mmap import mmap
+from os import makedirs, path, remove, rename
+from threading import Lock
+from time import sleep, time
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+DOWNLOAD_CONNECTIONS = 4
+DOWNLOAD_PART_SIZE = 8 * 1024 * 1024
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_RETRY_SECONDS = 1.0
+DOWNLOAD_PROGRESS_SAVE_SECONDS = 5
+
+PART_EXTENSION = '.part'
+PROGRESS_EXTENSION = '.chunks'
+
+
+class ChunkedDownload_Lib(object):
+    def __init__(self, connections=DOWNLOAD_CONNECTIONS, partSize=DOWNLOAD_PART_SIZE, logLevel='DEBUG'):
+        """
+        Download engine fetching MEGA files as byte ranges over several pooled connections at once. Each chunk is
+        decrypted as it arrives into a preallocated memory mapped file, and its MAC is checked against the file key
+        once all chunks are in. Done chunks are recorded next to the partial file, so an interrupted download resumes
+        where it stopped. Connections are shared by every file downloaded with the engine.
+
+        Args:
+            connections (int): Most byte ranges fetched at once.
+            partSize (int): Bytes fetched per request, whole chunks.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__connections = connections
+        self.__partSize = partSize
+        self.__logLevel = logLevel
+
+        self.__crypto = MegaCrypto_Lib(logLevel=logLevel)
+        self.__pool = HttpConnectionPool_Lib(maxIdleConnections=connections, logLevel=logLevel)
+        self.__scheduler = TaskScheduler_Lib(maxWorkers=connections, logLevel=logLevel)
+
+    def _download_part(self, url, key, chunks, chunkIndexes, outputMap, progress):
+        """
+        Fetch consecutive chunks in one range request, decrypt them into output map and record their MACs. Request is
+        retried with backoff.
+
+        Args:
+            url (str): Download URL of file.
+            key (tuple): File key as eight 32 bit words.
+            chunks (list): (start, end) byte ranges of every chunk of file.
+            chunkIndexes (list): Indexes of consecutive chunks to fetch.
+            outputMap (mmap): Memory map of partial output file.
+            progress (dict): Download progress, with "macs" of done chunks and "lock".
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('ChunkedDownload_Lib._download_part')
+        logger.setLevel(self.__logLevel)
+
+        start = chunks[chunkIndexes[0]][0]
+        end = chunks[chunkIndexes[-1]][1]
+        data = None
+        for attempt in range(DOWNLOAD_RETRIES):
+            try:
+                # MEGA takes ranges as inclusive "/start-end" suffix of download URL.
+                status, data = self.__pool.request(url='%s/%d-%d' % (url, start, end - 1), method='GET')
+                if status == 200 and len(data) == end - start:
+                    break
+                logger.debug(' Range %d-%d failed with status %s, %d bytes.' % (start, end, status, len(data)))
+            except IOError as e:
+                logger.debug(' Exception: %s' % str(e))
+            data = None
+            sleep(DOWNLOAD_RETRY_SECONDS * 2 ** attempt)
+
+        if data is None:
+            logger.error(' Error, could NOT download bytes %d-%d!' % (start, end))
+            return False
+
+        aesKey = self.__crypto.get_node_key(key)
+        nonce = key[4:6]
+        for chunkIndex in chunkIndexes:
+            chunkStart, chunkEnd = chunks[chunkIndex]
+            plainData = self.__crypto.aes_ctr_crypt(aesKey, nonce, data[chunkStart - start:chunkEnd - start],
+                                                    offset=chunkStart)
+            outputMap[chunkStart:chunkEnd] = plainData
+            chunkMac = self.__crypto.get_chunk_mac(aesKey, nonce, plainData)
+            with progress['lock']:
+                progress['macs'][str(chunkIndex)] = self.__crypto.a32_to_base64(chunkMac)
+        return True
+
+    def _get_parts(self, chunks, doneChunkIndexes):
+        """
+        Group chunks not done yet into runs of consecutive chunks of up to part size, one range request each.
+
+        Args:
+            chunks (list): (start, end) byte ranges of every chunk of file.
+            doneChunkIndexes (set): Indexes of chunks already done.
+
+        Returns:
+            List: of lists of chunk indexes.
+        """
+
+        logger = getLogger('ChunkedDownload_Lib._get_parts')
+        logger.setLevel(self.__logLevel)
+
+        parts = []
+        part = []
+        partBytes = 0
+        for chunkIndex, (start, end) in enumerate(chunks):
+            if chunkIndex in doneChunkIndexes or (part and partBytes + end - start > self.__partSize):
+                if part:
+                    parts.append(part)
+                part = []
+                partBytes = 0
+            if chunkIndex not in doneChunkIndexes:
+                part.append(chunkIndex)
+                partBytes += end - start
+        if part:
+            parts.append(part)
+        return parts
+
+    def _load_progress(self, progressFilePath, keyId, size):
+        """
+        Load MACs of chunks done by an interrupted download of the same file.
+
+        Args:
+            progressFilePath (str): Progress file path.
+            keyId (str): Hash of file key, so progress of another file is not used.
+            size (int): File size in bytes.
+
+        Returns:
+            Dictionary: of chunk index string to URL safe base64 chunk MAC. Empty if there is no progress to resume.
+        """
+
+        logger = getLogger('ChunkedDownload_Lib._load_progress')
+        logger.setLevel(self.__logLevel)
+
+        if not path.isfile(progressFilePath):
+            return {}
+        try:
+            with open(progressFilePath, 'r') as progressFile:
+                progress = load(progressFile)
+        except (IOError, ValueError) as e:
+            logger.debug(' Exception: %s' % str(e))
+            return {}
+
+        if progress.get('key') != keyId or progress.get('size') != size or not isinstance(progress.get('macs'), dict):
+            logger.debug(' Progress in "%s" is of another file.' % progressFilePath)
+            return {}
+        return progress['macs']
+
+    def _save_progress(self, progressFilePath, keyId, size, progress, outputMap):
+        """
+        Flush output map, then record done chunks, so chunks are only recorded once their data is on disk.
+
+        Args:
+            progressFilePath (str): Progress file path.
+            keyId (str): Hash of file key.
+            size (int): File size in bytes.
+            progress (dict): Download progress, with "macs" of done chunks and "lock".
+            outputMap (mmap): Memory map of partial output file.
+        """
+
+        logger = getLogger('ChunkedDownload_Lib._save_progress')
+        logger.setLevel(self.__logLevel)
+
+        with progress['lock']:
+            macs = dict(progress['macs'])
+        try:
+            outputMap.flush()
+            with open(progressFilePath + '.tmp', 'w') as progressFile:
+                dump({'key': keyId, 'size': size, 'macs': macs}, progressFile, separators=(',', ':'))
+            if path.exists(progressFilePath):
+                remove(progressFilePath)
+            rename(progressFilePath + '.tmp', progressFilePath)
+        except (IOError, OSError, ValueError) as e:
+            logger.warning(' Exception: %s' % str(e))
+
+    def close(self):
+        """
+        Close idle connections.
+        """
+
+        logger = getLogger('ChunkedDownload_Lib.close')
+        logger.setLevel(self.__logLevel)
+
+        self.__pool.close()
+
+    def download(self, url, key, size, localFilePath):
+        """
+        Download MEGA file to local file path. Missing local parent directories are created.
+
+        Args:
+            url (str): Download URL of file, as returned by "g" API command.
+            key (tuple): File key as eight 32 bit words.
+            size (int): File size in bytes.
+            localFilePath (str): Local file path to download to.
+
+        Returns:
+            Boolean: whether successful or not. Partial file and progress are kept on failure, to resume from.
+        """
+
+        logger = getLogger('ChunkedDownload_Lib.download')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Downloading %d bytes to "%s".' % (size, localFilePath))
+
+        partFilePath = localFilePath + PART_EXTENSION
+        progressFilePath = partFilePath + PROGRESS_EXTENSION
+        keyId = sha256(self.__crypto.a32_to_bytes(key)).hexdigest()
+        chunks = self.__crypto.get_chunks(size=size)
+
+        localDir = path.dirname(localFilePath)
+        if localDir and not path.isdir(localDir):
+            makedirs(localDir)
+
+        progress = {'macs': {}, 'lock': Lock()}
+        if path.isfile(partFilePath) and path.getsize(partFilePath) == size:
+            progress['macs'] = self._load_progress(progressFilePath=progressFilePath, keyId=keyId, size=size)
+        doneChunkIndexes = set(int(chunkIndex) for chunkIndex in progress['macs'])
+        if doneChunkIndexes:
+            logger.debug(' Resuming, %d of %d chunks done.' % (len(doneChunkIndexes), len(chunks)))
+
+        mode = 'r+b' if path.isfile(partFilePath) and doneChunkIndexes else 'w+b'
+        with open(partFilePath, mode) as partFile:
+            partFile.truncate(size)
+            outputMap = mmap(partFile.fileno(), size) if size else None
+            try:
+                tasks = []
+                for chunkIndexes in self._get_parts(chunks=chunks, doneChunkIndexes=doneChunkIndexes):
+                    tasks.append(self.__scheduler.submit(
+                        target=self._download_part, args=(url, key, chunks, chunkIndexes, outputMap, progress),
+                        name='download_%s_%d' % (path.basename(localFilePath), chunkIndexes[0])))
+
+                savedTime = time()
+                while not self.__scheduler.wait(tasks=tasks, timeout=DOWNLOAD_PROGRESS_SAVE_SECONDS):
+                    if time() - savedTime >= DOWNLOAD_PROGRESS_SAVE_SECONDS:
+                        self._save_progress(progressFilePath=progressFilePath, keyId=keyId, size=size,
+                                            progress=progress, outputMap=outputMap)
+                        savedTime = time()
+
+                if outputMap is not None:
+                    self._save_progress(progressFilePath=progressFilePath, keyId=keyId, size=size,
+                                        progress=progress, outputMap=outputMap)
+            finally:
+                if outputMap is not None:
+                    outputMap.close()
+
+        failedTasks = [task for task in tasks if task.exception() or not task.result()]
+        if failedTasks:
+            logger.error(' Error, %d parts of "%s" failed! Download can be resumed.' % (len(failedTasks),
+                                                                                      localFilePath))
+            return False
+
+        chunkMacs = [self.__crypto.base64_to_a32(progress['macs'][str(chunkIndex)])
+                     for chunkIndex in range(len(chunks))]
+        if self.__crypto.get_meta_mac(self.__crypto.get_node_key(key), chunkMacs) != tuple(key[6:8]):
+            logger.error(' Error, MAC of "%s" does not match! Discarding download.' % localFilePath)
+            for filePath in [partFilePath, progressFilePath]:
+                if path.exists(filePath):
+                    remove(filePath)
+            return False
+
+        if path.exists(localFilePath):
+            remove(localFilePath)
+        rename(partFilePath, localFilePath)
+        if path.exists(progressFilePath):
+            remove(progressFilePath)
+
+        logger.debug(' Success, downloaded "%s".' % localFilePath)
+        return True
@@ -0,0 +1,292 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from .httpConnectionPool_lib import HttpConnectionPool_Lib
+from .megaCrypto_lib import MegaCrypto_Lib
+from io import open as openFile
+from logging import getLogger
+from os import path
+from threading import Lock, Thread
+from time import sleep
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+UPLOAD_CONNECTIONS = 4
+UPLOAD_PART_SIZE = 8 * 1024 * 1024
+UPLOAD_RETRIES = 5
+UPLOAD_RETRY_SECONDS = 1.0
+
+# Threads encrypting parts. AES with pycryptodome releases the GIL, so encryption runs beside reading and sending.
+UPLOAD_ENCRYPT_THREADS = 2
+
+# Parts waiting between stages. Part buffers are reused, so memory use is bounded by the parts held by every stage.
+UPLOAD_QUEUE_SIZE = 2
+
+
+class ChunkedUpload_Lib(object):
+    def __init__(self, connections=UPLOAD_CONNECTIONS, partSize=UPLOAD_PART_SIZE, logLevel='DEBUG'):
+        """
+        Upload engine streaming MEGA files through a pipeline of three stages: reading parts into reused buffers,
+        working out chunk MACs and encrypting parts in place with AES-CTR, and sending parts over several pooled
+        connections at once. Stages are joined by bounded queues, so disk, CPU and network are busy at the same time
+        while memory use stays fixed. Connections are shared by every file uploaded with the engine.
+
+        Args:
+            connections (int): Most parts sent at once.
+            partSize (int): Bytes sent per request, whole chunks.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__connections = connections
+        self.__partSize = partSize
+        self.__logLevel = logLevel
+
+        self.__crypto = MegaCrypto_Lib(logLevel=logLevel)
+        self.__pool = HttpConnectionPool_Lib(maxIdleConnections=connections, logLevel=logLevel)
+
+    def _encrypt_parts(self, key, chunks, readQueue, sendQueue, state):
+        """
+        Encrypt stage. Work out MACs of chunks of read parts, then encrypt parts in place and pass them to send stage.
+        Runs until it gets None from read queue.
+
+        Args:
+            key (tuple): Upload key as six 32 bit words, AES key followed by nonce.
+            chunks (list): (start, end) byte ranges of every chunk of file.
+            readQueue (Queue): Read parts, as (buffer, chunk indexes) tuples.
+            sendQueue (Queue): Encrypted parts.
+            state (dict): Upload state, with chunk "macs", "failed" flag, "freeBuffers" queue and "lock".
+        """
+
+        logger = getLogger('ChunkedUpload_Lib._encrypt_parts')
+        logger.setLevel(self.__logLevel)
+
+        aesKey = tuple(key[:4])
+        nonce = tuple(key[4:6])
+        while True:
+            part = readQueue.get()
+            if part is None:
+                return
+
+            buffer, chunkIndexes = part
+            if state['failed']:
+                state['freeBuffers'].put(buffer)
+                continue
+
+            start = chunks[chunkIndexes[0]][0]
+            end = chunks[chunkIndexes[-1]][1]
+            view = memoryview(buffer)
+            macs = {}
+            for chunkIndex in chunkIndexes:
+                chunkStart, chunkEnd = chunks[chunkIndex]
+                macs[chunkIndex] = self.__crypto.get_chunk_mac(aesKey, nonce, view[chunkStart - start:chunkEnd - start])
+            self.__crypto.aes_ctr_crypt_in_place(aesKey, nonce, view[:end - start], offset=start)
+            with state['lock']:
+                state['macs'].update(macs)
+            sendQueue.put(part)
+
+    def _get_parts(self, chunks):
+        """
+        Group chunks into runs of consecutive chunks of up to part size, one request each.
+
+        Args:
+            chunks (list): (start, end) byte ranges of every chunk of file.
+
+        Returns:
+            List: of lists of chunk indexes.
+        """
+
+        logger = getLogger('ChunkedUpload_Lib._get_parts')
+        logger.setLevel(self.__logLevel)
+
+        parts = []
+        part = []
+        partBytes = 0
+        for chunkIndex, (start, end) in enumerate(chunks):
+            if part and partBytes + end - start > self.__partSize:
+                parts.append(part)
+                part = []
+                partBytes = 0
+            part.append(chunkIndex)
+            partBytes += end - start
+        if part:
+            parts.append(part)
+        return parts
+
+    def _send_part(self, url, start, data, state):
+        """
+        Send encrypted part to upload URL. Request is retried with backoff. The request completing the file gets the
+        completion handle, which is kept in upload state.
+
+        Args:
+            url (str): Upload URL of file, as returned by "u" API command.
+            start (int): Byte offset of part in file.
+            data (memoryview): Encrypted part.
+            state (dict): Upload state, with "handle" and "lock".
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('ChunkedUpload_Lib._send_part')
+        logger.setLevel(self.__logLevel)
+
+        for attempt in range(UPLOAD_RETRIES):
+            try:
+                # MEGA takes parts as byte offset suffix of upload URL, and answers with nothing until file is complete.
+                status, response = self.__pool.request(url='%s/%d' % (url, start), method='POST', body=data)
+                response = response.decode('utf-8').strip()
+                # Errors are negative numbers, completion tokens are base64 and may start with "-" as well.
+                if status == 200 and not (response.startswith('-') and response[1:].isdigit()):
+                    if response:
+                        with state['lock']:
+                            state['handle'] = response
+                    return True
+                logger.debug(' Part at %d failed with status %s: %s' % (start, status, response))
+            except IOError as e:
+                logger.debug(' Exception: %s' % str(e))
+            sleep(UPLOAD_RETRY_SECONDS * 2 ** attempt)
+
+        logger.error(' Error, could NOT upload part at byte %d!' % start)
+        return False
+
+    def _send_parts(self, url, chunks, sendQueue, state):
+        """
+        Send stage. Send encrypted parts and hand their buffers back to read stage. Runs until it gets None from send
+        queue.
+
+        Args:
+            url (str): Upload URL of file.
+            chunks (list): (start, end) byte ranges of every chunk of file.
+            sendQueue (Queue): Encrypted parts, as (buffer, chunk indexes) tuples.
+            state (dict): Upload state, with "handle", "failed" flag, "freeBuffers" queue and "lock".
+        """
+
+        logger = getLogger('ChunkedUpload_Lib._send_parts')
+        logger.setLevel(self.__logLevel)
+
+        while True:
+            part = sendQueue.get()
+            if part is None:
+                return
+
+            buffer, chunkIndexes = part
+            start = chunks[chunkIndexes[0]][0]
+            end = chunks[chunkIndexes[-1]][1]
+            if not state['failed'] and not self._send_part(url=url, start=start, data=memoryview(buffer)[:end - start],
+                                                           state=state):
+                state['failed'] = True
+            state['freeBuffers'].put(buffer)
+
+    def close(self):
+        """
+        Close idle connections.
+        """
+
+        logger = getLogger('ChunkedUpload_Lib.close')
+        logger.setLevel(self.__logLevel)
+
+        self.__pool.close()
+
+    def upload(self, url, key, localFilePath):
+        """
+        Upload local file to upload URL. Calling thread reads the file, while encrypt and send stages run in threads.
+
+        Args:
+            url (str): Upload URL of file, as returned by "u" API command.
+            key (tuple): Upload key as six random 32 bit words, AES key followed by nonce.
+            localFilePath (str): Local file path to upload.
+
+        Returns:
+            Tuple: of completion handle, to create the file node with, and eight word file key holding the meta MAC.
+                None if upload failed.
+        """
+
+        logger = getLogger('ChunkedUpload_Lib.upload')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            size = path.getsize(localFilePath)
+        except OSError as e:
+            logger.error(' Error, could NOT read "%s"! %s' % (localFilePath, str(e)))
+            return None
+
+        logger.debug(' Uploading %d bytes of "%s".' % (size, localFilePath))
+
+        chunks = self.__crypto.get_chunks(size=size)
+        parts = self._get_parts(chunks=chunks)
+        bufferSize = max([chunks[part[-1]][1] - chunks[part[0]][0] for part in parts] or [0])
+        state = {'macs': {}, 'handle': None, 'failed': False, 'freeBuffers': Queue(), 'lock': Lock()}
+        for count in range(min(len(parts), self.__connections + UPLOAD_ENCRYPT_THREADS + 2 * UPLOAD_QUEUE_SIZE + 1)):
+            state['freeBuffers'].put(bytearray(bufferSize))
+
+        readQueue = Queue(maxsize=UPLOAD_QUEUE_SIZE)
+        sendQueue = Queue(maxsize=UPLOAD_QUEUE_SIZE)
+        encryptThreads = []
+        for count in range(UPLOAD_ENCRYPT_THREADS):
+            t = Thread(target=self._encrypt_parts, args=(key, chunks, readQueue, sendQueue, state),
+                       name='thread_uploadEncrypt_%d' % count)
+            t.daemon = True
+            t.start()
+            encryptThreads.append(t)
+        sendThreads = []
+        for count in range(self.__connections):
+            t = Thread(target=self._send_parts, args=(url, chunks, sendQueue, state),
+                       name='thread_uploadSend_%d' % count)
+            t.daemon = True
+            t.start()
+            sendThreads.append(t)
+
+        try:
+            with openFile(localFilePath, 'rb', buffering=0) as localFile:
+                for chunkIndexes in parts:
+                    buffer = state['freeBuffers'].get()
+                    if state['failed']:
+                        break
+                    view = memoryview(buffer)
+                    length = chunks[chunkIndexes[-1]][1] - chunks[chunkIndexes[0]][0]
+                    readBytes = 0
+                    while readBytes < length:
+                        count = localFile.readinto(view[readBytes:length])
+                        if not count:
+                            raise IOError('"%s" is shorter than %d bytes' % (localFilePath, size))
+                        readBytes += count
+                    readQueue.put((buffer, chunkIndexes))
+        except IOError as e:
+            logger.error(' Error, could NOT read "%s"! %s' % (localFilePath, str(e)))
+            state['failed'] = True
+        finally:
+            for t in encryptThreads:
+                readQueue.put(None)
+            for t in encryptThreads:
+                t.join()
+            for t in sendThreads:
+                sendQueue.put(None)
+            for t in sendThreads:
+                t.join()
+
+        # Empty files are still sent, as one empty part, to get a completion handle.
+        if not parts and not self._send_part(url=url, start=0, data=b'', state=state):
+            state['failed'] = True
+
+        if state['failed'] or not state['handle']:
+            logger.error(' Error, could NOT upload "%s"!' % localFilePath)
+            return None
+
+        aesKey = tuple(key[:4])
+        nonce = tuple(key[4:6])
+        metaMac = self.__crypto.get_meta_mac(aesKey, [state['macs'][chunkIndex] for chunkIndex in range(len(chunks))])
+        fileKey = (aesKey[0] ^ nonce[0], aesKey[1] ^ nonce[1], aesKey[2] ^ metaMac[0], aesKey[3] ^ metaMac[1]) + \
+            nonce + metaMac
+
+        logger.debug(' Success, uploaded "%s".' % localFilePath)
+        return state['handle'], fileKey
@@ -0,0 +1,199 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from json import dump, load
+from logging import getLogger
+from os import makedirs, path, remove, rename
+from threading import Lock
+from time import time
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+TUNER_MIN_LEVEL = 1
+TUNER_MAX_LEVEL = 32
+# Seconds of transfers measured before concurrency is adjusted.
+TUNER_INTERVAL_SECONDS = 10.0
+# Transfers per worker measured before concurrency is adjusted, so each interval spans several transfers per worker.
+TUNER_INTERVAL_TRANSFERS = 2
+# Throughput changes within this fraction of the previous interval's are taken as no change.
+TUNER_TOLERANCE = 0.1
+# Concurrency is multiplied by this on errors or falling throughput.
+TUNER_DECREASE_FACTOR = 0.5
+# Intervals of steady throughput after which one more worker is tried.
+TUNER_PROBE_INTERVALS = 6
+
+TUNER_HOLDING = 'holding'
+TUNER_PROBING = 'probing'
+TUNER_SETTLING = 'settling'
+
+
+class ConcurrencyTuner_Lib(object):
+    def __init__(self, filePath, intervalSeconds=TUNER_INTERVAL_SECONDS, logLevel='DEBUG'):
+        """
+        Adaptive concurrency controller, additive increase and multiplicative decrease. Transfers are measured in
+        intervals of at least interval seconds and TUNER_INTERVAL_TRANSFERS transfers per worker. Concurrency goes up by
+        one while throughput of each interval improves on the previous one, and is halved when a transfer failed or
+        throughput fell, the interval after a decrease only measuring throughput at the lower level. Intervals in which
+        transfers were not waiting for a free worker only count failures, as throughput then depends on how much there
+        was to transfer. Tuned levels are kept in a file, as starting points of the next run.
+
+        Args:
+            filePath (str): File path to keep tuned levels in.
+            intervalSeconds (float): Seconds of transfers measured before concurrency is adjusted.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__filePath = filePath
+        self.__intervalSeconds = intervalSeconds
+        self.__logLevel = logLevel
+
+        self.__levels = None
+        self.__lock = Lock()
+        self.__windows = {}
+
+    def _load_levels(self):
+        """
+        Load levels file, once. Must be called with lock held.
+
+        Returns:
+            Dictionary: of key to tuned level.
+        """
+
+        logger = getLogger('ConcurrencyTuner_Lib._load_levels')
+        logger.setLevel(self.__logLevel)
+
+        if self.__levels is None:
+            self.__levels = {}
+            if path.isfile(self.__filePath):
+                try:
+                    with open(self.__filePath, 'r') as levelsFile:
+                        self.__levels = load(levelsFile)
+                except (IOError, ValueError) as e:
+                    logger.warning(' Exception: %s' % str(e))
+        return self.__levels
+
+    def _save_levels(self):
+        """
+        Write levels file atomically. Must be called with lock held.
+        """
+
+        logger = getLogger('ConcurrencyTuner_Lib._save_levels')
+        logger.setLevel(self.__logLevel)
+
+        tempFilePath = self.__filePath + '.tmp'
+        try:
+            levelsDir = path.dirname(self.__filePath)
+            if levelsDir and not path.isdir(levelsDir):
+                makedirs(levelsDir)
+            with open(tempFilePath, 'w') as levelsFile:
+                dump(self.__levels, levelsFile, separators=(',', ':'), sort_keys=True)
+            if path.exists(self.__filePath):
+                remove(self.__filePath)
+            rename(tempFilePath, self.__filePath)
+        except (IOError, OSError) as e:
+            logger.warning(' Exception: %s' % str(e))
+
+    def get_level(self, key, default):
+        """
+        Get concurrency of key, as tuned so far or by an earlier run.
+
+        Args:
+            key (str): Key of what is tuned, ie: direction, account and lane.
+            default (int): Concurrency if key was never tuned.
+
+        Returns:
+            Integer: concurrency level.
+        """
+
+        logger = getLogger('ConcurrencyTuner_Lib.get_level')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            level = self._load_levels().get(key, default)
+        return min(max(level, TUNER_MIN_LEVEL), TUNER_MAX_LEVEL)
+
+    def record_transfer(self, key, level, size, failed, saturated):
+        """
+        Record finished transfer, and adjust concurrency of key once its interval is over.
+
+        Args:
+            key (str): Key of what is tuned, ie: direction, account and lane.
+            level (int): Concurrency transfer ran at.
+            size (int): Bytes transferred. None if not known.
+            failed (bool): Whether transfer failed, ie: errored or was throttled.
+            saturated (bool): Whether transfers were waiting for a free worker when transfer finished.
+
+        Returns:
+            Integer: new concurrency level. None if unchanged.
+        """
+
+        logger = getLogger('ConcurrencyTuner_Lib.record_transfer')
+        logger.setLevel(self.__logLevel)
+
+        now = time()
+        with self.__lock:
+            window = self.__windows.setdefault(key, {'startTime': now, 'bytes': 0, 'count': 0, 'failures': 0,
+                                                     'saturated': True, 'throughput': None, 'state': TUNER_PROBING,
+                                                     'holds': 0})
+            window['bytes'] += size if size and not failed else 0
+            window['count'] += 1
+            window['failures'] += 1 if failed else 0
+            window['saturated'] = window['saturated'] and saturated
+
+            seconds = now - window['startTime']
+            if seconds < self.__intervalSeconds or \
+                    (window['count'] < level * TUNER_INTERVAL_TRANSFERS and not window['failures']):
+                return None
+
+            throughput = window['bytes'] / seconds
+            previousThroughput = window['throughput']
+            newLevel = level
+            reason = None
+            settle = False
+            if window['failures']:
+                newLevel = int(level * TUNER_DECREASE_FACTOR)
+                reason = '%d failed transfers' % window['failures']
+                settle = True
+            elif not window['saturated']:
+                pass
+            elif window['state'] == TUNER_SETTLING:
+                window['state'] = TUNER_HOLDING
+            elif previousThroughput is None or throughput > previousThroughput * (1 + TUNER_TOLERANCE):
+                newLevel = level + 1
+                reason = 'throughput rose to %.1f KiB/s' % (throughput / 1024)
+            elif throughput < previousThroughput * (1 - TUNER_TOLERANCE):
+                newLevel = int(level * TUNER_DECREASE_FACTOR)
+                reason = 'throughput fell to %.1f KiB/s' % (throughput / 1024)
+                settle = True
+            elif window['state'] == TUNER_PROBING:
+                newLevel = level - 1
+                reason = 'throughput stayed at %.1f KiB/s' % (throughput / 1024)
+                window['state'] = TUNER_HOLDING
+            else:
+                window['holds'] += 1
+                if window['holds'] >= TUNER_PROBE_INTERVALS:
+                    newLevel = level + 1
+                    reason = 'probing for more throughput'
+            newLevel = min(max(newLevel, TUNER_MIN_LEVEL), TUNER_MAX_LEVEL)
+
+            if settle:
+                # Next interval only measures throughput at the lower level, to compare later intervals against.
+                window.update({'throughput': None, 'state': TUNER_SETTLING})
+            elif window['saturated']:
+                window['throughput'] = throughput
+            if newLevel > level:
+                window.update({'state': TUNER_PROBING, 'holds': 0})
+            window.update({'startTime': now, 'bytes': 0, 'count': 0, 'failures': 0, 'saturated': True})
+            if newLevel == level:
+                return None
+
+            self._load_levels()[key] = newLevel
+            self._save_levels()
+
+        logger.info(' Concurrency of "%s" set from %d to %d, %s.' % (key, level, newLevel, reason))
+        return newLevel
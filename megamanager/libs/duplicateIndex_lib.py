@@ -0,0 +1,300 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from hashlib import sha1, sha256
+from json import dump, load
+from logging import getLogger
+from os import makedirs, path, remove, rename, stat
+from threading import Lock, Thread
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+HASH_THREADS = 4
+
+# Bytes hashed at both the start and the end of a file for its partial hash. Files up to twice this size are hashed
+# whole by their partial hash already.
+PARTIAL_HASH_BYTES = 64 * 1024
+FULL_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class DuplicateIndex_Lib(object):
+    def __init__(self, filePath, threads=HASH_THREADS, logLevel='DEBUG'):
+        """
+        Index of local file content, to find files holding the same content. Files are grouped by size first, then
+        files of the same size by a fast hash of their first and last bytes, and only files whose partial hashes match
+        are hashed whole. Hashes are kept per file, with the size and modification time they were worked out for, so
+        they are only worked out again for files that changed.
+
+        Args:
+            filePath (str): Index file path.
+            threads (int): Number of threads hashing files.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__filePath = filePath
+        self.__threads = threads
+        self.__logLevel = logLevel
+
+        self.__entries = None
+        self.__changed = False
+        self.__lock = Lock()
+
+    def _get_full_hash(self, filePath):
+        """
+        Get SHA-256 of whole file content.
+
+        Args:
+            filePath (str): Local file path.
+
+        Returns:
+            String: hex digest.
+        """
+
+        logger = getLogger('DuplicateIndex_Lib._get_full_hash')
+        logger.setLevel(self.__logLevel)
+
+        digest = sha256()
+        with open(filePath, 'rb') as localFile:
+            while True:
+                data = localFile.read(FULL_HASH_BLOCK_SIZE)
+                if not data:
+                    break
+                digest.update(data)
+        return digest.hexdigest()
+
+    def _get_hashes(self, filePaths, hashType):
+        """
+        Get hashes of local files, worked out in a pool of threads for files not hashed since they last changed.
+
+        Args:
+            filePaths (list): Local file paths.
+            hashType (str): "partial" or "full".
+
+        Returns:
+            Dictionary: of local file path to hash. Files that could not be read are left out.
+        """
+
+        logger = getLogger('DuplicateIndex_Lib._get_hashes')
+        logger.setLevel(self.__logLevel)
+
+        fileQueue = Queue()
+        hashes = {}
+        hashesLock = Lock()
+
+        def hash_files():
+            while True:
+                filePath = fileQueue.get()
+                if filePath is None:
+                    return
+                fileHash = self._update_entry(filePath=filePath, hashType=hashType)
+                if fileHash:
+                    with hashesLock:
+                        hashes[filePath] = fileHash
+
+        for filePath in filePaths:
+            fileQueue.put(filePath)
+        threads = []
+        for count in range(min(self.__threads, len(filePaths))):
+            fileQueue.put(None)
+            t = Thread(target=hash_files, name='thread_duplicateIndex_%d' % count)
+            t.daemon = True
+            t.start()
+            threads.append(t)
+        for t in threads:
+            t.join()
+
+        logger.debug(' Got %s hashes of %d files.' % (hashType, len(hashes)))
+        return hashes
+
+    def _get_partial_hash(self, filePath, size):
+        """
+        Get SHA-1 of first and last PARTIAL_HASH_BYTES bytes of file, or of whole file if it is not larger than that.
+
+        Args:
+            filePath (str): Local file path.
+            size (int): File size in bytes.
+
+        Returns:
+            String: hex digest.
+        """
+
+        logger = getLogger('DuplicateIndex_Lib._get_partial_hash')
+        logger.setLevel(self.__logLevel)
+
+        digest = sha1()
+        with open(filePath, 'rb') as localFile:
+            if size <= 2 * PARTIAL_HASH_BYTES:
+                digest.update(localFile.read())
+            else:
+                digest.update(localFile.read(PARTIAL_HASH_BYTES))
+                localFile.seek(size - PARTIAL_HASH_BYTES)
+                digest.update(localFile.read(PARTIAL_HASH_BYTES))
+        return digest.hexdigest()
+
+    def _group_by(self, groups, keys):
+        """
+        Split groups of files by key, keeping only groups still holding more than one file.
+
+        Args:
+            groups (list): Lists of local file paths.
+            keys (dict): Local file path to key. Files without a key are left out.
+
+        Returns:
+            List: of lists of local file paths.
+        """
+
+        logger = getLogger('DuplicateIndex_Lib._group_by')
+        logger.setLevel(self.__logLevel)
+
+        newGroups = []
+        for group in groups:
+            byKey = {}
+            for filePath in group:
+                if filePath in keys:
+                    byKey.setdefault(keys[filePath], []).append(filePath)
+            newGroups.extend(sorted(filePaths) for filePaths in byKey.values() if len(filePaths) > 1)
+        return newGroups
+
+    def _load_entries(self):
+        """
+        Load index file, once. Must be called with lock held.
+
+        Returns:
+            Dictionary: of local file path to entry.
+        """
+
+        logger = getLogger('DuplicateIndex_Lib._load_entries')
+        logger.setLevel(self.__logLevel)
+
+        if self.__entries is None:
+            self.__entries = {}
+            if path.isfile(self.__filePath):
+                try:
+                    with open(self.__filePath, 'r') as indexFile:
+                        self.__entries = load(indexFile)
+                except (IOError, ValueError) as e:
+                    logger.warning(' Exception: %s' % str(e))
+        return self.__entries
+
+    def _update_entry(self, filePath, hashType):
+        """
+        Get hash of local file, working it out again if file changed since it was hashed.
+
+        Args:
+            filePath (str): Local file path.
+            hashType (str): "partial" or "full".
+
+        Returns:
+            String: hash. None if file could not be read.
+        """
+
+        logger = getLogger('DuplicateIndex_Lib._update_entry')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            fileStat = stat(filePath)
+            with self.__lock:
+                entry = self._load_entries().get(filePath)
+            if not entry or entry['size'] != fileStat.st_size or entry['modified'] != fileStat.st_mtime:
+                entry = {'size': fileStat.st_size, 'modified': fileStat.st_mtime}
+            elif entry.get(hashType):
+                return entry[hashType]
+
+            if hashType == 'partial':
+                fileHash = self._get_partial_hash(filePath=filePath, size=fileStat.st_size)
+            elif fileStat.st_size <= 2 * PARTIAL_HASH_BYTES:
+                # Partial hash of small files is a hash of their whole content already.
+                fileHash = entry.get('partial') or self._get_partial_hash(filePath=filePath, size=fileStat.st_size)
+            else:
+                fileHash = self._get_full_hash(filePath=filePath)
+        except (IOError, OSError) as e:
+            logger.debug(' Exception: %s' % str(e))
+            return None
+
+        newEntry = dict(entry)
+        newEntry[hashType] = fileHash
+        with self.__lock:
+            self.__entries[filePath] = newEntry
+            self.__changed = True
+        return fileHash
+
+    def get_duplicates(self, filePaths):
+        """
+        Find local files holding the same content. Empty files are left out.
+
+        Args:
+            filePaths (list): Local file paths.
+
+        Returns:
+            Dictionary: of content hash to sorted list of local file paths holding it, for content held by more than
+                one file.
+        """
+
+        logger = getLogger('DuplicateIndex_Lib.get_duplicates')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Finding duplicates among %d local files.' % len(filePaths))
+
+        sizes = {}
+        for filePath in set(filePaths):
+            try:
+                size = stat(filePath).st_size
+            except OSError:
+                continue
+            if size:
+                sizes[filePath] = size
+        with self.__lock:
+            entries = self._load_entries()
+            for filePath in [filePath for filePath in entries if filePath not in sizes and not path.exists(filePath)]:
+                del entries[filePath]
+                self.__changed = True
+        groups = self._group_by(groups=[list(sizes)], keys=sizes)
+
+        partialHashes = self._get_hashes(filePaths=[filePath for group in groups for filePath in group],
+                                         hashType='partial')
+        groups = self._group_by(groups=groups, keys=partialHashes)
+
+        fullHashes = self._get_hashes(filePaths=[filePath for group in groups for filePath in group], hashType='full')
+        groups = self._group_by(groups=groups, keys=fullHashes)
+
+        duplicates = dict((fullHashes[group[0]], group) for group in groups)
+        logger.debug(' Success, found %d contents held by %d files.' % (
+            len(duplicates), sum(len(group) for group in groups)))
+        return duplicates
+
+    def save(self):
+        """
+        Write index file atomically, if it changed since it was loaded or saved.
+        """
+
+        logger = getLogger('DuplicateIndex_Lib.save')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            if not self.__changed:
+                return
+
+            tempFilePath = self.__filePath + '.tmp'
+            try:
+                indexDir = path.dirname(self.__filePath)
+                if indexDir and not path.isdir(indexDir):
+                    makedirs(indexDir)
+                with open(tempFilePath, 'w') as indexFile:
+                    dump(self.__entries, indexFile, separators=(',', ':'))
+                if path.exists(self.__filePath):
+                    remove(self.__filePath)
+                rename(tempFilePath, self.__filePath)
+                self.__changed = False
+                logger.debug(' Saved %d local file hashes.' % len(self.__entries))
+            except (IOError, OSError) as e:
+                logger.warning(' Exception: %s' % str(e))
@@ -5,38 +5,205 @@
 ###
 
 from .lib import Lib
+from json import loads
 from logging import getLogger
-from os import path
+from os import path, remove
+from re import findall
+from time import time
 
 __author__ = 'szmania'
 
 FFMPEG_LOG = 'ffmpeg.log'
+
+VIDEO_PRESET = 'medium'
+VIDEO_CRF = 23
+VIDEO_MAX_WIDTH = 720
+VIDEO_BITS_PER_PIXEL = 0.1
+VIDEO_DEFAULT_FRAME_RATE = 30.0
+AUDIO_BIT_RATE = 128000
+PREDICTION_SAMPLE_COUNT = 3
+PREDICTION_SAMPLE_SECONDS = 5.0
+# ffmpeg muxer of each output container file extension.
+CONTAINER_FORMATS = {'mp4': 'mp4', 'm4v': 'mp4', 'mov': 'mov', 'mkv': 'matroska'}
+# Audio codecs each output container can hold, so audio is only copied when it fits. None allows any audio codec.
+CONTAINER_AUDIO_CODECS = {
+    'mp4': ['aac', 'ac3', 'alac', 'eac3', 'mp3'],
+    'm4v': ['aac', 'ac3', 'alac', 'eac3', 'mp3'],
+    'mov': ['aac', 'ac3', 'alac', 'mp3', 'pcm_s16be', 'pcm_s16le', 'pcm_s24le'],
+    'mkv': None,
+}
 SCRIPT_DIR = path.dirname(path.realpath(__file__))
 
 class FFMPEG_Lib(object):
-    def __init__(self, ffmpegExePath, logLevel='DEBUG', logFilePath=FFMPEG_LOG):
+    def __init__(self, ffmpegExePath, ffprobeExePath=None, logLevel='DEBUG', logFilePath=FFMPEG_LOG):
         """
         Library for __ffmpeg converter and encoder interaction.
 
         Args:
             ffmpegExePath (str): Path to ffmpeg.exe
+            ffprobeExePath (str): Path to ffprobe.exe. Defaults to ffprobe next to ffmpeg.exe.
             logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
         """
 
         self.__ffmpegExePath = ffmpegExePath
+        self.__ffprobeExePath = ffprobeExePath if ffprobeExePath else self._get_ffprobe_exe_path(ffmpegExePath)
         self.__logLevel = logLevel
         self.__ffmpegLog = logFilePath
 
         self.__lib = Lib(logLevel=logLevel)
 
+    def _get_ffprobe_exe_path(self, ffmpegExePath):
+        """
+        Get ffprobe executable path from ffmpeg executable path. Both ship in the same directory.
+
+        Args:
+            ffmpegExePath (str): Path to ffmpeg.exe
+
+        Returns:
+            String: Path to ffprobe executable.
+        """
+
+        if not ffmpegExePath:
+            return 'ffprobe'
+
+        ffmpegDir, ffmpegExe = path.split(ffmpegExePath)
+        return path.join(ffmpegDir, ffmpegExe.replace('ffmpeg', 'ffprobe'))
+
+    def _get_audio_codec(self, filePath, encodeProfile=None, probe=None):
+        """
+        Get audio codec of video file, when encode profile would copy its audio and so needs to know whether it fits
+        the output container.
+
+        Args:
+            filePath (str): File path of video.
+            encodeProfile (EncodeProfile): Encode settings to use.
+            probe (dict): Video details as returned by probe_video_file. Video is probed again if None or probed before
+                audio codecs were.
+
+        Returns:
+            String: Audio codec name. None if audio is not copied, video has no audio or could not be probed.
+        """
+
+        logger = getLogger('FFMPEG_Lib._get_audio_codec')
+        logger.setLevel(self.__logLevel)
+
+        if not encodeProfile or not encodeProfile.audioCopy:
+            return None
+
+        if not probe or 'audioCodec' not in probe:
+            probe = self.probe_video_file(filePath=filePath) or {}
+        return probe.get('audioCodec')
+
+    def _get_encode_cmd(self, filePath, targetPath, encodeProfile=None, startTime=None, duration=None,
+                        audioCodec=None):
+        """
+        Get ffmpeg command to encode video file with given encode profile. Output is muxed into the profile's container,
+        and audio is re-encoded instead of copied when its codec is unknown or not allowed in that container.
+
+        Args:
+            filePath (str): File path of video to encode.
+            targetPath (str): File path of video to be encoded into.
+            encodeProfile (EncodeProfile): Encode settings to use. If None, MEGA Manager default settings are used.
+            startTime (float): Offset in seconds to start encoding from. None to start at the beginning.
+            duration (float): Seconds of video to encode. None to encode until the end.
+            audioCodec (str): Audio codec of video file, as returned by _get_audio_codec.
+
+        Returns:
+            String: ffmpeg command.
+        """
+
+        preset = encodeProfile.preset if encodeProfile else VIDEO_PRESET
+        crf = encodeProfile.crf if encodeProfile else VIDEO_CRF
+        maxWidth = encodeProfile.maxWidth if encodeProfile else VIDEO_MAX_WIDTH
+        maxHeight = encodeProfile.maxHeight if encodeProfile else None
+        audioCopy = encodeProfile.audioCopy if encodeProfile else False
+        threads = encodeProfile.threads if encodeProfile else 1
+        container = (encodeProfile.container if encodeProfile else 'mp4').lower()
 
-    def compress_video_file(self, filePath, targetPath):
+        allowedAudioCodecs = CONTAINER_AUDIO_CODECS.get(container)
+        if audioCopy and allowedAudioCodecs is not None and audioCodec not in allowedAudioCodecs:
+            audioCopy = False
+
+        if maxWidth and maxHeight:
+            scaleFilter = '-vf "scale=\'min(iw,%d)\':\'min(ih,%d)\':force_original_aspect_ratio=decrease:' \
+                          'force_divisible_by=2" ' % (maxWidth, maxHeight)
+        elif maxWidth:
+            scaleFilter = '-vf "scale=\'if(gte(iw,%d), %d, iw)\':-2" ' % (maxWidth, maxWidth)
+        elif maxHeight:
+            scaleFilter = '-vf "scale=-2:\'if(gte(ih,%d), %d, ih)\'" ' % (maxHeight, maxHeight)
+        else:
+            scaleFilter = ''
+
+        audioArgs = '-c:a copy' if audioCopy else '-c:a aac -b:a %dk' % (AUDIO_BIT_RATE / 1000)
+        seek = '-ss %.3f ' % startTime if startTime is not None else ''
+        limit = '-t %.3f ' % duration if duration is not None else ''
+        muxer = '-f %s ' % CONTAINER_FORMATS[container] if container in CONTAINER_FORMATS else ''
+
+        cmd = '"%s" -y %s-i "%s" %s%s-c:v libx264 -preset %s -crf %d %s -threads %d %s"%s"' % \
+              (self.__ffmpegExePath, seek, filePath, limit, scaleFilter, preset, crf, audioArgs, threads, muxer,
+               targetPath)
+        return cmd
+
+    def benchmark_encode_profile(self, samplePath, targetPath, encodeProfile):
+        """
+        Encode sample video file with given encode profile and measure encode speed, output size and quality.
+
+        Args:
+            samplePath (str): File path of sample video to encode.
+            targetPath (str): File path of video to be encoded into. File is removed once benchmark is done.
+            encodeProfile (EncodeProfile): Encode settings to benchmark.
+
+        Returns:
+            Dictionary: Benchmark results with keys "profile", "encodeSeconds", "fps", "size", "ssim" and "psnr".
+                None if sample could not be encoded.
+        """
+
+        logger = getLogger('FFMPEG_Lib.benchmark_encode_profile')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Benchmarking encode profile "%s" on "%s".' % (encodeProfile.name, samplePath))
+
+        probe = self.probe_video_file(filePath=samplePath)
+        if not probe:
+            return None
+
+        startTime = time()
+        result = self.compress_video_file(filePath=samplePath, targetPath=targetPath, encodeProfile=encodeProfile,
+                                          probe=probe)
+        encodeSeconds = time() - startTime
+
+        if not result or not path.exists(targetPath):
+            logger.error(' Error, could NOT benchmark encode profile "%s"!' % encodeProfile.name)
+            return None
+
+        frameCount = probe['duration'] * (probe['frameRate'] or VIDEO_DEFAULT_FRAME_RATE)
+        ssim, psnr = self.get_video_quality(filePath=targetPath, referencePath=samplePath)
+
+        benchmark = {
+            'profile': encodeProfile.name,
+            'encodeSeconds': encodeSeconds,
+            'fps': frameCount / encodeSeconds if encodeSeconds > 0 else 0.0,
+            'size': path.getsize(targetPath),
+            'ssim': ssim,
+            'psnr': psnr,
+        }
+
+        try:
+            remove(targetPath)
+        except OSError as e:
+            logger.warning(' Exception: %s' % str(e))
+
+        return benchmark
+
+    def compress_video_file(self, filePath, targetPath, encodeProfile=None, probe=None):
         """
         Compress video file.
 
         Args:
             filePath (str): File path of video to __compressAll.
             targetPath (str): File path of video to be compressed into.
+            encodeProfile (EncodeProfile): Encode settings to use. If None, MEGA Manager default settings are used.
+            probe (dict): Video details as returned by probe_video_file, if already probed.
 
         Returns:
             subprocess object:
@@ -47,8 +214,9 @@ class FFMPEG_Lib(object):
     
         logger.debug(' Compressing video file: "%s"' % filePath)
     
-        cmd = '"%s" -i "%s" -vf "scale=\'if(gte(iw,720), 720, iw)\':-2" -preset medium -threads 1 "%s"' % \
-              (self.__ffmpegExePath, filePath, targetPath)
+        audioCodec = self._get_audio_codec(filePath=filePath, encodeProfile=encodeProfile, probe=probe)
+        cmd = self._get_encode_cmd(filePath=filePath, targetPath=targetPath, encodeProfile=encodeProfile,
+                                   audioCodec=audioCodec)
 
         result = self.__lib.exec_cmd(command=cmd, noWindow=True, outputFile=self.__ffmpegLog)
 
@@ -58,3 +226,205 @@ class FFMPEG_Lib(object):
             logger.error(' Error, could NOT compress video file "%s"!' % filePath)
         return result
 
+    def estimate_compression_saving(self, probe, encodeProfile=None):
+        """
+        Estimate percentage of file size saved by compressing video, given its probe data.
+        Expected output bit rate is derived from the scaled output resolution, frame rate and a bits per pixel
+        budget typical of the encode profile's constant rate factor. Every 6 CRF steps roughly halve the bit rate.
+
+        Args:
+            probe (dict): Video details as returned by probe_video_file.
+            encodeProfile (EncodeProfile): Encode settings to estimate for. If None, MEGA Manager default settings are
+                used.
+
+        Returns:
+            Float: Estimated saving as percentage of input size. Negative if output is expected to be larger. None if
+                saving cannot be estimated.
+        """
+
+        logger = getLogger('FFMPEG_Lib.estimate_compression_saving')
+        logger.setLevel(self.__logLevel)
+
+        width = probe.get('width')
+        height = probe.get('height')
+        bitRate = probe.get('bitRate')
+
+        if not width or not height or not bitRate:
+            logger.debug(' Error, not enough probe data to estimate compression saving!')
+            return None
+
+        maxWidth = encodeProfile.maxWidth if encodeProfile else VIDEO_MAX_WIDTH
+        maxHeight = encodeProfile.maxHeight if encodeProfile else None
+        crf = encodeProfile.crf if encodeProfile else VIDEO_CRF
+
+        scale = 1.0
+        if maxWidth and width > maxWidth:
+            scale = min(scale, maxWidth / float(width))
+        if maxHeight and height > maxHeight:
+            scale = min(scale, maxHeight / float(height))
+
+        targetWidth = width * scale
+        targetHeight = height * scale
+        frameRate = probe.get('frameRate') or VIDEO_DEFAULT_FRAME_RATE
+        bitsPerPixel = VIDEO_BITS_PER_PIXEL * 2 ** ((VIDEO_CRF - crf) / 6.0)
+
+        predictedBitRate = targetWidth * targetHeight * frameRate * bitsPerPixel + AUDIO_BIT_RATE
+        saving = 100.0 * (1 - predictedBitRate / float(bitRate))
+
+        logger.debug(' Estimated compression saving is %.1f%%.' % saving)
+        return saving
+
+    def get_video_quality(self, filePath, referencePath):
+        """
+        Get SSIM and PSNR of encoded video file compared to its reference video file. Encoded video is scaled back to
+        the reference resolution before comparing.
+
+        Args:
+            filePath (str): File path of encoded video.
+            referencePath (str): File path of reference video.
+
+        Returns:
+            Tuple: SSIM and PSNR as floats. Either is None if it could not be measured.
+        """
+
+        logger = getLogger('FFMPEG_Lib.get_video_quality')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Measuring quality of "%s" against "%s".' % (filePath, referencePath))
+
+        cmd = '"%s" -i "%s" -i "%s" -lavfi "[0:v][1:v]scale2ref[distorted][reference];' \
+              '[distorted]split[distorted1][distorted2];[reference]split[reference1][reference2];' \
+              '[distorted1][reference1]ssim;[distorted2][reference2]psnr" -f null -' % \
+              (self.__ffmpegExePath, filePath, referencePath)
+
+        out, err = self.__lib.exec_cmd_and_return_output(command=cmd, mergeStderr=True)
+        out = out if out else ''
+
+        ssim = None
+        psnr = None
+        ssimValues = findall('All:([\d.]+)', out)
+        psnrValues = findall('average:([\d.]+|inf)', out)
+
+        if ssimValues:
+            ssim = float(ssimValues[-1])
+        if psnrValues:
+            psnr = float(psnrValues[-1])
+
+        if ssim is None or psnr is None:
+            logger.warning(' Error, could NOT measure quality of "%s"!' % filePath)
+        return ssim, psnr
+
+    def predict_compression(self, filePath, targetPath, probe, encodeProfile=None,
+                            sampleCount=PREDICTION_SAMPLE_COUNT, sampleSeconds=PREDICTION_SAMPLE_SECONDS):
+        """
+        Predict compressed size and encode time of video file by encoding a few short slices spread evenly over it and
+        extrapolating to its full duration.
+
+        Args:
+            filePath (str): File path of video to predict compression for.
+            targetPath (str): File path slices are encoded into. File is removed once prediction is done.
+            probe (dict): Video details as returned by probe_video_file.
+            encodeProfile (EncodeProfile): Encode settings to predict for.
+            sampleCount (int): Number of slices to encode.
+            sampleSeconds (float): Length of each slice in seconds.
+
+        Returns:
+            Dictionary: Prediction with keys "size" (bytes), "encodeSeconds" and "saving" (percent of input size).
+                None if prediction could not be made.
+        """
+
+        logger = getLogger('FFMPEG_Lib.predict_compression')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Predicting compression of video file "%s".' % filePath)
+
+        duration = probe.get('duration')
+        if not duration or duration <= sampleCount * sampleSeconds:
+            logger.debug(' Video file "%s" too short to predict compression.' % filePath)
+            return None
+
+        audioCodec = self._get_audio_codec(filePath=filePath, encodeProfile=encodeProfile, probe=probe)
+        sampledBytes = 0
+        sampledEncodeSeconds = 0.0
+        for sample in range(sampleCount):
+            startTime = (duration - sampleSeconds) * (sample + 0.5) / sampleCount
+            cmd = self._get_encode_cmd(filePath=filePath, targetPath=targetPath, encodeProfile=encodeProfile,
+                                       startTime=startTime, duration=sampleSeconds, audioCodec=audioCodec)
+
+            sampleStartTime = time()
+            result = self.__lib.exec_cmd(command=cmd, noWindow=True, outputFile=self.__ffmpegLog)
+            sampledEncodeSeconds += time() - sampleStartTime
+
+            if not result or not path.exists(targetPath):
+                logger.error(' Error, could NOT encode sample of video file "%s"!' % filePath)
+                return None
+
+            sampledBytes += path.getsize(targetPath)
+            try:
+                remove(targetPath)
+            except OSError as e:
+                logger.warning(' Exception: %s' % str(e))
+
+        scale = duration / (sampleCount * sampleSeconds)
+        predictedSize = sampledBytes * scale
+        fileSize = path.getsize(filePath)
+
+        prediction = {
+            'size': int(predictedSize),
+            'encodeSeconds': sampledEncodeSeconds * scale,
+            'saving': 100.0 * (1 - predictedSize / float(fileSize)) if fileSize else 0.0,
+        }
+
+        logger.debug(' Predicted compressed size %d bytes (%.1f%% saving) in %.0f seconds for "%s".' % (
+            prediction['size'], prediction['saving'], prediction['encodeSeconds'], filePath))
+        return prediction
+
+    def probe_video_file(self, filePath):
+        """
+        Probe video file with ffprobe for video and audio codec, resolution, bit rate and duration.
+
+        Args:
+            filePath (str): File path of video to probe.
+
+        Returns:
+            Dictionary: Video details with keys "codec", "audioCodec" (None if video has no audio), "width", "height",
+                "frameRate", "bitRate" (bits per second) and "duration" (seconds). None if video could not be probed.
+        """
+
+        logger = getLogger('FFMPEG_Lib.probe_video_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Probing video file: "%s"' % filePath)
+
+        cmd = '"%s" -v error -show_entries ' \
+              'stream=codec_type,codec_name,width,height,avg_frame_rate:format=duration,bit_rate -of json "%s"' % \
+              (self.__ffprobeExePath, filePath)
+
+        out, err = self.__lib.exec_cmd_and_return_output(command=cmd)
+
+        try:
+            data = loads(out)
+            stream = [item for item in data['streams'] if item.get('codec_type') == 'video'][0]
+            audioStreams = [item for item in data['streams'] if item.get('codec_type') == 'audio']
+            fileFormat = data['format']
+
+            frameRate = 0.0
+            numerator, _, denominator = stream.get('avg_frame_rate', '0/1').partition('/')
+            if denominator and float(denominator) > 0:
+                frameRate = float(numerator) / float(denominator)
+
+            probe = {
+                'codec': stream.get('codec_name'),
+                'audioCodec': audioStreams[0].get('codec_name') if audioStreams else None,
+                'width': int(stream.get('width', 0)),
+                'height': int(stream.get('height', 0)),
+                'frameRate': frameRate,
+                'bitRate': int(fileFormat.get('bit_rate', 0)),
+                'duration': float(fileFormat.get('duration', 0)),
+            }
+        except Exception as e:
+            logger.error(' Error, could NOT probe video file "%s"! Exception: %s' % (filePath, str(e)))
+            return None
+
+        logger.debug(' Success, could probe video file "%s".' % filePath)
+        return probe
@@ -0,0 +1,111 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from base64 import urlsafe_b64encode
+from logging import getLogger
+from mmap import ACCESS_READ, mmap
+from os import path, stat
+from struct import pack
+from zlib import crc32
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+# MEGA's file fingerprint: four CRC32s of 16 bytes. Files up to FINGERPRINT_FULL_SIZE bytes are read whole, larger ones
+# are sampled in FINGERPRINT_BLOCKS blocks of FINGERPRINT_BLOCK_SIZE bytes spread evenly over the file per CRC.
+FINGERPRINT_CRC_COUNT = 4
+FINGERPRINT_FULL_SIZE = 8192
+FINGERPRINT_BLOCK_SIZE = 64
+FINGERPRINT_BLOCKS = 32
+
+
+class Fingerprint_Lib(object):
+    def __init__(self, logLevel='DEBUG'):
+        """
+        Library for MEGA style sparse file fingerprints: CRCs of sampled blocks of file content, followed by the file's
+        modification time. A fingerprint reads at most 8 KiB whatever the file size, so it tells files apart without
+        reading multi-GB files whole. It is the same form as the "c" attribute MEGA clients store on file nodes.
+
+        Args:
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__logLevel = logLevel
+
+    def _get_crcs(self, data, size):
+        """
+        Get CRCs of file content.
+
+        Args:
+            data (mmap): File content, or bytes of it for small files.
+            size (int): File size in bytes.
+
+        Returns:
+            Bytes: four big endian CRC32s, or content itself padded with zero bytes for files up to 16 bytes.
+        """
+
+        logger = getLogger('Fingerprint_Lib._get_crcs')
+        logger.setLevel(self.__logLevel)
+
+        if size <= FINGERPRINT_CRC_COUNT * 4:
+            return data[:size] + b'\0' * (FINGERPRINT_CRC_COUNT * 4 - size)
+
+        crcs = []
+        if size <= FINGERPRINT_FULL_SIZE:
+            for index in range(FINGERPRINT_CRC_COUNT):
+                crcs.append(crc32(data[index * size // FINGERPRINT_CRC_COUNT:
+                                       (index + 1) * size // FINGERPRINT_CRC_COUNT]) & 0xffffffff)
+            return pack('>%dI' % FINGERPRINT_CRC_COUNT, *crcs)
+
+        lastBlock = FINGERPRINT_CRC_COUNT * FINGERPRINT_BLOCKS - 1
+        for index in range(FINGERPRINT_CRC_COUNT):
+            crc = 0
+            for block in range(index * FINGERPRINT_BLOCKS, (index + 1) * FINGERPRINT_BLOCKS):
+                offset = (size - FINGERPRINT_BLOCK_SIZE) * block // lastBlock
+                crc = crc32(data[offset:offset + FINGERPRINT_BLOCK_SIZE], crc)
+            crcs.append(crc & 0xffffffff)
+        return pack('>%dI' % FINGERPRINT_CRC_COUNT, *crcs)
+
+    def get_fingerprint(self, filePath, fileStat=None):
+        """
+        Get fingerprint of local file. Large files are memory mapped, so only the sampled pages are read.
+
+        Args:
+            filePath (str): Local file path.
+            fileStat (stat_result): Stat of file, if already taken. None to stat file.
+
+        Returns:
+            String: URL safe base64 of CRCs followed by modification time, as MEGA's "c" node attribute. None if file
+                could not be read.
+        """
+
+        logger = getLogger('Fingerprint_Lib.get_fingerprint')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            fileStat = fileStat or stat(filePath)
+            size = fileStat.st_size
+            with open(filePath, 'rb') as localFile:
+                if size <= FINGERPRINT_FULL_SIZE:
+                    crcs = self._get_crcs(data=localFile.read(size), size=size)
+                else:
+                    data = mmap(localFile.fileno(), 0, access=ACCESS_READ)
+                    try:
+                        crcs = self._get_crcs(data=data, size=size)
+                    finally:
+                        data.close()
+        except (IOError, OSError, ValueError) as e:
+            logger.debug(' Exception: %s' % str(e))
+            return None
+
+        # Modification time is serialized as MEGA does: byte count, then little endian bytes.
+        modified = max(0, int(fileStat.st_mtime))
+        modifiedBytes = b''
+        while modified:
+            modifiedBytes += pack('B', modified & 0xff)
+            modified >>= 8
+        return urlsafe_b64encode(crcs + pack('B', len(modifiedBytes)) + modifiedBytes).decode('ascii').rstrip('=')
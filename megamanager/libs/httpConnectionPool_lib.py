@@ -0,0 +1,167 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from logging import getLogger
+from os import path
+from socket import error as SocketError
+from threading import Lock
+
+try:
+    from httplib import HTTPConnection, HTTPException, HTTPSConnection
+    from urlparse import urlsplit
+except ImportError:
+    from http.client import HTTPConnection, HTTPException, HTTPSConnection
+    from urllib.parse import urlsplit
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+HTTP_MAX_IDLE_CONNECTIONS = 8
+HTTP_TIMEOUT = 120
+
+
+class HttpConnectionPool_Lib(object):
+    def __init__(self, maxIdleConnections=HTTP_MAX_IDLE_CONNECTIONS, timeout=HTTP_TIMEOUT, logLevel='DEBUG'):
+        """
+        Pool of keep-alive HTTP and HTTPS connections, kept per host so requests skip TCP and TLS handshakes. Safe to
+        use from many threads; each request takes an idle connection or opens a new one.
+
+        Args:
+            maxIdleConnections (int): Most idle connections kept open per host.
+            timeout (int): Socket timeout in seconds.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__maxIdleConnections = maxIdleConnections
+        self.__timeout = timeout
+        self.__logLevel = logLevel
+
+        self.__idleConnections = {}
+        self.__lock = Lock()
+        self.__openedCount = 0
+        self.__requestCount = 0
+
+    def _get_connection(self, scheme, host):
+        """
+        Get idle connection to host, or open a new one.
+
+        Args:
+            scheme (str): "http" or "https".
+            host (str): Host with optional port, ie: "g.api.mega.co.nz" or "127.0.0.1:8089".
+
+        Returns:
+            Tuple: of connection and whether it was reused.
+        """
+
+        logger = getLogger('HttpConnectionPool_Lib._get_connection')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            idleConnections = self.__idleConnections.get((scheme, host))
+            if idleConnections:
+                return idleConnections.pop(), True
+            self.__openedCount += 1
+
+        logger.debug(' Opening %s connection to "%s".' % (scheme, host))
+        connectionClass = HTTPSConnection if scheme == 'https' else HTTPConnection
+        return connectionClass(host, timeout=self.__timeout), False
+
+    def _release_connection(self, scheme, host, connection):
+        """
+        Return connection to pool, or close it if pool of host is full.
+
+        Args:
+            scheme (str): "http" or "https".
+            host (str): Host of connection.
+            connection (HTTPConnection): Connection to return.
+        """
+
+        logger = getLogger('HttpConnectionPool_Lib._release_connection')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            idleConnections = self.__idleConnections.setdefault((scheme, host), [])
+            if len(idleConnections) < self.__maxIdleConnections:
+                idleConnections.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """
+        Close all idle connections.
+        """
+
+        logger = getLogger('HttpConnectionPool_Lib.close')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            idleConnections = self.__idleConnections
+            self.__idleConnections = {}
+
+        for connections in idleConnections.values():
+            for connection in connections:
+                connection.close()
+
+    def get_stats(self):
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary: with "requests" made and "connections" opened.
+        """
+
+        logger = getLogger('HttpConnectionPool_Lib.get_stats')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            return {'requests': self.__requestCount, 'connections': self.__openedCount}
+
+    def request(self, url, method='POST', body=None, headers=None):
+        """
+        Make HTTP request over pooled connection. A reused connection the server has closed meanwhile is replaced
+        once with a new connection.
+
+        Args:
+            url (str): Request URL.
+            method (str): HTTP method.
+            body (bytes): Request body.
+            headers (dict): Request headers.
+
+        Returns:
+            Tuple: of HTTP status code and response body bytes.
+
+        Raises:
+            IOError: if request failed.
+        """
+
+        logger = getLogger('HttpConnectionPool_Lib.request')
+        logger.setLevel(self.__logLevel)
+
+        urlParts = urlsplit(url)
+        requestPath = urlParts.path + ('?' + urlParts.query if urlParts.query else '')
+
+        with self.__lock:
+            self.__requestCount += 1
+
+        while True:
+            connection, reused = self._get_connection(scheme=urlParts.scheme, host=urlParts.netloc)
+            try:
+                connection.request(method, requestPath or '/', body, headers or {})
+                response = connection.getresponse()
+                data = response.read()
+            except (HTTPException, SocketError) as e:
+                connection.close()
+                if reused:
+                    logger.debug(' Reused connection failed, retrying with new connection: %s' % str(e))
+                    continue
+                raise IOError('HTTP request to "%s" failed: %s' % (urlParts.netloc, str(e)))
+
+            if response.getheader('connection', '').lower() == 'close':
+                connection.close()
+            else:
+                self._release_connection(scheme=urlParts.scheme, host=urlParts.netloc, connection=connection)
+            return response.status, data
@@ -4,16 +4,29 @@
 # Initial Creation.
 ###
 
+from .metrics_lib import Metrics_Lib
+from .processWatchdog_lib import ProcessWatchdog_Lib
+from json import dumps, loads
 from logging import getLogger
 from numpy import array, load, savez_compressed
 from os import chdir, kill, listdir, path
 from re import split, sub
 from signal import SIGTERM
-from subprocess import call, PIPE, Popen
+from subprocess import PIPE, Popen
+from sys import platform
+from threading import Lock, Thread
+from time import time
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
 
 __author__ = 'szmania'
 
 SCRIPT_DIR = path.dirname(path.realpath(__file__))
+LOCAL_SCAN_THREADS = 8
+IS_WINDOWS = platform.startswith('win')
 
 class Lib(object):
     def __init__(self, logLevel='DEBUG'):
@@ -25,6 +38,33 @@ class Lib(object):
         """
 
         self.__logLevel = logLevel
+        self.__metrics = Metrics_Lib(logLevel=logLevel)
+        self.__watchdog = ProcessWatchdog_Lib(logLevel=logLevel)
+
+    def _get_platform_command(self, command):
+        """
+        Adjust command for current platform. Commands are written for Windows; elsewhere the "start /B" prefix is
+        dropped and list commands are joined so they can be run by the shell.
+
+        Args:
+            command (str): Command to adjust. Can also be list of command arguments.
+
+        Returns:
+            Command to execute.
+        """
+
+        logger = getLogger('Lib._get_platform_command')
+        logger.setLevel(self.__logLevel)
+
+        if IS_WINDOWS:
+            return command
+
+        if isinstance(command, list):
+            if command[:2] == ['start', '/B']:
+                command = command[2:]
+            return ' '.join(command)
+
+        return sub('^\\s*start\\s+(""\\s+)?/B\\s+', '', command)
 
     def dump_set_into_file(self, itemSet, filePath):
         """
@@ -50,10 +90,37 @@ class Lib(object):
         except Exception as e:
             logger.debug(' Exception: %s' % str(e))
             return False
+
+    def dump_dict_into_file(self, itemDict, filePath):
+        """
+        Dump dictionary into file. Values are stored as JSON strings so nested dictionaries can be kept.
+
+        Args:
+            itemDict (dict): Dictionary to dump into file.
+            filePath (str): File to dump to.
+
+        Returns:
+            Boolean: boolean of whether successful or not
+        """
+
+        logger = getLogger('MegaManager_lib.dump_dict_into_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Dumping dictionary into %s filePath.' % filePath)
+
+        try:
+            keys = list(itemDict.keys())
+            npKeys = array(keys)
+            npValues = array([dumps(itemDict[key]) for key in keys])
+            savez_compressed(filePath, keys=npKeys, values=npValues)
+            return True
+        except Exception as e:
+            logger.debug(' Exception: %s' % str(e))
+            return False
     
     def exec_cmd(self, command, workingDir=None, noWindow=False, outputFile=None):
         """
-        Execute given command.
+        Execute given command, under the process watchdog.
 
         Args:
             command (str): Command to execute.
@@ -70,19 +137,15 @@ class Lib(object):
     
         logger.debug(' Executing command: "%s"' % command)
 
-        if outputFile:
-            outFile = open(outputFile, 'a')
-        else:
-            outFile=None
-
+        command = self._get_platform_command(command=command)
         if workingDir:
             chdir(workingDir)
 
-        if noWindow:
-            CREATE_NO_WINDOW = 0x08000000
-            exitCode = call(command, stdout=outFile, stderr=outFile, creationflags=CREATE_NO_WINDOW)
-        else:
-            exitCode = call(command,  stdout=outFile, stderr=outFile)
+        startTime = time()
+        exitCode, out, outputBytes = self.__watchdog.run(command=command, noWindow=noWindow, outputFilePath=outputFile,
+                                                         keepOutput=False)
+        self.__metrics.record_command(command=command, seconds=time() - startTime, exitCode=exitCode,
+                                      outputBytes=outputBytes)
     
         # while not proc.poll():
         #     pass
@@ -97,17 +160,60 @@ class Lib(object):
             logger.debug(' Error when running command "%s".' % command)
             return False
 
-    def exec_cmd_and_return_output(self, command, workingDir=None, outputFile=None):
+    def exec_cmd_and_return_result(self, command, workingDir=None, noWindow=False, outputFile=None, keepBytes=None):
         """
-        Execute given command and return stdout and stderr.
+        Execute given command, under the process watchdog, and return its exit code and output, stdout and stderr
+        merged.
+
+        Args:
+            command (str): Command to execute.
+            workingDir (str): Working directory.
+            noWindow (bool): No window will be created if true.
+            outputFile (str): File path to append all program output to as well, as it is written.
+            keepBytes (int): Bytes of output returned, from its end. None to return all output.
+
+        Returns:
+            Tuple: of exit code and output. Exit code None if command could not be run.
+        """
+
+        logger = getLogger('Lib.exec_cmd_and_return_result')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Executing command: "%s"' % command)
+
+        command = self._get_platform_command(command=command)
+        if workingDir:
+            chdir(workingDir)
+
+        startTime = time()
+        exitCode = None
+        out = ''
+        outputBytes = 0
+        try:
+            exitCode, out, outputBytes = self.__watchdog.run(command=command, noWindow=noWindow,
+                                                             outputFilePath=outputFile, keepBytes=keepBytes)
+        except Exception as e:
+            logger.warning(' Exception: %s' % str(e))
+        finally:
+            self.__metrics.record_command(command=command, seconds=time() - startTime, exitCode=exitCode,
+                                          outputBytes=outputBytes)
+
+        out = out if isinstance(out, str) else out.decode('utf-8', 'replace')
+        return exitCode, out
+
+    def exec_cmd_and_return_output(self, command, workingDir=None, outputFile=None, mergeStderr=False):
+        """
+        Execute given command, under the process watchdog, and return stdout and error.
 
         Args:
             command (str): Command to execute.
             workingDir (str): Working directory.
             outputFile (str): File to pipe process output to.
+            mergeStderr (bool): If true stderr is merged into returned stdout.
 
         Returns:
-            Tuple: of stdout and stderr.
+            Tuple: of stdout and error. Error is None if command exited with 0, else its exit code, stderr being merged
+                into stdout or left to this process's stderr, or the exception it could not be run with.
         """
 
         logger = getLogger('MegaTools_Lib.exec_cmd_and_return_output')
@@ -115,25 +221,110 @@ class Lib(object):
 
         logger.debug(' Executing command: "%s"' % command)
 
+        command = self._get_platform_command(command=command)
         if workingDir:
             chdir(workingDir)
 
+        startTime = time()
+        exitCode = None
+        outputBytes = 0
         try:
-            if outputFile:
-                outFile = open(outputFile, 'a')
-                proc = Popen(command, stdout=outputFile, stderr=outFile)
-            else:
-                proc = Popen(command, stdout=PIPE, shell=True)
-
-            (out, err) = proc.communicate()
+            # Stderr goes to output file with stdout, else it is merged into stdout or left to this process's stderr.
+            exitCode, out, outputBytes = self.__watchdog.run(command=command, outputFilePath=outputFile,
+                                                             keepOutput=not outputFile,
+                                                             captureStderr=bool(outputFile or mergeStderr))
         except Exception as e:
             logger.warning(' Exception: %s' % str(e))
-            return None, None
+            return None, 'Exception: %s' % str(e)
         finally:
-            if outputFile:
-                outFile.close()
+            self.__metrics.record_command(command=command, seconds=time() - startTime, exitCode=exitCode,
+                                          outputBytes=outputBytes)
+
+        if exitCode != 0:
+            return out, 'Command exited with code %s' % exitCode
+        return out, None
 
-        return out, err
+    def get_local_file_paths_recursively(self, localRoot, extensions=None, threadCount=LOCAL_SCAN_THREADS):
+        """
+        Get all file paths under local root. Directories are listed in parallel by a pool of threads. Exception a thread
+        raises, other than for a directory that could not be listed, is raised once every directory is scanned.
+
+        Args:
+            localRoot (str): Local directory to scan.
+            extensions (list): Lower case file extensions to match ie: [".jpg", ".png"]. Matched case-insensitively.
+                None to match all files.
+            threadCount (int): Number of threads listing directories.
+
+        Returns:
+            List: file paths under local root.
+        """
+
+        logger = getLogger('Lib.get_local_file_paths_recursively')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Scanning local directory "%s" with %d threads.' % (localRoot, threadCount))
+
+        dirQueue = Queue()
+        errors = []
+        filePaths = []
+        filePathsLock = Lock()
+
+        def scan_dirs():
+            while True:
+                dirPath = dirQueue.get()
+                if dirPath is None:
+                    dirQueue.task_done()
+                    return
+
+                # Directory is marked done whatever happens, so the queue is not waited on forever.
+                try:
+                    try:
+                        names = listdir(dirPath)
+                    except OSError as e:
+                        logger.debug(' Exception: %s' % str(e))
+                        names = []
+
+                    found = []
+                    for name in names:
+                        itemPath = path.join(dirPath, name)
+                        if path.isdir(itemPath):
+                            if not path.islink(itemPath):
+                                dirQueue.put(itemPath)
+                        elif extensions is None or path.splitext(name)[1].lower() in extensions:
+                            found.append(itemPath)
+
+                    with filePathsLock:
+                        filePaths.extend(found)
+                except Exception as e:
+                    logger.error(' Exception scanning "%s": %s' % (dirPath, str(e)))
+                    with filePathsLock:
+                        errors.append(e)
+                finally:
+                    dirQueue.task_done()
+
+        if not path.isdir(localRoot):
+            logger.debug(' Error, local directory "%s" does NOT exist!' % localRoot)
+            return filePaths
+
+        dirQueue.put(localRoot)
+        threads = []
+        for count in range(threadCount):
+            t = Thread(target=scan_dirs, name='thread_localScan_%d' % count)
+            t.daemon = True
+            t.start()
+            threads.append(t)
+
+        dirQueue.join()
+        for t in threads:
+            dirQueue.put(None)
+        for t in threads:
+            t.join()
+
+        if errors:
+            raise errors[0]
+
+        logger.debug(' Success, found %d files in local directory "%s".' % (len(filePaths), localRoot))
+        return filePaths
 
     def get_mb_size_from_bytes(self, bytes):
         """
@@ -245,15 +436,22 @@ class Lib(object):
     
         logger.info(' Killing processes with name "%s"' % procName)
         try:
-            # p = Popen(['ps', '-a'], stdout=PIPE)
-            p = Popen(['tasklist', '/v'], stdout=PIPE)
-            out, err = p.communicate()
-
+            if IS_WINDOWS:
+                p = Popen(['tasklist', '/v'], stdout=PIPE)
+                out, err = p.communicate()
+
+                for line in out.splitlines():
+                    if line.startswith(procName):
+                        pid = int(line.split()[1])
+                        kill(pid, SIGTERM)
+            else:
+                p = Popen(['ps', '-A', '-o', 'pid=,comm='], stdout=PIPE)
+                out, err = p.communicate()
 
-            for line in out.splitlines():
-                if line.startswith(procName):
-                    pid = int(line.split()[1])
-                    kill(pid, SIGTERM)
+                for line in out.splitlines():
+                    line_split = line.split()
+                    if len(line_split) > 1 and line_split[1] == sub('\\.exe$', '', procName):
+                        kill(int(line_split[0]), SIGTERM)
 
             logger.debug(' Success, all "%s" processes have been killed.' % procName)
             return True
@@ -262,6 +460,40 @@ class Lib(object):
             logger.error('Exception: {}'.format(e))
             return False
 
+    def load_file_as_dict(self, filePath):
+        """
+        Load file dumped with dump_dict_into_file as dictionary.
+
+        Args:
+            filePath (str): File to load.
+
+        Returns:
+            Dictionary of items in file.
+        """
+
+        logger = getLogger('Lib.load_file_as_dict')
+        logger.setLevel(self.__logLevel)
+
+        items = {}
+        if path.isfile(filePath):
+            logger.debug(' Loading %s filePath.' % filePath)
+
+            try:
+                data = load(file=filePath, allow_pickle=False)
+                keys = data.f.keys.tolist()
+                values = data.f.values.tolist()
+                for key, value in zip(keys, values):
+                    items[key] = loads(value)
+
+            except Exception as e:
+                logger.debug(' Exception: %s' % str(e))
+            finally:
+                return items
+
+        else:
+            logger.debug(' Error, filepath "%s" does NOT exist!' % filePath)
+            return items
+
     def load_file_as_set(self, filePath):
         """
         Load file as set splitting each line into a new item.
@@ -299,7 +531,7 @@ class Lib(object):
 
         else:
             logger.debug(' Error, filepath "%s" does NOT exist!' % filePath)
-            return items
+            return set()
 
     def size_of_dir(self, dirPath):
         """
@@ -318,7 +550,7 @@ class Lib(object):
     
         sum = 0
         for file in listdir(dirPath):
-            sum += path.getsize(dirPath + '\\' + file)
+            sum += path.getsize(path.join(dirPath, file))
         return sum
     
 
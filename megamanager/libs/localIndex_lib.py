@@ -0,0 +1,274 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from .fingerprint_lib import Fingerprint_Lib
+from json import dump, load
+from logging import getLogger
+from os import makedirs, path, remove, rename, stat
+from threading import Lock, Thread
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+FINGERPRINT_THREADS = 8
+
+
+class LocalIndex_Lib(object):
+    def __init__(self, filePath, threads=FINGERPRINT_THREADS, logLevel='DEBUG'):
+        """
+        Index of local files, keeping each file's size, modification time and sparse fingerprint, plus the fingerprint
+        it had when it was last uploaded or downloaded ("synced"). Fingerprints are only worked out again for files
+        whose size or modification time changed. Entries of files removed locally are kept until removed from the
+        index, so a file that moved can be matched with the remote copy of its old path.
+
+        Args:
+            filePath (str): Index file path.
+            threads (int): Number of threads working out fingerprints.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__filePath = filePath
+        self.__threads = threads
+        self.__logLevel = logLevel
+
+        self.__fingerprint = Fingerprint_Lib(logLevel=logLevel)
+        self.__entries = None
+        self.__changed = False
+        self.__lock = Lock()
+
+    def _load_entries(self):
+        """
+        Load index file, once. Must be called with lock held.
+
+        Returns:
+            Dictionary: of local file path to entry.
+        """
+
+        logger = getLogger('LocalIndex_Lib._load_entries')
+        logger.setLevel(self.__logLevel)
+
+        if self.__entries is None:
+            self.__entries = {}
+            if path.isfile(self.__filePath):
+                try:
+                    with open(self.__filePath, 'r') as indexFile:
+                        self.__entries = load(indexFile)
+                except (IOError, ValueError) as e:
+                    logger.warning(' Exception: %s' % str(e))
+        return self.__entries
+
+    def _update_entry(self, filePath):
+        """
+        Get entry of local file, working out its fingerprint again if file changed since it was indexed.
+
+        Args:
+            filePath (str): Local file path.
+
+        Returns:
+            Dictionary: entry with "size", "modified", "fingerprint" and "synced" fingerprint. None if file does not
+                exist or could not be read.
+        """
+
+        logger = getLogger('LocalIndex_Lib._update_entry')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            fileStat = stat(filePath)
+        except OSError:
+            return None
+
+        with self.__lock:
+            entry = self._load_entries().get(filePath)
+        if entry and entry['size'] == fileStat.st_size and entry['modified'] == fileStat.st_mtime:
+            return entry
+
+        fingerprint = self.__fingerprint.get_fingerprint(filePath=filePath, fileStat=fileStat)
+        if not fingerprint:
+            return None
+
+        newEntry = {'size': fileStat.st_size, 'modified': fileStat.st_mtime, 'fingerprint': fingerprint,
+                    'synced': entry['synced'] if entry else None}
+        with self.__lock:
+            self.__entries[filePath] = newEntry
+            self.__changed = True
+        return newEntry
+
+    def get_entries(self, filePaths):
+        """
+        Get entries of local files, working out fingerprints of new and changed files in a pool of threads.
+
+        Args:
+            filePaths (list): Local file paths.
+
+        Returns:
+            Dictionary: of local file path to entry. Files that could not be read are left out.
+        """
+
+        logger = getLogger('LocalIndex_Lib.get_entries')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Indexing %d local files with %d threads.' % (len(filePaths), self.__threads))
+
+        fileQueue = Queue()
+        entries = {}
+        entriesLock = Lock()
+
+        def index_files():
+            while True:
+                filePath = fileQueue.get()
+                if filePath is None:
+                    return
+                entry = self._update_entry(filePath=filePath)
+                if entry:
+                    with entriesLock:
+                        entries[filePath] = entry
+
+        for filePath in filePaths:
+            fileQueue.put(filePath)
+        threads = []
+        for count in range(min(self.__threads, len(filePaths))):
+            fileQueue.put(None)
+            t = Thread(target=index_files, name='thread_localIndex_%d' % count)
+            t.daemon = True
+            t.start()
+            threads.append(t)
+        for t in threads:
+            t.join()
+
+        logger.debug(' Success, indexed %d local files.' % len(entries))
+        return entries
+
+    def get_synced_entries(self, dirPath):
+        """
+        Get entries of local files under directory that were synced, whether or not they still exist locally. Entries
+        are not checked against the files, so this reads no file.
+
+        Args:
+            dirPath (str): Local directory path.
+
+        Returns:
+            Dictionary: of local file path to copy of entry.
+        """
+
+        logger = getLogger('LocalIndex_Lib.get_synced_entries')
+        logger.setLevel(self.__logLevel)
+
+        dirPath = dirPath.rstrip('/') + '/'
+        with self.__lock:
+            return dict((filePath, dict(entry)) for filePath, entry in self._load_entries().items()
+                        if entry['synced'] and filePath.startswith(dirPath))
+
+    def get_synced_fingerprint(self, filePath):
+        """
+        Get fingerprint local file had when it was last uploaded or downloaded, even if it no longer exists locally.
+
+        Args:
+            filePath (str): Local file path.
+
+        Returns:
+            String: fingerprint. None if file was never synced.
+        """
+
+        logger = getLogger('LocalIndex_Lib.get_synced_fingerprint')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            entry = self._load_entries().get(filePath)
+        return entry['synced'] if entry else None
+
+    def get_unsynced_bytes(self, dirPath):
+        """
+        Get bytes of indexed local files under directory that were never synced, as of when they were last indexed.
+        Entries are not checked against the files, so this reads no file.
+
+        Args:
+            dirPath (str): Local directory path.
+
+        Returns:
+            Integer: bytes.
+        """
+
+        logger = getLogger('LocalIndex_Lib.get_unsynced_bytes')
+        logger.setLevel(self.__logLevel)
+
+        dirPath = dirPath.rstrip('/') + '/'
+        with self.__lock:
+            return sum(entry['size'] for filePath, entry in self._load_entries().items()
+                       if not entry['synced'] and filePath.startswith(dirPath))
+
+    def remove_entries(self, filePaths):
+        """
+        Remove entries of local files, ie: once their remote copies are removed or moved.
+
+        Args:
+            filePaths (list): Local file paths.
+        """
+
+        logger = getLogger('LocalIndex_Lib.remove_entries')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            entries = self._load_entries()
+            for filePath in filePaths:
+                if entries.pop(filePath, None):
+                    self.__changed = True
+
+    def save(self):
+        """
+        Write index file atomically, if it changed since it was loaded or saved.
+        """
+
+        logger = getLogger('LocalIndex_Lib.save')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            if not self.__changed:
+                return
+
+            tempFilePath = self.__filePath + '.tmp'
+            try:
+                indexDir = path.dirname(self.__filePath)
+                if indexDir and not path.isdir(indexDir):
+                    makedirs(indexDir)
+                with open(tempFilePath, 'w') as indexFile:
+                    dump(self.__entries, indexFile, separators=(',', ':'))
+                if path.exists(self.__filePath):
+                    remove(self.__filePath)
+                rename(tempFilePath, self.__filePath)
+                self.__changed = False
+                logger.debug(' Saved %d local file entries.' % len(self.__entries))
+            except (IOError, OSError) as e:
+                logger.warning(' Exception: %s' % str(e))
+
+    def set_synced_fingerprint(self, filePath, fingerprint=None):
+        """
+        Record fingerprint local file was uploaded or downloaded with.
+
+        Args:
+            filePath (str): Local file path.
+            fingerprint (str): Synced fingerprint. None for the file's current fingerprint.
+
+        Returns:
+            String: synced fingerprint. None if file could not be read.
+        """
+
+        logger = getLogger('LocalIndex_Lib.set_synced_fingerprint')
+        logger.setLevel(self.__logLevel)
+
+        entry = self._update_entry(filePath=filePath)
+        if not entry:
+            return None
+
+        with self.__lock:
+            entry['synced'] = fingerprint or entry['fingerprint']
+            self.__changed = True
+        return entry['synced']
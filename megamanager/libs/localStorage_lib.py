@@ -0,0 +1,391 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from .lib import IS_WINDOWS
+from .storageBackend_lib import FILE_TYPE_DIR, FILE_TYPE_FILE, StorageBackend_Lib
+from logging import getLogger
+from os import listdir, makedirs, path, remove, rename, stat, walk
+from shutil import copy2, rmtree
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+
+class LocalStorage_Lib(StorageBackend_Lib):
+    def __init__(self, rootDir, logLevel='DEBUG'):
+        """
+        Storage backend keeping "remote" files in local directory, ie: for load testing at disk speed or staging mirror
+        copies on a NAS. Remote path "/Root/dir/file" of account "user" is kept as "<rootDir>/user/Root/dir/file", the
+        same layout fake megatools use in directory mode.
+
+        Args:
+            rootDir (str): Local directory to keep account files in.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__rootDir = rootDir
+        self.__logLevel = logLevel
+
+    def _get_file_data(self, username, localPath):
+        """
+        Get file data of local path.
+
+        Args:
+            username (str): username of account local path belongs to
+            localPath (str): Local path of remote file.
+
+        Returns:
+            Dictionary: file data. None if local path does not exist.
+        """
+
+        logger = getLogger('LocalStorage_Lib._get_file_data')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            fileStat = stat(localPath)
+        except OSError:
+            return None
+
+        isDir = path.isdir(localPath)
+        accountDir = path.join(self.__rootDir, username)
+        remotePath = '/' + path.relpath(localPath, accountDir).replace('\\', '/')
+        return {'path': remotePath, 'type': FILE_TYPE_DIR if isDir else FILE_TYPE_FILE,
+                'size': None if isDir else fileStat.st_size, 'modified': int(fileStat.st_mtime)}
+
+    def _get_free_disk_space(self, dirPath):
+        """
+        Get free disk space of disk directory is on.
+
+        Args:
+            dirPath (str): Directory path.
+
+        Returns:
+            Integer: free bytes. None if free space could not be got.
+        """
+
+        logger = getLogger('LocalStorage_Lib._get_free_disk_space')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            if IS_WINDOWS:
+                from ctypes import byref, c_ulonglong, c_wchar_p, windll
+                freeBytes = c_ulonglong(0)
+                windll.kernel32.GetDiskFreeSpaceExW(c_wchar_p(dirPath), None, None, byref(freeBytes))
+                return freeBytes.value
+
+            from os import statvfs
+            diskStat = statvfs(dirPath)
+            return diskStat.f_bavail * diskStat.f_frsize
+        except Exception as e:
+            logger.debug(' Exception: %s' % str(e))
+            return None
+
+    def _get_local_path(self, username, remotePath):
+        """
+        Get local path remote path of account is kept at.
+
+        Args:
+            username (str): username of account
+            remotePath (str): Remote path, ie: "/Root/dir/file".
+
+        Returns:
+            String: local path.
+        """
+
+        logger = getLogger('LocalStorage_Lib._get_local_path')
+        logger.setLevel(self.__logLevel)
+
+        parts = [part for part in remotePath.split('/') if part and part not in ['.', '..']]
+        return path.join(self.__rootDir, username, *parts)
+
+    def copy_file(self, username, password, remoteFilePath, newRemoteFilePath):
+        """
+        Copy remote file. Parent directory of new path must exist.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, not used
+            remoteFilePath (str): Remote file path to copy.
+            newRemoteFilePath (str): Remote file path to copy to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('LocalStorage_Lib.copy_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Copying remote file "%s" to "%s".' % (username, remoteFilePath, newRemoteFilePath))
+
+        localPath = self._get_local_path(username=username, remotePath=remoteFilePath)
+        newLocalPath = self._get_local_path(username=username, remotePath=newRemoteFilePath)
+        if not path.isfile(localPath) or path.exists(newLocalPath) or not path.isdir(path.dirname(newLocalPath)):
+            logger.debug(' Error, could NOT copy "%s" to "%s"!' % (remoteFilePath, newRemoteFilePath))
+            return False
+        try:
+            copy2(localPath, newLocalPath)
+        except (IOError, OSError) as e:
+            logger.debug(' Exception: %s' % str(e))
+            return False
+
+        logger.debug(' Success, copied remote file.')
+        return True
+
+    def get_file(self, username, password, remoteFilePath, localFilePath):
+        """
+        Copy remote file to local file path. Missing local parent directories are created.
+
+        Args:
+            username (str): username of account to copy from
+            password (str): password of account, not used
+            remoteFilePath (str): Remote file path to copy.
+            localFilePath (str): Local file path to copy to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('LocalStorage_Lib.get_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Copying "%s" to "%s".' % (username, remoteFilePath, localFilePath))
+
+        sourcePath = self._get_local_path(username=username, remotePath=remoteFilePath)
+        if not path.isfile(sourcePath):
+            logger.debug(' Error, remote file "%s" does not exist!' % remoteFilePath)
+            return False
+
+        try:
+            localDirPath = path.dirname(localFilePath)
+            if localDirPath and not path.isdir(localDirPath):
+                makedirs(localDirPath)
+            copy2(sourcePath, localFilePath)
+            logger.debug(' Success, copied file.')
+            return True
+        except (IOError, OSError) as e:
+            logger.debug(' Exception: %s' % str(e))
+            return False
+
+    def get_quota(self, username, password):
+        """
+        Get account space. Used space is size of account files, free space is free disk space.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, not used
+
+        Returns:
+            Dictionary: with "total", "used" and "free" space in bytes. None if space could not be got.
+        """
+
+        logger = getLogger('LocalStorage_Lib.get_quota')
+        logger.setLevel(self.__logLevel)
+
+        freeBytes = self._get_free_disk_space(dirPath=self.__rootDir)
+        if freeBytes is None:
+            logger.debug(' Error, could NOT get account space!')
+            return None
+
+        usedBytes = 0
+        for root, dirs, files in walk(path.join(self.__rootDir, username)):
+            for fileName in files:
+                try:
+                    usedBytes += path.getsize(path.join(root, fileName))
+                except OSError:
+                    pass
+
+        return {'total': usedBytes + freeBytes, 'used': usedBytes, 'free': freeBytes}
+
+    def list_files(self, username, password, remotePath, recursive=True):
+        """
+        List files and directories under remote directory, not including remote directory itself.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, not used
+            remotePath (str): Remote directory path to list.
+            recursive (bool): List subdirectories too.
+
+        Returns:
+            List: of file data dictionaries. None if remote directory does not exist.
+        """
+
+        logger = getLogger('LocalStorage_Lib.list_files')
+        logger.setLevel(self.__logLevel)
+
+        localDirPath = self._get_local_path(username=username, remotePath=remotePath)
+        if not path.isdir(localDirPath):
+            logger.debug(' Error, remote directory "%s" does not exist!' % remotePath)
+            return None
+
+        if recursive:
+            localPaths = []
+            for root, dirs, files in walk(localDirPath):
+                localPaths.extend(path.join(root, name) for name in dirs + files)
+        else:
+            localPaths = [path.join(localDirPath, name) for name in listdir(localDirPath)]
+
+        files = []
+        for localPath in sorted(localPaths):
+            fileData = self._get_file_data(username=username, localPath=localPath)
+            if fileData:
+                files.append(fileData)
+        return files
+
+    def make_dir(self, username, password, remoteDirPath):
+        """
+        Create remote directory. Parent directory must exist.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, not used
+            remoteDirPath (str): Remote directory path to create.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('LocalStorage_Lib.make_dir')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Creating remote directory "%s".' % (username, remoteDirPath))
+
+        localDirPath = self._get_local_path(username=username, remotePath=remoteDirPath)
+        parentDirPath = path.dirname(localDirPath)
+        # Account root directory, ie: "/Root", has no remote parent so is created with its account directory.
+        isAccountRoot = remoteDirPath.strip('/').count('/') == 0
+
+        if not path.isdir(parentDirPath) and not isAccountRoot:
+            logger.debug(' Error, parent directory of "%s" does not exist!' % remoteDirPath)
+            return False
+
+        try:
+            makedirs(localDirPath)
+            logger.debug(' Success, could create remote directory.')
+            return True
+        except OSError as e:
+            logger.debug(' Error, could NOT create remote directory! %s' % str(e))
+            return False
+
+    def move_file(self, username, password, remoteFilePath, newRemoteFilePath):
+        """
+        Move or rename remote file. Parent directory of new path must exist.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, not used
+            remoteFilePath (str): Remote file path to move.
+            newRemoteFilePath (str): Remote file path to move to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('LocalStorage_Lib.move_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Moving remote file "%s" to "%s".' % (username, remoteFilePath, newRemoteFilePath))
+
+        localPath = self._get_local_path(username=username, remotePath=remoteFilePath)
+        newLocalPath = self._get_local_path(username=username, remotePath=newRemoteFilePath)
+        if not path.isfile(localPath) or path.exists(newLocalPath) or not path.isdir(path.dirname(newLocalPath)):
+            logger.debug(' Error, could NOT move "%s" to "%s"!' % (remoteFilePath, newRemoteFilePath))
+            return False
+        try:
+            rename(localPath, newLocalPath)
+        except OSError as e:
+            logger.debug(' Exception: %s' % str(e))
+            return False
+
+        logger.debug(' Success, moved remote file.')
+        return True
+
+    def put_file(self, username, password, localFilePath, remoteFilePath):
+        """
+        Copy local file to remote file path, replacing remote file if it exists. Remote parent directories are created
+        when missing, so mirror copies can be staged without creating each directory first.
+
+        Args:
+            username (str): username of account to copy to
+            password (str): password of account, not used
+            localFilePath (str): Local file path to copy.
+            remoteFilePath (str): Remote file path to copy to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('LocalStorage_Lib.put_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Copying "%s" to "%s".' % (username, localFilePath, remoteFilePath))
+
+        targetPath = self._get_local_path(username=username, remotePath=remoteFilePath)
+        tempPath = targetPath + '.part'
+        try:
+            if not path.isdir(path.dirname(targetPath)):
+                makedirs(path.dirname(targetPath))
+            copy2(localFilePath, tempPath)
+            if path.exists(targetPath):
+                remove(targetPath)
+            rename(tempPath, targetPath)
+            logger.debug(' Success, copied file.')
+            return True
+        except (IOError, OSError) as e:
+            logger.debug(' Exception: %s' % str(e))
+            if path.exists(tempPath):
+                remove(tempPath)
+            return False
+
+    def remove_file(self, username, password, remoteFilePath):
+        """
+        Remove remote file or directory.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, not used
+            remoteFilePath (str): Remote file path to remove.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('LocalStorage_Lib.remove_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Removing remote file "%s"!' % (username, remoteFilePath))
+
+        localPath = self._get_local_path(username=username, remotePath=remoteFilePath)
+        try:
+            if path.isdir(localPath):
+                rmtree(localPath)
+            else:
+                remove(localPath)
+            logger.debug(' Success, could remove remote file.')
+            return True
+        except OSError as e:
+            logger.debug(' Error, could NOT remove remote file! %s' % str(e))
+            return False
+
+    def stat_file(self, username, password, remoteFilePath):
+        """
+        Get remote file data.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, not used
+            remoteFilePath (str): Remote file or directory path.
+
+        Returns:
+            Dictionary: file data. None if remote file does not exist.
+        """
+
+        logger = getLogger('LocalStorage_Lib.stat_file')
+        logger.setLevel(self.__logLevel)
+
+        return self._get_file_data(username=username,
+                                   localPath=self._get_local_path(username=username, remotePath=remoteFilePath))
@@ -0,0 +1,378 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from fnmatch import fnmatch
+from logging import getLogger
+from os import close, path, read, stat, strerror, walk
+from select import select
+from struct import calcsize, unpack_from
+from sys import platform
+from threading import Condition, Thread
+from time import time
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+CHANGE_CHANGED = 'changed'
+CHANGE_REMOVED = 'removed'
+CHANGE_RESCAN = 'rescan'
+
+WATCH_DEBOUNCE_SECONDS = 2.0
+WATCH_POLL_SECONDS = 10.0
+
+# inotify event masks, from <sys/inotify.h>.
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | \
+    IN_MOVE_SELF
+EVENT_HEADER_FORMAT = 'iIII'
+EVENT_HEADER_SIZE = calcsize(EVENT_HEADER_FORMAT)
+EVENT_BUFFER_SIZE = 64 * 1024
+
+
+class LocalWatcher_Lib(object):
+    def __init__(self, localRoots, ignoredPatterns=None, debounceSeconds=WATCH_DEBOUNCE_SECONDS,
+                 pollSeconds=WATCH_POLL_SECONDS, logLevel='DEBUG'):
+        """
+        Watch local directory trees for changed and removed files. On Linux every directory is watched with inotify,
+        elsewhere trees are polled for files whose size or modification time changed. Changes are collected per path,
+        so many events on one file are reported as one change.
+
+        Args:
+            localRoots (list): Local root directory paths to watch recursively.
+            ignoredPatterns (list): File name patterns to ignore, ie: partial downloads.
+            debounceSeconds (float): Seconds without new events before collected changes are reported, so files still
+                being written are reported once they are done.
+            pollSeconds (float): Seconds between polls, if inotify is not available.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__localRoots = [localRoot.rstrip('/') for localRoot in localRoots]
+        self.__ignoredPatterns = ignoredPatterns if ignoredPatterns else []
+        self.__debounceSeconds = debounceSeconds
+        self.__pollSeconds = pollSeconds
+        self.__logLevel = logLevel
+
+        self.__changes = {}
+        self.__lastEventTime = 0
+        self.__condition = Condition()
+        self.__libc = None
+        self.__fd = None
+        self.__watches = {}
+        self.__snapshot = {}
+        self.__running = False
+        self.__thread = None
+
+    def _add_change(self, filePath, change):
+        """
+        Collect change of path, replacing earlier change of the same path.
+
+        Args:
+            filePath (str): Local file or directory path.
+            change (str): CHANGE_CHANGED, CHANGE_REMOVED or CHANGE_RESCAN.
+        """
+
+        logger = getLogger('LocalWatcher_Lib._add_change')
+        logger.setLevel(self.__logLevel)
+
+        if change != CHANGE_RESCAN and self._is_ignored(filePath=filePath):
+            return
+        with self.__condition:
+            if self.__changes.get(filePath) != CHANGE_RESCAN:
+                self.__changes[filePath] = change
+            self.__lastEventTime = time()
+            self.__condition.notify_all()
+
+    def _add_watches(self, dirPath, reportFiles=False):
+        """
+        Watch directory and every directory under it with inotify.
+
+        Args:
+            dirPath (str): Local directory path.
+            reportFiles (bool): Whether to report files found as changed, ie: for directories created or moved in,
+                whose files may have been written before they were watched.
+        """
+
+        logger = getLogger('LocalWatcher_Lib._add_watches')
+        logger.setLevel(self.__logLevel)
+
+        for root, dirs, files in walk(dirPath):
+            wd = self.__libc.inotify_add_watch(self.__fd, self._encode_path(root), WATCH_MASK)
+            if wd < 0:
+                logger.warning(' Error, could not watch "%s": %s' % (root, strerror(get_errno())))
+                continue
+            self.__watches[wd] = root
+            if reportFiles:
+                for fileName in files:
+                    self._add_change(filePath=path.join(root, fileName), change=CHANGE_CHANGED)
+
+    def _encode_path(self, filePath):
+        """
+        Get path as bytes, for passing to libc.
+
+        Args:
+            filePath (str): Local path.
+
+        Returns:
+            Bytes: encoded path.
+        """
+
+        return filePath if isinstance(filePath, bytes) else filePath.encode('utf-8')
+
+    def _get_inotify(self):
+        """
+        Get libc with inotify, if platform has it.
+
+        Returns:
+            CDLL: libc. None if inotify is not available.
+        """
+
+        logger = getLogger('LocalWatcher_Lib._get_inotify')
+        logger.setLevel(self.__logLevel)
+
+        if not platform.startswith('linux'):
+            return None
+        try:
+            libc = CDLL(find_library('c') or 'libc.so.6', use_errno=True)
+            libc.inotify_init1
+            libc.inotify_add_watch
+        except (OSError, AttributeError) as e:
+            logger.debug(' inotify not available: %s' % str(e))
+            return None
+        return libc
+
+    def _get_snapshot(self):
+        """
+        Get size and modification time of every file under watched roots.
+
+        Returns:
+            Dictionary: of local file path to (size, modification time).
+        """
+
+        logger = getLogger('LocalWatcher_Lib._get_snapshot')
+        logger.setLevel(self.__logLevel)
+
+        snapshot = {}
+        for localRoot in self.__localRoots:
+            for root, dirs, files in walk(localRoot):
+                for fileName in files:
+                    filePath = path.join(root, fileName)
+                    try:
+                        fileStat = stat(filePath)
+                    except OSError:
+                        continue
+                    snapshot[filePath] = (fileStat.st_size, fileStat.st_mtime)
+        return snapshot
+
+    def _handle_event(self, wd, mask, name):
+        """
+        Turn inotify event into a change of the path it is about.
+
+        Args:
+            wd (int): Watch descriptor event is for.
+            mask (int): Event mask.
+            name (str): Name of file or directory in watched directory. Empty if event is about directory itself.
+        """
+
+        logger = getLogger('LocalWatcher_Lib._handle_event')
+        logger.setLevel(self.__logLevel)
+
+        if mask & IN_Q_OVERFLOW:
+            logger.warning(' inotify event queue overflowed, rescanning watched roots.')
+            for localRoot in self.__localRoots:
+                self._add_change(filePath=localRoot, change=CHANGE_RESCAN)
+            return
+
+        dirPath = self.__watches.get(wd)
+        if dirPath is None:
+            return
+        if mask & IN_IGNORED:
+            del self.__watches[wd]
+            return
+        if not name:
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF) and dirPath in self.__localRoots:
+                logger.warning(' Watched root "%s" was removed or moved.' % dirPath)
+            return
+
+        filePath = path.join(dirPath, name)
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            if mask & IN_ISDIR:
+                for watchedWd, watchedPath in list(self.__watches.items()):
+                    if watchedPath == filePath or watchedPath.startswith(filePath + '/'):
+                        del self.__watches[watchedWd]
+            self._add_change(filePath=filePath, change=CHANGE_REMOVED)
+        elif mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_watches(dirPath=filePath, reportFiles=True)
+        elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_ATTRIB):
+            self._add_change(filePath=filePath, change=CHANGE_CHANGED)
+
+    def _is_ignored(self, filePath):
+        """
+        Whether file name matches an ignored pattern.
+
+        Args:
+            filePath (str): Local file path.
+
+        Returns:
+            Boolean: whether file is ignored or not.
+        """
+
+        fileName = path.basename(filePath)
+        return any(fnmatch(fileName, pattern) for pattern in self.__ignoredPatterns)
+
+    def _read_inotify(self):
+        """
+        Read inotify events until watcher is stopped.
+        """
+
+        logger = getLogger('LocalWatcher_Lib._read_inotify')
+        logger.setLevel(self.__logLevel)
+
+        while self.__running:
+            try:
+                readable = select([self.__fd], [], [], 1.0)[0]
+                if not readable:
+                    continue
+                data = read(self.__fd, EVENT_BUFFER_SIZE)
+            except (IOError, OSError) as e:
+                if not self.__running:
+                    return
+                logger.debug(' Exception: %s' % str(e))
+                continue
+
+            offset = 0
+            while offset + EVENT_HEADER_SIZE <= len(data):
+                wd, mask, cookie, length = unpack_from(EVENT_HEADER_FORMAT, data, offset)
+                offset += EVENT_HEADER_SIZE
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if not isinstance(name, str):
+                    name = name.decode('utf-8', 'replace')
+                self._handle_event(wd=wd, mask=mask, name=name)
+
+    def _poll(self):
+        """
+        Poll watched roots until watcher is stopped, collecting files whose size or modification time changed.
+        """
+
+        logger = getLogger('LocalWatcher_Lib._poll')
+        logger.setLevel(self.__logLevel)
+
+        while self.__running:
+            with self.__condition:
+                self.__condition.wait(self.__pollSeconds)
+            if not self.__running:
+                return
+            snapshot = self._get_snapshot()
+            for filePath, fileState in snapshot.items():
+                if self.__snapshot.get(filePath) != fileState:
+                    self._add_change(filePath=filePath, change=CHANGE_CHANGED)
+            for filePath in set(self.__snapshot) - set(snapshot):
+                self._add_change(filePath=filePath, change=CHANGE_REMOVED)
+            self.__snapshot = snapshot
+
+    def get_changes(self, timeout=None):
+        """
+        Wait for changes and get them, once no new event came for the debounce time.
+
+        Args:
+            timeout (float): Maximum seconds to wait. None to wait until there are changes.
+
+        Returns:
+            Dictionary: of local path to CHANGE_CHANGED or CHANGE_REMOVED, or of watched root path to CHANGE_RESCAN
+                if events were lost and the whole root has to be synced again. Empty if timeout was reached first.
+        """
+
+        logger = getLogger('LocalWatcher_Lib.get_changes')
+        logger.setLevel(self.__logLevel)
+
+        endTime = time() + timeout if timeout is not None else None
+        with self.__condition:
+            while True:
+                now = time()
+                if self.__changes:
+                    quietTime = self.__lastEventTime + self.__debounceSeconds - now
+                    if quietTime <= 0:
+                        changes = self.__changes
+                        self.__changes = {}
+                        logger.debug(' Got %d local changes.' % len(changes))
+                        return changes
+                    waitTime = quietTime
+                else:
+                    waitTime = None
+                if endTime is not None:
+                    if now >= endTime:
+                        return {}
+                    waitTime = min(waitTime, endTime - now) if waitTime is not None else endTime - now
+                self.__condition.wait(waitTime if waitTime is not None else self.__pollSeconds)
+
+    def start(self):
+        """
+        Start watching local roots.
+
+        Returns:
+            Boolean: whether inotify is used or not, in which case roots are polled.
+        """
+
+        logger = getLogger('LocalWatcher_Lib.start')
+        logger.setLevel(self.__logLevel)
+
+        self.__running = True
+        self.__libc = self._get_inotify()
+        if self.__libc:
+            self.__fd = self.__libc.inotify_init1(IN_NONBLOCK)
+            if self.__fd < 0:
+                logger.warning(' Error, could not initialize inotify: %s' % strerror(get_errno()))
+                self.__libc = None
+
+        if self.__libc:
+            for localRoot in self.__localRoots:
+                self._add_watches(dirPath=localRoot)
+            self.__thread = Thread(target=self._read_inotify, name='thread_localWatcher_inotify')
+            logger.debug(' Watching %d directories with inotify.' % len(self.__watches))
+        else:
+            self.__snapshot = self._get_snapshot()
+            self.__thread = Thread(target=self._poll, name='thread_localWatcher_poll')
+            logger.debug(' Polling %d files every %.1f seconds.' % (len(self.__snapshot), self.__pollSeconds))
+
+        self.__thread.daemon = True
+        self.__thread.start()
+        return self.__libc is not None
+
+    def stop(self):
+        """
+        Stop watching local roots.
+        """
+
+        logger = getLogger('LocalWatcher_Lib.stop')
+        logger.setLevel(self.__logLevel)
+
+        self.__running = False
+        with self.__condition:
+            self.__condition.notify_all()
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+        if self.__fd is not None and self.__fd >= 0:
+            close(self.__fd)
+        self.__fd = None
+        self.__watches = {}
+        logger.debug(' Stopped watching local roots.')
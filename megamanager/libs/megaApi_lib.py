@@ -0,0 +1,1447 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from .fingerprint_lib import Fingerprint_Lib
+from .httpConnectionPool_lib import HttpConnectionPool_Lib
+from .megaCrypto_lib import MegaCrypto_Lib
+from .metrics_lib import Metrics_Lib
+from .storageBackend_lib import FILE_TYPE_DIR, FILE_TYPE_FILE, StorageBackend_Lib
+from json import dumps, loads
+from logging import getLogger
+from multiprocessing import cpu_count, Pool
+from os import path, urandom
+from random import randint
+from threading import Lock
+from time import sleep, time
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+API_URL = 'https://g.api.mega.co.nz'
+API_BATCH_SIZE = 100
+API_CONNECTIONS = 8
+API_RETRIES = 7
+API_RETRY_SECONDS = 0.25
+
+ERROR_EAGAIN = -3
+ERROR_ETOOMANY = -6
+ERROR_ENOENT = -9
+ERROR_ESID = -15
+ERROR_NAMES = {-1: 'EINTERNAL', -2: 'EARGS', -3: 'EAGAIN', -4: 'ERATELIMIT', -5: 'EFAILED', -6: 'ETOOMANY',
+               -7: 'ERANGE', -8: 'EEXPIRED', -9: 'ENOENT', -10: 'ECIRCULAR', -11: 'EACCESS', -12: 'EEXIST',
+               -13: 'EINCOMPLETE', -14: 'EKEY', -15: 'ESID', -16: 'EBLOCKED', -17: 'EOVERQUOTA', -18: 'ETEMPUNAVAIL'}
+
+# Node types of MEGA's API. Root, inbox and rubbish bin nodes are shown as "/Root", "/Inbox" and "/Rubbish", as
+# megatools shows them.
+NODE_TYPE_FILE = 0
+NODE_TYPE_DIR = 1
+SYSTEM_NODE_PATHS = {2: '/Root', 3: '/Inbox', 4: '/Rubbish'}
+
+# Seconds between saves of node trees changed by server change notifications. Trees are saved on close as well.
+REMOTE_STATE_SAVE_SECONDS = 60
+
+
+def _derive_password_key(loginData):
+    """
+    Derive password key and user hash of account. Module level, so it can be pickled to login process pool.
+
+    Args:
+        loginData (tuple): of lower case email, password and result of "us0" API command.
+
+    Returns:
+        Tuple: of password key and user hash.
+    """
+
+    email, password, preLogin = loginData
+    crypto = MegaCrypto_Lib(logLevel='WARN')
+    if isinstance(preLogin, dict) and preLogin.get('v') == 2:
+        return crypto.get_password_key_v2(password=password, salt=preLogin['s'])
+    passwordKey = crypto.get_password_key_v1(password=password)
+    return passwordKey, crypto.get_user_hash_v1(email=email, passwordKey=passwordKey)
+
+
+class MegaApiError(Exception):
+    def __init__(self, code, message=None):
+        """
+        Error returned by MEGA's API.
+
+        Args:
+            code (int): Negative API error code, ie: -9 for ENOENT.
+            message (str): Error description.
+        """
+
+        self.code = code
+        super(MegaApiError, self).__init__('%s (%s)%s' % (ERROR_NAMES.get(code, 'UNKNOWN'), code,
+                                                          ': ' + message if message else ''))
+
+
+class MegaApi_Lib(StorageBackend_Lib):
+    def __init__(self, apiUrl=API_URL, transferBackend=None, sessionCache=None, remoteState=None, downloader=None,
+                 uploader=None, maxConnections=API_CONNECTIONS, logLevel='DEBUG'):
+        """
+        Storage backend talking to MEGA's JSON API in process. Each account logs in once and keeps its session and node
+        tree, so listing, stat, removal and directory creation cost one pooled keep-alive HTTP request instead of a
+        megatools process and login. Commands of bulk operations are batched into one request.
+
+        Node tree is fetched whole once, then kept current by applying the server's change notifications (action
+        packets) since the tree's sequence number, so listing never needs a full fetch again.
+
+        Args:
+            apiUrl (str): API URL, ie: "https://g.api.mega.co.nz" or URL of fake MEGA API server.
+            transferBackend (StorageBackend_Lib): Backend file transfers are handed to, ie: MegaTools_Lib.
+            sessionCache (SessionCache_Lib): Cache sessions are reused from across runs. None to log in every run.
+            remoteState (RemoteState_Lib): Store node trees are kept in across runs. None to fetch trees every run.
+            downloader (ChunkedDownload_Lib): Engine files are downloaded with in parallel ranges. None to download with
+                transfer backend.
+            uploader (ChunkedUpload_Lib): Engine files are uploaded with in pipelined parts. None to upload with
+                transfer backend.
+            maxConnections (int): Most idle keep-alive connections kept open.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__apiUrl = apiUrl.rstrip('/')
+        self.__transferBackend = transferBackend
+        self.__sessionCache = sessionCache
+        self.__remoteState = remoteState
+        self.__downloader = downloader
+        self.__uploader = uploader
+        self.__logLevel = logLevel
+
+        self.__crypto = MegaCrypto_Lib(logLevel=logLevel)
+        self.__fingerprint = Fingerprint_Lib(logLevel=logLevel)
+        self.__metrics = Metrics_Lib(logLevel=logLevel)
+        self.__pool = HttpConnectionPool_Lib(maxIdleConnections=maxConnections, logLevel=logLevel)
+
+        self.__sequenceId = randint(0, 0xffffffff)
+        self.__sequenceLock = Lock()
+        self.__sessions = {}
+        self.__sessionsLock = Lock()
+
+    def _add_node(self, session, nodeData, key=None):
+        """
+        Decrypt node returned by API and add it to session node tree.
+
+        Args:
+            session (dict): Account session.
+            nodeData (dict): Node as returned by "f" or "p" API command.
+            key (tuple): Decrypted node key, if already decrypted. None to decrypt it.
+
+        Returns:
+            Dictionary: added node. None if node could not be decrypted.
+        """
+
+        logger = getLogger('MegaApi_Lib._add_node')
+        logger.setLevel(self.__logLevel)
+
+        node = {'handle': nodeData['h'], 'parent': nodeData.get('p'), 'type': nodeData['t'], 'name': None,
+                'size': nodeData.get('s'), 'modified': nodeData.get('ts'), 'key': None, 'fingerprint': None}
+
+        if node['type'] in SYSTEM_NODE_PATHS:
+            node['name'] = SYSTEM_NODE_PATHS[node['type']][1:]
+        else:
+            try:
+                if key is None:
+                    encryptedKey = self._get_encrypted_node_key(session=session, nodeData=nodeData)
+                    if not encryptedKey:
+                        return None
+                    key = self.__crypto.decrypt_key(encryptedKey, session['masterKey'])
+                node['key'] = key
+                attributes = self.__crypto.decrypt_attributes(self.__crypto.base64_url_decode(nodeData.get('a', '')),
+                                                              self.__crypto.get_node_key(key))
+            except (TypeError, ValueError) as e:
+                logger.debug(' Exception: %s' % str(e))
+                attributes = None
+            if not attributes or not attributes.get('n'):
+                logger.debug(' Could not decrypt node "%s".' % node['handle'])
+                return None
+            node['name'] = attributes['n']
+            node['fingerprint'] = attributes.get('c')
+
+        session['nodes'][node['handle']] = node
+        session['nodeData'][node['handle']] = nodeData
+        return node
+
+    def _add_nodes(self, session, nodesData):
+        """
+        Decrypt nodes returned by API and add them to session node tree. Node keys are all decrypted with master key in
+        one pass.
+
+        Args:
+            session (dict): Account session.
+            nodesData (list): Nodes as returned by "f" API command or in action packets.
+
+        Returns:
+            List: of added nodes.
+        """
+
+        logger = getLogger('MegaApi_Lib._add_nodes')
+        logger.setLevel(self.__logLevel)
+
+        encryptedKeys = []
+        keyedNodesData = []
+        addedNodes = []
+        for nodeData in nodesData:
+            if nodeData.get('t') in SYSTEM_NODE_PATHS:
+                addedNodes.append(self._add_node(session=session, nodeData=nodeData))
+                continue
+            try:
+                encryptedKey = self._get_encrypted_node_key(session=session, nodeData=nodeData)
+            except (TypeError, ValueError) as e:
+                logger.debug(' Exception: %s' % str(e))
+                encryptedKey = None
+            if encryptedKey:
+                encryptedKeys.append(encryptedKey)
+                keyedNodesData.append(nodeData)
+
+        keys = self.__crypto.decrypt_keys(encryptedKeys, session['masterKey'])
+        for nodeData, key in zip(keyedNodesData, keys):
+            addedNodes.append(self._add_node(session=session, nodeData=nodeData, key=key))
+        return [node for node in addedNodes if node]
+
+    def _api_request(self, session, commands, endpoint='cs', parameters=None):
+        """
+        Send batch of API commands in one request. Whole request is retried with backoff while API returns EAGAIN.
+
+        Args:
+            session (dict): Account session. None for commands made before login.
+            commands (list): API command dictionaries, ie: [{"a": "uq", "strg": 1}]. None for requests without body.
+            endpoint (str): "cs" for commands, "sc" for server change notifications.
+            parameters (dict): Extra URL parameters, ie: {"sn": sequenceNumber} of "sc" request.
+
+        Returns:
+            List: result of each command. Failed commands have negative integer error code as result. Dictionary
+                result of "sc" request.
+
+        Raises:
+            MegaApiError: if whole request failed, ie: with ESID when session expired.
+        """
+
+        logger = getLogger('MegaApi_Lib._api_request')
+        logger.setLevel(self.__logLevel)
+
+        with self.__sequenceLock:
+            self.__sequenceId = (self.__sequenceId + 1) & 0xffffffff
+            sequenceId = self.__sequenceId
+
+        url = '%s/%s?id=%d' % (self.__apiUrl, endpoint, sequenceId)
+        for name, value in sorted((parameters or {}).items()):
+            url += '&%s=%s' % (name, value)
+        if session:
+            url += '&sid=%s' % session['sid']
+        body = dumps(commands).encode('utf-8') if commands is not None else b''
+        command = 'megaapi_%s -u %s' % (commands[0].get('a') if commands else endpoint,
+                                        session['username'] if session else '')
+
+        for attempt in range(API_RETRIES):
+            startTime = time()
+            try:
+                status, data = self.__pool.request(url=url, body=body, headers={'Content-Type': 'application/json'})
+            except IOError as e:
+                self.__metrics.record_command(command=command, seconds=time() - startTime, exitCode=None)
+                logger.debug(' Exception: %s' % str(e))
+                status, data = None, None
+
+            result = None
+            if status == 200:
+                self.__metrics.record_command(command=command, seconds=time() - startTime, exitCode=0,
+                                              outputBytes=len(data))
+                try:
+                    result = loads(data.decode('utf-8'))
+                except ValueError:
+                    result = None
+            elif status is not None:
+                self.__metrics.record_command(command=command, seconds=time() - startTime, exitCode=status)
+
+            if isinstance(result, (list, dict)):
+                return result
+            if isinstance(result, int) and result != ERROR_EAGAIN:
+                raise MegaApiError(result)
+
+            retrySeconds = API_RETRY_SECONDS * 2 ** attempt
+            logger.debug(' API request failed (status %s), retrying in %.2f seconds.' % (status, retrySeconds))
+            sleep(retrySeconds)
+
+        raise MegaApiError(ERROR_EAGAIN, 'API request failed %d times' % API_RETRIES)
+
+    def _apply_actions(self, session, packets):
+        """
+        Apply server change notifications (action packets) to session node tree. New and moved nodes ("t"), removed
+        nodes ("d") and changed attributes ("u") are applied; other packets, ie: of shares and contacts, are skipped.
+
+        Args:
+            session (dict): Account session.
+            packets (list): Action packets of "sc" request.
+
+        Returns:
+            Integer: number of action packets applied.
+        """
+
+        logger = getLogger('MegaApi_Lib._apply_actions')
+        logger.setLevel(self.__logLevel)
+
+        appliedCount = 0
+        for packet in packets:
+            action = packet.get('a')
+            if action == 't':
+                nodesData = packet.get('t', {}).get('f', [])
+                with session['lock']:
+                    moved = any(nodeData.get('h') in session['nodes'] for nodeData in nodesData)
+                    addedNodes = self._add_nodes(session=session, nodesData=nodesData)
+                    if moved:
+                        self._update_paths(session=session)
+                    else:
+                        # Parents are sent before their children, so paths are worked out in one pass.
+                        for node in addedNodes:
+                            parent = session['nodes'].get(node['parent'])
+                            node['path'] = SYSTEM_NODE_PATHS.get(node['type']) or \
+                                (parent['path'] + '/' + node['name'] if parent and parent.get('path') else None)
+                            if node['path']:
+                                session['paths'][node['path']] = node['handle']
+            elif action == 'd':
+                self._remove_nodes(session=session, handles=[packet.get('n')])
+            elif action == 'u':
+                with session['lock']:
+                    node = session['nodes'].get(packet.get('n'))
+                    if not node:
+                        continue
+                    nodeData = dict(session['nodeData'][node['handle']])
+                    nodeData['a'] = packet.get('at', nodeData.get('a'))
+                    nodeData['ts'] = packet.get('ts', nodeData.get('ts'))
+                    updatedNode = self._add_node(session=session, nodeData=nodeData, key=node['key'])
+                    if updatedNode:
+                        updatedNode['path'] = node['path']
+                        if updatedNode['name'] != node['name']:
+                            self._update_paths(session=session)
+            else:
+                continue
+            appliedCount += 1
+
+        logger.debug(' %s: Applied %d of %d action packets.' % (session['username'], appliedCount, len(packets)))
+        return appliedCount
+
+    def _call(self, username, password, commands, endpoint='cs', parameters=None):
+        """
+        Send batch of API commands with account session, logging in first if needed. Commands are sent again once
+        with a new session if session expired.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            commands (list): API command dictionaries. None for requests without body.
+            endpoint (str): "cs" for commands, "sc" for server change notifications.
+            parameters (dict): Extra URL parameters.
+
+        Returns:
+            List: result of each command. Failed commands have negative integer error code as result. Dictionary
+                result of "sc" request.
+
+        Raises:
+            MegaApiError: if login or request failed.
+        """
+
+        logger = getLogger('MegaApi_Lib._call')
+        logger.setLevel(self.__logLevel)
+
+        session = self._get_session(username=username, password=password)
+        sessionId = session['sid']
+        try:
+            return self._api_request(session=session, commands=commands, endpoint=endpoint, parameters=parameters)
+        except MegaApiError as e:
+            if e.code != ERROR_ESID:
+                raise
+            logger.debug(' %s: Session expired, logging in again.' % username)
+            # Session keeps its node tree, only its session id is replaced.
+            with session['loginLock']:
+                if session['sid'] == sessionId:
+                    session['sid'] = None
+                    if self.__sessionCache:
+                        self.__sessionCache.remove_session(username=username)
+            session = self._get_session(username=username, password=password)
+            return self._api_request(session=session, commands=commands, endpoint=endpoint, parameters=parameters)
+
+    def _fetch_nodes(self, username, password):
+        """
+        Fetch whole node tree of account into session, with sequence number to poll server changes from.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Dictionary: account session with fetched node tree.
+
+        Raises:
+            MegaApiError: if node tree could not be fetched.
+        """
+
+        logger = getLogger('MegaApi_Lib._fetch_nodes')
+        logger.setLevel(self.__logLevel)
+
+        result = self._call(username=username, password=password, commands=[{'a': 'f', 'c': 1}])[0]
+        if not isinstance(result, dict):
+            raise MegaApiError(result, 'could not fetch nodes')
+
+        session = self._get_session(username=username, password=password)
+        with session['lock']:
+            session['nodes'] = {}
+            session['nodeData'] = {}
+            self._add_nodes(session=session, nodesData=result.get('f', []))
+            self._update_paths(session=session)
+            session['sn'] = result.get('sn')
+            session['stale'] = False
+            session['changed'] = True
+        self._save_nodes(session=session, force=True)
+
+        logger.debug(' %s: Fetched %d nodes.' % (username, len(session['nodes'])))
+        return session
+
+    def _get_account_session(self, username, password):
+        """
+        Get session entry of account, without logging in.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Dictionary: session. "sid" is None if account is not logged in yet.
+        """
+
+        logger = getLogger('MegaApi_Lib._get_account_session')
+        logger.setLevel(self.__logLevel)
+
+        with self.__sessionsLock:
+            session = self.__sessions.get(username)
+            if not session or session['password'] != password:
+                session = {'username': username, 'password': password, 'sid': None, 'masterKey': None,
+                           'userHandle': None, 'nodes': None, 'nodeData': {}, 'paths': {}, 'sn': None,
+                           'stale': False, 'changed': False, 'savedTime': 0, 'lock': Lock(), 'loginLock': Lock(),
+                           'syncLock': Lock()}
+                self.__sessions[username] = session
+        return session
+
+    def _get_cached_session(self, username, password):
+        """
+        Get session of account from session cache.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Dictionary: with "sid", "masterKey" and "userHandle". None if account has no cached session.
+        """
+
+        logger = getLogger('MegaApi_Lib._get_cached_session')
+        logger.setLevel(self.__logLevel)
+
+        if not self.__sessionCache:
+            return None
+        return self.__sessionCache.get_session(username=username, password=password)
+
+    def _get_encrypted_node_key(self, session, nodeData):
+        """
+        Get key of node encrypted with master key of account.
+
+        Args:
+            session (dict): Account session.
+            nodeData (dict): Node as returned by API.
+
+        Returns:
+            Tuple: encrypted key words. None if node has no key of account.
+        """
+
+        logger = getLogger('MegaApi_Lib._get_encrypted_node_key')
+        logger.setLevel(self.__logLevel)
+
+        keys = dict(part.split(':', 1) for part in nodeData.get('k', '').split('/') if ':' in part)
+        encryptedKey = keys.get(session['userHandle'], keys.get(nodeData.get('u')))
+        return self.__crypto.base64_to_a32(encryptedKey) if encryptedKey else None
+
+    def _get_file_data(self, node):
+        """
+        Get file data of node.
+
+        Args:
+            node (dict): Session node.
+
+        Returns:
+            Dictionary: file data.
+        """
+
+        logger = getLogger('MegaApi_Lib._get_file_data')
+        logger.setLevel(self.__logLevel)
+
+        isFile = node['type'] == NODE_TYPE_FILE
+        fileData = {'path': node['path'], 'type': FILE_TYPE_FILE if isFile else FILE_TYPE_DIR,
+                    'size': node['size'] if isFile else None, 'modified': node['modified']}
+        if isFile and node.get('fingerprint'):
+            fileData['fingerprint'] = node['fingerprint']
+        return fileData
+
+    def _get_node(self, username, password, remotePath):
+        """
+        Get node of remote path from session node tree, loading tree if not loaded yet. Server changes are polled if
+        path is not found and tree may be out of date.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remotePath (str): Remote path of node.
+
+        Returns:
+            Dictionary: node. None if remote path does not exist.
+        """
+
+        logger = getLogger('MegaApi_Lib._get_node')
+        logger.setLevel(self.__logLevel)
+
+        remotePath = remotePath.rstrip('/')
+        session = self._get_session(username=username, password=password)
+        if session['nodes'] is None:
+            session = self._sync_nodes(username=username, password=password)
+
+        with session['lock']:
+            handle = session['paths'].get(remotePath)
+            stale = session['stale']
+        if handle is None and stale:
+            session = self._sync_nodes(username=username, password=password)
+            handle = session['paths'].get(remotePath)
+        return session['nodes'].get(handle) if handle else None
+
+    def _get_put_node_command(self, session, parent, remotePath, nodeType, key, handle='xxxxxxxx', fingerprint=None):
+        """
+        Get API command creating node under parent directory.
+
+        Args:
+            session (dict): Session of account.
+            parent (dict): Session node of parent directory.
+            remotePath (str): Remote path of new node.
+            nodeType (int): NODE_TYPE_DIR or NODE_TYPE_FILE.
+            key (tuple): Node key, four words for directories, eight for files.
+            handle (str): Completion handle of uploaded file content, or handle of file node to copy. Placeholder for
+                directories.
+            fingerprint (str): Sparse fingerprint of file, kept as "c" attribute. None for directories.
+
+        Returns:
+            Dictionary: "p" command.
+        """
+
+        attributes = {'n': remotePath.rsplit('/', 1)[1]}
+        if fingerprint:
+            attributes['c'] = fingerprint
+        attributes = self.__crypto.encrypt_attributes(attributes, self.__crypto.get_node_key(key))
+        return {'a': 'p', 't': parent['handle'], 'i': self.__crypto.base64_url_encode(urandom(8)),
+                'n': [{'h': handle, 't': nodeType, 'a': self.__crypto.base64_url_encode(attributes),
+                       'k': self.__crypto.a32_to_base64(self.__crypto.encrypt_key(key, session['masterKey']))}]}
+
+    def _get_session(self, username, password):
+        """
+        Get logged in session of account, from session cache or by logging in if account has no session id yet.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Dictionary: session with "sid", "masterKey", "userHandle" and node tree.
+
+        Raises:
+            MegaApiError: if login failed.
+        """
+
+        logger = getLogger('MegaApi_Lib._get_session')
+        logger.setLevel(self.__logLevel)
+
+        session = self._get_account_session(username=username, password=password)
+
+        # Login lock is per account, so workers of one account log in once while other accounts are not held up.
+        with session['loginLock']:
+            if not session['sid']:
+                session.update(self._get_cached_session(username=username, password=password) or
+                               self._login(username=username, password=password))
+        return session
+
+    def _load_nodes(self, username, password):
+        """
+        Load node tree of account saved by an earlier run into session.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Boolean: whether tree was loaded or not.
+        """
+
+        logger = getLogger('MegaApi_Lib._load_nodes')
+        logger.setLevel(self.__logLevel)
+
+        tree = self.__remoteState.load_tree(username=username) if self.__remoteState else None
+        if not tree:
+            return False
+
+        session = self._get_session(username=username, password=password)
+        with session['lock']:
+            session['nodes'] = {}
+            session['nodeData'] = {}
+            self._add_nodes(session=session, nodesData=tree['nodes'])
+            self._update_paths(session=session)
+            session['sn'] = tree['sn']
+            session['stale'] = False
+            session['changed'] = False
+            session['savedTime'] = time()
+
+        logger.debug(' %s: Loaded %d saved nodes.' % (username, len(session['nodes'])))
+        return True
+
+    def _login(self, username, password, passwordKeys=None):
+        """
+        Log in to account, and add session to session cache.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            passwordKeys (tuple): Password key and user hash, if already derived. None to derive them.
+
+        Returns:
+            Dictionary: with "sid", "masterKey" and "userHandle".
+
+        Raises:
+            MegaApiError: if login failed.
+        """
+
+        logger = getLogger('MegaApi_Lib._login')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Logging in.' % username)
+        email = username.lower()
+
+        if passwordKeys:
+            passwordKey, userHash = passwordKeys
+        else:
+            preLogin = self._api_request(session=None, commands=[{'a': 'us0', 'user': email}])[0]
+            passwordKey, userHash = _derive_password_key((email, password, preLogin))
+
+        login = self._api_request(session=None, commands=[{'a': 'us', 'user': email, 'uh': userHash}])[0]
+        if not isinstance(login, dict):
+            raise MegaApiError(login, 'could not log in as "%s"' % username)
+
+        masterKey = self.__crypto.decrypt_key(self.__crypto.base64_to_a32(login['k']), passwordKey)
+        if 'tsid' in login:
+            sessionData = self.__crypto.base64_url_decode(login['tsid'])
+            check = self.__crypto.encrypt_key(self.__crypto.bytes_to_a32(sessionData[:16]), masterKey)
+            if self.__crypto.a32_to_bytes(check) != sessionData[-16:]:
+                raise MegaApiError(ERROR_ENOENT, 'wrong password for "%s"' % username)
+            sessionId = login['tsid']
+        else:
+            sessionId = self.__crypto.decrypt_session_id(csid=login['csid'], privateKey=login['privk'],
+                                                         masterKey=masterKey)
+
+        logger.debug(' Success, logged in as "%s".' % username)
+        if self.__sessionCache:
+            self.__sessionCache.set_session(username=username, password=password,
+                                            session={'sid': sessionId, 'masterKey': masterKey,
+                                                     'userHandle': login.get('u')})
+        return {'sid': sessionId, 'masterKey': masterKey, 'userHandle': login.get('u')}
+
+    def _poll_actions(self, username, password):
+        """
+        Poll server changes since sequence number of session node tree, and apply them. Polls until server has no
+        more changes.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Integer: number of action packets applied.
+
+        Raises:
+            MegaApiError: if changes could not be polled, with ETOOMANY if server no longer has changes since sequence
+                number, so whole tree must be fetched again.
+        """
+
+        logger = getLogger('MegaApi_Lib._poll_actions')
+        logger.setLevel(self.__logLevel)
+
+        session = self._get_session(username=username, password=password)
+        appliedCount = 0
+        while True:
+            result = self._call(username=username, password=password, commands=None, endpoint='sc',
+                                parameters={'sn': session['sn']})
+            # Up to date once server hands out a wait URL instead of action packets.
+            if not isinstance(result, dict) or 'a' not in result:
+                break
+            appliedCount += self._apply_actions(session=session, packets=result['a'])
+            with session['lock']:
+                session['sn'] = result.get('sn', session['sn'])
+                session['changed'] = True
+
+        with session['lock']:
+            session['stale'] = False
+        self._save_nodes(session=session)
+
+        logger.debug(' %s: Applied %d server changes.' % (username, appliedCount))
+        return appliedCount
+
+    def _put_node(self, username, password, parent, remotePath, nodeType, key, handle='xxxxxxxx', fingerprint=None):
+        """
+        Create node under parent directory and add it to session node tree.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            parent (dict): Session node of parent directory.
+            remotePath (str): Remote path of new node.
+            nodeType (int): NODE_TYPE_DIR or NODE_TYPE_FILE.
+            key (tuple): Node key, four words for directories, eight for files.
+            handle (str): Completion handle of uploaded file content, or handle of file node to copy. Placeholder for
+                directories.
+            fingerprint (str): Sparse fingerprint of file, kept as "c" attribute. None for directories.
+
+        Returns:
+            Dictionary: added node. None if node could not be created.
+
+        Raises:
+            MegaApiError: if API request failed.
+        """
+
+        logger = getLogger('MegaApi_Lib._put_node')
+        logger.setLevel(self.__logLevel)
+
+        session = self._get_session(username=username, password=password)
+        command = self._get_put_node_command(session=session, parent=parent, remotePath=remotePath, nodeType=nodeType,
+                                             key=key, handle=handle, fingerprint=fingerprint)
+        result = self._call(username=username, password=password, commands=[command])[0]
+        if not isinstance(result, dict) or not result.get('f'):
+            logger.debug(' Error, could NOT create node "%s"! %s' % (remotePath, str(result)))
+            return None
+
+        session = self._get_session(username=username, password=password)
+        with session['lock']:
+            node = self._add_node(session=session, nodeData=result['f'][0])
+            if node:
+                node['path'] = remotePath
+                session['paths'][remotePath] = node['handle']
+        return node
+
+    def _remove_nodes(self, session, handles):
+        """
+        Remove nodes and their descendants from session node tree.
+
+        Args:
+            session (dict): Account session.
+            handles (list): Handles of removed nodes.
+        """
+
+        logger = getLogger('MegaApi_Lib._remove_nodes')
+        logger.setLevel(self.__logLevel)
+
+        with session['lock']:
+            for handle in handles:
+                node = session['nodes'].pop(handle, None)
+                session['nodeData'].pop(handle, None)
+                if not node or not node['path']:
+                    continue
+                session['paths'].pop(node['path'], None)
+                if node['type'] == NODE_TYPE_FILE:
+                    continue
+
+                prefix = node['path'] + '/'
+                for nodePath in [nodePath for nodePath in session['paths'] if nodePath.startswith(prefix)]:
+                    descendantHandle = session['paths'].pop(nodePath)
+                    session['nodes'].pop(descendantHandle, None)
+                    session['nodeData'].pop(descendantHandle, None)
+
+    def _save_nodes(self, session, force=False):
+        """
+        Save session node tree, if it changed and was not saved within REMOTE_STATE_SAVE_SECONDS.
+
+        Args:
+            session (dict): Account session.
+            force (bool): Save changed tree however recently it was saved.
+        """
+
+        logger = getLogger('MegaApi_Lib._save_nodes')
+        logger.setLevel(self.__logLevel)
+
+        if not self.__remoteState:
+            return
+
+        with session['lock']:
+            if not session['changed'] or not session['sn'] or \
+                    (not force and time() - session['savedTime'] < REMOTE_STATE_SAVE_SECONDS):
+                return
+            nodesData = list(session['nodeData'].values())
+            sequenceNumber = session['sn']
+            session['changed'] = False
+            session['savedTime'] = time()
+
+        self.__remoteState.save_tree(username=session['username'], sequenceNumber=sequenceNumber, nodes=nodesData)
+
+    def _sync_nodes(self, username, password):
+        """
+        Bring session node tree up to date. Tree is loaded as saved by an earlier run, or fetched whole if there is
+        none, then server changes since its sequence number are applied.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Dictionary: account session with up to date node tree.
+
+        Raises:
+            MegaApiError: if node tree could not be fetched.
+        """
+
+        logger = getLogger('MegaApi_Lib._sync_nodes')
+        logger.setLevel(self.__logLevel)
+
+        session = self._get_session(username=username, password=password)
+        with session['syncLock']:
+            if session['nodes'] is None and not self._load_nodes(username=username, password=password):
+                return self._fetch_nodes(username=username, password=password)
+            if not session['sn']:
+                return self._fetch_nodes(username=username, password=password)
+
+            try:
+                self._poll_actions(username=username, password=password)
+            except MegaApiError as e:
+                if e.code != ERROR_ETOOMANY:
+                    raise
+                logger.debug(' %s: Server changes since saved tree expired, fetching whole tree.' % username)
+                if self.__remoteState:
+                    self.__remoteState.remove_tree(username=username)
+                return self._fetch_nodes(username=username, password=password)
+        return session
+
+    def _update_paths(self, session):
+        """
+        Work out path of each session node from its parents, and index nodes by path.
+
+        Args:
+            session (dict): Account session.
+        """
+
+        logger = getLogger('MegaApi_Lib._update_paths')
+        logger.setLevel(self.__logLevel)
+
+        nodes = session['nodes']
+        for node in nodes.values():
+            node['path'] = None
+
+        for node in nodes.values():
+            # Walk up to the first node with a known path, then work paths out downwards. Nodes whose parents are
+            # missing, ie: shared nodes, get no path.
+            chain = []
+            chainHandles = set()
+            current = node
+            while current is not None and current['path'] is None and current['handle'] not in chainHandles:
+                if current['type'] in SYSTEM_NODE_PATHS:
+                    current['path'] = SYSTEM_NODE_PATHS[current['type']]
+                    break
+                chain.append(current)
+                chainHandles.add(current['handle'])
+                current = nodes.get(current['parent'])
+
+            parentPath = current['path'] if current is not None else None
+            for chainNode in reversed(chain):
+                chainNode['path'] = parentPath + '/' + chainNode['name'] if parentPath else None
+                parentPath = chainNode['path']
+
+        session['paths'] = dict((node['path'], handle) for handle, node in nodes.items() if node['path'])
+
+    def close(self):
+        """
+        Save changed node trees and close idle keep-alive connections.
+        """
+
+        logger = getLogger('MegaApi_Lib.close')
+        logger.setLevel(self.__logLevel)
+
+        with self.__sessionsLock:
+            sessions = list(self.__sessions.values())
+        for session in sessions:
+            self._save_nodes(session=session, force=True)
+        self.__pool.close()
+        if self.__downloader:
+            self.__downloader.close()
+        if self.__uploader:
+            self.__uploader.close()
+
+    def copy_file(self, username, password, remoteFilePath, newRemoteFilePath):
+        """
+        Copy remote file within account on the server, with a "p" (put nodes) API command of the existing file node
+        handle and key, so the content is not transferred again.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file path to copy.
+            newRemoteFilePath (str): Remote file path to copy to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaApi_Lib.copy_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Copying remote file "%s" to "%s".' % (username, remoteFilePath, newRemoteFilePath))
+
+        newRemoteFilePath = newRemoteFilePath.rstrip('/')
+        try:
+            node = self._get_node(username=username, password=password, remotePath=remoteFilePath)
+            if not node or node['type'] != NODE_TYPE_FILE or not node['key']:
+                logger.debug(' Error, remote file "%s" does not exist!' % remoteFilePath)
+                return False
+            if self._get_node(username=username, password=password, remotePath=newRemoteFilePath):
+                logger.debug(' Error, remote file "%s" already exists!' % newRemoteFilePath)
+                return False
+            parent = self._get_node(username=username, password=password,
+                                    remotePath=newRemoteFilePath.rsplit('/', 1)[0])
+            if not parent or parent['type'] == NODE_TYPE_FILE:
+                logger.debug(' Error, parent directory of "%s" does not exist!' % newRemoteFilePath)
+                return False
+            newNode = self._put_node(username=username, password=password, parent=parent,
+                                     remotePath=newRemoteFilePath, nodeType=NODE_TYPE_FILE, key=node['key'],
+                                     handle=node['handle'], fingerprint=node['fingerprint'])
+        except MegaApiError as e:
+            logger.debug(' Error, could NOT copy remote file! %s' % str(e))
+            return False
+
+        return newNode is not None
+
+    def get_file(self, username, password, remoteFilePath, localFilePath):
+        """
+        Download remote file to local file path, with download engine if there is one, otherwise through transfer
+        backend.
+
+        Args:
+            username (str): username of account to download from
+            password (str): password of account to download from
+            remoteFilePath (str): Remote file path to download.
+            localFilePath (str): Local file path to download to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaApi_Lib.get_file')
+        logger.setLevel(self.__logLevel)
+
+        if self.__downloader:
+            try:
+                node = self._get_node(username=username, password=password, remotePath=remoteFilePath)
+                if not node or node['type'] != NODE_TYPE_FILE:
+                    logger.error(' Error, remote file "%s" does not exist!' % remoteFilePath)
+                    return False
+                result = self._call(username=username, password=password,
+                                    commands=[{'a': 'g', 'g': 1, 'n': node['handle']}])[0]
+            except MegaApiError as e:
+                logger.error(' Error, could NOT get download URL of "%s"! %s' % (remoteFilePath, str(e)))
+                return False
+
+            if not isinstance(result, dict) or not result.get('g'):
+                logger.error(' Error, could NOT get download URL of "%s"! %s' % (remoteFilePath, str(result)))
+                return False
+            return self.__downloader.download(url=result['g'], key=node['key'], size=int(result['s']),
+                                              localFilePath=localFilePath)
+
+        if not self.__transferBackend:
+            logger.error(' Error, no transfer backend to download "%s" with!' % remoteFilePath)
+            return False
+        return self.__transferBackend.get_file(username=username, password=password, remoteFilePath=remoteFilePath,
+                                               localFilePath=localFilePath)
+
+    def get_quota(self, username, password):
+        """
+        Get account space.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Dictionary: with "total", "used" and "free" space in bytes. None if space could not be got.
+        """
+
+        logger = getLogger('MegaApi_Lib.get_quota')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            result = self._call(username=username, password=password, commands=[{'a': 'uq', 'strg': 1, 'xfer': 1}])[0]
+        except MegaApiError as e:
+            logger.debug(' Error, could NOT get account space! %s' % str(e))
+            return None
+
+        if not isinstance(result, dict) or 'mstrg' not in result:
+            logger.debug(' Error, could NOT get account space! %s' % str(result))
+            return None
+
+        total = int(result['mstrg'])
+        used = int(result.get('cstrg', 0))
+        return {'total': total, 'used': used, 'free': max(0, total - used)}
+
+    def get_stats(self):
+        """
+        Get connection pool statistics, ie: to check keep-alive connections are reused.
+
+        Returns:
+            Dictionary: with "requests" made and "connections" opened.
+        """
+
+        logger = getLogger('MegaApi_Lib.get_stats')
+        logger.setLevel(self.__logLevel)
+
+        return self.__pool.get_stats()
+
+    def list_files(self, username, password, remotePath, recursive=True):
+        """
+        List files and directories under remote directory, not including remote directory itself. Server changes are
+        applied to node tree first, so listing is never out of date.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remotePath (str): Remote directory path to list.
+            recursive (bool): List subdirectories too.
+
+        Returns:
+            List: of file data dictionaries. None if remote directory could not be listed.
+        """
+
+        logger = getLogger('MegaApi_Lib.list_files')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            session = self._sync_nodes(username=username, password=password)
+        except MegaApiError as e:
+            logger.debug(' Error, could NOT list "%s"! %s' % (remotePath, str(e)))
+            return None
+
+        remotePath = remotePath.rstrip('/')
+        if remotePath not in session['paths']:
+            logger.debug(' Error, remote directory "%s" does not exist!' % remotePath)
+            return None
+
+        prefix = remotePath + '/'
+        depth = prefix.count('/')
+        files = []
+        with session['lock']:
+            for nodePath in sorted(session['paths']):
+                if not nodePath.startswith(prefix) or (not recursive and nodePath.count('/') != depth):
+                    continue
+                node = session['nodes'][session['paths'][nodePath]]
+                if node['type'] in [NODE_TYPE_FILE, NODE_TYPE_DIR]:
+                    files.append(self._get_file_data(node=node))
+        return files
+
+    def make_dir(self, username, password, remoteDirPath):
+        """
+        Create remote directory. Parent directory must exist. MEGA allows several nodes of the same name, so an
+        existing directory is not created again.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteDirPath (str): Remote directory path to create.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaApi_Lib.make_dir')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Creating remote directory "%s".' % (username, remoteDirPath))
+
+        remoteDirPath = remoteDirPath.rstrip('/')
+        parentPath = remoteDirPath.rsplit('/', 1)[0]
+        try:
+            if self._get_node(username=username, password=password, remotePath=remoteDirPath):
+                logger.debug(' Error, remote directory "%s" already exists!' % remoteDirPath)
+                return False
+            parent = self._get_node(username=username, password=password, remotePath=parentPath)
+            if not parent or parent['type'] == NODE_TYPE_FILE:
+                logger.debug(' Error, parent directory of "%s" does not exist!' % remoteDirPath)
+                return False
+
+            key = self.__crypto.bytes_to_a32(urandom(16))
+            node = self._put_node(username=username, password=password, parent=parent, remotePath=remoteDirPath,
+                                  nodeType=NODE_TYPE_DIR, key=key)
+        except MegaApiError as e:
+            logger.debug(' Error, could NOT create remote directory! %s' % str(e))
+            return False
+
+        if not node:
+            logger.debug(' Error, could NOT create remote directory!')
+            return False
+
+        logger.debug(' Success, could create remote directory.')
+        return True
+
+    def make_dirs(self, username, password, remoteDirPaths):
+        """
+        Create remote directories and any missing parent directories, with one API request per directory depth,
+        API_BATCH_SIZE directories per request, rather than one per directory. Existing directories are skipped.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteDirPaths (list): Remote directory paths to create.
+
+        Returns:
+            List: of remote directory paths, given or their parents, that were created or already existed. Directories
+                that could not be created, or whose request failed, are left out.
+        """
+
+        logger = getLogger('MegaApi_Lib.make_dirs')
+        logger.setLevel(self.__logLevel)
+
+        createdCount = 0
+        existing_dirPaths = set()
+        try:
+            missing_dirPaths = set()
+            for remoteDirPath in remoteDirPaths:
+                parts = remoteDirPath.rstrip('/').split('/')
+                for index in range(2, len(parts) + 1):
+                    dirPath = '/'.join(parts[:index])
+                    if dirPath in missing_dirPaths or dirPath in existing_dirPaths:
+                        continue
+                    node = self._get_node(username=username, password=password, remotePath=dirPath)
+                    if not node:
+                        missing_dirPaths.add(dirPath)
+                    elif node['type'] != NODE_TYPE_FILE:
+                        existing_dirPaths.add(dirPath)
+
+            logger.debug(' %s: Creating %d remote directories.' % (username, len(missing_dirPaths)))
+
+            for depth in sorted(set(dirPath.count('/') for dirPath in missing_dirPaths)):
+                level_dirPaths = sorted(dirPath for dirPath in missing_dirPaths if dirPath.count('/') == depth)
+                for offset in range(0, len(level_dirPaths), API_BATCH_SIZE):
+                    session = self._get_session(username=username, password=password)
+                    batch = []
+                    commands = []
+                    for dirPath in level_dirPaths[offset:offset + API_BATCH_SIZE]:
+                        parent = self._get_node(username=username, password=password,
+                                                remotePath=dirPath.rsplit('/', 1)[0])
+                        if not parent or parent['type'] == NODE_TYPE_FILE:
+                            logger.debug(' Error, parent directory of "%s" does not exist!' % dirPath)
+                            continue
+                        batch.append(dirPath)
+                        commands.append(self._get_put_node_command(session=session, parent=parent, remotePath=dirPath,
+                                                                   nodeType=NODE_TYPE_DIR,
+                                                                   key=self.__crypto.bytes_to_a32(urandom(16))))
+                    if not commands:
+                        continue
+                    results = self._call(username=username, password=password, commands=commands)
+                    session = self._get_session(username=username, password=password)
+                    with session['lock']:
+                        for dirPath, result in zip(batch, results):
+                            if not isinstance(result, dict) or not result.get('f'):
+                                logger.debug(' Error, could NOT create node "%s"! %s' % (dirPath, str(result)))
+                                continue
+                            node = self._add_node(session=session, nodeData=result['f'][0])
+                            if node:
+                                node['path'] = dirPath
+                                session['paths'][dirPath] = node['handle']
+                                existing_dirPaths.add(dirPath)
+                                createdCount += 1
+        except MegaApiError as e:
+            logger.debug(' Error, could NOT create remote directories! %s' % str(e))
+
+        logger.debug(' Created %d remote directories.' % createdCount)
+        return sorted(existing_dirPaths)
+
+    def move_file(self, username, password, remoteFilePath, newRemoteFilePath):
+        """
+        Move or rename remote file in place, with "m" (move) and "a" (set attributes) API commands sent in one request.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file path to move.
+            newRemoteFilePath (str): Remote file path to move to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaApi_Lib.move_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Moving remote file "%s" to "%s".' % (username, remoteFilePath, newRemoteFilePath))
+
+        newRemoteFilePath = newRemoteFilePath.rstrip('/')
+        newParentPath, newName = newRemoteFilePath.rsplit('/', 1)
+        try:
+            node = self._get_node(username=username, password=password, remotePath=remoteFilePath)
+            if not node or node['type'] != NODE_TYPE_FILE:
+                logger.debug(' Error, remote file "%s" does not exist!' % remoteFilePath)
+                return False
+            if self._get_node(username=username, password=password, remotePath=newRemoteFilePath):
+                logger.debug(' Error, remote file "%s" already exists!' % newRemoteFilePath)
+                return False
+            parent = self._get_node(username=username, password=password, remotePath=newParentPath)
+            if not parent or parent['type'] == NODE_TYPE_FILE:
+                logger.debug(' Error, parent directory of "%s" does not exist!' % newRemoteFilePath)
+                return False
+
+            session = self._get_session(username=username, password=password)
+            commands = []
+            if parent['handle'] != node['parent']:
+                commands.append({'a': 'm', 'n': node['handle'], 't': parent['handle'],
+                                 'i': self.__crypto.base64_url_encode(urandom(8))})
+            attributes = None
+            if newName != node['name']:
+                attributes = {'n': newName}
+                if node['fingerprint']:
+                    attributes['c'] = node['fingerprint']
+                attributes = self.__crypto.base64_url_encode(
+                    self.__crypto.encrypt_attributes(attributes, self.__crypto.get_node_key(node['key'])))
+                commands.append({'a': 'a', 'n': node['handle'], 'at': attributes,
+                                 'i': self.__crypto.base64_url_encode(urandom(8))})
+            results = self._call(username=username, password=password, commands=commands) if commands else []
+        except MegaApiError as e:
+            logger.debug(' Error, could NOT move remote file! %s' % str(e))
+            return False
+
+        if any(result != 0 for result in results):
+            logger.debug(' Error, could NOT move remote file! %s' % str(results))
+            return False
+
+        with session['lock']:
+            session['paths'].pop(node['path'], None)
+            node['parent'] = parent['handle']
+            node['name'] = newName
+            node['path'] = newRemoteFilePath
+            session['paths'][newRemoteFilePath] = node['handle']
+            nodeData = dict(session['nodeData'].get(node['handle'], {}), p=parent['handle'])
+            if attributes:
+                nodeData['a'] = attributes
+            session['nodeData'][node['handle']] = nodeData
+            session['changed'] = True
+
+        logger.debug(' Success, moved remote file.')
+        return True
+
+    def open_sessions(self, accounts):
+        """
+        Log in to accounts up front. Cached sessions are reused. Pre-login of the remaining accounts is batched into one
+        API request, and their password keys are derived in parallel in a process pool, since key derivation is the
+        slow part of login.
+
+        Args:
+            accounts (list): of username and password tuples.
+
+        Returns:
+            Integer: number of accounts with open session.
+        """
+
+        logger = getLogger('MegaApi_Lib.open_sessions')
+        logger.setLevel(self.__logLevel)
+
+        loginSessions = []
+        for username, password in accounts:
+            session = self._get_account_session(username=username, password=password)
+            with session['loginLock']:
+                if not session['sid']:
+                    cachedSession = self._get_cached_session(username=username, password=password)
+                    if cachedSession:
+                        session.update(cachedSession)
+                    elif session not in loginSessions:
+                        loginSessions.append(session)
+
+        if loginSessions:
+            logger.debug(' Logging in to %d of %d accounts.' % (len(loginSessions), len(accounts)))
+            try:
+                preLogins = self._api_request(session=None, commands=[{'a': 'us0', 'user': session['username'].lower()}
+                                                                      for session in loginSessions])
+            except MegaApiError as e:
+                logger.debug(' Error, could NOT pre-login accounts! %s' % str(e))
+                preLogins = [None] * len(loginSessions)
+
+            loginData = [(session['username'].lower(), session['password'], preLogin)
+                         for session, preLogin in zip(loginSessions, preLogins)]
+            try:
+                loginPool = Pool(processes=min(cpu_count(), len(loginData)))
+                try:
+                    passwordKeys = loginPool.map(_derive_password_key, loginData)
+                finally:
+                    loginPool.close()
+                    loginPool.join()
+            except (OSError, ImportError) as e:
+                logger.debug(' Could not start login processes, deriving keys in turn: %s' % str(e))
+                passwordKeys = [_derive_password_key(data) for data in loginData]
+
+            for session, keys in zip(loginSessions, passwordKeys):
+                with session['loginLock']:
+                    if session['sid']:
+                        continue
+                    try:
+                        session.update(self._login(username=session['username'], password=session['password'],
+                                                   passwordKeys=keys))
+                    except MegaApiError as e:
+                        logger.error(' Error, could NOT log in as "%s"! %s' % (session['username'], str(e)))
+
+        with self.__sessionsLock:
+            openCount = len([session for session in self.__sessions.values() if session['sid']])
+        logger.debug(' %d accounts have open session.' % openCount)
+        return openCount
+
+    def put_file(self, username, password, localFilePath, remoteFilePath):
+        """
+        Upload local file to remote file path, with upload engine if there is one, otherwise through transfer backend.
+        Remote parent directory must exist, and remote file must not.
+
+        Args:
+            username (str): username of account to upload to
+            password (str): password of account to upload to
+            localFilePath (str): Local file path to upload.
+            remoteFilePath (str): Remote file path to upload to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaApi_Lib.put_file')
+        logger.setLevel(self.__logLevel)
+
+        if self.__uploader:
+            remoteFilePath = remoteFilePath.rstrip('/')
+            try:
+                if self._get_node(username=username, password=password, remotePath=remoteFilePath):
+                    logger.error(' Error, remote file "%s" already exists!' % remoteFilePath)
+                    return False
+                parent = self._get_node(username=username, password=password,
+                                        remotePath=remoteFilePath.rsplit('/', 1)[0])
+                if not parent or parent['type'] == NODE_TYPE_FILE:
+                    logger.error(' Error, parent directory of "%s" does not exist!' % remoteFilePath)
+                    return False
+                result = self._call(username=username, password=password,
+                                    commands=[{'a': 'u', 's': path.getsize(localFilePath)}])[0]
+            except (MegaApiError, OSError) as e:
+                logger.error(' Error, could NOT get upload URL of "%s"! %s' % (localFilePath, str(e)))
+                return False
+
+            if not isinstance(result, dict) or not result.get('p'):
+                logger.error(' Error, could NOT get upload URL of "%s"! %s' % (localFilePath, str(result)))
+                return False
+            fingerprint = self.__fingerprint.get_fingerprint(filePath=localFilePath)
+            uploaded = self.__uploader.upload(url=result['p'], key=self.__crypto.bytes_to_a32(urandom(24)),
+                                              localFilePath=localFilePath)
+            if not uploaded:
+                return False
+
+            completionHandle, fileKey = uploaded
+            try:
+                node = self._put_node(username=username, password=password, parent=parent, remotePath=remoteFilePath,
+                                      nodeType=NODE_TYPE_FILE, key=fileKey, handle=completionHandle,
+                                      fingerprint=fingerprint)
+            except MegaApiError as e:
+                logger.error(' Error, could NOT create remote file "%s"! %s' % (remoteFilePath, str(e)))
+                return False
+            return node is not None
+
+        if not self.__transferBackend:
+            logger.error(' Error, no transfer backend to upload "%s" with!' % localFilePath)
+            return False
+
+        result = self.__transferBackend.put_file(username=username, password=password, localFilePath=localFilePath,
+                                                 remoteFilePath=remoteFilePath)
+        # Uploaded node is not in node tree until it is fetched again.
+        session = self._get_session(username=username, password=password)
+        with session['lock']:
+            session['stale'] = True
+        return result
+
+    def remove_file(self, username, password, remoteFilePath):
+        """
+        Remove remote file or directory.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file path to remove.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaApi_Lib.remove_file')
+        logger.setLevel(self.__logLevel)
+
+        return self.remove_files(username=username, password=password, remoteFilePaths=[remoteFilePath]) == 1
+
+    def remove_files(self, username, password, remoteFilePaths):
+        """
+        Remove remote files or directories, API_BATCH_SIZE per API request.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePaths (list): Remote file paths to remove.
+
+        Returns:
+            Integer: number of remote files removed.
+        """
+
+        logger = getLogger('MegaApi_Lib.remove_files')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Removing %d remote files!' % (username, len(remoteFilePaths)))
+
+        removedCount = 0
+        try:
+            handles = []
+            for remoteFilePath in remoteFilePaths:
+                node = self._get_node(username=username, password=password, remotePath=remoteFilePath)
+                if node:
+                    handles.append(node['handle'])
+                else:
+                    logger.debug(' Error, remote file "%s" does not exist!' % remoteFilePath)
+
+            session = self._get_session(username=username, password=password)
+            for offset in range(0, len(handles), API_BATCH_SIZE):
+                batch = handles[offset:offset + API_BATCH_SIZE]
+                commands = [{'a': 'd', 'n': handle, 'i': self.__crypto.base64_url_encode(urandom(8))}
+                            for handle in batch]
+                results = self._call(username=username, password=password, commands=commands)
+                removedHandles = [handle for handle, result in zip(batch, results) if result == 0]
+                self._remove_nodes(session=session, handles=removedHandles)
+                removedCount += len(removedHandles)
+        except MegaApiError as e:
+            logger.debug(' Error, could NOT remove remote files! %s' % str(e))
+
+        logger.debug(' Removed %d of %d remote files.' % (removedCount, len(remoteFilePaths)))
+        return removedCount
+
+    def stat_file(self, username, password, remoteFilePath):
+        """
+        Get remote file data from session node tree.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file or directory path.
+
+        Returns:
+            Dictionary: file data. None if remote file does not exist.
+        """
+
+        logger = getLogger('MegaApi_Lib.stat_file')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            node = self._get_node(username=username, password=password, remotePath=remoteFilePath)
+        except MegaApiError as e:
+            logger.debug(' Error, could NOT get remote file data! %s' % str(e))
+            return None
+        return self._get_file_data(node=node) if node else None
@@ -0,0 +1,773 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from base64 import b64decode, b64encode
+from binascii import hexlify, unhexlify
+from hashlib import pbkdf2_hmac
+from json import dumps, loads
+from logging import getLogger
+from os import path
+from struct import pack, unpack
+
+try:
+    from Crypto.Cipher import AES
+    from Crypto.Util import Counter
+except ImportError:
+    AES = None
+    Counter = None
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+PASSWORD_KEY_V1_ROUNDS = 0x10000
+PASSWORD_KEY_V1_SEED = (0x93C467E3, 0x7DB0C7A4, 0xD1BE3F81, 0x0152CB56)
+PASSWORD_KEY_V2_ROUNDS = 100000
+USER_HASH_V1_ROUNDS = 0x4000
+ZERO_IV = b'\0' * 16
+
+# MEGA's file chunk sizes: 128 KiB, 256 KiB, ... growing by 128 KiB up to 1 MiB, then 1 MiB chunks. Each chunk has its
+# own MAC.
+CHUNK_SIZE_STEP = 128 * 1024
+CHUNK_SIZE_MAX = 1024 * 1024
+
+
+def _get_aes_tables():
+    """
+    Build AES S-boxes and round tables from GF(2^8) log tables.
+
+    Returns:
+        Tuple: of S-box, inverse S-box, four encryption tables and four decryption tables.
+    """
+
+    exp = [0] * 512
+    log = [0] * 256
+    value = 1
+    for index in range(255):
+        exp[index] = value
+        log[value] = index
+        value ^= ((value << 1) ^ 0x11b) if value & 0x80 else (value << 1)
+    for index in range(255, 512):
+        exp[index] = exp[index - 255]
+
+    def mul(a, b):
+        return exp[log[a] + log[b]] if a and b else 0
+
+    sBox = [0] * 256
+    inverseSBox = [0] * 256
+    for index in range(256):
+        inverse = exp[255 - log[index]] if index else 0
+        value = inverse
+        for shift in range(1, 5):
+            value ^= ((inverse << shift) | (inverse >> (8 - shift))) & 0xff
+        sBox[index] = value ^ 0x63
+        inverseSBox[value ^ 0x63] = index
+
+    def rotate(word, bits):
+        return ((word >> bits) | (word << (32 - bits))) & 0xffffffff
+
+    encryptTable = [(mul(s, 2) << 24) | (s << 16) | (s << 8) | mul(s, 3) for s in sBox]
+    decryptTable = [(mul(s, 14) << 24) | (mul(s, 9) << 16) | (mul(s, 13) << 8) | mul(s, 11) for s in inverseSBox]
+    encryptTables = [[rotate(word, bits) for word in encryptTable] for bits in [0, 8, 16, 24]]
+    decryptTables = [[rotate(word, bits) for word in decryptTable] for bits in [0, 8, 16, 24]]
+    return sBox, inverseSBox, encryptTables, decryptTables
+
+
+S_BOX, INVERSE_S_BOX, ENCRYPT_TABLES, DECRYPT_TABLES = _get_aes_tables()
+
+
+class _AES128(object):
+    def __init__(self, key):
+        """
+        Pure Python AES-128 block cipher, used when pycryptodome is not installed. Fast enough for keys and
+        attributes, not for file content.
+
+        Args:
+            key (tuple): Key as four 32 bit words.
+        """
+
+        S = S_BOX
+        words = list(key)
+        rcon = 1
+        for index in range(4, 44):
+            word = words[index - 1]
+            if index % 4 == 0:
+                word = ((word << 8) | (word >> 24)) & 0xffffffff
+                word = (S[word >> 24] << 24) | (S[(word >> 16) & 0xff] << 16) | (S[(word >> 8) & 0xff] << 8) | \
+                    S[word & 0xff]
+                word ^= rcon << 24
+                rcon = ((rcon << 1) ^ 0x11b) if rcon & 0x80 else (rcon << 1)
+            words.append(words[index - 4] ^ word)
+        self.__encryptKeys = words
+
+        D0, D1, D2, D3 = DECRYPT_TABLES
+        decryptKeys = list(words[40:44])
+        for round in range(9, 0, -1):
+            for word in words[round * 4:round * 4 + 4]:
+                decryptKeys.append(D0[S[word >> 24]] ^ D1[S[(word >> 16) & 0xff]] ^ D2[S[(word >> 8) & 0xff]] ^
+                                   D3[S[word & 0xff]])
+        decryptKeys.extend(words[0:4])
+        self.__decryptKeys = decryptKeys
+
+    def decrypt_block(self, block):
+        """
+        Decrypt one block.
+
+        Args:
+            block (tuple): Block as four 32 bit words.
+
+        Returns:
+            Tuple: decrypted block as four 32 bit words.
+        """
+
+        D0, D1, D2, D3 = DECRYPT_TABLES
+        S = INVERSE_S_BOX
+        k = self.__decryptKeys
+        s0, s1, s2, s3 = block[0] ^ k[0], block[1] ^ k[1], block[2] ^ k[2], block[3] ^ k[3]
+        for index in range(4, 40, 4):
+            s0, s1, s2, s3 = (
+                D0[s0 >> 24] ^ D1[(s3 >> 16) & 0xff] ^ D2[(s2 >> 8) & 0xff] ^ D3[s1 & 0xff] ^ k[index],
+                D0[s1 >> 24] ^ D1[(s0 >> 16) & 0xff] ^ D2[(s3 >> 8) & 0xff] ^ D3[s2 & 0xff] ^ k[index + 1],
+                D0[s2 >> 24] ^ D1[(s1 >> 16) & 0xff] ^ D2[(s0 >> 8) & 0xff] ^ D3[s3 & 0xff] ^ k[index + 2],
+                D0[s3 >> 24] ^ D1[(s2 >> 16) & 0xff] ^ D2[(s1 >> 8) & 0xff] ^ D3[s0 & 0xff] ^ k[index + 3])
+        return ((S[s0 >> 24] << 24 | S[(s3 >> 16) & 0xff] << 16 | S[(s2 >> 8) & 0xff] << 8 | S[s1 & 0xff]) ^ k[40],
+                (S[s1 >> 24] << 24 | S[(s0 >> 16) & 0xff] << 16 | S[(s3 >> 8) & 0xff] << 8 | S[s2 & 0xff]) ^ k[41],
+                (S[s2 >> 24] << 24 | S[(s1 >> 16) & 0xff] << 16 | S[(s0 >> 8) & 0xff] << 8 | S[s3 & 0xff]) ^ k[42],
+                (S[s3 >> 24] << 24 | S[(s2 >> 16) & 0xff] << 16 | S[(s1 >> 8) & 0xff] << 8 | S[s0 & 0xff]) ^ k[43])
+
+    def encrypt_block(self, block):
+        """
+        Encrypt one block.
+
+        Args:
+            block (tuple): Block as four 32 bit words.
+
+        Returns:
+            Tuple: encrypted block as four 32 bit words.
+        """
+
+        E0, E1, E2, E3 = ENCRYPT_TABLES
+        S = S_BOX
+        k = self.__encryptKeys
+        s0, s1, s2, s3 = block[0] ^ k[0], block[1] ^ k[1], block[2] ^ k[2], block[3] ^ k[3]
+        for index in range(4, 40, 4):
+            s0, s1, s2, s3 = (
+                E0[s0 >> 24] ^ E1[(s1 >> 16) & 0xff] ^ E2[(s2 >> 8) & 0xff] ^ E3[s3 & 0xff] ^ k[index],
+                E0[s1 >> 24] ^ E1[(s2 >> 16) & 0xff] ^ E2[(s3 >> 8) & 0xff] ^ E3[s0 & 0xff] ^ k[index + 1],
+                E0[s2 >> 24] ^ E1[(s3 >> 16) & 0xff] ^ E2[(s0 >> 8) & 0xff] ^ E3[s1 & 0xff] ^ k[index + 2],
+                E0[s3 >> 24] ^ E1[(s0 >> 16) & 0xff] ^ E2[(s1 >> 8) & 0xff] ^ E3[s2 & 0xff] ^ k[index + 3])
+        return ((S[s0 >> 24] << 24 | S[(s1 >> 16) & 0xff] << 16 | S[(s2 >> 8) & 0xff] << 8 | S[s3 & 0xff]) ^ k[40],
+                (S[s1 >> 24] << 24 | S[(s2 >> 16) & 0xff] << 16 | S[(s3 >> 8) & 0xff] << 8 | S[s0 & 0xff]) ^ k[41],
+                (S[s2 >> 24] << 24 | S[(s3 >> 16) & 0xff] << 16 | S[(s0 >> 8) & 0xff] << 8 | S[s1 & 0xff]) ^ k[42],
+                (S[s3 >> 24] << 24 | S[(s0 >> 16) & 0xff] << 16 | S[(s1 >> 8) & 0xff] << 8 | S[s2 & 0xff]) ^ k[43])
+
+
+class MegaCrypto_Lib(object):
+    def __init__(self, logLevel='DEBUG'):
+        """
+        Library for MEGA client side cryptography: login key derivation, key and node attribute encryption and session
+        id decryption. Keys are tuples of 32 bit words ("a32"), as MEGA's API uses them. Uses pycryptodome when
+        installed, pure Python AES otherwise.
+
+        Args:
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__logLevel = logLevel
+
+    def _get_int_from_mpi(self, data):
+        """
+        Get integer from multi precision integer, a 16 bit bit length followed by big endian bytes.
+
+        Args:
+            data (bytes): MPI data, may be followed by other data.
+
+        Returns:
+            Tuple: of integer and data following MPI.
+        """
+
+        logger = getLogger('MegaCrypto_Lib._get_int_from_mpi')
+        logger.setLevel(self.__logLevel)
+
+        header = bytearray(data[:2])
+        length = ((header[0] << 8 | header[1]) + 7) // 8
+        return int(hexlify(data[2:2 + length]), 16), data[2 + length:]
+
+    def _iter_blocks(self, data):
+        """
+        Iterate 16 byte blocks of data as four 32 bit words.
+
+        Args:
+            data (bytes): Data, multiple of 16 bytes.
+
+        Returns:
+            Generator: of blocks as four 32 bit word tuples.
+        """
+
+        logger = getLogger('MegaCrypto_Lib._iter_blocks')
+        logger.setLevel(self.__logLevel)
+
+        for offset in range(0, len(data), 16):
+            yield unpack('>4I', data[offset:offset + 16])
+
+    def _to_bytes(self, text):
+        """
+        Encode text as UTF-8 bytes, unless it is bytes already.
+
+        Args:
+            text (str): Text to encode.
+
+        Returns:
+            Bytes: encoded text.
+        """
+
+        logger = getLogger('MegaCrypto_Lib._to_bytes')
+        logger.setLevel(self.__logLevel)
+
+        return text if isinstance(text, bytes) else text.encode('utf-8')
+
+    def a32_to_base64(self, a32):
+        """
+        Encode 32 bit words as URL safe base64 without padding.
+
+        Args:
+            a32 (tuple): 32 bit words.
+
+        Returns:
+            String: URL safe base64 text.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.a32_to_base64')
+        logger.setLevel(self.__logLevel)
+
+        return self.base64_url_encode(self.a32_to_bytes(a32))
+
+    def a32_to_bytes(self, a32):
+        """
+        Pack 32 bit words as big endian bytes.
+
+        Args:
+            a32 (tuple): 32 bit words.
+
+        Returns:
+            Bytes: packed words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.a32_to_bytes')
+        logger.setLevel(self.__logLevel)
+
+        return pack('>%dI' % len(a32), *a32)
+
+    def aes_cbc_decrypt(self, key, data):
+        """
+        Decrypt data with AES-CBC and zero IV, as MEGA encrypts node attributes.
+
+        Args:
+            key (tuple): AES key as four 32 bit words.
+            data (bytes): Encrypted data, multiple of 16 bytes.
+
+        Returns:
+            Bytes: decrypted data.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.aes_cbc_decrypt')
+        logger.setLevel(self.__logLevel)
+
+        if AES:
+            return AES.new(self.a32_to_bytes(key), AES.MODE_CBC, ZERO_IV).decrypt(data)
+
+        cipher = _AES128(key)
+        previous = (0, 0, 0, 0)
+        result = []
+        for block in self._iter_blocks(data):
+            decrypted = cipher.decrypt_block(block)
+            result.extend(word ^ previousWord for word, previousWord in zip(decrypted, previous))
+            previous = block
+        return self.a32_to_bytes(result)
+
+    def aes_cbc_encrypt(self, key, data):
+        """
+        Encrypt data with AES-CBC and zero IV, as MEGA encrypts node attributes.
+
+        Args:
+            key (tuple): AES key as four 32 bit words.
+            data (bytes): Data to encrypt, multiple of 16 bytes.
+
+        Returns:
+            Bytes: encrypted data.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.aes_cbc_encrypt')
+        logger.setLevel(self.__logLevel)
+
+        if AES:
+            return AES.new(self.a32_to_bytes(key), AES.MODE_CBC, ZERO_IV).encrypt(data)
+
+        cipher = _AES128(key)
+        previous = (0, 0, 0, 0)
+        result = []
+        for block in self._iter_blocks(data):
+            previous = cipher.encrypt_block([word ^ previousWord for word, previousWord in zip(block, previous)])
+            result.extend(previous)
+        return self.a32_to_bytes(result)
+
+    def aes_ctr_crypt(self, key, nonce, data, offset=0):
+        """
+        Encrypt or decrypt data with AES-CTR, as MEGA encrypts file content. Counter block is the two nonce words
+        followed by the 64 bit block number.
+
+        Args:
+            key (tuple): AES key as four 32 bit words.
+            nonce (tuple): Nonce as two 32 bit words.
+            data (bytes): Data to encrypt or decrypt.
+            offset (int): Byte offset of data in the whole stream, so chunks can be handled separately.
+
+        Returns:
+            Bytes: encrypted or decrypted data.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.aes_ctr_crypt')
+        logger.setLevel(self.__logLevel)
+
+        skip = offset % 16
+        if AES:
+            counter = Counter.new(64, prefix=self.a32_to_bytes(nonce), initial_value=offset // 16)
+            cipher = AES.new(self.a32_to_bytes(key), AES.MODE_CTR, counter=counter)
+            if skip:
+                cipher.encrypt(b'\0' * skip)
+            return cipher.encrypt(data)
+
+        cipher = _AES128(key)
+        blockNumber = offset // 16
+        keyStream = []
+        for index in range((skip + len(data) + 15) // 16):
+            number = blockNumber + index
+            keyStream.extend(cipher.encrypt_block((nonce[0], nonce[1], (number >> 32) & 0xffffffff,
+                                                   number & 0xffffffff)))
+        keyStream = bytearray(self.a32_to_bytes(keyStream)[skip:skip + len(data)])
+        return bytes(bytearray(byte ^ keyByte for byte, keyByte in zip(bytearray(data), keyStream)))
+
+    def aes_ctr_crypt_in_place(self, key, nonce, buffer, offset=0):
+        """
+        Encrypt or decrypt writable buffer with AES-CTR in place, so large file parts are not copied.
+
+        Args:
+            key (tuple): AES key as four 32 bit words.
+            nonce (tuple): Nonce as two 32 bit words.
+            buffer (memoryview): Writable buffer, ie: memoryview of bytearray.
+            offset (int): Byte offset of buffer in the whole stream.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.aes_ctr_crypt_in_place')
+        logger.setLevel(self.__logLevel)
+
+        if AES:
+            counter = Counter.new(64, prefix=self.a32_to_bytes(nonce), initial_value=offset // 16)
+            cipher = AES.new(self.a32_to_bytes(key), AES.MODE_CTR, counter=counter)
+            if offset % 16:
+                cipher.encrypt(b'\0' * (offset % 16))
+            cipher.encrypt(buffer, output=buffer)
+            return
+
+        buffer[:] = self.aes_ctr_crypt(key, nonce, bytes(bytearray(buffer)), offset=offset)
+
+    def base64_to_a32(self, text):
+        """
+        Decode URL safe base64 as 32 bit words.
+
+        Args:
+            text (str): URL safe base64 text, with or without padding.
+
+        Returns:
+            Tuple: 32 bit words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.base64_to_a32')
+        logger.setLevel(self.__logLevel)
+
+        return self.bytes_to_a32(self.base64_url_decode(text))
+
+    def base64_url_decode(self, text):
+        """
+        Decode URL safe base64 without padding, as MEGA's API uses it.
+
+        Args:
+            text (str): URL safe base64 text.
+
+        Returns:
+            Bytes: decoded data.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.base64_url_decode')
+        logger.setLevel(self.__logLevel)
+
+        text = str(text).replace('-', '+').replace('_', '/').replace(',', '')
+        return b64decode(text + '=' * (-len(text) % 4))
+
+    def base64_url_encode(self, data):
+        """
+        Encode data as URL safe base64 without padding, as MEGA's API uses it.
+
+        Args:
+            data (bytes): Data to encode.
+
+        Returns:
+            String: URL safe base64 text.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.base64_url_encode')
+        logger.setLevel(self.__logLevel)
+
+        text = b64encode(data).decode('ascii')
+        return str(text.replace('+', '-').replace('/', '_').rstrip('='))
+
+    def bytes_to_a32(self, data):
+        """
+        Unpack big endian bytes as 32 bit words, padding data with zero bytes to a multiple of 4 bytes.
+
+        Args:
+            data (bytes): Data to unpack.
+
+        Returns:
+            Tuple: 32 bit words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.bytes_to_a32')
+        logger.setLevel(self.__logLevel)
+
+        data = data + b'\0' * (-len(data) % 4)
+        return unpack('>%dI' % (len(data) // 4), data)
+
+    def decrypt_attributes(self, data, key):
+        """
+        Decrypt node attributes, ie: {"n": "file name"}.
+
+        Args:
+            data (bytes): Encrypted attributes.
+            key (tuple): Node AES key as four 32 bit words.
+
+        Returns:
+            Dictionary: node attributes. None if attributes could not be decrypted with key.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.decrypt_attributes')
+        logger.setLevel(self.__logLevel)
+
+        if not data or len(data) % 16:
+            return None
+
+        attributes = self.aes_cbc_decrypt(key, data).rstrip(b'\0')
+        if not attributes.startswith(b'MEGA{"'):
+            return None
+        try:
+            return loads(attributes[4:].decode('utf-8'))
+        except ValueError as e:
+            logger.debug(' Exception: %s' % str(e))
+            return None
+
+    def decrypt_key(self, encryptedKey, key):
+        """
+        Decrypt key with AES-ECB, ie: master key with password key or node key with master key.
+
+        Args:
+            encryptedKey (tuple): Encrypted key, multiple of four 32 bit words.
+            key (tuple): AES key as four 32 bit words.
+
+        Returns:
+            Tuple: decrypted key words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.decrypt_key')
+        logger.setLevel(self.__logLevel)
+
+        if AES:
+            return self.bytes_to_a32(AES.new(self.a32_to_bytes(key), AES.MODE_ECB).decrypt(
+                self.a32_to_bytes(encryptedKey)))
+
+        cipher = _AES128(key)
+        result = []
+        for offset in range(0, len(encryptedKey), 4):
+            result.extend(cipher.decrypt_block(encryptedKey[offset:offset + 4]))
+        return tuple(result)
+
+    def decrypt_keys(self, encryptedKeys, key):
+        """
+        Decrypt many keys under one key with AES-ECB, ie: all node keys of an account with master key. Cipher is set
+        up once and keys are decrypted in one pass, rather than once per key.
+
+        Args:
+            encryptedKeys (list): Encrypted keys, each multiple of four 32 bit words.
+            key (tuple): AES key as four 32 bit words.
+
+        Returns:
+            List: of decrypted key words tuples, in same order.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.decrypt_keys')
+        logger.setLevel(self.__logLevel)
+
+        if AES:
+            data = AES.new(self.a32_to_bytes(key), AES.MODE_ECB).decrypt(
+                b''.join(self.a32_to_bytes(encryptedKey) for encryptedKey in encryptedKeys))
+            words = self.bytes_to_a32(data)
+        else:
+            cipher = _AES128(key)
+            words = []
+            for encryptedKey in encryptedKeys:
+                for offset in range(0, len(encryptedKey), 4):
+                    words.extend(cipher.decrypt_block(encryptedKey[offset:offset + 4]))
+
+        result = []
+        offset = 0
+        for encryptedKey in encryptedKeys:
+            result.append(tuple(words[offset:offset + len(encryptedKey)]))
+            offset += len(encryptedKey)
+        return result
+
+    def decrypt_session_id(self, csid, privateKey, masterKey):
+        """
+        Decrypt RSA encrypted session id returned by login.
+
+        Args:
+            csid (str): URL safe base64 RSA encrypted session id.
+            privateKey (str): URL safe base64 RSA private key, encrypted with master key.
+            masterKey (tuple): Account master key.
+
+        Returns:
+            String: session id.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.decrypt_session_id')
+        logger.setLevel(self.__logLevel)
+
+        privateKeyData = self.a32_to_bytes(self.decrypt_key(self.base64_to_a32(privateKey), masterKey))
+        p, privateKeyData = self._get_int_from_mpi(privateKeyData)
+        q, privateKeyData = self._get_int_from_mpi(privateKeyData)
+        d, privateKeyData = self._get_int_from_mpi(privateKeyData)
+
+        encryptedSessionId, remaining = self._get_int_from_mpi(self.base64_url_decode(csid))
+        sessionId = '%x' % pow(encryptedSessionId, d, p * q)
+        sessionId = unhexlify('0' * (len(sessionId) % 2) + sessionId)
+        return self.base64_url_encode(sessionId[:43])
+
+    def encrypt_attributes(self, attributes, key):
+        """
+        Encrypt node attributes, ie: {"n": "file name"}.
+
+        Args:
+            attributes (dict): Node attributes.
+            key (tuple): Node AES key as four 32 bit words.
+
+        Returns:
+            Bytes: encrypted attributes.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.encrypt_attributes')
+        logger.setLevel(self.__logLevel)
+
+        data = ('MEGA' + dumps(attributes, separators=(',', ':'))).encode('utf-8')
+        data += b'\0' * (-len(data) % 16)
+        return self.aes_cbc_encrypt(key, data)
+
+    def encrypt_key(self, plainKey, key):
+        """
+        Encrypt key with AES-ECB, ie: node key with master key.
+
+        Args:
+            plainKey (tuple): Key to encrypt, multiple of four 32 bit words.
+            key (tuple): AES key as four 32 bit words.
+
+        Returns:
+            Tuple: encrypted key words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.encrypt_key')
+        logger.setLevel(self.__logLevel)
+
+        if AES:
+            return self.bytes_to_a32(AES.new(self.a32_to_bytes(key), AES.MODE_ECB).encrypt(
+                self.a32_to_bytes(plainKey)))
+
+        cipher = _AES128(key)
+        result = []
+        for offset in range(0, len(plainKey), 4):
+            result.extend(cipher.encrypt_block(plainKey[offset:offset + 4]))
+        return tuple(result)
+
+    def get_chunk_mac(self, key, nonce, data):
+        """
+        Get MAC of file chunk, CBC-MAC of chunk with IV of nonce words twice, as MEGA checks file content.
+
+        Args:
+            key (tuple): File AES key as four 32 bit words.
+            nonce (tuple): File nonce as two 32 bit words.
+            data (bytes): Plain chunk data, or memoryview of it. Last chunk of file is padded with zero bytes.
+
+        Returns:
+            Tuple: chunk MAC as four 32 bit words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.get_chunk_mac')
+        logger.setLevel(self.__logLevel)
+
+        if len(data) % 16 or (not AES and isinstance(data, memoryview)):
+            data = bytes(bytearray(data)) + b'\0' * (-len(data) % 16)
+        iv = (nonce[0], nonce[1], nonce[0], nonce[1])
+        if AES:
+            return self.bytes_to_a32(AES.new(self.a32_to_bytes(key), AES.MODE_CBC,
+                                             self.a32_to_bytes(iv)).encrypt(data)[-16:])
+
+        cipher = _AES128(key)
+        mac = iv
+        for block in self._iter_blocks(data):
+            mac = cipher.encrypt_block([word ^ macWord for word, macWord in zip(block, mac)])
+        return tuple(mac)
+
+    def get_chunks(self, size):
+        """
+        Get byte ranges of MEGA chunks of file, the units file MACs are worked out over.
+
+        Args:
+            size (int): File size in bytes.
+
+        Returns:
+            List: of (start, end) byte ranges, end exclusive.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.get_chunks')
+        logger.setLevel(self.__logLevel)
+
+        chunks = []
+        start = 0
+        chunkSize = CHUNK_SIZE_STEP
+        while start < size:
+            chunks.append((start, min(start + chunkSize, size)))
+            start += chunkSize
+            chunkSize = min(chunkSize + CHUNK_SIZE_STEP, CHUNK_SIZE_MAX)
+        return chunks
+
+    def get_meta_mac(self, key, chunkMacs):
+        """
+        Get meta MAC of file from MACs of its chunks in order, as kept in last two words of file key.
+
+        Args:
+            key (tuple): File AES key as four 32 bit words.
+            chunkMacs (list): Chunk MACs, each four 32 bit words.
+
+        Returns:
+            Tuple: meta MAC as two 32 bit words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.get_meta_mac')
+        logger.setLevel(self.__logLevel)
+
+        data = b''.join(self.a32_to_bytes(chunkMac) for chunkMac in chunkMacs)
+        mac = self.bytes_to_a32(self.aes_cbc_encrypt(key, data)[-16:]) if data else (0, 0, 0, 0)
+        return mac[0] ^ mac[1], mac[2] ^ mac[3]
+
+    def get_node_key(self, key):
+        """
+        Get AES key of node from its decrypted key. File keys are eight words that fold into the AES key, folder keys
+        are the AES key itself.
+
+        Args:
+            key (tuple): Decrypted node key.
+
+        Returns:
+            Tuple: AES key as four 32 bit words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.get_node_key')
+        logger.setLevel(self.__logLevel)
+
+        if len(key) == 8:
+            return key[0] ^ key[4], key[1] ^ key[5], key[2] ^ key[6], key[3] ^ key[7]
+        return tuple(key[:4])
+
+    def get_password_key_v1(self, password):
+        """
+        Derive password key of version 1 accounts, by 65536 rounds of AES over password.
+
+        Args:
+            password (str): Account password.
+
+        Returns:
+            Tuple: password key as four 32 bit words.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.get_password_key_v1')
+        logger.setLevel(self.__logLevel)
+
+        passwordA32 = self.bytes_to_a32(self._to_bytes(password))
+        keys = [tuple(passwordA32[offset:offset + 4]) + (0,) * (4 - len(passwordA32[offset:offset + 4]))
+                for offset in range(0, len(passwordA32), 4)]
+
+        if AES:
+            ciphers = [AES.new(self.a32_to_bytes(key), AES.MODE_ECB) for key in keys]
+            passwordKey = self.a32_to_bytes(PASSWORD_KEY_V1_SEED)
+            for round in range(PASSWORD_KEY_V1_ROUNDS):
+                for cipher in ciphers:
+                    passwordKey = cipher.encrypt(passwordKey)
+            return self.bytes_to_a32(passwordKey)
+
+        ciphers = [_AES128(key) for key in keys]
+        passwordKey = PASSWORD_KEY_V1_SEED
+        for round in range(PASSWORD_KEY_V1_ROUNDS):
+            for cipher in ciphers:
+                passwordKey = cipher.encrypt_block(passwordKey)
+        return tuple(passwordKey)
+
+    def get_password_key_v2(self, password, salt):
+        """
+        Derive password key and user hash of version 2 accounts, by PBKDF2-HMAC-SHA512 over password.
+
+        Args:
+            password (str): Account password.
+            salt (str): URL safe base64 salt returned by "us0" API command.
+
+        Returns:
+            Tuple: of password key as four 32 bit words and user hash to log in with.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.get_password_key_v2')
+        logger.setLevel(self.__logLevel)
+
+        derivedKey = pbkdf2_hmac('sha512', self._to_bytes(password), self.base64_url_decode(salt),
+                                 PASSWORD_KEY_V2_ROUNDS, 32)
+        return self.bytes_to_a32(derivedKey[:16]), self.base64_url_encode(derivedKey[16:32])
+
+    def get_user_hash_v1(self, email, passwordKey):
+        """
+        Get user hash of version 1 accounts to log in with.
+
+        Args:
+            email (str): Account email address.
+            passwordKey (tuple): Password key from get_password_key_v1.
+
+        Returns:
+            String: user hash.
+        """
+
+        logger = getLogger('MegaCrypto_Lib.get_user_hash_v1')
+        logger.setLevel(self.__logLevel)
+
+        emailA32 = self.bytes_to_a32(self._to_bytes(email.lower()))
+        userHash = [0, 0, 0, 0]
+        for index, word in enumerate(emailA32):
+            userHash[index % 4] ^= word
+
+        if AES:
+            cipher = AES.new(self.a32_to_bytes(passwordKey), AES.MODE_ECB)
+            userHashData = self.a32_to_bytes(userHash)
+            for round in range(USER_HASH_V1_ROUNDS):
+                userHashData = cipher.encrypt(userHashData)
+            userHash = self.bytes_to_a32(userHashData)
+        else:
+            cipher = _AES128(passwordKey)
+            for round in range(USER_HASH_V1_ROUNDS):
+                userHash = cipher.encrypt_block(userHash)
+
+        return self.a32_to_base64((userHash[0], userHash[2]))
@@ -4,21 +4,36 @@
 # Initial Creation.
 ###
 
-from .lib import Lib
+from .lib import IS_WINDOWS, Lib
+from .storageBackend_lib import FILE_TYPE_DIR, FILE_TYPE_FILE, StorageBackend_Lib
 from logging import getLogger
-from os import chdir, path, remove, rename
-from re import findall, split, sub
+from os import chdir, environ, makedirs, path, pathsep, remove, rename
+from re import findall, match, search, split, sub
 from random import randint
 from tempfile import gettempdir
+from time import mktime, strptime
 
 __author__ = 'szmania'
 
 MEGATOOLS_LOG = 'megaTools.log'
-TEMP_LOGFILE_PATH = gettempdir() + '\\megaManager_error_files_%d.tmp' % randint(0, 9999999999)
+TEMP_LOGFILE_PATH = path.join(gettempdir(), 'megaManager_error_files_%d.tmp' % randint(0, 9999999999))
 SCRIPT_DIR = path.dirname(path.realpath(__file__))
-
-class MegaTools_Lib(object):
-    def __init__(self, megaToolsDir, downSpeedLimit=None, upSpeedLimit=None, logLevel='DEBUG', logFilePath=MEGATOOLS_LOG):
+MEGALS_LINE_PATTERN = '^(\\S+)\\s+(\\S*)\\s+(\\d)\\s+(\\S+)\\s+(\\d{4}-\\d{2}-\\d{2} \\d{2}:\\d{2}:\\d{2}) (.*)$'
+
+# Transfer errors meaning account is over its quota, or over a limit, as megatools reports MEGA errors and HTTP status.
+QUOTA_ERROR_PATTERN = '(?i)EOVERQUOTA|over ?quota|quota exceeded|bandwidth limit exceeded|(?:HTTP|status|returned) 509'
+RATE_LIMIT_ERROR_PATTERN = '(?i)ERATELIMIT|ETOOMANY|too many requests|(?:HTTP|status|returned) 429'
+# Retry time given with an error, ie: "retry in 3600 seconds".
+RETRY_AFTER_PATTERN = '(?i)(?:retry|try again)\\D{0,10}(\\d+) ?s'
+QUOTA_PARK_SECONDS = 3600
+RATE_LIMIT_PARK_SECONDS = 60
+# Bytes of transfer output kept, from its end, to look for quota and rate limit errors in, so long megacopy runs don't
+# hold all their output in memory.
+TRANSFER_OUTPUT_KEEP_BYTES = 64 * 1024
+
+class MegaTools_Lib(StorageBackend_Lib):
+    def __init__(self, megaToolsDir, downSpeedLimit=None, upSpeedLimit=None, logLevel='DEBUG',
+                 logFilePath=MEGATOOLS_LOG, parking=None):
         """
         Library for interaction with MegaTools. A tool suite for MEGA.
 
@@ -27,8 +42,11 @@ class MegaTools_Lib(object):
             downSpeedLimit (int): Max download speed limit.
             upSpeedLimit (int): Max upload speed limit.
             logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+            parking (AccountParking_Lib): Accounts whose transfers hit a quota or rate limit are parked in it, and no
+                transfers are run for parked accounts. None to not park accounts.
         """
         self.__megaToolsDir = megaToolsDir
+        self.__parking = parking
         self.__downSpeedLimit = downSpeedLimit
         self.__upSpeedLimit = upSpeedLimit
         self.__logLevel = logLevel
@@ -36,6 +54,103 @@ class MegaTools_Lib(object):
 
         self.__lib = Lib(logLevel=logLevel)
 
+        # Windows finds megatools in the working directory, other platforms only search PATH.
+        if not IS_WINDOWS and megaToolsDir and megaToolsDir not in environ.get('PATH', '').split(pathsep):
+            environ['PATH'] = megaToolsDir + pathsep + environ.get('PATH', '')
+
+    def _exec_transfer_cmd(self, username, command, noWindow=False):
+        """
+        Execute transfer command of account, unless account is parked. Account is parked if command fails over quota or
+        rate limit, until the retry time megatools gives or a default time.
+
+        Args:
+            username (str): username of account transferring
+            command (str): Command to execute.
+            noWindow (bool): No window will be created if true.
+
+        Returns:
+            boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaTools_Lib._exec_transfer_cmd')
+        logger.setLevel(self.__logLevel)
+
+        if self.__parking and self.__parking.get_parked_until(username=username):
+            logger.debug(' Account "%s" is parked, transfer not run.' % username)
+            return False
+
+        exitCode, out = self.__lib.exec_cmd_and_return_result(command=command, workingDir=self.__megaToolsDir,
+                                                              noWindow=noWindow, outputFile=self.__megaTools_log,
+                                                              keepBytes=TRANSFER_OUTPUT_KEEP_BYTES)
+        if exitCode == 0:
+            return True
+
+        parkSeconds = self.get_over_limit_seconds(output=out)
+        if parkSeconds and self.__parking:
+            reason = 'transfer quota exceeded' if search(QUOTA_ERROR_PATTERN, out) else 'rate limited'
+            self.__parking.park(username=username, seconds=parkSeconds, reason=reason)
+        return False
+
+    def _get_file_data_from_megals_line_data(self, line):
+        """
+        Extract file data from megals long format line data output.
+        example input:
+        udtDgR7I    Xz2tWWB5Dmo 0    4405067776 2013-04-10 19:16:02 /Root/bigfile.jpg
+
+        Args:
+            line (str): line to extract file data from.
+
+        Returns:
+            Dictionary: with "path", "type", "size" (None for directories) and "modified" (seconds since epoch). None if
+                line is not file data.
+        """
+
+        logger = getLogger('MegaTools_Lib._get_file_data_from_megals_line_data')
+        logger.setLevel(self.__logLevel)
+
+        result = match(MEGALS_LINE_PATTERN, line)
+        if not result:
+            return None
+
+        handle, parentHandle, fileType, size, modified, filePath = result.groups()
+        try:
+            modified = int(mktime(strptime(modified, '%Y-%m-%d %H:%M:%S')))
+        except (OverflowError, ValueError) as e:
+            logger.debug(' Exception: %s' % str(e))
+            modified = None
+
+        return {'path': filePath, 'type': fileType, 'size': int(size) if size.isdigit() else None,
+                'modified': modified}
+
+    def create_remote_dir(self, username, password, remoteDirPath):
+        """
+        Create remote directory.
+
+        Args:
+            username (str): username of account to create directory in
+            password (str): password of account to create directory in
+            remoteDirPath (str): remote directory path to create. Parent directory must exist.
+
+        Returns:
+            boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaTools_Lib.create_remote_dir')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Creating remote directory "%s".' % (username, remoteDirPath))
+
+        cmd = 'megamkdir -u %s -p %s "%s"' % (username, password, remoteDirPath)
+
+        result = self.__lib.exec_cmd(command=cmd, workingDir=self.__megaToolsDir, outputFile=self.__megaTools_log)
+
+        if result:
+            logger.debug(' Success, could create remote directory.')
+            return True
+        else:
+            logger.debug(' Error, could NOT create remote directory!')
+            return False
+
     def download_all_files_from_account(self, username, password, localRoot, remoteRoot):
         """
         Download all account files.
@@ -61,11 +176,11 @@ class MegaTools_Lib(object):
         # chdir('%s' % self.__megaToolsDir)
 
         if self.__downSpeedLimit:
-            cmd = 'start "" /B megacopy --__download -u %s -p %s --limit-speed %d --local "%s" --remote "%s"' % (username, password, self.__downSpeedLimit, localRoot, remoteRoot)
+            cmd = 'start "" /B megacopy --download -u %s -p %s --limit-speed %d --local "%s" --remote "%s"' % (username, password, self.__downSpeedLimit, localRoot, remoteRoot)
         else:
-            cmd = 'start "" /B megacopy --__download -u %s -p %s --local "%s" --remote "%s"' % (username, password, localRoot,remoteRoot)
+            cmd = 'start "" /B megacopy --download -u %s -p %s --local "%s" --remote "%s"' % (username, password, localRoot,remoteRoot)
 
-        result = self.__lib.exec_cmd(command=cmd, workingDir=self.__megaToolsDir, noWindow=True, outputFile=self.__megaTools_log)
+        result = self._exec_transfer_cmd(username=username, command=cmd, noWindow=True)
 
         if result:
             logger.debug(' Success, downloadeded all files from account.')
@@ -74,7 +189,48 @@ class MegaTools_Lib(object):
             logger.debug(' Error, could not download all files from account!')
             return False
 
-    def download_file(self, username, password, localFilePath, remoteFilePath):
+    def download_dir(self, username, password, localDir, remoteDir, speedLimit=None):
+        """
+        Download remote directory, with files not downloaded yet, and wait for it to finish.
+
+        Args:
+            username (str): username of account to download from
+            password (str): password of account to download from
+            localDir (str): Local directory to download to. Created if missing.
+            remoteDir (str): Remote directory to download.
+            speedLimit (int): Download speed limit, overriding downSpeedLimit. None for downSpeedLimit.
+
+        Returns:
+            boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaTools_Lib.download_dir')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Downloading directory "%s" to "%s".' % (username, remoteDir, localDir))
+
+        if not path.exists(localDir):
+            try:
+                makedirs(localDir)
+            except OSError as e:
+                logger.debug(' Exception: %s' % str(e))
+
+        speedLimit = speedLimit or self.__downSpeedLimit
+        if speedLimit:
+            cmd = 'megacopy --download -u %s -p %s --limit-speed %d --local "%s" --remote "%s"' % (
+                username, password, speedLimit, localDir, remoteDir)
+        else:
+            cmd = 'megacopy --download -u %s -p %s --local "%s" --remote "%s"' % (username, password, localDir,
+                                                                                 remoteDir)
+
+        if self._exec_transfer_cmd(username=username, command=cmd):
+            logger.debug(' Success, downloaded remote dir.')
+            return True
+
+        logger.warning(' Error, could NOT download remote dir "%s"!' % remoteDir)
+        return False
+
+    def download_file(self, username, password, localFilePath, remoteFilePath, speedLimit=None):
         """
         Download a remote file from MEGA account.
 
@@ -83,6 +239,7 @@ class MegaTools_Lib(object):
             password (str): password of account to __download file from
             localFilePath (str): Location to __download file to.
             remoteFilePath (str): Location to __download file from.
+            speedLimit (int): Download speed limit, overriding downSpeedLimit. None for downSpeedLimit.
 
         Returns:
             bool: whether successful download or not
@@ -93,9 +250,20 @@ class MegaTools_Lib(object):
 
         logger.debug(' MEGA downloading file from account "%s" - "%s" to "%s"' % (username, password, localFilePath))
 
-        cmd = 'start /B megaget -u %s -p %s --path "%s" "%s"' % (username, password, localFilePath, remoteFilePath)
-        result = self.__lib.exec_cmd(command=cmd, workingDir=self.__megaToolsDir,
-                                     noWindow=True, outputFile=self.__megaTools_log)
+        localDirPath = path.dirname(localFilePath)
+        if localDirPath and not path.exists(localDirPath):
+            try:
+                makedirs(localDirPath)
+            except OSError as e:
+                logger.debug(' Exception: %s' % str(e))
+
+        speedLimit = speedLimit or self.__downSpeedLimit
+        if speedLimit:
+            cmd = 'megaget -u %s -p %s --limit-speed %d --path "%s" "%s"' % (username, password, speedLimit,
+                                                                             localFilePath, remoteFilePath)
+        else:
+            cmd = 'megaget -u %s -p %s --path "%s" "%s"' % (username, password, localFilePath, remoteFilePath)
+        result = self._exec_transfer_cmd(username=username, command=cmd, noWindow=True)
 
         if result:
             logger.debug(' Successfully downloaded file.')
@@ -104,6 +272,26 @@ class MegaTools_Lib(object):
             logger.debug(' Error when trying to download file.')
             return False
 
+    def get_file(self, username, password, remoteFilePath, localFilePath):
+        """
+        Download remote file to local file path. Missing local parent directories are created.
+
+        Args:
+            username (str): username of account to download from
+            password (str): password of account to download from
+            remoteFilePath (str): Remote file path to download.
+            localFilePath (str): Local file path to download to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaTools_Lib.get_file')
+        logger.setLevel(self.__logLevel)
+
+        return self.download_file(username=username, password=password, localFilePath=localFilePath,
+                                  remoteFilePath=remoteFilePath)
+
     def get_file_extension_from_megals_line_data(self, line):
         """
         Extract file extension from megals line data output.
@@ -266,6 +454,64 @@ class MegaTools_Lib(object):
         logger.debug(' Error, could NOT get account total space!')
         return None
 
+    def get_quota(self, username, password):
+        """
+        Get account space.
+
+        Args:
+            username (str): username for MEGA account
+            password (str): password for MEGA account
+
+        Returns:
+            Dictionary: with "total", "used" and "free" space in bytes. None if space could not be got.
+        """
+
+        logger = getLogger('MegaTools_Lib.get_quota')
+        logger.setLevel(self.__logLevel)
+
+        cmd = 'start /B megadf -u %s -p %s' % (username, password)
+        out, err = self.__lib.exec_cmd_and_return_output(command=cmd, workingDir=self.__megaToolsDir)
+
+        quota = {}
+        for line in out.splitlines() if out else []:
+            values = findall('^(Total|Used|Free):\s*(\d+)', line.strip())
+            if values:
+                quota[values[0][0].lower()] = int(values[0][1])
+
+        if len(quota) == 3:
+            logger.debug(' Success, could get account space.')
+            return quota
+
+        logger.debug(' Error, could NOT get account space! %s' % str(err))
+        return None
+
+    def get_over_limit_seconds(self, output):
+        """
+        Get seconds to wait before retrying a transfer that failed with given output, if it failed over quota or rate
+        limit.
+
+        Args:
+            output (str): Output of failed megatools command.
+
+        Returns:
+            Integer: seconds to wait, retry time given in output or a default. None if not over quota or rate limit.
+        """
+
+        logger = getLogger('MegaTools_Lib.get_over_limit_seconds')
+        logger.setLevel(self.__logLevel)
+
+        if not output:
+            return None
+        if search(QUOTA_ERROR_PATTERN, output):
+            defaultSeconds = QUOTA_PARK_SECONDS
+        elif search(RATE_LIMIT_ERROR_PATTERN, output):
+            defaultSeconds = RATE_LIMIT_PARK_SECONDS
+        else:
+            return None
+
+        retryAfter = search(RETRY_AFTER_PATTERN, output)
+        return int(retryAfter.group(1)) if retryAfter else defaultSeconds
+
     def get_remote_dir_size(self, username, password, localDirPath, localRoot, remoteRoot):
         """
         Get remote directory sizes of equivalent local file path
@@ -292,7 +538,7 @@ class MegaTools_Lib(object):
             cmd = 'start /B megals -lR -u %s -p %s "%s"' % (username, password, remotePath)
             out, err = self.__lib.exec_cmd_and_return_output(command=cmd, workingDir=self.__megaToolsDir)
 
-            lines = out.split('\r\n')
+            lines = out.splitlines()
             totalRemoteDirSize = 0
             for line in lines:
                 line_split = line.split()
@@ -329,7 +575,7 @@ class MegaTools_Lib(object):
         cmd = ['start', '/B', 'megals', '-u', '%s' % username, '-p', '%s' % password, '"%s"' % remoteRoot]
         out, err = self.__lib.exec_cmd_and_return_output(command=cmd, workingDir=self.__megaToolsDir)
 
-        dirs = out.split('\r\n')
+        dirs = out.splitlines()
         dirList = []
 
         for dir in dirs:
@@ -361,7 +607,7 @@ class MegaTools_Lib(object):
 
         if not err:
             if not out == '':
-                lines = out.split('\r\n')
+                lines = out.splitlines()
                 if removeBlankLines:
                     lines = list(filter(None, lines))  # fastest
                 logger.debug(' Success, could get remote file data recursievly.')
@@ -483,7 +729,7 @@ class MegaTools_Lib(object):
 
         if not err:
             if not out == '':
-                lines = out.split('\r\n')
+                lines = out.splitlines()
                 remoteFiles = []
                 for line in lines:
                     if not line == '' and len(findall("\?", line)) == 0:
@@ -517,13 +763,103 @@ class MegaTools_Lib(object):
 
         if not err:
             if not out == '':
-                lines = out.split('\r\n')
+                lines = out.splitlines()
                 logger.debug(' Success, could get remote sub directory names.')
                 return lines
 
         logger.warning(str(err))
         return None
 
+    def list_files(self, username, password, remotePath, recursive=True):
+        """
+        List files and directories under remote directory, not including remote directory itself.
+
+        Args:
+            username (str): username of MEGA account.
+            password (str): password of MEGA account.
+            remotePath (str): Remote directory path to list.
+            recursive (bool): List subdirectories too.
+
+        Returns:
+            List: of file data dictionaries. None if remote directory could not be listed, ie: megals failed or was
+                killed, or remote directory does not exist.
+        """
+
+        logger = getLogger('MegaTools_Lib.list_files')
+        logger.setLevel(self.__logLevel)
+
+        cmd = 'megals -l%s -u %s -p %s "%s"' % ('R' if recursive else '', username, password, remotePath)
+        # Stderr is merged into output, its lines are not file data.
+        exitCode, out = self.__lib.exec_cmd_and_return_result(command=cmd, workingDir=self.__megaToolsDir)
+
+        if exitCode != 0:
+            logger.debug(' Error, could NOT list "%s"! Exit code %s. %s' % (remotePath, exitCode, out.strip()))
+            return None
+
+        files = []
+        for line in out.splitlines() if out else []:
+            fileData = self._get_file_data_from_megals_line_data(line=line)
+            if fileData and fileData['type'] in [FILE_TYPE_FILE, FILE_TYPE_DIR] and \
+                    fileData['path'].startswith(remotePath.rstrip('/') + '/'):
+                files.append(fileData)
+        return files
+
+    def make_dir(self, username, password, remoteDirPath):
+        """
+        Create remote directory. Parent directory must exist.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteDirPath (str): Remote directory path to create.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaTools_Lib.make_dir')
+        logger.setLevel(self.__logLevel)
+
+        return self.create_remote_dir(username=username, password=password, remoteDirPath=remoteDirPath)
+
+    def put_file(self, username, password, localFilePath, remoteFilePath):
+        """
+        Upload local file to remote file path. Remote parent directory must exist.
+
+        Args:
+            username (str): username of account to upload to
+            password (str): password of account to upload to
+            localFilePath (str): Local file path to upload.
+            remoteFilePath (str): Remote file path to upload to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaTools_Lib.put_file')
+        logger.setLevel(self.__logLevel)
+
+        return self.upload_file(username=username, password=password, localFilePath=localFilePath,
+                                remoteFilePath=remoteFilePath)
+
+    def remove_file(self, username, password, remoteFilePath):
+        """
+        Remove remote file or directory.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file path to remove.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaTools_Lib.remove_file')
+        logger.setLevel(self.__logLevel)
+
+        return self.remove_remote_file(username=username, password=password, remoteFilePath=remoteFilePath)
+
     def remove_local_incomplete_files(self, username, password, localRoot, remoteRoot):
         """
         Delete incomplete files from account.
@@ -545,7 +881,7 @@ class MegaTools_Lib(object):
 
         if not err:
             if not out == '':
-                lines = out.split('\r\n')
+                lines = out.splitlines()
                 for line in lines:
                     line_split = line.split()
                     if len(line_split) > 2:
@@ -603,7 +939,70 @@ class MegaTools_Lib(object):
             logger.debug(' Error, could NOT remove remote file!')
             return False
 
-    def upload_local_dir(self, username, password, localDir, remoteDir):
+    def stat_file(self, username, password, remoteFilePath):
+        """
+        Get remote file data, from listing of its parent directory.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file or directory path.
+
+        Returns:
+            Dictionary: file data. None if remote file does not exist, or its parent directory could not be listed.
+        """
+
+        logger = getLogger('MegaTools_Lib.stat_file')
+        logger.setLevel(self.__logLevel)
+
+        remoteFilePath = remoteFilePath.rstrip('/')
+        parentPath = remoteFilePath.rsplit('/', 1)[0]
+        if not parentPath:
+            return {'path': remoteFilePath, 'type': FILE_TYPE_DIR, 'size': None, 'modified': None}
+
+        for fileData in self.list_files(username=username, password=password, remotePath=parentPath,
+                                        recursive=False) or []:
+            if fileData['path'] == remoteFilePath:
+                return fileData
+        return None
+
+    def upload_file(self, username, password, localFilePath, remoteFilePath, speedLimit=None):
+        """
+        Upload file. Remote parent directory must exist.
+
+        Args:
+            username (str): username of account to upload to
+            password (str): password of account to upload to
+            localFilePath (str): Local file to upload
+            remoteFilePath (str): Remote file path to upload to
+            speedLimit (int): Upload speed limit, overriding upSpeedLimit. None for upSpeedLimit.
+
+        Returns:
+            boolean: whether successful or not.
+        """
+
+        logger = getLogger('MegaTools_Lib.upload_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' %s: Uploading file "%s" to "%s".' % (username, localFilePath, remoteFilePath))
+
+        speedLimit = speedLimit or self.__upSpeedLimit
+        if speedLimit:
+            cmd = 'megaput -u %s -p %s --limit-speed %d --path "%s" "%s"' % (username, password, speedLimit,
+                                                                             remoteFilePath, localFilePath)
+        else:
+            cmd = 'megaput -u %s -p %s --path "%s" "%s"' % (username, password, remoteFilePath, localFilePath)
+
+        result = self._exec_transfer_cmd(username=username, command=cmd)
+
+        if result:
+            logger.debug(' Success, uploaded file.')
+            return True
+        else:
+            logger.debug(' Error, could NOT upload file!')
+            return False
+
+    def upload_local_dir(self, username, password, localDir, remoteDir, speedLimit=None):
         """
         Upload directory.
 
@@ -611,6 +1010,7 @@ class MegaTools_Lib(object):
             password (str): password of account to upload to
             localDir (str): Local directory to upload
             remoteDir (str): Remote directory to upload to
+            speedLimit (int): Upload speed limit, overriding upSpeedLimit. None for upSpeedLimit.
 
         Returns:
             boolean: whether successful or not.
@@ -621,26 +1021,19 @@ class MegaTools_Lib(object):
 
         logger.debug('%s - %s: Uploading files in directory "%s"' % (username, password, localDir))
 
-        if self.__upSpeedLimit:
-            cmd = 'megacopy -u %s -p %s --limit-speed %d --local "%s" --remote "%s"' % (username, password, self.__upSpeedLimit, localDir, remoteDir)
+        speedLimit = speedLimit or self.__upSpeedLimit
+        if speedLimit:
+            cmd = 'megacopy -u %s -p %s --limit-speed %d --local "%s" --remote "%s"' % (username, password, speedLimit,
+                                                                                          localDir, remoteDir)
         else:
             cmd = 'megacopy -u %s -p %s --local "%s" --remote "%s"' % (username, password, localDir, remoteDir)
 
 
-        out, err = self.__lib.exec_cmd_and_return_output(command=cmd, workingDir=self.__megaToolsDir, outputFile=self.__megaTools_log)
-        # proc = Popen(cmd, stdout=logFile, stderr=logFile, shell=True)
-        # proc = Popen(cmd)
-        # proc = Popen(cmd, stdout=logFile, stderr=logFile)
-
-        # (out, err) = proc.communicate()
-        # lines = out.split('\r\n')
-        # logFile.close()
-
-        if not err:
+        if self._exec_transfer_cmd(username=username, command=cmd):
             logger.debug(' Success, uploaded local dir.')
             return True
 
-        logger.warning(str(err))
+        logger.warning(' Error, could NOT upload local dir "%s"!' % localDir)
         return False
 
     def upload_to_account(self, username, password, localRoot, remoteRoot):
@@ -668,7 +1061,7 @@ class MegaTools_Lib(object):
         out, err = self.__lib.exec_cmd_and_return_output(command=cmd, workingDir=self.__megaToolsDir, outputFile=self.__megaTools_log)
 
         if not err:
-            lines = out.split('\r\n')
+            lines = out.splitlines()
             for line in lines:
                 if not line == '':
                     if len(split(':\d{2} ', line)) > 1:
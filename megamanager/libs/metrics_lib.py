@@ -0,0 +1,324 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from json import dump
+from logging import getLogger
+from os import path, remove, rename
+from re import findall, sub
+from threading import Lock
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+COMMAND_DURATION_BUCKETS = [0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0]
+PROMETHEUS_PREFIX = 'megamanager_command'
+
+# Commands are run through many Lib instances, so metrics are kept per process rather than per instance.
+_COMMAND_METRICS = {}
+_COMMAND_METRICS_LOCK = Lock()
+
+
+class Metrics_Lib(object):
+    def __init__(self, logLevel='DEBUG'):
+        """
+        Library for recording timing metrics of executed commands and exporting them.
+
+        Args:
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__logLevel = logLevel
+
+    def _get_command_metrics(self, commandType):
+        """
+        Get metrics of command type, adding them if none were recorded yet. Must be called with _COMMAND_METRICS_LOCK
+        held.
+
+        Args:
+            commandType (str): Command type, ie: "megals".
+
+        Returns:
+            Dictionary: metrics of command type.
+        """
+
+        return _COMMAND_METRICS.setdefault(commandType, {
+            'count': 0, 'seconds': 0.0, 'minSeconds': None, 'maxSeconds': None, 'outputBytes': 0, 'stalls': 0,
+            'buckets': [0] * len(COMMAND_DURATION_BUCKETS), 'exitCodes': {}, 'accounts': {}})
+
+    def _get_prometheus_label_value(self, value):
+        """
+        Escape value for use as Prometheus label value.
+
+        Args:
+            value (str): Label value to escape.
+
+        Returns:
+            String: escaped label value.
+        """
+
+        logger = getLogger('Metrics_Lib._get_prometheus_label_value')
+        logger.setLevel(self.__logLevel)
+
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def _write_file_atomically(self, filePath, lines):
+        """
+        Write lines to temporary file then rename it over file path, so readers never see a partial file.
+
+        Args:
+            filePath (str): File path to write.
+            lines (list): Lines to write.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('Metrics_Lib._write_file_atomically')
+        logger.setLevel(self.__logLevel)
+
+        tempFilePath = filePath + '.tmp'
+        try:
+            with open(tempFilePath, 'w') as tempFile:
+                tempFile.write('\n'.join(lines) + '\n')
+            if path.exists(filePath):
+                remove(filePath)
+            rename(tempFilePath, filePath)
+            return True
+        except Exception as e:
+            logger.warning(' Exception: %s' % str(e))
+            return False
+
+    def export_json(self, filePath):
+        """
+        Export command metrics summary as JSON file.
+
+        Args:
+            filePath (str): File path to export to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('Metrics_Lib.export_json')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Exporting command metrics to "%s".' % filePath)
+
+        try:
+            with open(filePath, 'w') as outFile:
+                dump(self.get_summary(), outFile, indent=4, sort_keys=True)
+            logger.debug(' Success, exported command metrics to "%s".' % filePath)
+            return True
+        except Exception as e:
+            logger.warning(' Exception: %s' % str(e))
+            return False
+
+    def export_prometheus(self, filePath):
+        """
+        Export command metrics as Prometheus text file, for node_exporter textfile collector.
+
+        Args:
+            filePath (str): File path to export to. Should end with ".prom" to be picked up by node_exporter.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('Metrics_Lib.export_prometheus')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Exporting command metrics to "%s".' % filePath)
+
+        summary = self.get_summary()
+        label = self._get_prometheus_label_value
+
+        lines = ['# HELP %s_duration_seconds Wall time of executed commands.' % PROMETHEUS_PREFIX,
+                 '# TYPE %s_duration_seconds histogram' % PROMETHEUS_PREFIX]
+        for commandType in sorted(summary):
+            metrics = summary[commandType]
+            for bucket, count in zip(COMMAND_DURATION_BUCKETS, metrics['buckets']):
+                lines.append('%s_duration_seconds_bucket{command="%s",le="%s"} %d'
+                             % (PROMETHEUS_PREFIX, label(commandType), bucket, count))
+            lines.append('%s_duration_seconds_bucket{command="%s",le="+Inf"} %d'
+                         % (PROMETHEUS_PREFIX, label(commandType), metrics['count']))
+            lines.append('%s_duration_seconds_sum{command="%s"} %f'
+                         % (PROMETHEUS_PREFIX, label(commandType), metrics['seconds']))
+            lines.append('%s_duration_seconds_count{command="%s"} %d'
+                         % (PROMETHEUS_PREFIX, label(commandType), metrics['count']))
+
+        lines.extend(['# HELP %s_output_bytes_total Bytes of output written by executed commands.' % PROMETHEUS_PREFIX,
+                      '# TYPE %s_output_bytes_total counter' % PROMETHEUS_PREFIX])
+        for commandType in sorted(summary):
+            lines.append('%s_output_bytes_total{command="%s"} %d'
+                         % (PROMETHEUS_PREFIX, label(commandType), summary[commandType]['outputBytes']))
+
+        lines.extend(['# HELP %s_stalls_total Processes killed for making no progress.' % PROMETHEUS_PREFIX,
+                      '# TYPE %s_stalls_total counter' % PROMETHEUS_PREFIX])
+        for commandType in sorted(summary):
+            lines.append('%s_stalls_total{command="%s"} %d'
+                         % (PROMETHEUS_PREFIX, label(commandType), summary[commandType]['stalls']))
+
+        lines.extend(['# HELP %s_exits_total Executed commands by exit code.' % PROMETHEUS_PREFIX,
+                      '# TYPE %s_exits_total counter' % PROMETHEUS_PREFIX])
+        for commandType in sorted(summary):
+            exitCodes = summary[commandType]['exitCodes']
+            for exitCode in sorted(exitCodes):
+                lines.append('%s_exits_total{command="%s",exit_code="%s"} %d'
+                             % (PROMETHEUS_PREFIX, label(commandType), label(exitCode), exitCodes[exitCode]))
+
+        lines.extend(['# HELP %s_account_seconds_total Wall time of executed commands per account.' % PROMETHEUS_PREFIX,
+                      '# TYPE %s_account_seconds_total counter' % PROMETHEUS_PREFIX])
+        for commandType in sorted(summary):
+            accounts = summary[commandType]['accounts']
+            for account in sorted(accounts):
+                lines.append('%s_account_seconds_total{command="%s",account="%s"} %f'
+                             % (PROMETHEUS_PREFIX, label(commandType), label(account), accounts[account]['seconds']))
+
+        lines.extend(['# HELP %s_account_calls_total Executed commands per account.' % PROMETHEUS_PREFIX,
+                      '# TYPE %s_account_calls_total counter' % PROMETHEUS_PREFIX])
+        for commandType in sorted(summary):
+            accounts = summary[commandType]['accounts']
+            for account in sorted(accounts):
+                lines.append('%s_account_calls_total{command="%s",account="%s"} %d'
+                             % (PROMETHEUS_PREFIX, label(commandType), label(account), accounts[account]['count']))
+
+        result = self._write_file_atomically(filePath=filePath, lines=lines)
+        if result:
+            logger.debug(' Success, exported command metrics to "%s".' % filePath)
+        return result
+
+    def get_command_account(self, command):
+        """
+        Get account username command is run against, from its "-u" argument.
+
+        Args:
+            command (str): Executed command.
+
+        Returns:
+            String: account username. None if command is not run against an account.
+        """
+
+        logger = getLogger('Metrics_Lib.get_command_account')
+        logger.setLevel(self.__logLevel)
+
+        accounts = findall('(?:^|\s)(?:-u|--username)\s+"?([^"\s]+)', command)
+        return accounts[0] if accounts else None
+
+    def get_command_type(self, command):
+        """
+        Get command type from executed command, ie: "megals" or "ffmpeg".
+
+        Args:
+            command (str): Executed command.
+
+        Returns:
+            String: executable name of command without directory or ".exe" extension.
+        """
+
+        logger = getLogger('Metrics_Lib.get_command_type')
+        logger.setLevel(self.__logLevel)
+
+        command = sub('^\s*start\s+(?:""\s+)?/B\s+', '', command.strip())
+        if command.startswith('"'):
+            executable = command[1:].split('"', 1)[0]
+        else:
+            executable = command.split(' ', 1)[0]
+
+        executable = path.basename(sub('\\\\', '/', executable))
+        return sub('(?i)\.exe$', '', executable)
+
+    def get_summary(self):
+        """
+        Get summary of command metrics recorded so far.
+
+        Returns:
+            Dictionary: of command type to metrics dictionary with "count", "seconds", "minSeconds", "maxSeconds",
+                "outputBytes", "stalls" (processes killed for making no progress), "buckets" (cumulative count per
+                COMMAND_DURATION_BUCKETS bound), "exitCodes" and "accounts" (of account to "count", "seconds" and
+                "outputBytes").
+        """
+
+        logger = getLogger('Metrics_Lib.get_summary')
+        logger.setLevel(self.__logLevel)
+
+        summary = {}
+        with _COMMAND_METRICS_LOCK:
+            for commandType, metrics in _COMMAND_METRICS.items():
+                summary[commandType] = {
+                    'count': metrics['count'],
+                    'seconds': metrics['seconds'],
+                    'minSeconds': metrics['minSeconds'],
+                    'maxSeconds': metrics['maxSeconds'],
+                    'outputBytes': metrics['outputBytes'],
+                    'stalls': metrics['stalls'],
+                    'buckets': list(metrics['buckets']),
+                    'exitCodes': dict(metrics['exitCodes']),
+                    'accounts': dict((account, dict(accountMetrics))
+                                     for account, accountMetrics in metrics['accounts'].items())
+                }
+
+        return summary
+
+    def record_command(self, command, seconds, exitCode, outputBytes=0):
+        """
+        Record metrics of executed command.
+
+        Args:
+            command (str): Executed command.
+            seconds (float): Wall time command took in seconds.
+            exitCode (int): Exit code of command. None if command could not be run.
+            outputBytes (int): Bytes of output written by command.
+        """
+
+        logger = getLogger('Metrics_Lib.record_command')
+        logger.setLevel(self.__logLevel)
+
+        commandType = self.get_command_type(command=command)
+        account = self.get_command_account(command=command)
+        exitCode = str(exitCode)
+
+        logger.debug(' Command "%s" took %.3f seconds, exited with %s and wrote %d bytes.'
+                     % (commandType, seconds, exitCode, outputBytes))
+
+        with _COMMAND_METRICS_LOCK:
+            metrics = self._get_command_metrics(commandType=commandType)
+
+            metrics['count'] += 1
+            metrics['seconds'] += seconds
+            metrics['minSeconds'] = seconds if metrics['minSeconds'] is None else min(metrics['minSeconds'], seconds)
+            metrics['maxSeconds'] = seconds if metrics['maxSeconds'] is None else max(metrics['maxSeconds'], seconds)
+            metrics['outputBytes'] += outputBytes
+            metrics['exitCodes'][exitCode] = metrics['exitCodes'].get(exitCode, 0) + 1
+
+            for index, bucket in enumerate(COMMAND_DURATION_BUCKETS):
+                if seconds <= bucket:
+                    metrics['buckets'][index] += 1
+
+            if account:
+                accountMetrics = metrics['accounts'].setdefault(account, {'count': 0, 'seconds': 0.0,
+                                                                          'outputBytes': 0})
+                accountMetrics['count'] += 1
+                accountMetrics['seconds'] += seconds
+                accountMetrics['outputBytes'] += outputBytes
+
+    def record_stall(self, command):
+        """
+        Record process of command killed for making no progress.
+
+        Args:
+            command (str): Executed command.
+        """
+
+        logger = getLogger('Metrics_Lib.record_stall')
+        logger.setLevel(self.__logLevel)
+
+        commandType = self.get_command_type(command=command)
+
+        logger.debug(' Command "%s" stalled.' % commandType)
+
+        with _COMMAND_METRICS_LOCK:
+            self._get_command_metrics(commandType=commandType)['stalls'] += 1
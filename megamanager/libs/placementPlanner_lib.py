@@ -0,0 +1,125 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from json import dump, load
+from logging import getLogger
+from os import makedirs, path, remove, rename
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+# Fraction of each account's total space kept free when placing directories, for files added to them later.
+PLACEMENT_RESERVE_FRACTION = 0.05
+
+
+class PlacementPlanner_Lib(object):
+    def __init__(self, planFilePath, reserveFraction=PLACEMENT_RESERVE_FRACTION, logLevel='DEBUG'):
+        """
+        Plan which account each new local directory is synced to, from free space of accounts and size of directories.
+        Directories are placed largest first, each onto the account with most space left, so accounts fill up evenly
+        and new data, and its transfers, are spread over all accounts. Plans are written to a file to be reviewed
+        before they are applied.
+
+        Args:
+            planFilePath (str): File path to write plan to.
+            reserveFraction (float): Fraction of each account's total space kept free.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__planFilePath = planFilePath
+        self.__reserveFraction = reserveFraction
+        self.__logLevel = logLevel
+
+    def get_plan(self, dirs, accounts):
+        """
+        Place directories onto accounts. A directory is not placed on an account already having its remote path.
+        Directories fitting on no account are left unplaced.
+
+        Args:
+            dirs (list): of dictionaries with "localPath", "remotePath" and "bytes" of each new directory.
+            accounts (dict): of username to dictionary with "freeBytes", "totalBytes" and "pendingBytes", bytes mapped
+                to account locally but not synced yet, and "remotePaths" of its path mappings.
+
+        Returns:
+            Dictionary: plan with "assignments", list of dictionaries with "username", "localPath", "remotePath" and
+                "bytes", "unplaced" directories, and "accounts", username to dictionary with "freeBytes" before and
+                "plannedBytes" placed.
+        """
+
+        logger = getLogger('PlacementPlanner_Lib.get_plan')
+        logger.setLevel(self.__logLevel)
+
+        spaceLeft = {}
+        remotePaths = {}
+        for username, account in accounts.items():
+            reserveBytes = int(account['totalBytes'] * self.__reserveFraction)
+            spaceLeft[username] = account['freeBytes'] - account['pendingBytes'] - reserveBytes
+            remotePaths[username] = set(remotePath.rstrip('/') for remotePath in account['remotePaths'])
+
+        plan = {'assignments': [], 'unplaced': [],
+                'accounts': dict((username, {'freeBytes': account['freeBytes'], 'plannedBytes': 0})
+                                 for username, account in accounts.items())}
+        for newDir in sorted(dirs, key=lambda item: (-item['bytes'], item['localPath'])):
+            candidates = [username for username in spaceLeft if spaceLeft[username] >= newDir['bytes'] and
+                          newDir['remotePath'].rstrip('/') not in remotePaths[username]]
+            if not candidates:
+                logger.debug(' No account has room for "%s".' % newDir['localPath'])
+                plan['unplaced'].append(dict(newDir))
+                continue
+
+            username = max(candidates, key=lambda item: (spaceLeft[item], item))
+            spaceLeft[username] -= newDir['bytes']
+            remotePaths[username].add(newDir['remotePath'].rstrip('/'))
+            plan['accounts'][username]['plannedBytes'] += newDir['bytes']
+            plan['assignments'].append(dict(newDir, username=username))
+
+        return plan
+
+    def load_plan(self):
+        """
+        Load plan file.
+
+        Returns:
+            Dictionary: plan, as returned by get_plan. None if there is no plan file or it could not be read.
+        """
+
+        logger = getLogger('PlacementPlanner_Lib.load_plan')
+        logger.setLevel(self.__logLevel)
+
+        if not path.isfile(self.__planFilePath):
+            logger.warning(' No placement plan "%s" to apply!' % self.__planFilePath)
+            return None
+        try:
+            with open(self.__planFilePath, 'r') as planFile:
+                return load(planFile)
+        except (IOError, ValueError) as e:
+            logger.warning(' Exception: %s' % str(e))
+            return None
+
+    def save_plan(self, plan):
+        """
+        Write plan file atomically.
+
+        Args:
+            plan (dict): Plan, as returned by get_plan.
+        """
+
+        logger = getLogger('PlacementPlanner_Lib.save_plan')
+        logger.setLevel(self.__logLevel)
+
+        tempFilePath = self.__planFilePath + '.tmp'
+        try:
+            planDir = path.dirname(self.__planFilePath)
+            if planDir and not path.isdir(planDir):
+                makedirs(planDir)
+            with open(tempFilePath, 'w') as planFile:
+                dump(plan, planFile, indent=2, sort_keys=True)
+            if path.exists(self.__planFilePath):
+                remove(self.__planFilePath)
+            rename(tempFilePath, self.__planFilePath)
+        except (IOError, OSError) as e:
+            logger.warning(' Exception: %s' % str(e))
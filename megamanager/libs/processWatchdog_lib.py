@@ -0,0 +1,344 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from .metrics_lib import Metrics_Lib
+from logging import getLogger
+from os import devnull, kill, listdir, path, read
+from re import search, split
+from subprocess import call, PIPE, Popen, STDOUT
+from sys import platform
+from threading import Event, Lock, Thread
+from time import sleep, time
+
+try:
+    from os import sysconf
+    from signal import SIGKILL
+except ImportError:
+    from signal import SIGTERM as SIGKILL
+    sysconf = None
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+IS_WINDOWS = platform.startswith('win')
+
+# Seconds a process may go without output, transfer or CPU progress before it is killed. 0 to never kill processes.
+PROCESS_STALL_SECONDS = 600
+# Times a stalled process is run again, waiting PROCESS_STALL_BACKOFF_SECONDS before the first retry, doubling after.
+PROCESS_STALL_RETRIES = 2
+PROCESS_STALL_BACKOFF_SECONDS = 5.0
+PROCESS_POLL_SECONDS = 1.0
+# Progress line of megatools transfers, ie: "file.jpg: 45.20% - 1.2 MiB (1258291 bytes) of 2.7 MiB (2831155 bytes)".
+TRANSFER_PROGRESS_PATTERN = '\\((\\d+) bytes\\) of'
+# Seconds output readers are waited for once process is killed, in case a descendant still holds the pipe open.
+READER_JOIN_SECONDS = 5.0
+
+# Processes are run through many Lib instances, so watchdog settings are kept per process rather than per instance.
+_WATCHDOG_SETTINGS = {'stallSeconds': PROCESS_STALL_SECONDS, 'retries': PROCESS_STALL_RETRIES,
+                      'backoffSeconds': PROCESS_STALL_BACKOFF_SECONDS}
+
+
+class ProcessWatchdog_Lib(object):
+    def __init__(self, logLevel='DEBUG'):
+        """
+        Runs commands while watching them for progress: output written, bytes transferred as parsed from megatools
+        progress lines, and CPU time of the process and its descendants where the platform reports it. A process making
+        none of these for the stall interval is killed, with its descendants, and run again after a backoff. Stalls
+        are recorded in the command metrics.
+
+        Args:
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__logLevel = logLevel
+        self.__metrics = Metrics_Lib(logLevel=logLevel)
+
+    def _get_cpu_seconds(self, pids):
+        """
+        Get CPU time used so far by processes, from "/proc".
+
+        Args:
+            pids (list): Process ids.
+
+        Returns:
+            Float: CPU seconds, user and system. None if the platform does not report CPU time in "/proc".
+        """
+
+        logger = getLogger('ProcessWatchdog_Lib._get_cpu_seconds')
+        logger.setLevel(self.__logLevel)
+
+        if not sysconf or not path.isdir('/proc/self'):
+            return None
+
+        ticks = 0
+        for pid in pids:
+            try:
+                with open('/proc/%d/stat' % pid, 'r') as statFile:
+                    # Fields after the parenthesized command name, which may hold spaces.
+                    fields = statFile.read().rsplit(')', 1)[1].split()
+                ticks += int(fields[11]) + int(fields[12])
+            except (IOError, IndexError, ValueError):
+                pass
+        return ticks / float(sysconf('SC_CLK_TCK'))
+
+    def _get_process_tree(self, pid):
+        """
+        Get process id and ids of its descendants, ie: a command run by a shell. Descendants are found in "/proc", so
+        elsewhere only the process itself is returned.
+
+        Args:
+            pid (int): Process id.
+
+        Returns:
+            List: of process ids, process first.
+        """
+
+        logger = getLogger('ProcessWatchdog_Lib._get_process_tree')
+        logger.setLevel(self.__logLevel)
+
+        if not path.isdir('/proc/self'):
+            return [pid]
+
+        children = {}
+        for name in listdir('/proc'):
+            if not name.isdigit():
+                continue
+            try:
+                with open('/proc/%s/stat' % name, 'r') as statFile:
+                    parentPid = int(statFile.read().rsplit(')', 1)[1].split()[1])
+                children.setdefault(parentPid, []).append(int(name))
+            except (IOError, IndexError, ValueError):
+                pass
+
+        pids = [pid]
+        for treePid in pids:
+            pids.extend(children.get(treePid, []))
+        return pids
+
+    def _kill_process_tree(self, proc):
+        """
+        Kill process and its descendants.
+
+        Args:
+            proc (Popen): Process to kill.
+        """
+
+        logger = getLogger('ProcessWatchdog_Lib._kill_process_tree')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            if IS_WINDOWS:
+                with open(devnull, 'w') as nullFile:
+                    call(['taskkill', '/F', '/T', '/PID', str(proc.pid)], stdout=nullFile, stderr=nullFile)
+                return
+            for pid in reversed(self._get_process_tree(pid=proc.pid)):
+                try:
+                    kill(pid, SIGKILL)
+                except OSError:
+                    pass
+        except Exception as e:
+            logger.warning(' Exception: %s' % str(e))
+
+    def _read_output(self, stream, progress, chunks, outFile, keepBytes=None):
+        """
+        Read process output until it ends, counting it as progress. Bytes given in megatools progress lines count as
+        transfer progress instead, so a transfer repeating the same progress does not count as making progress.
+
+        Args:
+            stream (file): Process output pipe.
+            progress (dict): Progress of process, with "bytes" of output, "outputBytes" of output other than progress
+                lines, "transferBytes", "keptBytes" of output chunks kept and "lock".
+            chunks (list): List to keep output chunks in. None to not keep output.
+            outFile (file): File to append output to. None to not write output to file.
+            keepBytes (int): Bytes of output kept, from its end. Older chunks are dropped once the ones after hold as
+                many. None to keep all output.
+        """
+
+        remainder = b''
+        while True:
+            chunk = read(stream.fileno(), 65536)
+            if not chunk:
+                break
+            if outFile:
+                outFile.write(chunk)
+                outFile.flush()
+
+            lines = split(b'[\r\n]', remainder + chunk)
+            remainder = lines.pop()
+            with progress['lock']:
+                if chunks is not None:
+                    chunks.append(chunk)
+                    progress['keptBytes'] += len(chunk)
+                    while keepBytes and progress['keptBytes'] - len(chunks[0]) >= keepBytes:
+                        progress['keptBytes'] -= len(chunks.pop(0))
+                progress['bytes'] += len(chunk)
+                for line in lines:
+                    transferred = search(TRANSFER_PROGRESS_PATTERN.encode('ascii'), line)
+                    if transferred:
+                        progress['transferBytes'] = max(progress['transferBytes'], int(transferred.group(1)))
+                    else:
+                        progress['outputBytes'] += len(line) + 1
+        stream.close()
+
+    def _run_once(self, command, noWindow, outputFilePath, keepOutput, captureStderr, stallSeconds, keepBytes=None):
+        """
+        Run command once, killing it if it makes no progress for stall seconds.
+
+        Args:
+            command (str): Command to execute, for the platform.
+            noWindow (bool): No window will be created if true.
+            outputFilePath (str): File path to append output to. None to not write output to file.
+            keepOutput (bool): Whether to return output.
+            captureStderr (bool): Whether stderr is merged into output, else it goes where this process's stderr goes.
+            stallSeconds (float): Seconds without progress before process is killed. 0 to never kill it.
+            keepBytes (int): Bytes of output kept, from its end, if output is kept. None to keep all output.
+
+        Returns:
+            Tuple: of exit code, output, bytes of output and whether process stalled. Output is None if not kept.
+        """
+
+        logger = getLogger('ProcessWatchdog_Lib._run_once')
+        logger.setLevel(self.__logLevel)
+
+        kwargs = {'stdout': PIPE, 'stderr': STDOUT if captureStderr else None}
+        if IS_WINDOWS:
+            if noWindow:
+                kwargs['creationflags'] = 0x08000000
+        else:
+            kwargs['shell'] = True
+
+        outFile = open(outputFilePath, 'ab') if outputFilePath else None
+        try:
+            proc = Popen(command, **kwargs)
+
+            progress = {'bytes': 0, 'outputBytes': 0, 'transferBytes': 0, 'keptBytes': 0, 'lock': Lock()}
+            chunks = [] if keepOutput else None
+            reader = Thread(target=self._read_output, args=(proc.stdout, progress, chunks, outFile, keepBytes),
+                            name='thread_watchdog_output_%d' % proc.pid)
+            reader.daemon = True
+            reader.start()
+
+            done = Event()
+            stall = {'stalled': False}
+
+            def watch():
+                lastProgress = None
+                lastProgressTime = time()
+                pids = None
+                cpuSeconds = None
+                while not done.wait(PROCESS_POLL_SECONDS):
+                    with progress['lock']:
+                        current = (progress['outputBytes'], progress['transferBytes'])
+                    # CPU time is only checked when output and transfer made no progress, from the process tree found
+                    # last time. "/proc" is only walked again for the tree when that shows no progress either, as
+                    # walking it reads every process.
+                    if lastProgress and current == lastProgress[:2]:
+                        lastCpuSeconds = cpuSeconds
+                        cpuSeconds = self._get_cpu_seconds(pids=pids) if pids else None
+                        if cpuSeconds is None or cpuSeconds == lastCpuSeconds:
+                            pids = self._get_process_tree(pid=proc.pid)
+                            cpuSeconds = self._get_cpu_seconds(pids=pids)
+                    current += (cpuSeconds, )
+                    if current != lastProgress:
+                        lastProgress = current
+                        lastProgressTime = time()
+                    elif time() - lastProgressTime >= stallSeconds:
+                        stall['stalled'] = True
+                        self._kill_process_tree(proc=proc)
+                        return
+
+            watcher = None
+            if stallSeconds:
+                watcher = Thread(target=watch, name='thread_watchdog_%d' % proc.pid)
+                watcher.daemon = True
+                watcher.start()
+
+            exitCode = proc.wait()
+            done.set()
+            if watcher:
+                watcher.join()
+            reader.join(READER_JOIN_SECONDS if stall['stalled'] else None)
+        finally:
+            if outFile:
+                outFile.close()
+
+        with progress['lock']:
+            out = b''.join(chunks) if chunks is not None else None
+        if out and keepBytes:
+            out = out[-keepBytes:]
+        return exitCode, out, progress['bytes'], stall['stalled']
+
+    def configure(self, stallSeconds=None, retries=None, backoffSeconds=None):
+        """
+        Set watchdog settings of every command run from now on, by any instance.
+
+        Args:
+            stallSeconds (float): Seconds without progress before a process is killed. 0 to never kill processes. None
+                to keep current setting.
+            retries (int): Times a stalled process is run again. None to keep current setting.
+            backoffSeconds (float): Seconds waited before first retry, doubling for each retry after. None to keep
+                current setting.
+        """
+
+        logger = getLogger('ProcessWatchdog_Lib.configure')
+        logger.setLevel(self.__logLevel)
+
+        if stallSeconds is not None:
+            _WATCHDOG_SETTINGS['stallSeconds'] = stallSeconds
+        if retries is not None:
+            _WATCHDOG_SETTINGS['retries'] = retries
+        if backoffSeconds is not None:
+            _WATCHDOG_SETTINGS['backoffSeconds'] = backoffSeconds
+
+        logger.debug(' Processes stalling for %s seconds are killed and retried %d times.' % (
+            _WATCHDOG_SETTINGS['stallSeconds'], _WATCHDOG_SETTINGS['retries']))
+
+    def run(self, command, noWindow=False, outputFilePath=None, keepOutput=True, captureStderr=True, keepBytes=None):
+        """
+        Run command under watchdog. Stalled processes are killed and run again, with exponential backoff, up to the
+        configured retries.
+
+        Args:
+            command (str): Command to execute, for the platform.
+            noWindow (bool): No window will be created if true.
+            outputFilePath (str): File path to append output to. None to not write output to file.
+            keepOutput (bool): Whether to return output.
+            captureStderr (bool): Whether stderr is merged into output, else it goes where this process's stderr goes.
+            keepBytes (int): Bytes of output kept, from its end, if output is kept, so long running commands don't
+                hold all their output in memory. None to keep all output.
+
+        Returns:
+            Tuple: of exit code, output and bytes of output of last run. Output is None if not kept.
+        """
+
+        logger = getLogger('ProcessWatchdog_Lib.run')
+        logger.setLevel(self.__logLevel)
+
+        stallSeconds = _WATCHDOG_SETTINGS['stallSeconds']
+        retries = _WATCHDOG_SETTINGS['retries']
+        commandText = ' '.join(command) if isinstance(command, list) else command
+        commandType = self.__metrics.get_command_type(command=commandText)
+
+        attempt = 0
+        while True:
+            exitCode, out, outputBytes, stalled = self._run_once(command=command, noWindow=noWindow,
+                                                                 outputFilePath=outputFilePath, keepOutput=keepOutput,
+                                                                 captureStderr=captureStderr,
+                                                                 stallSeconds=stallSeconds, keepBytes=keepBytes)
+            if not stalled:
+                return exitCode, out, outputBytes
+
+            self.__metrics.record_stall(command=commandText)
+            if attempt >= retries:
+                logger.warning(' Command "%s" stalled %d times, giving up.' % (commandType, attempt + 1))
+                return exitCode, out, outputBytes
+
+            backoffSeconds = _WATCHDOG_SETTINGS['backoffSeconds'] * 2 ** attempt
+            logger.warning(' Command "%s" made no progress for %s seconds and was killed, retrying in %.1f seconds.'
+                           % (commandType, stallSeconds, backoffSeconds))
+            sleep(backoffSeconds)
+            attempt += 1
@@ -0,0 +1,129 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from hashlib import sha256
+from json import dump, load
+from logging import getLogger
+from os import makedirs, path, remove, rename
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+
+class RemoteState_Lib(object):
+    def __init__(self, dirPath, logLevel='DEBUG'):
+        """
+        On-disk copy of account node trees, with the sequence number of the last server change applied to each. Nodes
+        are kept as the API returns them, so names and keys stay encrypted at rest. A later run loads the tree and
+        only asks the server for changes since, instead of fetching the whole tree again.
+
+        Args:
+            dirPath (str): Directory holding one tree file per account.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__dirPath = dirPath
+        self.__logLevel = logLevel
+
+    def _get_file_path(self, username):
+        """
+        Get tree file path of account. Files are named by hash of username.
+
+        Args:
+            username (str): username of account
+
+        Returns:
+            String: tree file path.
+        """
+
+        logger = getLogger('RemoteState_Lib._get_file_path')
+        logger.setLevel(self.__logLevel)
+
+        return path.join(self.__dirPath, sha256(username.lower().encode('utf-8')).hexdigest() + '.json')
+
+    def load_tree(self, username):
+        """
+        Load node tree of account.
+
+        Args:
+            username (str): username of account
+
+        Returns:
+            Dictionary: with "sn" sequence number and "nodes" list of API nodes. None if account has no saved tree.
+        """
+
+        logger = getLogger('RemoteState_Lib.load_tree')
+        logger.setLevel(self.__logLevel)
+
+        filePath = self._get_file_path(username=username)
+        if not path.isfile(filePath):
+            return None
+
+        try:
+            with open(filePath, 'r') as treeFile:
+                tree = load(treeFile)
+        except (IOError, ValueError) as e:
+            logger.warning(' Exception: %s' % str(e))
+            return None
+
+        if not isinstance(tree, dict) or not tree.get('sn') or not isinstance(tree.get('nodes'), list):
+            logger.debug(' Saved tree of "%s" is not valid.' % username)
+            return None
+
+        logger.debug(' Loaded %d nodes of "%s".' % (len(tree['nodes']), username))
+        return tree
+
+    def remove_tree(self, username):
+        """
+        Remove saved node tree of account, ie: after server no longer has changes since its sequence number.
+
+        Args:
+            username (str): username of account
+        """
+
+        logger = getLogger('RemoteState_Lib.remove_tree')
+        logger.setLevel(self.__logLevel)
+
+        filePath = self._get_file_path(username=username)
+        if path.isfile(filePath):
+            try:
+                remove(filePath)
+            except OSError as e:
+                logger.warning(' Exception: %s' % str(e))
+
+    def save_tree(self, username, sequenceNumber, nodes):
+        """
+        Save node tree of account atomically.
+
+        Args:
+            username (str): username of account
+            sequenceNumber (str): Sequence number of last server change applied to tree.
+            nodes (list): API nodes of tree.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        logger = getLogger('RemoteState_Lib.save_tree')
+        logger.setLevel(self.__logLevel)
+
+        filePath = self._get_file_path(username=username)
+        tempFilePath = filePath + '.tmp'
+        try:
+            if not path.isdir(self.__dirPath):
+                makedirs(self.__dirPath)
+            with open(tempFilePath, 'w') as treeFile:
+                dump({'sn': sequenceNumber, 'nodes': nodes}, treeFile, separators=(',', ':'))
+            if path.exists(filePath):
+                remove(filePath)
+            rename(tempFilePath, filePath)
+        except (IOError, OSError) as e:
+            logger.warning(' Exception: %s' % str(e))
+            return False
+
+        logger.debug(' Saved %d nodes of "%s".' % (len(nodes), username))
+        return True
@@ -0,0 +1,203 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from .megaCrypto_lib import MegaCrypto_Lib
+from hashlib import pbkdf2_hmac, sha256
+from hmac import compare_digest, new as new_hmac
+from json import dump, dumps, load, loads
+from logging import getLogger
+from os import makedirs, path, remove, rename, urandom
+from threading import Lock
+from time import time
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+SESSION_CACHE_KEY_ROUNDS = 10000
+
+
+class SessionCache_Lib(object):
+    def __init__(self, filePath, logLevel='DEBUG'):
+        """
+        Cache of MEGA account sessions, so accounts log in once rather than every run. Sessions are encrypted at rest
+        with AES-CTR and authenticated with HMAC-SHA256, under keys derived from the account password, so the cache
+        file is useless without the passwords. Accounts are stored by hash of username.
+
+        Args:
+            filePath (str): Cache file path.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__filePath = filePath
+        self.__logLevel = logLevel
+
+        self.__crypto = MegaCrypto_Lib(logLevel=logLevel)
+        self.__entries = None
+        self.__lock = Lock()
+
+    def _get_account_id(self, username):
+        """
+        Get cache key of account.
+
+        Args:
+            username (str): username of account
+
+        Returns:
+            String: hex SHA-256 of lower case username.
+        """
+
+        logger = getLogger('SessionCache_Lib._get_account_id')
+        logger.setLevel(self.__logLevel)
+
+        return sha256(username.lower().encode('utf-8')).hexdigest()
+
+    def _get_entry_keys(self, username, password, salt):
+        """
+        Derive encryption and authentication keys of cache entry from account password.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            salt (bytes): Random salt of entry.
+
+        Returns:
+            Tuple: of AES key as four 32 bit words and HMAC key bytes.
+        """
+
+        logger = getLogger('SessionCache_Lib._get_entry_keys')
+        logger.setLevel(self.__logLevel)
+
+        passwordBytes = password if isinstance(password, bytes) else password.encode('utf-8')
+        keyData = pbkdf2_hmac('sha256', passwordBytes, salt + username.lower().encode('utf-8'),
+                              SESSION_CACHE_KEY_ROUNDS, 32)
+        return self.__crypto.bytes_to_a32(keyData[:16]), keyData[16:]
+
+    def _load_entries(self):
+        """
+        Load cache file, once. Must be called with lock held.
+
+        Returns:
+            Dictionary: of account id to encrypted entry.
+        """
+
+        logger = getLogger('SessionCache_Lib._load_entries')
+        logger.setLevel(self.__logLevel)
+
+        if self.__entries is None:
+            self.__entries = {}
+            if path.isfile(self.__filePath):
+                try:
+                    with open(self.__filePath, 'r') as cacheFile:
+                        self.__entries = load(cacheFile)
+                except (IOError, ValueError) as e:
+                    logger.warning(' Exception: %s' % str(e))
+        return self.__entries
+
+    def _save_entries(self):
+        """
+        Write cache file atomically. Must be called with lock held.
+        """
+
+        logger = getLogger('SessionCache_Lib._save_entries')
+        logger.setLevel(self.__logLevel)
+
+        tempFilePath = self.__filePath + '.tmp'
+        try:
+            cacheDir = path.dirname(self.__filePath)
+            if cacheDir and not path.isdir(cacheDir):
+                makedirs(cacheDir)
+            with open(tempFilePath, 'w') as cacheFile:
+                dump(self.__entries, cacheFile, indent=4, sort_keys=True)
+            if path.exists(self.__filePath):
+                remove(self.__filePath)
+            rename(tempFilePath, self.__filePath)
+        except (IOError, OSError) as e:
+            logger.warning(' Exception: %s' % str(e))
+
+    def get_session(self, username, password):
+        """
+        Get cached session of account.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, to decrypt session with.
+
+        Returns:
+            Dictionary: session with "sid", "masterKey" and "userHandle". None if account has no cached session, or
+                it does not decrypt with password.
+        """
+
+        logger = getLogger('SessionCache_Lib.get_session')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            entry = self._load_entries().get(self._get_account_id(username=username))
+        if not entry:
+            return None
+
+        try:
+            salt = self.__crypto.base64_url_decode(entry['salt'])
+            nonce = self.__crypto.base64_to_a32(entry['nonce'])
+            data = self.__crypto.base64_url_decode(entry['data'])
+            aesKey, hmacKey = self._get_entry_keys(username=username, password=password, salt=salt)
+            mac = new_hmac(hmacKey, self.__crypto.a32_to_bytes(nonce) + data, sha256).hexdigest()
+            if not compare_digest(mac.encode('ascii'), entry['mac'].encode('ascii')):
+                logger.debug(' Cached session of "%s" does not match password.' % username)
+                return None
+            session = loads(self.__crypto.aes_ctr_crypt(aesKey, nonce, data).decode('utf-8'))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(' Exception: %s' % str(e))
+            return None
+
+        logger.debug(' Using cached session of "%s".' % username)
+        return {'sid': session['sid'], 'masterKey': tuple(session['masterKey']), 'userHandle': session['userHandle']}
+
+    def remove_session(self, username):
+        """
+        Remove cached session of account, ie: after session expired.
+
+        Args:
+            username (str): username of account
+        """
+
+        logger = getLogger('SessionCache_Lib.remove_session')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            if self._load_entries().pop(self._get_account_id(username=username), None):
+                logger.debug(' Removed cached session of "%s".' % username)
+                self._save_entries()
+
+    def set_session(self, username, password, session):
+        """
+        Cache session of account.
+
+        Args:
+            username (str): username of account
+            password (str): password of account, to encrypt session with.
+            session (dict): Session with "sid", "masterKey" and "userHandle".
+        """
+
+        logger = getLogger('SessionCache_Lib.set_session')
+        logger.setLevel(self.__logLevel)
+
+        salt = urandom(16)
+        nonce = self.__crypto.bytes_to_a32(urandom(8))
+        aesKey, hmacKey = self._get_entry_keys(username=username, password=password, salt=salt)
+        plainData = dumps({'sid': session['sid'], 'masterKey': list(session['masterKey']),
+                           'userHandle': session['userHandle']}).encode('utf-8')
+        data = self.__crypto.aes_ctr_crypt(aesKey, nonce, plainData)
+
+        entry = {'salt': self.__crypto.base64_url_encode(salt), 'nonce': self.__crypto.a32_to_base64(nonce),
+                 'data': self.__crypto.base64_url_encode(data),
+                 'mac': new_hmac(hmacKey, self.__crypto.a32_to_bytes(nonce) + data, sha256).hexdigest(),
+                 'created': int(time())}
+
+        with self.__lock:
+            self._load_entries()[self._get_account_id(username=username)] = entry
+            self._save_entries()
+        logger.debug(' Cached session of "%s".' % username)
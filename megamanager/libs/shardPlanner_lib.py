@@ -0,0 +1,257 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from hashlib import sha1
+from heapq import heappop, heappush
+from json import dump, load
+from logging import getLogger
+from os import makedirs, path, remove, rename
+from threading import Lock
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+# Each file costs as much as this many bytes when balancing shards, for the per-file overhead of a transfer.
+SHARD_FILE_COST_BYTES = 256 * 1024
+# Directories are split into smaller units until at most this many units per shard exist.
+SHARD_MAX_UNITS = 16
+
+UNIT_TYPE_DIR = 'dir'
+UNIT_TYPE_FILES = 'files'
+
+
+class ShardPlanner_Lib(object):
+    def __init__(self, shards, progressFilePath, fileCost=SHARD_FILE_COST_BYTES, logLevel='DEBUG'):
+        """
+        Split directory trees into shards of about the same byte and file count, so they can be transferred as parallel
+        jobs, and keep track of which parts of each shard are done, so an interrupted transfer resumes where it stopped.
+
+        Shards are made of units: whole directories, transferred as one directory copy, and chunks of the files directly
+        in a directory that was split, transferred one by one.
+
+        Args:
+            shards (int): Number of shards to split trees into.
+            progressFilePath (str): File path to keep completed units in.
+            fileCost (int): Bytes each file costs on top of its size when balancing shards.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__shards = max(1, shards)
+        self.__progressFilePath = progressFilePath
+        self.__fileCost = fileCost
+        self.__logLevel = logLevel
+
+        self.__progress = None
+        self.__lock = Lock()
+
+    def _get_cost(self, unit):
+        """
+        Get cost of unit, its bytes plus a fixed cost per file.
+
+        Args:
+            unit (dict): Unit.
+
+        Returns:
+            Integer: cost.
+        """
+
+        return unit['bytes'] + unit['count'] * self.__fileCost
+
+    def _get_dir_tree(self, files):
+        """
+        Get tree of directories holding files, with byte and file count of each directory including subdirectories.
+
+        Args:
+            files (dict): of file sub path, ie: "/dir/file.txt", to size in bytes.
+
+        Returns:
+            Dictionary: of directory sub path, "" for root, to dictionary with "bytes", "count", sub paths of child
+                "dirs" and sub paths of "files" directly in directory.
+        """
+
+        logger = getLogger('ShardPlanner_Lib._get_dir_tree')
+        logger.setLevel(self.__logLevel)
+
+        tree = {'': {'bytes': 0, 'count': 0, 'dirs': set(), 'files': []}}
+        for subPath, size in files.items():
+            dirPath = subPath.rsplit('/', 1)[0]
+            tree.setdefault(dirPath, {'bytes': 0, 'count': 0, 'dirs': set(), 'files': []})['files'].append(subPath)
+            while True:
+                tree[dirPath]['bytes'] += size
+                tree[dirPath]['count'] += 1
+                if not dirPath:
+                    break
+                parentPath = dirPath.rsplit('/', 1)[0]
+                tree.setdefault(parentPath, {'bytes': 0, 'count': 0, 'dirs': set(), 'files': []})['dirs'].add(dirPath)
+                dirPath = parentPath
+        return tree
+
+    def _load_progress(self):
+        """
+        Load progress file, once. Must be called with lock held.
+
+        Returns:
+            Dictionary: of transfer key to list of completed unit keys.
+        """
+
+        logger = getLogger('ShardPlanner_Lib._load_progress')
+        logger.setLevel(self.__logLevel)
+
+        if self.__progress is None:
+            self.__progress = {}
+            if path.isfile(self.__progressFilePath):
+                try:
+                    with open(self.__progressFilePath, 'r') as progressFile:
+                        self.__progress = load(progressFile)
+                except (IOError, ValueError) as e:
+                    logger.warning(' Exception: %s' % str(e))
+        return self.__progress
+
+    def _save_progress(self):
+        """
+        Write progress file atomically. Must be called with lock held.
+        """
+
+        logger = getLogger('ShardPlanner_Lib._save_progress')
+        logger.setLevel(self.__logLevel)
+
+        tempFilePath = self.__progressFilePath + '.tmp'
+        try:
+            progressDir = path.dirname(self.__progressFilePath)
+            if progressDir and not path.isdir(progressDir):
+                makedirs(progressDir)
+            with open(tempFilePath, 'w') as progressFile:
+                dump(self.__progress, progressFile, separators=(',', ':'))
+            if path.exists(self.__progressFilePath):
+                remove(self.__progressFilePath)
+            rename(tempFilePath, self.__progressFilePath)
+        except (IOError, OSError) as e:
+            logger.warning(' Exception: %s' % str(e))
+
+    def clear_progress(self, transferKey):
+        """
+        Forget completed units of transfer, once all its shards are done.
+
+        Args:
+            transferKey (str): Key of transfer, ie: direction, account and paths.
+        """
+
+        logger = getLogger('ShardPlanner_Lib.clear_progress')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            if self._load_progress().pop(transferKey, None) is not None:
+                self._save_progress()
+
+    def get_completed_units(self, transferKey):
+        """
+        Get keys of units of transfer completed by earlier runs.
+
+        Args:
+            transferKey (str): Key of transfer, ie: direction, account and paths.
+
+        Returns:
+            Set: of unit keys.
+        """
+
+        logger = getLogger('ShardPlanner_Lib.get_completed_units')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            return set(self._load_progress().get(transferKey, []))
+
+    def get_shards(self, files):
+        """
+        Split tree into shards. The largest directory is split into its subdirectories and chunks of its own files until
+        units are small enough to balance, then units are handed out largest first, each to the shard with least cost
+        so far.
+
+        Args:
+            files (dict): of file sub path, ie: "/dir/file.txt", to size in bytes.
+
+        Returns:
+            List: of shards, largest first, each a dictionary with "bytes", "count" and "units". Each unit is a
+                dictionary with "type" UNIT_TYPE_DIR or UNIT_TYPE_FILES, directory sub "path", "key", "bytes",
+                "count" and, for UNIT_TYPE_FILES, "files" sub paths. Files units are keyed by a hash of their files
+                rather than by chunk number, so a file added to or removed from the directory between runs does not
+                shift later chunks onto keys completed by an earlier run.
+        """
+
+        logger = getLogger('ShardPlanner_Lib.get_shards')
+        logger.setLevel(self.__logLevel)
+
+        tree = self._get_dir_tree(files=files)
+
+        def get_dir_unit(dirPath):
+            return {'type': UNIT_TYPE_DIR, 'path': dirPath, 'key': 'dir:%s' % dirPath,
+                    'bytes': tree[dirPath]['bytes'], 'count': tree[dirPath]['count']}
+
+        def get_files_unit(dirPath, dirFiles):
+            digest = sha1()
+            for subPath in sorted(dirFiles):
+                digest.update((subPath.encode('utf-8') if isinstance(subPath, unicode) else subPath) + b'\0')
+            return {'type': UNIT_TYPE_FILES, 'path': dirPath, 'key': 'files:%s:%s' % (dirPath, digest.hexdigest()),
+                    'bytes': sum(files[subPath] for subPath in dirFiles), 'count': len(dirFiles), 'files': dirFiles}
+
+        units = [get_dir_unit('')]
+        targetCost = self._get_cost(units[0]) / float(self.__shards)
+        while len(units) < self.__shards * SHARD_MAX_UNITS:
+            splittable = [unit for unit in units if unit['type'] == UNIT_TYPE_DIR and
+                          (tree[unit['path']]['dirs'] or len(tree[unit['path']]['files']) > 1)]
+            if not splittable:
+                break
+            largest = max(splittable, key=self._get_cost)
+            if self._get_cost(largest) <= targetCost / 2:
+                break
+            units.remove(largest)
+            units.extend(get_dir_unit(dirPath) for dirPath in sorted(tree[largest['path']]['dirs']))
+
+            # Files directly in directory are chunked, so a large flat directory is split too.
+            chunkFiles = []
+            chunkCost = 0
+            for subPath in sorted(tree[largest['path']]['files']):
+                fileCost = files[subPath] + self.__fileCost
+                if chunkFiles and chunkCost + fileCost > targetCost / 2:
+                    units.append(get_files_unit(largest['path'], chunkFiles))
+                    chunkFiles = []
+                    chunkCost = 0
+                chunkFiles.append(subPath)
+                chunkCost += fileCost
+            if chunkFiles:
+                units.append(get_files_unit(largest['path'], chunkFiles))
+
+        shards = [{'bytes': 0, 'count': 0, 'units': []} for index in range(min(self.__shards, len(units)))]
+        heap = [(0, index) for index in range(len(shards))]
+        for unit in sorted(units, key=self._get_cost, reverse=True):
+            cost, index = heappop(heap)
+            shards[index]['units'].append(unit)
+            shards[index]['bytes'] += unit['bytes']
+            shards[index]['count'] += unit['count']
+            heappush(heap, (cost + self._get_cost(unit), index))
+
+        shards.sort(key=self._get_cost, reverse=True)
+        logger.debug(' Split %d files of %d bytes into %d shards of %d units.' % (
+            tree['']['count'], tree['']['bytes'], len(shards), len(units)))
+        return shards
+
+    def set_unit_completed(self, transferKey, unitKey):
+        """
+        Record unit of transfer as completed.
+
+        Args:
+            transferKey (str): Key of transfer, ie: direction, account and paths.
+            unitKey (str): Key of unit.
+        """
+
+        logger = getLogger('ShardPlanner_Lib.set_unit_completed')
+        logger.setLevel(self.__logLevel)
+
+        with self.__lock:
+            completedUnits = self._load_progress().setdefault(transferKey, [])
+            if unitKey not in completedUnits:
+                completedUnits.append(unitKey)
+                self._save_progress()
@@ -0,0 +1,233 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from abc import ABCMeta, abstractmethod
+from os import path
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+# Same numbering as megals file types.
+FILE_TYPE_FILE = '0'
+FILE_TYPE_DIR = '1'
+
+
+class StorageBackend_Lib(object):
+    """
+    Interface of storage backends MegaManager syncs against. Remote paths are absolute, "/" separated and start with
+    "/Root", ie: "/Root/MyDir/file.jpg".
+
+    File data is returned as dictionary with "path" (remote path), "type" (FILE_TYPE_FILE or FILE_TYPE_DIR), "size"
+    (bytes, None for directories) and "modified" (seconds since epoch). Backends that know the sparse fingerprint of
+    remote files, as Fingerprint_Lib works it out, add it as "fingerprint".
+    """
+    __metaclass__ = ABCMeta
+
+    def close(self):
+        """
+        Release backend resources, ie: save state and close connections. Backends holding resources override this.
+        """
+
+        pass
+
+    def copy_file(self, username, password, remoteFilePath, newRemoteFilePath):
+        """
+        Copy remote file within account, without transferring it again. Parent directory of new path must exist.
+        Backends that can copy files override this; others return False, so the file is uploaded instead.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file path to copy.
+            newRemoteFilePath (str): Remote file path to copy to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        return False
+
+    @abstractmethod
+    def get_file(self, username, password, remoteFilePath, localFilePath):
+        """
+        Download remote file to local file path. Missing local parent directories are created.
+
+        Args:
+            username (str): username of account to download from
+            password (str): password of account to download from
+            remoteFilePath (str): Remote file path to download.
+            localFilePath (str): Local file path to download to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+        pass
+
+    @abstractmethod
+    def get_quota(self, username, password):
+        """
+        Get account space.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+
+        Returns:
+            Dictionary: with "total", "used" and "free" space in bytes. None if space could not be got.
+        """
+        pass
+
+    @abstractmethod
+    def list_files(self, username, password, remotePath, recursive=True):
+        """
+        List files and directories under remote directory, not including remote directory itself.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remotePath (str): Remote directory path to list.
+            recursive (bool): List subdirectories too.
+
+        Returns:
+            List: of file data dictionaries. None if remote directory could not be listed.
+        """
+        pass
+
+    @abstractmethod
+    def make_dir(self, username, password, remoteDirPath):
+        """
+        Create remote directory. Parent directory must exist.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteDirPath (str): Remote directory path to create.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+        pass
+
+    def make_dirs(self, username, password, remoteDirPaths):
+        """
+        Create remote directories, parents before children. Parent directories must exist or be among the directories
+        given. Backends that can create many directories at once override this.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteDirPaths (list): Remote directory paths to create.
+
+        Returns:
+            List: of given remote directory paths that were created or already existed. Directories that could not be
+                created are left out.
+        """
+
+        existing_dirPaths = []
+        for remoteDirPath in sorted(set(remoteDirPaths), key=lambda dirPath: (dirPath.count('/'), dirPath)):
+            if self.make_dir(username=username, password=password, remoteDirPath=remoteDirPath):
+                existing_dirPaths.append(remoteDirPath)
+                continue
+            fileData = self.stat_file(username=username, password=password, remoteFilePath=remoteDirPath)
+            if fileData and fileData['type'] == FILE_TYPE_DIR:
+                existing_dirPaths.append(remoteDirPath)
+        return existing_dirPaths
+
+    def move_file(self, username, password, remoteFilePath, newRemoteFilePath):
+        """
+        Move or rename remote file, without transferring it again. Parent directory of new path must exist. Backends
+        that can move files override this; others return False, so the file is uploaded again instead.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file path to move.
+            newRemoteFilePath (str): Remote file path to move to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        return False
+
+    def open_sessions(self, accounts):
+        """
+        Log in to accounts up front. Backends that keep sessions override this; others log in per command.
+
+        Args:
+            accounts (list): of username and password tuples.
+
+        Returns:
+            Integer: number of accounts with open session.
+        """
+
+        return 0
+
+    @abstractmethod
+    def put_file(self, username, password, localFilePath, remoteFilePath):
+        """
+        Upload local file to remote file path. Remote parent directory must exist.
+
+        Args:
+            username (str): username of account to upload to
+            password (str): password of account to upload to
+            localFilePath (str): Local file path to upload.
+            remoteFilePath (str): Remote file path to upload to.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+        pass
+
+    @abstractmethod
+    def remove_file(self, username, password, remoteFilePath):
+        """
+        Remove remote file or directory.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file path to remove.
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+        pass
+
+    def remove_files(self, username, password, remoteFilePaths):
+        """
+        Remove remote files or directories. Backends that can remove many files at once override this.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePaths (list): Remote file paths to remove.
+
+        Returns:
+            Integer: number of remote files removed.
+        """
+
+        removedCount = 0
+        for remoteFilePath in remoteFilePaths:
+            if self.remove_file(username=username, password=password, remoteFilePath=remoteFilePath):
+                removedCount += 1
+        return removedCount
+
+    @abstractmethod
+    def stat_file(self, username, password, remoteFilePath):
+        """
+        Get remote file data.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteFilePath (str): Remote file or directory path.
+
+        Returns:
+            Dictionary: file data. None if remote file does not exist.
+        """
+        pass
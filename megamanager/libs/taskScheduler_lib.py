@@ -0,0 +1,464 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from heapq import heappop, heappush
+from itertools import count
+from logging import getLogger
+from os import path
+from threading import Condition, currentThread, Event, Lock, Thread
+from time import time
+from traceback import format_exc
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+# Seconds each wait for tasks blocks at most before waiting again, so waits can be interrupted by Ctrl-C.
+WAIT_SECONDS = 1.0
+# Seconds worker waits for a pending task before it exits.
+WORKER_IDLE_SECONDS = 1.0
+WORKER_THREAD_NAME = 'TaskScheduler_Lib_worker'
+
+
+class DependencyError(Exception):
+    def __init__(self, message, cause=None):
+        """
+        Raised as task exception when a task it depends on failed, in which case the task itself is not run.
+
+        Args:
+            message (str): Error message.
+            cause (Exception): Exception the first failed task in the chain of dependencies raised.
+        """
+
+        super(DependencyError, self).__init__(message)
+        self.cause = cause
+
+
+class Task(object):
+    def __init__(self, target, args=(), kwargs=None, name=None, logLevel='DEBUG'):
+        """
+        Task run by TaskScheduler_Lib. Holds the task result or exception once it is done.
+
+        Args:
+            target (function): Function to run.
+            args (tuple): Positional arguments for target.
+            kwargs (dict): Keyword arguments for target.
+            name (str): Task name.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__target = target
+        self.__args = args
+        self.__kwargs = kwargs if kwargs else {}
+        self.__name = name if name else getattr(target, '__name__', 'task')
+        self.__logLevel = logLevel
+
+        self.__callbacks = []
+        self.__callbacksLock = Lock()
+        self.__doneEvent = Event()
+        self.__exception = None
+        self.__result = None
+        self.__startTime = None
+        self.__endTime = None
+
+    @property
+    def name(self):
+        """
+        Getter for task name.
+
+        Returns:
+            String: Returns task name.
+        """
+
+        return self.__name
+
+    @property
+    def runTime(self):
+        """
+        Getter for task run time.
+
+        Returns:
+            Float: Returns seconds task ran for. None if task did not finish yet.
+        """
+
+        if self.__startTime is None or self.__endTime is None:
+            return None
+        return self.__endTime - self.__startTime
+
+    def add_done_callback(self, callback):
+        """
+        Add function called with this task once it is done. Called right away if task is already done.
+
+        Args:
+            callback (function): Function taking the task as its only argument.
+        """
+
+        with self.__callbacksLock:
+            if not self.__doneEvent.is_set():
+                self.__callbacks.append(callback)
+                return
+
+        self._call_callback(callback)
+
+    def done(self):
+        """
+        Whether task is done or not.
+
+        Returns:
+            Boolean: whether task is done or not.
+        """
+
+        return self.__doneEvent.is_set()
+
+    def exception(self, timeout=None):
+        """
+        Wait for task to be done and return the exception it raised.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait.
+
+        Returns:
+            Exception: Exception raised by task. None if task succeeded or is not done before timeout.
+        """
+
+        self._wait(timeout=timeout)
+        return self.__exception
+
+    def result(self, timeout=None):
+        """
+        Wait for task to be done and return its result.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait.
+
+        Returns:
+            Object: Value returned by task. None if task failed or is not done before timeout.
+        """
+
+        self._wait(timeout=timeout)
+        return self.__result
+
+    def run(self, exception=None):
+        """
+        Run task, storing its result or exception, and call done callbacks.
+
+        Args:
+            exception (Exception): If given, task is not run and finishes with this exception instead.
+        """
+
+        logger = getLogger('Task.run')
+        logger.setLevel(self.__logLevel)
+
+        self.__startTime = time()
+        try:
+            if exception:
+                raise exception
+            self.__result = self.__target(*self.__args, **self.__kwargs)
+        except Exception as e:
+            self.__exception = e
+            logger.error(' Exception in task "%s": %s' % (self.__name, str(e)))
+            logger.debug(format_exc())
+        finally:
+            self.__endTime = time()
+
+        with self.__callbacksLock:
+            self.__doneEvent.set()
+            callbacks = list(self.__callbacks)
+            self.__callbacks = []
+
+        for callback in callbacks:
+            self._call_callback(callback)
+
+    def _call_callback(self, callback):
+        """
+        Call done callback, logging any exception it raises.
+
+        Args:
+            callback (function): Function taking the task as its only argument.
+        """
+
+        logger = getLogger('Task._call_callback')
+        logger.setLevel(self.__logLevel)
+
+        try:
+            callback(self)
+        except Exception as e:
+            logger.error(' Exception in done callback of task "%s": %s' % (self.__name, str(e)))
+
+    def _wait(self, timeout):
+        """
+        Wait for task to be done.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait. None to wait forever.
+        """
+
+        if timeout is not None:
+            self.__doneEvent.wait(timeout)
+            return
+        while not self.__doneEvent.wait(WAIT_SECONDS):
+            pass
+
+
+class TaskScheduler_Lib(object):
+    def __init__(self, maxWorkers=None, logLevel='DEBUG'):
+        """
+        Library for running tasks on a pool of worker threads and waiting on them without polling. Workers are started
+        as tasks are queued, up to maxWorkers, and each runs pending tasks until none is left for WORKER_IDLE_SECONDS.
+
+        Args:
+            maxWorkers (int): Maximum number of tasks running at once. None for no limit.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__maxWorkers = maxWorkers
+        self.__logLevel = logLevel
+
+        self.__condition = Condition()
+        # Heap of (priority, sequence, task), so tasks of the same priority start in the order they were queued.
+        self.__pending = []
+        self.__sequence = count()
+        self.__running = 0
+        self.__tasks = []
+        self.__waiting = {}
+        self.__workers = 0
+
+    @property
+    def maxWorkers(self):
+        """
+        Getter for maximum number of tasks running at once.
+
+        Returns:
+            Integer: Returns maximum number of tasks running at once. None for no limit.
+        """
+
+        return self.__maxWorkers
+
+    @property
+    def pendingCount(self):
+        """
+        Getter for number of tasks ready to run but waiting for a free worker.
+
+        Returns:
+            Integer: Returns number of pending tasks.
+        """
+
+        with self.__condition:
+            return len(self.__pending)
+
+    @property
+    def tasks(self):
+        """
+        Getter for all tasks submitted to scheduler.
+
+        Returns:
+            List: Returns list of Task objects.
+        """
+
+        with self.__condition:
+            return list(self.__tasks)
+
+    def _on_dependency_done(self, task, dependencies, dependency):
+        """
+        Called when a dependency of a waiting task is done. Task is queued once all its dependencies are done, or fails
+        right away if a dependency failed.
+
+        Args:
+            task (Task): Task waiting on dependencies.
+            dependencies (list): Task objects task depends on.
+            dependency (Task): Dependency that is done.
+        """
+
+        with self.__condition:
+            if task in self.__waiting and dependency.exception():
+                del self.__waiting[task]
+                failed = True
+            elif task in self.__waiting and all(item.done() for item in dependencies):
+                heappush(self.__pending, (self.__waiting.pop(task), next(self.__sequence), task))
+                failed = False
+            else:
+                return
+
+        if failed:
+            cause = dependency.exception()
+            if isinstance(cause, DependencyError):
+                cause = cause.cause
+            task.run(exception=DependencyError('Dependency "%s" of task "%s" failed: %s' % (
+                dependency.name, task.name, str(dependency.exception())), cause=cause))
+            with self.__condition:
+                self.__condition.notify_all()
+        else:
+            self._start_workers()
+
+    def _run_worker(self):
+        """
+        Run pending tasks, lowest priority value first, until none is left for WORKER_IDLE_SECONDS or there are more
+        workers than self.__maxWorkers. Worker thread is named after the task it runs.
+        """
+
+        logger = getLogger('TaskScheduler_Lib._run_worker')
+        logger.setLevel(self.__logLevel)
+
+        thread = currentThread()
+        while True:
+            with self.__condition:
+                idleStartTime = time()
+                while not self.__pending or (self.__maxWorkers is not None and self.__running >= self.__maxWorkers):
+                    remaining = idleStartTime + WORKER_IDLE_SECONDS - time()
+                    if remaining <= 0 or (self.__maxWorkers is not None and self.__workers > self.__maxWorkers):
+                        self.__workers -= 1
+                        return
+                    self.__condition.wait(remaining)
+                task = heappop(self.__pending)[2]
+                self.__running += 1
+
+            thread.name = task.name
+            task.run()
+            thread.name = WORKER_THREAD_NAME
+
+            with self.__condition:
+                self.__running -= 1
+                self.__condition.notify_all()
+
+            logger.info(' Task "%s" finished!' % task.name)
+
+    def _start_workers(self):
+        """
+        Start workers for pending tasks no idle worker is left for, while there are fewer than self.__maxWorkers, and
+        wake idle workers.
+        """
+
+        with self.__condition:
+            toStart = len(self.__pending) - (self.__workers - self.__running)
+            if self.__maxWorkers is not None:
+                toStart = min(toStart, self.__maxWorkers - self.__workers)
+            toStart = max(toStart, 0)
+            self.__workers += toStart
+            if self.__pending:
+                self.__condition.notify_all()
+
+        for index in range(toStart):
+            t = Thread(target=self._run_worker, name=WORKER_THREAD_NAME)
+            t.daemon = True
+            t.start()
+
+    def get_results(self):
+        """
+        Get results of done tasks.
+
+        Returns:
+            Dictionary: Task names mapped to tuple of task result and task exception.
+        """
+
+        results = {}
+        for task in self.tasks:
+            if task.done():
+                results[task.name] = (task.result(), task.exception())
+        return results
+
+    def join(self, timeout=None):
+        """
+        Block until every submitted task is done, including tasks submitted while waiting.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait. None to wait forever.
+
+        Returns:
+            Boolean: whether all tasks are done or not.
+        """
+
+        with self.__condition:
+            tasks = self.__tasks
+        return self.wait(tasks=tasks, timeout=timeout)
+
+    def set_max_workers(self, maxWorkers):
+        """
+        Change maximum number of tasks running at once. When lowered, running tasks finish and workers over the new
+        maximum exit in their place.
+
+        Args:
+            maxWorkers (int): Maximum number of tasks running at once. None for no limit.
+        """
+
+        logger = getLogger('TaskScheduler_Lib.set_max_workers')
+        logger.setLevel(self.__logLevel)
+
+        with self.__condition:
+            self.__maxWorkers = maxWorkers
+        self._start_workers()
+
+    def submit(self, target, args=(), kwargs=None, name=None, callback=None, dependsOn=None, priority=0):
+        """
+        Submit task to run on a worker thread.
+
+        Args:
+            target (function): Function to run.
+            args (tuple): Positional arguments for target.
+            kwargs (dict): Keyword arguments for target.
+            name (str): Task name.
+            callback (function): Function called with the task once it is done.
+            dependsOn (list): Task objects, possibly of other schedulers, that must be done before this task starts.
+                If any of them fails, this task fails with DependencyError without running.
+            priority (int): Tasks with lower priority start first, once their dependencies are done.
+
+        Returns:
+            Task: Submitted task.
+        """
+
+        logger = getLogger('TaskScheduler_Lib.submit')
+        logger.setLevel(self.__logLevel)
+
+        task = Task(target=target, args=args, kwargs=kwargs, name=name, logLevel=self.__logLevel)
+        if callback:
+            task.add_done_callback(callback)
+
+        logger.debug(' Submitting task "%s".' % task.name)
+
+        dependencies = [dependency for dependency in dependsOn if dependency] if dependsOn else []
+
+        with self.__condition:
+            self.__tasks.append(task)
+            if dependencies:
+                self.__waiting[task] = priority
+            else:
+                heappush(self.__pending, (priority, next(self.__sequence), task))
+
+        for dependency in dependencies:
+            dependency.add_done_callback(
+                lambda doneDependency: self._on_dependency_done(task, dependencies, doneDependency))
+
+        self._start_workers()
+        return task
+
+    def wait(self, tasks, timeout=None):
+        """
+        Block until given tasks are done. Given list may grow while waiting.
+
+        Args:
+            tasks (list): Task objects to wait for.
+            timeout (float): Maximum time in seconds to wait. None to wait forever.
+
+        Returns:
+            Boolean: whether all tasks are done or not.
+        """
+
+        logger = getLogger('TaskScheduler_Lib.wait')
+        logger.setLevel(self.__logLevel)
+
+        deadline = time() + timeout if timeout is not None else None
+
+        # Condition is waited on for at most WAIT_SECONDS at a time, as waiting without timeout can't be interrupted.
+        with self.__condition:
+            while not all(task.done() for task in tasks):
+                if deadline is None:
+                    self.__condition.wait(WAIT_SECONDS)
+                else:
+                    remaining = deadline - time()
+                    if remaining <= 0:
+                        logger.debug(' Waiting for tasks to complete TIMED OUT! Timeout %d (seconds)' % timeout)
+                        return False
+                    self.__condition.wait(min(remaining, WAIT_SECONDS))
+        return True
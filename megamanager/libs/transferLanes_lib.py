@@ -0,0 +1,238 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from .taskScheduler_lib import TaskScheduler_Lib
+from fnmatch import fnmatch
+from logging import getLogger
+from os import path
+from threading import Lock
+from time import time
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+# Lanes as (name, maximum file size in bytes, workers), smallest first. None for no maximum.
+TRANSFER_LANES = [('small', 8 * 1024 * 1024, 8), ('large', None, 2)]
+# Added to priority of files modified recently, so they go first.
+PRIORITY_RECENT_BOOST = -10
+
+
+class TransferSkippedError(Exception):
+    """
+    Raised by transfers that were not run, ie: because their account is parked, so they are left for a later sync. They
+    neither count as failed nor as transferred, so the tuner does not lower workers for them.
+    """
+    pass
+
+
+class TransferLanes_Lib(object):
+    def __init__(self, lanes=None, priorityRules=None, recentSeconds=None, tuner=None, tunerKey=None,
+                 logLevel='DEBUG'):
+        """
+        Transfer queue split into lanes by file size, each lane with its own workers, so a few large files don't hold
+        up many small ones. Within a lane, transfers start in priority order, lowest first: files matching a priority
+        rule get its priority, and recently modified files get PRIORITY_RECENT_BOOST on top. Bytes and time of each lane
+        are counted, to report lane throughput. With a tuner, workers of each lane are adjusted to its throughput and
+        failures, starting from the level tuned by an earlier run.
+
+        Args:
+            lanes (list): of (name, maximum file size in bytes, workers) tuples, smallest first. Files go to the first
+                lane they fit, files larger than every lane to the last one. None for TRANSFER_LANES.
+            priorityRules (list): of (path pattern, priority) tuples. First rule whose pattern matches file path
+                applies. Files matching none have priority 0.
+            recentSeconds (float): Files modified less than this many seconds ago are recent. None for no file being
+                recent.
+            tuner (ConcurrencyTuner_Lib): Tuner adjusting workers of each lane. None for fixed workers.
+            tunerKey (str): Key lanes are tuned under, followed by lane name, ie: direction and account.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__priorityRules = priorityRules if priorityRules else []
+        self.__recentSeconds = recentSeconds
+        self.__tuner = tuner
+        self.__tunerKey = tunerKey
+        self.__logLevel = logLevel
+
+        self.__lanes = []
+        for name, maxBytes, workers in lanes if lanes else TRANSFER_LANES:
+            tunerLaneKey = '%s:%s' % (tunerKey, name)
+            if tuner:
+                workers = tuner.get_level(key=tunerLaneKey, default=workers)
+            self.__lanes.append({'name': name, 'maxBytes': maxBytes, 'tunerKey': tunerLaneKey,
+                                 'scheduler': TaskScheduler_Lib(maxWorkers=workers, logLevel=logLevel),
+                                 'files': 0, 'bytes': 0, 'seconds': 0.0, 'startTime': None, 'endTime': None})
+        self.__lock = Lock()
+
+    @property
+    def tasks(self):
+        """
+        Getter for all tasks submitted to lanes.
+
+        Returns:
+            List: Returns list of Task objects.
+        """
+
+        return [task for lane in self.__lanes for task in lane['scheduler'].tasks]
+
+    def _get_lane(self, size):
+        """
+        Get lane of file.
+
+        Args:
+            size (int): File size in bytes. None if not known, ie: not a transfer.
+
+        Returns:
+            Dictionary: lane.
+        """
+
+        if size is None:
+            return self.__lanes[0]
+        for lane in self.__lanes:
+            if lane['maxBytes'] is None or size <= lane['maxBytes']:
+                return lane
+        return self.__lanes[-1]
+
+    def _run_transfer(self, lane, target, args, kwargs, size):
+        """
+        Run transfer and count its bytes and time in lane, if it succeeded. Tuner is told of every transfer not skipped,
+        and lane workers set to the level it returns.
+
+        Args:
+            lane (dict): Lane transfer runs in.
+            target (function): Function to run.
+            args (tuple): Positional arguments for target.
+            kwargs (dict): Keyword arguments for target.
+            size (int): File size in bytes. None if not known.
+
+        Returns:
+            Object: Value returned by target.
+        """
+
+        startTime = time()
+        try:
+            result = target(*args, **kwargs)
+        except TransferSkippedError:
+            raise
+        except Exception:
+            self._tune_lane(lane=lane, size=size, failed=True)
+            raise
+        endTime = time()
+        self._tune_lane(lane=lane, size=size, failed=False)
+
+        with self.__lock:
+            lane['files'] += 1
+            lane['bytes'] += size if size else 0
+            lane['seconds'] += endTime - startTime
+            lane['startTime'] = min(lane['startTime'], startTime) if lane['startTime'] else startTime
+            lane['endTime'] = max(lane['endTime'], endTime) if lane['endTime'] else endTime
+        return result
+
+    def _tune_lane(self, lane, size, failed):
+        """
+        Tell tuner of finished transfer, and set lane workers to level it returns.
+
+        Args:
+            lane (dict): Lane transfer ran in.
+            size (int): File size in bytes. None if not known.
+            failed (bool): Whether transfer failed.
+        """
+
+        if not self.__tuner:
+            return
+        scheduler = lane['scheduler']
+        level = self.__tuner.record_transfer(key=lane['tunerKey'], level=scheduler.maxWorkers, size=size,
+                                            failed=failed, saturated=scheduler.pendingCount > 0)
+        if level:
+            scheduler.set_max_workers(maxWorkers=level)
+
+    def get_priority(self, filePath, modified=None):
+        """
+        Get transfer priority of file. Lower goes first.
+
+        Args:
+            filePath (str): Local or remote file path.
+            modified (float): Modification time of file, in seconds since epoch. None if not known.
+
+        Returns:
+            Integer: priority.
+        """
+
+        priority = 0
+        for pattern, rulePriority in self.__priorityRules:
+            if fnmatch(filePath, pattern):
+                priority = rulePriority
+                break
+        if self.__recentSeconds and modified and time() - modified < self.__recentSeconds:
+            priority += PRIORITY_RECENT_BOOST
+        return priority
+
+    def get_stats(self):
+        """
+        Get transfer statistics of each lane.
+
+        Returns:
+            List: of dictionaries with lane "name", "workers", "files" and "bytes" transferred, "seconds" from first
+                transfer start to last transfer end, "throughput" over those seconds and "workerThroughput" per
+                transfer, both in bytes per second.
+        """
+
+        stats = []
+        with self.__lock:
+            for lane in self.__lanes:
+                seconds = lane['endTime'] - lane['startTime'] if lane['startTime'] else 0.0
+                stats.append({'name': lane['name'], 'workers': lane['scheduler'].maxWorkers, 'files': lane['files'],
+                              'bytes': lane['bytes'], 'seconds': seconds,
+                              'throughput': lane['bytes'] / seconds if seconds else 0.0,
+                              'workerThroughput': lane['bytes'] / lane['seconds'] if lane['seconds'] else 0.0})
+        return stats
+
+    def log_stats(self, description):
+        """
+        Log transfer statistics of each lane that transferred files.
+
+        Args:
+            description (str): What lanes transfer, ie: "Upload".
+        """
+
+        logger = getLogger('TransferLanes_Lib.log_stats')
+        logger.setLevel(self.__logLevel)
+
+        for stats in self.get_stats():
+            if stats['files']:
+                logger.info(' %s lane "%s" (%d workers): %d files, %d bytes in %.1f seconds, %.1f KiB/s, '
+                            '%.1f KiB/s per transfer.' % (description, stats['name'], stats['workers'], stats['files'],
+                                                          stats['bytes'], stats['seconds'],
+                                                          stats['throughput'] / 1024,
+                                                          stats['workerThroughput'] / 1024))
+
+    def submit(self, target, args=(), kwargs=None, name=None, dependsOn=None, size=None, filePath=None,
+               modified=None):
+        """
+        Submit transfer to lane of its size, with priority of its path and modification time.
+
+        Args:
+            target (function): Function to run.
+            args (tuple): Positional arguments for target.
+            kwargs (dict): Keyword arguments for target.
+            name (str): Task name.
+            dependsOn (list): Task objects that must be done before this task starts.
+            size (int): File size in bytes. None if not known, ie: not a transfer, in which case task goes to the
+                first lane.
+            filePath (str): File path priority rules are matched against. None for priority 0.
+            modified (float): Modification time of file, in seconds since epoch. None if not known.
+
+        Returns:
+            Task: Submitted task.
+        """
+
+        logger = getLogger('TransferLanes_Lib.submit')
+        logger.setLevel(self.__logLevel)
+
+        lane = self._get_lane(size=size)
+        priority = self.get_priority(filePath=filePath, modified=modified) if filePath else 0
+        return lane['scheduler'].submit(target=self._run_transfer, args=(lane, target, args, kwargs or {}, size),
+                                        name=name, dependsOn=dependsOn, priority=priority)
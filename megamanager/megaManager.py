@@ -9,9 +9,15 @@
 ###
 
 from account import Account
+from compressionQueue import CompressionQueue
+from encodeProfile import DEFAULT_ENCODE_PROFILE, EncodeProfile, get_default_encode_profiles
 from logging import DEBUG, getLogger, FileHandler, Formatter, StreamHandler
-from libs import CompressImages_Lib, FFMPEG_Lib, Lib, MegaTools_Lib
-from os import chdir, getpid, path, remove, rename, walk
+from libs import AccountParking_Lib, ChunkedDownload_Lib, ChunkedUpload_Lib, CompressImages_Lib, FFMPEG_Lib, \
+    FILE_TYPE_DIR, FILE_TYPE_FILE, Lib, LocalIndex_Lib, LocalStorage_Lib, CHANGE_REMOVED, CHANGE_RESCAN, \
+    ConcurrencyTuner_Lib, DependencyError, DuplicateIndex_Lib, LocalWatcher_Lib, MegaApi_Lib, MegaTools_Lib, \
+    Metrics_Lib, PlacementPlanner_Lib, ProcessWatchdog_Lib, RemoteState_Lib, SessionCache_Lib, ShardPlanner_Lib, \
+    TaskScheduler_Lib, TransferLanes_Lib, TransferSkippedError, UNIT_TYPE_DIR
+from os import chdir, getpid, listdir, makedirs, path, remove, rename, stat, walk
 from pathMapping import PathMapping
 from random import randint
 from re import findall, split, sub
@@ -19,8 +25,8 @@ from shutil import copyfile
 from syncprofile import SyncProfile
 from sys import stdout
 from tempfile import gettempdir
-from threading import Thread
-from time import time
+from threading import Lock
+from time import localtime, sleep, strftime, time
 
 
 __author__ = 'szmania'
@@ -36,25 +42,63 @@ REMOTE_ROOT = ''
 
 COMPRESSION_IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png']
 COMPRESSION_VIDEO_EXTENSIONS = ['.avi', '.mp4', '.wmv']
+COMPRESSION_MIN_SAVING = 10.0
+COMPRESSION_PREDICTION_MIN_SIZE = 500
+IMAGE_COMPRESSION_RATIO = 0.25
+VIDEO_COMPRESSION_RATIO = 0.5
 
-WORKING_DIR = path.dirname(path.realpath(__file__))
+PIPELINE_COMPRESS_WORKERS = 1
+
+DAEMON_REFRESH_SECONDS = 900
+DAEMON_RETRY_SECONDS = 1.0
+# Temporary files written while downloading and compressing, which daemon mode does not sync.
+DAEMON_IGNORED_PATTERNS = ['*.part', '*.part.chunks', '*.tmp', '*.duplicate', '*.compressimages-backup', '*_NEW.*']
+
+# Suffix of remote file a replacement is uploaded to, before it is moved over the remote file it replaces.
+UPLOAD_STAGING_SUFFIX = '.megaManager-upload'
+
+# Seconds a sync waits for parked accounts, once only their path mappings are left.
+QUOTA_MAX_WAIT_SECONDS = 3600
 
-TEMP_LOGFILE_PATH = gettempdir() + '\\megaManager_error_files_%d.npz' % randint(0, 9999999999)
+# Remote directory new directories are placed under, each as a sub directory of the same name.
+PLACEMENT_REMOTE_ROOT = '/Root'
 
-COMPRESSED_IMAGES_FILE = WORKING_DIR + "\\data\\compressed_images.npz"
-UNABLE_TO_COMPRESS_IMAGES_FILE = WORKING_DIR + "\\data\\unable_to_compress_images.npz"
-COMPRESSED_VIDEOS_FILE = WORKING_DIR + "\\data\\compressed_videos.npz"
-UNABLE_TO_COMPRESS_VIDEOS_FILE = WORKING_DIR + "\\data\\unable_to_compress_videos.npz"
-REMOVED_REMOTE_FILES = WORKING_DIR + '\\data\\removed_remote_files.npz'
+STORAGE_BACKEND_API = 'api'
+STORAGE_BACKEND_LOCAL = 'local'
+STORAGE_BACKEND_MEGATOOLS = 'megatools'
 
-LOGFILE_STDOUT = WORKING_DIR + '\\data\\mega_stdout.log'
-LOGFILE_STDERR = WORKING_DIR + '\\data\\mega_stderr.log'
-MEGAMANAGER_LOGFILEPATH = WORKING_DIR + '\\data\\megaManager_log.log'
+WORKING_DIR = path.dirname(path.realpath(__file__))
+
+TEMP_LOGFILE_PATH = path.join(gettempdir(), 'megaManager_error_files_%d.npz' % randint(0, 9999999999))
+
+COMPRESSED_IMAGES_FILE = path.join(WORKING_DIR, 'data', 'compressed_images.npz')
+UNABLE_TO_COMPRESS_IMAGES_FILE = path.join(WORKING_DIR, 'data', 'unable_to_compress_images.npz')
+COMPRESSED_VIDEOS_FILE = path.join(WORKING_DIR, 'data', 'compressed_videos.npz')
+UNABLE_TO_COMPRESS_VIDEOS_FILE = path.join(WORKING_DIR, 'data', 'unable_to_compress_videos.npz')
+VIDEO_PROBES_FILE = path.join(WORKING_DIR, 'data', 'video_probes.npz')
+COMPRESSION_QUEUE_FILE = path.join(WORKING_DIR, 'data', 'compression_queue.npz')
+ENCODE_BENCHMARK_FILE = path.join(WORKING_DIR, 'data', 'encode_benchmark.txt')
+COMMAND_METRICS_FILE = path.join(WORKING_DIR, 'data', 'command_metrics.json')
+COMMAND_METRICS_TEXTFILE = path.join(WORKING_DIR, 'data', 'command_metrics.prom')
+LOCAL_INDEX_FILE = path.join(WORKING_DIR, 'data', 'local_index.json')
+DUPLICATE_INDEX_FILE = path.join(WORKING_DIR, 'data', 'duplicate_index.json')
+REMOVED_REMOTE_FILES = path.join(WORKING_DIR, 'data', 'removed_remote_files.npz')
+REMOTE_STATE_DIR = path.join(WORKING_DIR, 'data', 'remote_state')
+SESSION_CACHE_FILE = path.join(WORKING_DIR, 'data', 'session_cache.json')
+SHARD_PROGRESS_FILE = path.join(WORKING_DIR, 'data', 'shard_progress.json')
+CONCURRENCY_LEVELS_FILE = path.join(WORKING_DIR, 'data', 'concurrency_levels.json')
+PARKED_ACCOUNTS_FILE = path.join(WORKING_DIR, 'data', 'parked_accounts.json')
+PLACEMENT_PLAN_FILE = path.join(WORKING_DIR, 'data', 'placement_plan.json')
+
+LOGFILE_STDOUT = path.join(WORKING_DIR, 'data', 'mega_stdout.log')
+LOGFILE_STDERR = path.join(WORKING_DIR, 'data', 'mega_stderr.log')
+MEGAMANAGER_LOGFILEPATH = path.join(WORKING_DIR, 'data', 'megaManager_log.log')
 
 
 class MegaManager(object):
     def __init__(self, **kwargs):
-        self.__threads = []
+        self.__scheduler = None
+        self.__benchmarkProfiles = None
         self.__download = None
         self.__upload = None
         self.__removeRemote = None
@@ -62,21 +106,79 @@ class MegaManager(object):
         self.__compressAll = None
         self.__compressImages = None
         self.__compressVideos = None
+        self.__compressLocal = None
+        self.__compressMaxBytes = None
+        self.__compressMaxSeconds = None
+        self.__adaptiveConcurrency = None
+        self.__applyPlacement = None
+        self.__compressMinSaving = COMPRESSION_MIN_SAVING
+        self.__compressPredictMinSize = COMPRESSION_PREDICTION_MIN_SIZE
+        self.__concurrencyTuner = None
+        self.__contentTasks = {}
+        self.__contentTasksLock = Lock()
+        self.__daemon = None
+        self.__daemonRefreshSeconds = DAEMON_REFRESH_SECONDS
+        self.__downloadConnections = None
         self.__downSpeed = None
+        self.__duplicates = {}
+        self.__encodeProfile = None
+        self.__ffprobeExePath = None
+        self.__findDuplicates = None
+        self.__incremental = None
         self.__upSpeed = None
+        self.__uploadConnections = None
+        self.__localIndex = None
         self.__logLevel = None
-
+        self.__megaApiUrl = None
+        self.__metricsTextfile = None
+        self.__mirror = None
+        self.__mirrorRoot = None
+        self.__parking = None
+        self.__pipeline = None
+        self.__pipelineCompressions = None
+        self.__pipelineDownloads = {}
+        self.__pipelineUploads = {}
+        self.__pipelineLanesLock = Lock()
+        self.__placementRemoteRoot = PLACEMENT_REMOTE_ROOT
+        self.__placementRoots = None
+        self.__planPlacement = None
+        self.__priorityRecentSeconds = None
+        self.__priorityRules = None
+        self.__processStallRetries = None
+        self.__processStallSeconds = None
+        self.__quotaMaxWaitSeconds = QUOTA_MAX_WAIT_SECONDS
+        self.__remoteDirs = set()
+        self.__remoteDirsLock = Lock()
+        self.__shards = None
+        self.__storage = None
+        self.__storageBackend = STORAGE_BACKEND_MEGATOOLS
+        self.__storageRoot = None
+        self.__transferLanes = None
+
+        self.__commandMetricsFilePath = COMMAND_METRICS_FILE
         self.__compressedImagesFilePath = COMPRESSED_IMAGES_FILE
         self.__compressedVideosFilePath = COMPRESSED_VIDEOS_FILE
+        self.__compressionQueueFilePath = COMPRESSION_QUEUE_FILE
         self.__compressionImageExtensions = COMPRESSION_IMAGE_EXTENSIONS
         self.__compressionVideoExtensions = COMPRESSION_VIDEO_EXTENSIONS
+        self.__concurrencyLevelsFilePath = CONCURRENCY_LEVELS_FILE
+        self.__duplicateIndexFilePath = DUPLICATE_INDEX_FILE
+        self.__encodeBenchmarkFilePath = ENCODE_BENCHMARK_FILE
+        self.__localIndexFilePath = LOCAL_INDEX_FILE
         # self.__megaManager_configPath = MEGAMANAGER_CONFIG
         self.__megaManager_logFilePath = MEGAMANAGER_LOGFILEPATH
+        self.__parkedAccountsFilePath = PARKED_ACCOUNTS_FILE
+        self.__placementPlanFilePath = PLACEMENT_PLAN_FILE
+        self.__remoteStateDirPath = REMOTE_STATE_DIR
         self.__removedRemoteFilePath = REMOVED_REMOTE_FILES
+        self.__sessionCacheFilePath = SESSION_CACHE_FILE
+        self.__shardProgressFilePath = SHARD_PROGRESS_FILE
         self.__unableToCompressImagesFilePath = UNABLE_TO_COMPRESS_IMAGES_FILE
         self.__unableToCompressVideosFilePath = UNABLE_TO_COMPRESS_VIDEOS_FILE
+        self.__videoProbesFilePath = VIDEO_PROBES_FILE
 
         self.__syncProfiles = []
+        self.__encodeProfiles = get_default_encode_profiles()
 
         if path.exists(self.__megaManager_logFilePath):
             try:
@@ -96,23 +198,38 @@ class MegaManager(object):
         logger = getLogger('MegaManager._all_profiles_download')
         logger.setLevel(self.__logLevel)
 
-        for profile in self.__syncProfiles:
-            for pathMapping in profile.pathMappings:
-                self.__megaTools.download_all_files_from_account(username=profile.username, password=profile.password,
-                                                                 localRoot=pathMapping['localRoot'],
-                                                                 remoteRoot=pathMapping['remoteRoot'])
+        self._sync_path_mappings_around_parked_accounts(download=True)
+
+        # self.__megaTools.download_all_files_from_account(account['user'], account['pass'], self.__localRoot, self.__remoteRoot)
+
+    def _all_profiles_compression(self):
+        """
+        Queue image and/or video files of all profiles for compression, then compress queued files in order of expected
+        bytes saved.
+        """
+
+        logger = getLogger('MegaManager._all_profiles_compression')
+        logger.setLevel(self.__logLevel)
+
+        self.__duplicates = self._find_duplicate_files()
 
-                # self.__megaTools.download_all_files_from_account(account['user'], account['pass'], self.__localRoot, self.__remoteRoot)
+        if self.__compressImages:
+            self._all_profiles_image_compression()
+        if self.__compressVideos:
+            self._all_profiles_video_compression()
+
+        self.__compressionQueue.save()
+        self._process_compression_queue()
 
     def _all_profiles_image_compression(self):
         """
-        Compress image.
+        Queue image files of all profiles for compression.
         """
 
         logger = getLogger('MegaManager._all_profiles_image_compression')
         logger.setLevel(self.__logLevel)
 
-        logger.debug(' Compressing local image files')
+        logger.debug(' Finding local image files to compress')
 
         for profile in self.__syncProfiles:
             for pathMapping in profile.pathMappings:
@@ -127,26 +244,99 @@ class MegaManager(object):
         logger = getLogger('MegaManager._all_profiles_upload')
         logger.setLevel(self.__logLevel)
 
-        for profile in self.__syncProfiles:
-            for pathMapping in profile.pathMappings:
-                self.__megaTools.upload_to_account(username=profile.username, password=profile.password,
-                                                   localRoot=pathMapping['localRoot'],
-                                                   remoteRoot=pathMapping['remoteRoot'])
+        self._sync_path_mappings_around_parked_accounts(download=False)
 
     def _all_profiles_video_compression(self):
         """
-        Compress video.
+        Queue video files of all profiles for compression.
         """
 
         logger = getLogger('MegaManager._all_profiles_video_compression')
         logger.setLevel(self.__logLevel)
 
-        logger.debug(' Compressing local video files')
+        logger.debug(' Finding local video files to compress')
 
         for profile in self.__syncProfiles:
             for pathMapping in profile.pathMappings:
                 self._find_video_files_to_compress(username=profile.account.username, password=profile.account.password,
-                                                   localRoot=pathMapping.localPath, remoteRoot=pathMapping.remotePath)
+                                                   localRoot=pathMapping.localPath, remoteRoot=pathMapping.remotePath,
+                                                   encodeProfile=self._get_encode_profile(pathMapping=pathMapping))
+
+    def _apply_placement(self):
+        """
+        Apply placement plan written by self._plan_placement(), adding a path mapping of each placed directory to the
+        config file profile of its account. The config file before is kept as "<config file>.old". Directories mapped
+        already are skipped, so a plan can be applied again.
+
+        Returns:
+            Boolean: whether config file was updated or not.
+        """
+
+        logger = getLogger('MegaManager._apply_placement')
+        logger.setLevel(self.__logLevel)
+
+        plan = PlacementPlanner_Lib(planFilePath=self.__placementPlanFilePath, logLevel=self.__logLevel).load_plan()
+        if not plan:
+            return False
+
+        mappedPaths = set(sub('\\\\', '/', pathMapping.localPath).rstrip('/')
+                          for profile in self.__syncProfiles for pathMapping in profile.pathMappings)
+        with open(self.__configPath, 'r') as configFile:
+            lines = configFile.readlines()
+
+        # Profile sections with their username, count of path mappings and last line, new path mappings going after it.
+        sections = []
+        section = None
+        for index, line in enumerate(lines):
+            if line.startswith('[Profile'):
+                section = {'username': None, 'count': 0, 'lastLine': index}
+                sections.append(section)
+            elif line.startswith('['):
+                section = None
+            elif section is not None and line.strip():
+                section['lastLine'] = index
+                if line.startswith('Username='):
+                    section['username'] = split('=', line)[1].strip()
+                elif line.startswith('LocalPath'):
+                    section['count'] += 1
+
+        newLines = {}
+        for assignment in plan['assignments']:
+            if assignment['localPath'] in mappedPaths:
+                logger.debug(' "%s" is mapped already.' % assignment['localPath'])
+                continue
+            profileSections = [item for item in sections if item['username'] == assignment['username']]
+            if not profileSections:
+                logger.warning(' No profile of account "%s" to map "%s" in!' % (assignment['username'],
+                                                                                  assignment['localPath']))
+                continue
+            section = profileSections[0]
+            section['count'] += 1
+            newLines.setdefault(section['lastLine'], []).extend([
+                'LocalPath%d=%s\n' % (section['count'], assignment['localPath']),
+                'RemotePath%d=%s\n' % (section['count'], assignment['remotePath'])])
+            mappedPaths.add(assignment['localPath'])
+            logger.info(' Mapped "%s" to "%s" of account "%s".' % (assignment['localPath'], assignment['remotePath'],
+                                                                   assignment['username']))
+        if not newLines:
+            logger.info(' No new path mappings to apply.')
+            return False
+
+        tempFilePath = self.__configPath + '.tmp'
+        try:
+            with open(tempFilePath, 'w') as configFile:
+                for index, line in enumerate(lines):
+                    configFile.write(line if line.endswith('\n') else line + '\n')
+                    configFile.writelines(newLines.get(index, []))
+            copyfile(self.__configPath, self.__configPath + '.old')
+            remove(self.__configPath)
+            rename(tempFilePath, self.__configPath)
+        except (IOError, OSError) as e:
+            logger.warning(' Exception: %s' % str(e))
+            return False
+
+        logger.info(' Applied placement plan to "%s".' % self.__configPath)
+        return True
 
     def _assign_attributes(self, **kwargs):
         """
@@ -159,6 +349,203 @@ class MegaManager(object):
         for key, value in kwargs.items():
             setattr(self, '_MegaManager__%s' % key, value)
 
+    def _benchmark_encode_profiles(self, samplePath):
+        """
+        Encode sample video file with every encode profile and report encode speed, output size and quality of each.
+        Report is logged and written to self.__encodeBenchmarkFilePath.
+
+        Args:
+            samplePath (str): File path of sample video to encode.
+
+        Returns:
+            List: benchmark result dictionaries, one per encode profile.
+        """
+
+        logger = getLogger('MegaManager._benchmark_encode_profiles')
+        logger.setLevel(self.__logLevel)
+
+        logger.info(' Benchmarking encode profiles on sample "%s".' % samplePath)
+
+        benchmarks = []
+        for name in sorted(self.__encodeProfiles):
+            encodeProfile = self.__encodeProfiles[name]
+            targetPath = samplePath.rsplit(".", 1)[0] + '_BENCHMARK_%s.%s' % (name, encodeProfile.container)
+            benchmark = self.__ffmpeg.benchmark_encode_profile(samplePath=samplePath, targetPath=targetPath,
+                                                                encodeProfile=encodeProfile)
+            if benchmark:
+                benchmarks.append(benchmark)
+
+        lines = ['Sample: %s (%s)' % (samplePath, self.__lib.get_mb_size_from_bytes(path.getsize(samplePath))),
+                 '%-12s %10s %10s %12s %8s %8s' % ('Profile', 'Seconds', 'FPS', 'Size', 'SSIM', 'PSNR')]
+        for benchmark in benchmarks:
+            lines.append('%-12s %10.1f %10.1f %12s %8s %8s' % (
+                benchmark['profile'], benchmark['encodeSeconds'], benchmark['fps'],
+                self.__lib.get_mb_size_from_bytes(benchmark['size']),
+                '%.4f' % benchmark['ssim'] if benchmark['ssim'] is not None else '-',
+                '%.2f' % benchmark['psnr'] if benchmark['psnr'] is not None else '-'))
+
+        for line in lines:
+            logger.info(' %s' % line)
+
+        try:
+            with open(self.__encodeBenchmarkFilePath, 'w') as outs:
+                outs.write('\n'.join(lines) + '\n')
+        except Exception as e:
+            logger.warning(' Exception: %s' % str(e))
+
+        return benchmarks
+
+    def _compress_image_file(self, filePath):
+        """
+        Compress image file and record the outcome in self.__compressedImageFiles or self.__unableToCompressImageFiles.
+
+        Args:
+            filePath (str): File path of image to compress.
+
+        Returns:
+            Boolean: whether image file was compressed or not.
+        """
+
+        logger = getLogger('MegaManager._compress_image_file')
+        logger.setLevel(self.__logLevel)
+
+        result = self.__compressImages_lib.compress_image_file(filePath=filePath)
+        if result:
+            compressPath_backup = filePath + '.compressimages-backup'
+            if path.exists(compressPath_backup):
+                logger.debug(' File compressed successfully "%s"!' % filePath)
+                try:
+                    remove(compressPath_backup)
+                except OSError as e:
+                    logger.warning(' Exception: %s' % str(e))
+                    pass
+
+                self.__compressedImageFiles.add(filePath)
+                self.__lib.dump_set_into_file(itemSet=self.__compressedImageFiles,
+                                              filePath=self.__compressedImagesFilePath, )
+                return True
+
+            else:
+                logger.debug(
+                    ' File cannot be compressed any further "%s"!' % filePath)
+                self.__unableToCompressImageFiles.add(filePath)
+                self.__lib.dump_set_into_file(
+                    itemSet=self.__unableToCompressImageFiles,
+                    filePath=self.__unableToCompressImagesFilePath, )
+
+        else:
+            logger.debug(
+                ' Error, image file could not be compressed "%s"!' % filePath)
+            self.__unableToCompressImageFiles.add(filePath)
+            self.__lib.dump_set_into_file(itemSet=self.__unableToCompressImageFiles,
+                                          filePath=self.__unableToCompressImagesFilePath)
+        return False
+
+    def _compress_video_file(self, filePath, encodeProfile):
+        """
+        Compress video file, replacing it with the compressed file, and record the outcome in
+        self.__compressedVideoFiles or self.__unableToCompressVideoFiles.
+
+        Args:
+            filePath (str): File path of video to compress.
+            encodeProfile (EncodeProfile): Encode settings to compress video file with.
+
+        Returns:
+            String: File path of compressed video file. None if video file was not compressed.
+        """
+
+        logger = getLogger('MegaManager._compress_video_file')
+        logger.setLevel(self.__logLevel)
+
+        tempFilePath = filePath.rsplit(".", 1)[0] + '_NEW.%s' % encodeProfile.container
+
+        if path.exists(tempFilePath):
+            for retry in range(100):
+                try:
+                    remove(tempFilePath)
+                    break
+                except:
+                    logger.debug(" Remove failed, retrying...")
+        # Copied audio must fit the output container, which is checked against the probed audio codec.
+        probe = self._get_video_file_probe(filePath=filePath) if encodeProfile.audioCopy else None
+        result = self.__ffmpeg.compress_video_file(filePath, targetPath=tempFilePath, encodeProfile=encodeProfile,
+                                                   probe=probe)
+
+        if result == True and path.exists(tempFilePath):
+            for retry in range(100):
+                try:
+                    remove(filePath)
+                    break
+                except:
+                    logger.debug(" Remove failed, retrying...")
+
+            for retry in range(100):
+                newFilePath = sub('_NEW', '', tempFilePath)
+                try:
+                    rename(tempFilePath, newFilePath)
+                    break
+                except:
+                    logger.debug(" Rename failed, retrying...")
+
+            logger.debug(' Video file compressed successfully "%s" into "%s"!' % (
+            filePath, newFilePath))
+            self.__compressedVideoFiles.add(newFilePath)
+            self.__lib.dump_set_into_file(itemSet=self.__compressedVideoFiles,
+                                          filePath=self.__compressedVideosFilePath, )
+            return newFilePath
+
+        elif path.exists(tempFilePath):
+            remove(tempFilePath)
+
+        else:
+            logger.debug(
+                ' Error, video file could not be compressed "%s"!' % filePath)
+            self.__unableToCompressVideoFiles.add(filePath)
+            self.__lib.dump_set_into_file(itemSet=self.__unableToCompressVideoFiles,
+                                          filePath=self.__unableToCompressVideosFilePath, )
+        return None
+
+    def _copy_compressed_file(self, filePath, fileType, compressed_filePath):
+        """
+        Give file the compressed content of a file holding the same content, instead of compressing it again, and record
+        it as compressed.
+
+        Args:
+            filePath (str): File path of duplicate to give compressed content.
+            fileType (str): "image" or "video".
+            compressed_filePath (str): File path of compressed file of the same content.
+
+        Returns:
+            String: File path of compressed duplicate, with extension of compressed file. None if it could not be
+                copied.
+        """
+
+        logger = getLogger('MegaManager._copy_compressed_file')
+        logger.setLevel(self.__logLevel)
+
+        newFilePath = path.splitext(filePath)[0] + path.splitext(compressed_filePath)[1]
+        tempFilePath = newFilePath + '.duplicate'
+        try:
+            copyfile(compressed_filePath, tempFilePath)
+            remove(filePath)
+            if path.exists(newFilePath):
+                remove(newFilePath)
+            rename(tempFilePath, newFilePath)
+        except (IOError, OSError) as e:
+            logger.warning(' Exception: %s' % str(e))
+            if path.exists(tempFilePath):
+                remove(tempFilePath)
+            return None
+
+        logger.debug(' Gave duplicate "%s" compressed content of "%s".' % (newFilePath, compressed_filePath))
+        if fileType == 'image':
+            self.__compressedImageFiles.add(newFilePath)
+            self.__lib.dump_set_into_file(itemSet=self.__compressedImageFiles, filePath=self.__compressedImagesFilePath)
+        else:
+            self.__compressedVideoFiles.add(newFilePath)
+            self.__lib.dump_set_into_file(itemSet=self.__compressedVideoFiles, filePath=self.__compressedVideosFilePath)
+        return newFilePath
+
     def _create_profiles_data_file(self):
         """
         Create self.__megaAccountsOutputPath file. File that has all fetched data of accounts and local and remote spaces of each account.
@@ -172,22 +559,468 @@ class MegaManager(object):
 
         try:
             self.__accounts_details_dict = {}
+            tasks = []
             with open(self.__megaAccountsOutputPath, "w") as outs:
                 for profile in self.__syncProfiles:
-                    logger.debug(' Creating thread to gather details for profile "%s".' % profile.profileName)
+                    logger.debug(' Creating task to gather details for profile "%s".' % profile.profileName)
 
-                    t_megaFile = Thread(target=self._get_profile_details, args=(profile, ),
-                                        name='thread_megaFile_%s' % profile.profileName)
-                    t_megaFile.start()
-                    self.__threads.append(t_megaFile)
+                    tasks.append(self.__scheduler.submit(target=self._get_profile_details, args=(profile, ),
+                                                         name='thread_megaFile_%s' % profile.profileName))
 
             outs.close()
 
+            self.__scheduler.wait(tasks=tasks)
+            self._export_accounts_details_dict()
+            logger.info(' "%s" file creation complete!' % self.__megaAccountsOutputPath)
+
         except (Exception, KeyboardInterrupt)as e:
             logger.debug(' Exception: %s' % e)
             if path.exists(self.__megaAccountsOutputPath + '.old'):
                 copyfile(self.__megaAccountsOutputPath + '.old', self.__megaAccountsOutputPath)
 
+    def _create_incremental_upload_tasks(self, profile, pathMapping):
+        """
+        Plan upload of path mapping from the local index alone, without listing remote files, and wait for it to
+        finish. Only local files new or modified since they were last synced are compressed and uploaded, so
+        directories holding none cost no more than reading their local file details. Remote directories missing for
+        new files are created at once up front. Directories holding a synced file are known to exist remotely.
+
+        With remote removal on, local files removed since they were last synced are moved remotely if a new local file
+        has the same size and fingerprint, else removed remotely. Otherwise remote files are never moved or removed.
+        Files modified remotely are not noticed, so path mappings never synced before, whose remote files are not known
+        yet, are planned in full.
+
+        Args:
+            profile (SyncProfile): Profile path mapping belongs to.
+            pathMapping (PathMapping): Path mapping to upload.
+
+        Returns:
+            Boolean: whether all tasks succeeded or not.
+        """
+
+        logger = getLogger('MegaManager._create_incremental_upload_tasks')
+        logger.setLevel(self.__logLevel)
+
+        username = profile.account.username
+        password = profile.account.password
+        localRoot = sub('\\\\', '/', pathMapping.localPath)
+        remoteRoot = pathMapping.remotePath
+        uploadLanes = self._get_transfer_lanes(username=username, download=False)
+        encodeProfile = self._get_encode_profile(pathMapping=pathMapping)
+
+        syncedEntries = self.__localIndex.get_synced_entries(dirPath=localRoot)
+        if not syncedEntries:
+            logger.info(' "%s" was never synced, planning it in full.' % localRoot)
+            return self._create_pipeline_tasks(profile=profile, pathMapping=pathMapping)
+
+        logger.debug(' Planning incremental upload of "%s" to "%s".' % (localRoot, remoteRoot))
+
+        local_filePaths = set(sub('\\\\', '/', local_filePath)
+                              for local_filePath in self.__lib.get_local_file_paths_recursively(localRoot=localRoot))
+        localEntries = self.__localIndex.get_entries(filePaths=sorted(local_filePaths))
+        changed_filePaths = sorted(local_filePath for local_filePath, localEntry in localEntries.items()
+                                   if localEntry['fingerprint'] != localEntry['synced'])
+        removed_filePaths = sorted(set(syncedEntries) - local_filePaths)
+
+        # Synced files missing locally, by size and fingerprint, to find local files moved since they were synced.
+        # Moving a remote file removes it from its old path, so it is only done when remote removal is on.
+        orphan_filePaths = {}
+        for local_filePath in removed_filePaths if self.__removeRemote else []:
+            syncedEntry = syncedEntries[local_filePath]
+            orphan_filePaths.setdefault((syncedEntry['size'], syncedEntry['synced']), []).append(local_filePath)
+        movedFrom = {}
+        for local_filePath in changed_filePaths:
+            localEntry = localEntries[local_filePath]
+            moved_filePaths = orphan_filePaths.get((localEntry['size'], localEntry['fingerprint'])) \
+                if not localEntry['synced'] else None
+            if moved_filePaths:
+                movedFrom[local_filePath] = moved_filePaths.pop(0)
+
+        with self.__remoteDirsLock:
+            self.__remoteDirs.add((username, remoteRoot))
+            for local_filePath in syncedEntries:
+                self.__remoteDirs.add((username, remoteRoot + local_filePath[len(localRoot):].rsplit('/', 1)[0]))
+        if self.__upload:
+            self._create_remote_dirs(username=username, password=password, remoteRoot=remoteRoot,
+                                     remote_filePaths=[remoteRoot + local_filePath[len(localRoot):]
+                                                       for local_filePath in changed_filePaths])
+
+        tasks = []
+        for local_filePath in changed_filePaths:
+            subPath = local_filePath[len(localRoot):]
+
+            if local_filePath in movedFrom:
+                if self.__upload:
+                    old_remoteFilePath = remoteRoot + movedFrom[local_filePath][len(localRoot):]
+                    tasks.append(uploadLanes.submit(target=self._pipeline_move_remote_file,
+                                                    args=(username, password, local_filePath, localRoot,
+                                                          remoteRoot, old_remoteFilePath),
+                                                    name='pipeline_move_%s' % subPath))
+                continue
+
+            # Synced files exist remotely, so they are replaced.
+            existsRemotely = localEntries[local_filePath]['synced'] is not None
+
+            compressTask = None
+            fileType = self._get_compression_file_type(filePath=local_filePath)
+            if fileType:
+                compressTask = self.__pipelineCompressions.submit(target=self._pipeline_compress_file,
+                                                                  args=(local_filePath, fileType, encodeProfile),
+                                                                  name='pipeline_compress_%s' % subPath)
+                tasks.append(compressTask)
+
+            if self.__upload:
+                tasks.append(uploadLanes.submit(target=self._pipeline_upload_file,
+                                                args=(username, password, local_filePath, localRoot,
+                                                      remoteRoot, existsRemotely, compressTask,
+                                                      existsRemotely),
+                                                name='pipeline_upload_%s' % subPath,
+                                                dependsOn=[compressTask],
+                                                size=localEntries[local_filePath]['size'],
+                                                filePath=local_filePath,
+                                                modified=localEntries[local_filePath]['modified']))
+
+        moved_filePaths = set(movedFrom.values())
+        if self.__removeRemote:
+            remote_filePaths = [remoteRoot + local_filePath[len(localRoot):] for local_filePath in removed_filePaths
+                                if local_filePath not in moved_filePaths]
+            if remote_filePaths:
+                tasks.append(uploadLanes.submit(target=self._pipeline_prune_remote_files,
+                                                args=(username, password, localRoot, remoteRoot,
+                                                      remote_filePaths),
+                                                name='pipeline_prune_%s' % remoteRoot,
+                                                dependsOn=list(tasks)))
+
+        logger.info(' Incremental upload of "%s" has %d tasks, for %d of %d local files.' % (
+            localRoot, len(tasks), len(changed_filePaths), len(localEntries)))
+
+        failedTasks, skippedTasks = self._get_failed_tasks(tasks=tasks)
+        self.__localIndex.save()
+
+        if skippedTasks:
+            logger.warning(' Incremental upload of "%s" skipped %d tasks, account "%s" is parked.' % (
+                localRoot, len(skippedTasks), username))
+        if failedTasks:
+            logger.warning(' Incremental upload of "%s" finished with %d failed tasks.' % (localRoot, len(failedTasks)))
+            return False
+
+        logger.info(' Incremental upload of "%s" finished.' % localRoot)
+        return True
+
+    def _create_local_change_tasks(self, profile, pathMapping, local_filePath, change):
+        """
+        Plan sync of one local file that changed or was removed, as found by daemon mode. Changed files are compressed
+        and uploaded, unless they are the same as when last synced or were modified remotely too. Removed files or
+        directories are removed remotely, if remote removal is on.
+
+        Args:
+            profile (SyncProfile): Profile path mapping belongs to.
+            pathMapping (PathMapping): Path mapping local file is under.
+            local_filePath (str): Local file or directory path.
+            change (str): CHANGE_CHANGED or CHANGE_REMOVED.
+
+        Returns:
+            List: of tasks planned.
+        """
+
+        logger = getLogger('MegaManager._create_local_change_tasks')
+        logger.setLevel(self.__logLevel)
+
+        username = profile.account.username
+        password = profile.account.password
+        localRoot = sub('\\\\', '/', pathMapping.localPath)
+        remoteRoot = pathMapping.remotePath
+        uploadLanes = self._get_transfer_lanes(username=username, download=False)
+        subPath = local_filePath[len(localRoot):]
+        remote_filePath = remoteRoot + subPath
+
+        if change == CHANGE_REMOVED:
+            if not self.__removeRemote or self.__download or path.exists(local_filePath):
+                return []
+            return [uploadLanes.submit(target=self._pipeline_prune_remote_files,
+                                       args=(username, password, localRoot, remoteRoot, [remote_filePath]),
+                                       name='daemon_prune_%s' % subPath)]
+
+        fileType = self._get_compression_file_type(filePath=local_filePath)
+        if not self.__upload and not fileType:
+            return []
+
+        localEntry = self.__localIndex.get_entries(filePaths=[local_filePath]).get(local_filePath)
+        # Files downloaded or uploaded by the daemon itself are the same as when last synced.
+        if not localEntry or localEntry['fingerprint'] == localEntry['synced']:
+            return []
+
+        remoteFile = self.__storage.stat_file(username=username, password=password, remoteFilePath=remote_filePath)
+        existsRemotely = remoteFile is not None
+        if existsRemotely:
+            fileChange = self._get_file_change(localFingerprint=localEntry['fingerprint'],
+                                               syncedFingerprint=localEntry['synced'],
+                                               remoteFingerprint=remoteFile.get('fingerprint'))
+            if not fileChange:
+                self.__localIndex.set_synced_fingerprint(filePath=local_filePath,
+                                                         fingerprint=localEntry['fingerprint'])
+                return []
+            elif fileChange == 'remote':
+                logger.info(' "%s" was modified remotely since last sync, local file is kept.' % subPath)
+                return []
+            elif fileChange == 'both':
+                logger.warning(' "%s" differs locally and remotely since last sync, both are kept.' % subPath)
+                return []
+
+        logger.debug(' Local file "%s" changed, syncing it.' % local_filePath)
+
+        tasks = []
+        compressTask = None
+        if fileType:
+            compressTask = self.__pipelineCompressions.submit(target=self._pipeline_compress_file,
+                                                              args=(local_filePath, fileType,
+                                                                    self._get_encode_profile(pathMapping=pathMapping)),
+                                                              name='daemon_compress_%s' % subPath)
+            tasks.append(compressTask)
+
+        if self.__upload:
+            tasks.append(uploadLanes.submit(target=self._pipeline_upload_file,
+                                            args=(username, password, local_filePath, localRoot,
+                                                  remoteRoot, existsRemotely, compressTask, existsRemotely),
+                                            name='daemon_upload_%s' % subPath, dependsOn=[compressTask],
+                                            size=localEntry['size'], filePath=local_filePath,
+                                            modified=localEntry['modified']))
+        return tasks
+
+    def _create_pipeline_tasks(self, profile, pathMapping):
+        """
+        Plan path mapping sync as a per-file pipeline and wait for it to finish. Each file is downloaded, then
+        compressed, then uploaded, each stage only starting once the file's previous stage is done. Stages have their
+        own workers, so different files are in different stages at once. Remote files without a local file are pruned
+        once every other task of the path mapping is done.
+
+        Files on both sides are compared by sparse fingerprint, kept in the local index, so only files modified locally
+        since they were last synced are uploaded again. With remote removal on, new local files with the same size and
+        fingerprint as a synced file since removed locally were moved or renamed, so its remote file is moved rather
+        than uploaded again. Otherwise remote files are never moved.
+
+        Local files holding the same content as files of this or other path mappings are compressed once, the others
+        getting a copy of the compressed file, and uploaded once per account, the others being copied remotely.
+
+        Args:
+            profile (SyncProfile): Profile path mapping belongs to.
+            pathMapping (PathMapping): Path mapping to sync.
+
+        Returns:
+            Boolean: whether all pipeline tasks succeeded or not.
+        """
+
+        logger = getLogger('MegaManager._create_pipeline_tasks')
+        logger.setLevel(self.__logLevel)
+
+        username = profile.account.username
+        password = profile.account.password
+        localRoot = sub('\\\\', '/', pathMapping.localPath)
+        remoteRoot = pathMapping.remotePath
+        downloadLanes = self._get_transfer_lanes(username=username, download=True)
+        uploadLanes = self._get_transfer_lanes(username=username, download=False)
+        encodeProfile = self._get_encode_profile(pathMapping=pathMapping)
+
+        logger.debug(' Planning pipeline for "%s" to "%s".' % (localRoot, remoteRoot))
+
+        remote_subPaths = set()
+        remoteFileData = {}
+        remoteFiles = self._get_remote_root_files(username=username, password=password, remoteRoot=remoteRoot)
+        # Taking remote files as missing would upload every file again.
+        if remoteFiles is None:
+            logger.warning(' Pipeline for "%s" NOT planned, remote files could not be listed.' % localRoot)
+            return False
+        for remoteFile in remoteFiles:
+            remote_filePath = remoteFile['path']
+            if not remote_filePath.startswith(remoteRoot):
+                continue
+            if remoteFile['type'] == FILE_TYPE_FILE:
+                remote_subPaths.add(remote_filePath[len(remoteRoot):])
+                remoteFileData[remote_filePath[len(remoteRoot):]] = remoteFile
+            elif remoteFile['type'] == FILE_TYPE_DIR:
+                with self.__remoteDirsLock:
+                    self.__remoteDirs.add((username, remote_filePath))
+
+        local_subPaths = set()
+        for local_filePath in self.__lib.get_local_file_paths_recursively(localRoot=localRoot):
+            local_subPaths.add(sub('\\\\', '/', local_filePath)[len(localRoot):])
+
+        localEntries = self.__localIndex.get_entries(filePaths=[localRoot + subPath for subPath in local_subPaths])
+
+        # Synced files since removed locally, by size and fingerprint, to find local files moved since they were synced.
+        # Moving a remote file removes it from its old path, so it is only done when remote removal is on. Remote files
+        # never synced, or modified remotely since, may be wanted where they are.
+        movedFrom = {}
+        orphan_subPaths = {}
+        if self.__upload and self.__removeRemote and not self.__download:
+            for subPath in sorted(remote_subPaths - local_subPaths):
+                syncedFingerprint = self.__localIndex.get_synced_fingerprint(filePath=localRoot + subPath)
+                if syncedFingerprint and remoteFileData[subPath].get('fingerprint') in [None, syncedFingerprint]:
+                    orphan_subPaths.setdefault((remoteFileData[subPath]['size'], syncedFingerprint),
+                                               []).append(subPath)
+            for subPath in sorted(local_subPaths - remote_subPaths):
+                localEntry = localEntries.get(localRoot + subPath)
+                moved_subPaths = orphan_subPaths.get((localEntry['size'], localEntry['fingerprint'])) \
+                    if localEntry else None
+                if moved_subPaths:
+                    movedFrom[subPath] = moved_subPaths.pop(0)
+        moved_subPaths = set(movedFrom.values())
+
+        if self.__upload:
+            self._create_remote_dirs(username=username, password=password, remoteRoot=remoteRoot,
+                                     remote_filePaths=[remoteRoot + subPath
+                                                       for subPath in sorted(local_subPaths - remote_subPaths)])
+
+        tasks = []
+        for subPath in sorted(remote_subPaths | local_subPaths):
+            local_filePath = localRoot + subPath
+            remote_filePath = remoteRoot + subPath
+            existsRemotely = subPath in remote_subPaths
+
+            if subPath in movedFrom:
+                tasks.append(uploadLanes.submit(target=self._pipeline_move_remote_file,
+                                                args=(username, password, local_filePath, localRoot,
+                                                      remoteRoot, remoteRoot + movedFrom[subPath]),
+                                                name='pipeline_move_%s' % subPath))
+                continue
+
+            modified = False
+            if existsRemotely and local_filePath in localEntries:
+                localFingerprint = localEntries[local_filePath]['fingerprint']
+                syncedFingerprint = localEntries[local_filePath]['synced']
+                change = self._get_file_change(localFingerprint=localFingerprint, syncedFingerprint=syncedFingerprint,
+                                               remoteFingerprint=remoteFileData[subPath].get('fingerprint'))
+                if not change and syncedFingerprint != localFingerprint:
+                    self.__localIndex.set_synced_fingerprint(filePath=local_filePath, fingerprint=localFingerprint)
+                elif change == 'remote':
+                    logger.info(' "%s" was modified remotely since last sync, local file is kept.' % subPath)
+                elif change == 'both':
+                    logger.warning(' "%s" differs locally and remotely since last sync, both are kept.' % subPath)
+                modified = change == 'local'
+
+            downloadTask = None
+            if subPath not in local_subPaths:
+                if not self.__download or subPath in moved_subPaths:
+                    continue
+                downloadTask = downloadLanes.submit(target=self._pipeline_download_file,
+                                                    args=(username, password, local_filePath,
+                                                          remote_filePath),
+                                                    name='pipeline_download_%s' % subPath,
+                                                    size=remoteFileData[subPath]['size'],
+                                                    filePath=local_filePath,
+                                                    modified=remoteFileData[subPath]['modified'])
+                tasks.append(downloadTask)
+
+            compressTask = None
+            fileType = self._get_compression_file_type(filePath=local_filePath)
+            # Duplicates share tasks only if they are compressed the same way.
+            contentKey = None
+            if local_filePath in self.__duplicates:
+                contentKey = (self.__duplicates[local_filePath], fileType,
+                              encodeProfile.name if fileType == 'video' else None)
+
+            if fileType:
+                with self.__contentTasksLock:
+                    sourceTask = self.__contentTasks.get(contentKey + ('compress', )) if contentKey else None
+                    if sourceTask:
+                        compressTask = self.__pipelineCompressions.submit(
+                            target=self._pipeline_compress_duplicate_file, args=(local_filePath, fileType, sourceTask),
+                            name='pipeline_compress_%s' % subPath, dependsOn=[downloadTask, sourceTask])
+                    else:
+                        compressTask = self.__pipelineCompressions.submit(target=self._pipeline_compress_file,
+                                                                          args=(local_filePath, fileType,
+                                                                                encodeProfile),
+                                                                          name='pipeline_compress_%s' % subPath,
+                                                                          dependsOn=[downloadTask])
+                        if contentKey:
+                            self.__contentTasks[contentKey + ('compress', )] = compressTask
+                tasks.append(compressTask)
+
+            if self.__upload and (compressTask or modified or not existsRemotely):
+                # Files not downloaded yet are only known from remote file data.
+                fileData = localEntries.get(local_filePath) or remoteFileData[subPath]
+                with self.__contentTasksLock:
+                    sourceTask = self.__contentTasks.get(contentKey + (username, )) if contentKey else None
+                    uploadTask = uploadLanes.submit(target=self._pipeline_upload_file,
+                                                    args=(username, password, local_filePath, localRoot,
+                                                          remoteRoot, existsRemotely, compressTask, modified,
+                                                          sourceTask),
+                                                    name='pipeline_upload_%s' % subPath,
+                                                    dependsOn=[downloadTask, compressTask, sourceTask],
+                                                    size=fileData['size'], filePath=local_filePath,
+                                                    modified=fileData['modified'])
+                    if contentKey and not sourceTask:
+                        self.__contentTasks[contentKey + (username, )] = uploadTask
+                tasks.append(uploadTask)
+
+        if self.__removeRemote and not self.__download:
+            remote_filePaths = [remoteRoot + subPath
+                                for subPath in sorted(remote_subPaths - local_subPaths - moved_subPaths)]
+            pruneTask = uploadLanes.submit(target=self._pipeline_prune_remote_files,
+                                           args=(username, password, localRoot, remoteRoot,
+                                                 remote_filePaths),
+                                           name='pipeline_prune_%s' % remoteRoot, dependsOn=list(tasks))
+            tasks.append(pruneTask)
+
+        logger.info(' Pipeline for "%s" has %d tasks.' % (localRoot, len(tasks)))
+
+        # Stage tasks run on the stage schedulers, so wait on each task rather than on the main scheduler.
+        failedTasks, skippedTasks = self._get_failed_tasks(tasks=tasks)
+        self.__localIndex.save()
+
+        if skippedTasks:
+            logger.warning(' Pipeline for "%s" skipped %d tasks, account "%s" is parked.' % (
+                localRoot, len(skippedTasks), username))
+        if failedTasks:
+            logger.warning(' Pipeline for "%s" finished with %d failed tasks.' % (localRoot, len(failedTasks)))
+            return False
+
+        logger.info(' Pipeline for "%s" finished.' % localRoot)
+        return True
+
+    def _create_remote_dirs(self, username, password, remoteRoot, remote_filePaths):
+        """
+        Create remote directories missing for files about to be uploaded under remote root, all at once up front rather
+        than by each upload. Directories not known to exist are taken as missing, up to remote root and its parents,
+        as remote root may not have been created yet either. Only directories the storage backend reports as created
+        or existing are known to exist afterwards, so uploads into the others create them again.
+
+        Args:
+            username (str): username of account to create directories in
+            password (str): password of account to create directories in
+            remoteRoot (str): Remote root path of path mapping.
+            remote_filePaths (list): Remote file paths about to be uploaded.
+
+        Returns:
+            Integer: number of missing remote directories that exist now.
+        """
+
+        logger = getLogger('MegaManager._create_remote_dirs')
+        logger.setLevel(self.__logLevel)
+
+        with self.__remoteDirsLock:
+            missing_dirPaths = set()
+            for remote_filePath in remote_filePaths:
+                dirPath = remote_filePath.rsplit('/', 1)[0]
+                while dirPath.count('/') > 1 and (username, dirPath) not in self.__remoteDirs:
+                    missing_dirPaths.add(dirPath)
+                    dirPath = dirPath.rsplit('/', 1)[0]
+            if not missing_dirPaths:
+                return 0
+
+            # Lock is held while creating, so uploads don't take directories for created before they are.
+            existing_dirPaths = set(self.__storage.make_dirs(username=username, password=password,
+                                                             remoteDirPaths=sorted(missing_dirPaths)))
+            self.__remoteDirs.update((username, dirPath) for dirPath in existing_dirPaths)
+
+        createdCount = len(missing_dirPaths & existing_dirPaths)
+        if createdCount < len(missing_dirPaths):
+            logger.warning(' Could only create %d of %d missing remote directories under "%s".' % (
+                createdCount, len(missing_dirPaths), remoteRoot))
+        else:
+            logger.debug(' Created %d missing remote directories under "%s".' % (createdCount, remoteRoot))
+        return createdCount
+
     def _create_thread_create_profiles_data_file(self):
         """
         Create thread to create profiles data file.
@@ -198,9 +1031,55 @@ class MegaManager(object):
 
         logger.debug(' Creating thread to create "%s" file.' % self.__megaAccountsOutputPath)
 
-        t = Thread(target=self._create_profiles_data_file, name='thread_create_profiles_data_file')
-        self.__threads.append(t)
-        t.start()
+        self.__scheduler.submit(target=self._create_profiles_data_file, name='thread_create_profiles_data_file')
+
+    def _create_thread_pipeline(self):
+        """
+        Create threads to sync every path mapping as a per-file download, compress, upload and prune pipeline. Pipeline
+        state is set up on first call only, so daemon mode keeps indexes and sessions between syncs.
+
+        Returns:
+            List: of tasks, one per path mapping.
+        """
+
+        logger = getLogger('MegaManager._create_thread_pipeline')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Creating threads to run sync pipelines.')
+
+        if not self.__localIndex:
+            self._load_compression_state()
+
+            self.__localIndex = LocalIndex_Lib(filePath=self.__localIndexFilePath, logLevel=self.__logLevel)
+            self.__pipelineCompressions = TaskScheduler_Lib(maxWorkers=PIPELINE_COMPRESS_WORKERS,
+                                                            logLevel=self.__logLevel)
+            if self.__adaptiveConcurrency:
+                self.__concurrencyTuner = ConcurrencyTuner_Lib(filePath=self.__concurrencyLevelsFilePath,
+                                                               logLevel=self.__logLevel)
+
+            # Log in to every account at once, so slow password key derivation runs in parallel rather than per worker.
+            self.__storage.open_sessions(accounts=[(profile.account.username, profile.account.password)
+                                                   for profile in self.__syncProfiles])
+
+        if self.__upload or self.__compressImages or self.__compressVideos:
+            with self.__contentTasksLock:
+                self.__contentTasks = {}
+            self.__duplicates = self._find_duplicate_files()
+
+        # Downloads need remote files listed, so incremental uploads only plan from the local index without them.
+        if self.__incremental and not self.__download:
+            createTasks = self._create_incremental_upload_tasks
+        else:
+            createTasks = self._create_pipeline_tasks
+
+        tasks = []
+        for profile in self.__syncProfiles:
+            for pathMapping in profile.pathMappings:
+                tasks.append(self.__scheduler.submit(target=self._sync_path_mapping_around_parked_account,
+                                                     args=(profile, pathMapping, createTasks),
+                                                     name='thread_pipeline_%s_%s' % (profile.profileName,
+                                                                                     pathMapping.remotePath)))
+        return tasks
 
     def _create_thread_download(self):
         """
@@ -212,9 +1091,7 @@ class MegaManager(object):
 
         logger.debug(' Creating thread to download files from MEGA accounts.')
 
-        t = Thread(target=self._all_profiles_download, args=(), name='thread_download')
-        self.__threads.append(t)
-        t.start()
+        self.__scheduler.submit(target=self._all_profiles_download, args=(), name='thread_download')
 
     def _create_thread_upload(self):
         """
@@ -226,9 +1103,7 @@ class MegaManager(object):
 
         logger.debug(' Creating thread to upload files to MEGA accounts.')
 
-        t = Thread(target=self._all_profiles_upload, args=(), name='thread_upload')
-        self.__threads.append(t)
-        t.start()
+        self.__scheduler.submit(target=self._all_profiles_upload, args=(), name='thread_upload')
 
     def _create_threads_local_unfinished_file_remover(self):
         """
@@ -248,11 +1123,9 @@ class MegaManager(object):
             for pathMapping in profile.pathMappings:
                 localPath = pathMapping.localPath
                 remotePath = pathMapping.remotePath
-                t_unfinishedFileRemover = Thread(target=self.__megaTools.remove_local_incomplete_files, args=(
-                    username, password, localPath, remotePath,),
-                                                 name='thread_unfinishedFileRemover_%s' % profileName)
-                self.__threads.append(t_unfinishedFileRemover)
-                t_unfinishedFileRemover.start()
+                self.__scheduler.submit(target=self.__megaTools.remove_local_incomplete_files,
+                                        args=(username, password, localPath, remotePath,),
+                                        name='thread_unfinishedFileRemover_%s' % profileName)
 
         # for account in self.__foundUserPass:
         #     t_unfinishedFileRemover = Thread(target=self.__megaTools.remove_local_incomplete_files, args=(
@@ -274,47 +1147,26 @@ class MegaManager(object):
         logger.debug(' Creating thread to remove files remotely.')
 
         for account in self.__foundUserPass:
-            t = Thread(target=self._get_remote_files_that_dont_exist_locally,
-                       args=(account['user'], account['pass'],),
-                       name='thread_remoteFileRemover_%s' % account['user'])
-            self.__threads.append(t)
-            t.start()
-
-    def _create_thread_compress_image_files(self):
-        """
-        Create threads to compress image files.
-        """
-
-        logger = getLogger('MegaManager._create_thread_compress_image_files')
-        logger.setLevel(self.__logLevel)
-
-        logger.debug(' Creating thread to compress local image files.')
-
-        self.__compressedImageFiles = self.__lib.load_file_as_set(filePath=self.__compressedImagesFilePath)
-        self.__unableToCompressImageFiles = self.__lib.load_file_as_set(filePath=self.__unableToCompressImagesFilePath)
-
-        t_compress = Thread(target=self._all_profiles_image_compression, args=( ), name='thread_compressImages')
-        self.__threads.append(t_compress)
-        t_compress.start()
+            self.__scheduler.submit(target=self._get_remote_files_that_dont_exist_locally,
+                                    args=(account['user'], account['pass'],),
+                                    name='thread_remoteFileRemover_%s' % account['user'])
 
-    def _create_thread_compress_video_files(self):
+    def _create_thread_compress_files(self):
         """
-        Create threads to compress video files.
+        Create thread to compress image and/or video files.
         """
 
-        logger = getLogger('MegaManager._create_thread_compress_video_files')
+        logger = getLogger('MegaManager._create_thread_compress_files')
         logger.setLevel(self.__logLevel)
 
-        logger.debug(' Creating thread to compress local video files.')
+        logger.debug(' Creating thread to compress local files.')
 
-        self.__compressedVideoFiles = self.__lib.load_file_as_set(filePath=self.__compressedVideosFilePath)
-        # self.__compressedVideoFiles = self.__lib.load_file_as_set(filePath='C:\\Users\\PDitty\\Documents\\MEGA\\My_Mods\\Tools\\MEGA_Manager\\new_1.txt')
+        self._load_compression_state()
 
-        self.__unableToCompressVideoFiles = self.__lib.load_file_as_set(filePath=self.__unableToCompressVideosFilePath)
+        self.__compressionQueue = CompressionQueue(filePath=self.__compressionQueueFilePath, logLevel=self.__logLevel)
+        self.__compressionQueue.load()
 
-        t_compress = Thread(target=self._all_profiles_video_compression, args=( ), name='thread_compressVideos')
-        self.__threads.append(t_compress)
-        t_compress.start()
+        self.__scheduler.submit(target=self._all_profiles_compression, args=( ), name='thread_compress')
 
     def _delete_remote_files_that_dont_exist_locally(self, username, password):
         """
@@ -408,9 +1260,76 @@ class MegaManager(object):
             logger.error(' Exception: %s' % str(e))
             return False
 
+    def _export_command_metrics(self):
+        """
+        Export timing metrics of all megatools and ffmpeg commands run, as JSON file and as Prometheus text file.
+
+        Returns:
+            Boolean: whether both exports succeeded or not.
+        """
+
+        logger = getLogger('MegaManager._export_command_metrics')
+        logger.setLevel(self.__logLevel)
+
+        summary = self.__metrics.get_summary()
+        for commandType in sorted(summary):
+            metrics = summary[commandType]
+            logger.info(' Command "%s" ran %d times taking %.1f seconds.'
+                        % (commandType, metrics['count'], metrics['seconds']))
+            if metrics['stalls']:
+                logger.warning(' Command "%s" stalled %d times.' % (commandType, metrics['stalls']))
+
+        jsonResult = self.__metrics.export_json(filePath=self.__commandMetricsFilePath)
+        textfilePath = self.__metricsTextfile if self.__metricsTextfile else COMMAND_METRICS_TEXTFILE
+        textfileResult = self.__metrics.export_prometheus(filePath=textfilePath)
+        return jsonResult and textfileResult
+
+    def _find_duplicate_files(self):
+        """
+        Find local files holding the same content under every local path of every profile, so each content is compressed
+        and uploaded once. Duplicates are reported in the log.
+
+        Returns:
+            Dictionary: of local file path, "/" separated, to hash of its content, for files whose content is held by
+                other files too.
+        """
+
+        logger = getLogger('MegaManager._find_duplicate_files')
+        logger.setLevel(self.__logLevel)
+
+        localRoots = set(sub('\\\\', '/', pathMapping.localPath)
+                         for profile in self.__syncProfiles for pathMapping in profile.pathMappings)
+        filePaths = set()
+        for localRoot in localRoots:
+            for local_filePath in self.__lib.get_local_file_paths_recursively(localRoot=localRoot):
+                filePaths.add(sub('\\\\', '/', local_filePath))
+
+        duplicateIndex = DuplicateIndex_Lib(filePath=self.__duplicateIndexFilePath, logLevel=self.__logLevel)
+        groups = duplicateIndex.get_duplicates(filePaths=list(filePaths))
+        duplicateIndex.save()
+
+        duplicates = {}
+        duplicateBytes = 0
+        for contentHash in sorted(groups, key=lambda contentHash: groups[contentHash][0]):
+            filePaths = groups[contentHash]
+            size = path.getsize(filePaths[0]) if path.exists(filePaths[0]) else 0
+            duplicateBytes += size * (len(filePaths) - 1)
+            message = ' Same content of %s in: "%s".' % (self.__lib.get_mb_size_from_bytes(size),
+                                                        '", "'.join(filePaths))
+            if self.__findDuplicates:
+                logger.info(message)
+            else:
+                logger.debug(message)
+            for filePath in filePaths:
+                duplicates[filePath] = contentHash
+
+        logger.info(' Found %d duplicate files of %d contents, %s in extra copies.' % (
+            len(duplicates) - len(groups), len(groups), self.__lib.get_mb_size_from_bytes(duplicateBytes)))
+        return duplicates
+
     def _find_image_files_to_compress(self, username, password, localRoot, remoteRoot):
         """
-        Find image files to compress.
+        Find image files to compress and push them to the compression queue.
 
         Args:
             username (str): Username of account to find local images for.
@@ -422,73 +1341,29 @@ class MegaManager(object):
         logger = getLogger('MegaManager._find_image_files_to_compress')
         logger.setLevel(self.__logLevel)
 
-        logger.debug(' Compressing image files.')
-
-        localRoot_adj = sub('\\\\', '/', localRoot)
-        # chdir('%s' % self.__megaToolsDir)
-
-        # cmd = 'megals -lR -u %s -p %s "%s"' % (username, password, self.__remoteRoot)
-        # proc = Popen(cmd, stdout=PIPE, shell=True)
-
-        # (out, err) = proc.communicate()
-        # lines = out.split('\r\n')
-
-        lines = self.__megaTools.get_remote_file_data_recursively(username=username, password=password,
-                                                                  remotePath=remoteRoot, removeBlankLines=True)
-
-        if lines:
-            for line in lines:
-                remote_type = self.__megaTools.get_file_type_from_megals_line_data(line=line)
-                remote_fileExt = self.__megaTools.get_file_extension_from_megals_line_data(line=line)
-                remote_filePath = self.__megaTools.get_file_path_from_megals_line_data(line=line)
-                file_subPath = sub(remoteRoot, '', remote_filePath)
-                local_filePath = localRoot_adj + file_subPath
-
-                if remote_type == '0' and remote_fileExt in self.__compressionImageExtensions and \
-                                path.isfile(local_filePath) and (local_filePath not in self.__compressedImageFiles) \
-                                and (local_filePath not in self.__unableToCompressImageFiles):
-
-                    result = self.__compressImages_lib.compress_image_file(filePath=local_filePath)
-                    if result:
-                        compressPath_backup = local_filePath + '.compressimages-backup'
-                        if path.exists(compressPath_backup):
-                            logger.debug(' File compressed successfully "%s"!' % local_filePath)
-                            try:
-                                remove(compressPath_backup)
-                            except WindowsError as e:
-                                logger.warning(' Exception: %s' % str(e))
-                                pass
-
-                            self.compressedFiles = []
-                            self.compressedFiles.add(local_filePath)
-                            self.__lib.dump_set_into_file(itemSet=self.__compressedImageFiles,
-                                                          filePath=self.__compressedImagesFilePath, )
-
-                        else:
-                            logger.debug(
-                                ' File cannot be compressed any further "%s"!' % local_filePath)
-                            self.__unableToCompressImageFiles.add(local_filePath)
-                            self.__lib.dump_set_into_file(
-                                itemSet=self.__unableToCompressImageFiles,
-                                filePath=self.__unableToCompressImagesFilePath, )
+        logger.debug(' Finding image files to compress.')
 
-                    else:
-                        logger.debug(
-                            ' Error, image file could not be compressed "%s"!' % local_filePath)
-                        self.__unableToCompressImageFiles.add(local_filePath)
-                        self.__lib.dump_set_into_file(itemSet=self.__unableToCompressImageFiles,
-                                                      filePath=self.__unableToCompressImagesFilePath)
+        local_filePaths = self._get_compression_candidates(username=username, password=password, localRoot=localRoot,
+                                                           remoteRoot=remoteRoot,
+                                                           extensions=self.__compressionImageExtensions)
 
+        for local_filePath in local_filePaths:
+            if path.isfile(local_filePath) and (local_filePath not in self.__compressedImageFiles) \
+                    and (local_filePath not in self.__unableToCompressImageFiles):
+                self.__compressionQueue.push(filePath=local_filePath, fileType='image',
+                                             fileSize=path.getsize(local_filePath), ratio=IMAGE_COMPRESSION_RATIO)
 
-    def _find_video_files_to_compress(self, username, password, localRoot, remoteRoot):
+    def _find_video_files_to_compress(self, username, password, localRoot, remoteRoot, encodeProfile=None):
         """
-        Find video files to __compressAll.
+        Find video files to compress and push them to the compression queue. Video files not expected to save at least
+        self.__compressMinSaving percent are left out.
 
         Args:
             username (str): username of account to find local video files for
             password (str): password of account to find local video files for
             localRoot (str): Local path to search for image files to compress
             remoteRoot (str): Remote path to search for image files to compress
+            encodeProfile (EncodeProfile): Encode settings to compress video files with.
         """
 
         logger = getLogger('MegaManager._find_video_files_to_compress')
@@ -496,69 +1371,28 @@ class MegaManager(object):
 
         logger.debug(' Finding video files to compress.')
 
-        localRoot_adj = sub('\\\\', '/', localRoot)
+        encodeProfile = encodeProfile or self.__encodeProfiles[DEFAULT_ENCODE_PROFILE]
 
-        lines = self.__megaTools.get_remote_file_data_recursively(username=username, password=password,
-                                                                  remotePath=remoteRoot, removeBlankLines=True)
+        local_filePaths = self._get_compression_candidates(username=username, password=password, localRoot=localRoot,
+                                                           remoteRoot=remoteRoot,
+                                                           extensions=self.__compressionVideoExtensions)
 
-        if lines:
-            for line in lines:
-                remote_type = self.__megaTools.get_file_type_from_megals_line_data(line=line)
-                remote_fileExt = self.__megaTools.get_file_extension_from_megals_line_data(line=line)
-                remote_filePath = self.__megaTools.get_file_path_from_megals_line_data(line=line)
-                file_subPath = sub(remoteRoot, '', remote_filePath)
-                local_filePath = localRoot_adj + file_subPath
-                # if local_filePath not in self.__compressedVideoFiles:
-                #     pass
-                # remote_type = line.split()[2]
-                if remote_type == '0' and remote_fileExt in self.__compressionVideoExtensions and \
-                                path.isfile(local_filePath) and (local_filePath not in self.__compressedVideoFiles) \
-                                and (local_filePath not in self.__unableToCompressVideoFiles):
-
-                    tempFilePath = local_filePath.rsplit(".", 1)[0] + '_NEW.mp4'
-
-                    if path.exists(tempFilePath):
-                        for retry in range(100):
-                            try:
-                                remove(tempFilePath)
-                                break
-                            except:
-                                logger.debug(" Remove failed, retrying...")
-                    result = self.__ffmpeg.compress_video_file(local_filePath,
-                                                               targetPath=tempFilePath, )
-
-                    if result == True and path.exists(tempFilePath):
-                        for retry in range(100):
-                            try:
-                                remove(local_filePath)
-                                break
-                            except:
-                                logger.debug(" Remove failed, retrying...")
-
-                        for retry in range(100):
-                            newFilePath = sub('_NEW', '', tempFilePath)
-                            try:
-                                rename(tempFilePath, newFilePath)
-                                break
-                            except:
-                                logger.debug(" Rename failed, retrying...")
-
-                        logger.debug(' Video file compressed successfully "%s" into "%s"!' % (
-                        local_filePath, newFilePath))
-                        self.__compressedVideoFiles.add(newFilePath)
-                        self.__lib.dump_set_into_file(itemSet=self.__compressedVideoFiles,
-                                                      filePath=COMPRESSED_VIDEOS_FILE, )
-
-                    elif path.exists(tempFilePath):
-                        remove(tempFilePath)
+        for local_filePath in local_filePaths:
+            if path.isfile(local_filePath) and (local_filePath not in self.__compressedVideoFiles) \
+                    and (local_filePath not in self.__unableToCompressVideoFiles):
 
-                    else:
-                        logger.debug(
-                            ' Error, video file could not be compressed "%s"!' % local_filePath)
-                        self.__unableToCompressVideoFiles.add(local_filePath)
-                        self.__lib.dump_set_into_file(itemSet=self.__unableToCompressVideoFiles,
-                                                      filePath=UNABLE_TO_COMPRESS_VIDEOS_FILE, )
+                saving = self._get_video_file_expected_saving(filePath=local_filePath, encodeProfile=encodeProfile)
+                if saving is not None and saving < self.__compressMinSaving:
+                    logger.debug(' Skipping video file "%s", expected saving %.1f%% is below minimum of %.1f%%.' % (
+                        local_filePath, saving, self.__compressMinSaving))
+                    continue
 
+                ratio = saving / 100.0 if saving is not None else VIDEO_COMPRESSION_RATIO
+                self.__compressionQueue.push(filePath=local_filePath, fileType='video',
+                                             fileSize=path.getsize(local_filePath), ratio=ratio,
+                                             encodeProfile=encodeProfile.name)
+
+        self.__lib.dump_dict_into_file(itemDict=self.__videoProbes, filePath=self.__videoProbesFilePath)
 
     def _get_accounts_user_pass(self, file):
         """
@@ -600,76 +1434,485 @@ class MegaManager(object):
 
         return foundUserPass
 
-    def _get_profile_details(self, profile):
+    def _get_compression_file_type(self, filePath):
         """
-        Creats dictionary of account data (remote size, local size, etc...) for self.__megaAccountsOutputPath file.
+        Get compression file type of file, if its type is being compressed this run.
 
         Args:
-            profile (SyncProfile): Profile to get data for.
+            filePath (str): File path to get compression file type of.
+
+        Returns:
+            String: "image" or "video". None if file is not to be compressed.
         """
 
-        profile = self._update_account_remote_details(account=profile.account)
+        logger = getLogger('MegaManager._get_compression_file_type')
+        logger.setLevel(self.__logLevel)
 
-    def _get_remote_files_that_dont_exist_locally(self, username, password):
+        fileExt = path.splitext(filePath)[1].lower()
+
+        if self.__compressImages and fileExt in [ext.lower() for ext in self.__compressionImageExtensions] \
+                and filePath not in self.__compressedImageFiles and filePath not in self.__unableToCompressImageFiles:
+            return 'image'
+
+        if self.__compressVideos and fileExt in [ext.lower() for ext in self.__compressionVideoExtensions] \
+                and filePath not in self.__compressedVideoFiles and filePath not in self.__unableToCompressVideoFiles:
+            return 'video'
+
+        return None
+
+    def _get_compression_candidates(self, username, password, localRoot, remoteRoot, extensions):
         """
-        Get remote files that don't exist locally.
+        Get local file paths with given extensions to consider for compression. Extensions are matched
+        case-insensitively. If self.__compressLocal is set local root is scanned directly, which works offline and
+        includes files not uploaded yet. Otherwise remote root files are listed and mapped to their local paths.
 
         Args:
-            username (str): username of account to upload to
-            password (str): Password of account to upload to
+            username (str): Username of account to find local files for.
+            password (str): Password of account to find local files for.
+            localRoot (str): Local path to search for files to compress.
+            remoteRoot (str): Remote path to search for files to compress.
+            extensions (list): File extensions to match ie: [".jpg", ".png"].
 
         Returns:
-            list of remote files that don't exist locally
+            List: local file paths, using "/" as separator.
         """
 
-        logger = getLogger('MegaManager._get_remote_files_that_dont_exist_locally')
+        logger = getLogger('MegaManager._get_compression_candidates')
         logger.setLevel(self.__logLevel)
 
-        logger.debug(' Getting remote files that do not exist locally on %s - %s.' % (username, password))
+        extensions = [extension.lower() for extension in extensions]
 
-        localRoot_adj = sub('\\\\', '/', self.__localRoot)
-        chdir('%s' % self.__megaToolsDir)
+        if self.__compressLocal:
+            logger.debug(' Scanning local path "%s" for files to compress.' % localRoot)
+            local_filePaths = self.__lib.get_local_file_paths_recursively(localRoot=localRoot, extensions=extensions)
+            return [sub('\\\\', '/', local_filePath) for local_filePath in local_filePaths]
 
-        remoteFiles = self.__megaTools.get_remote_file_paths_recursively(username=username, password=password,
-                                                                         remotePath=self.__remoteRoot)
+        localRoot_adj = sub('\\\\', '/', localRoot)
 
-        dontExistLocally = []
-        for remote_filePath in remoteFiles:
-            file_subPath = sub(self.__remoteRoot, '', remote_filePath)
-            local_filePath = localRoot_adj + file_subPath
+        lines = self.__megaTools.get_remote_file_data_recursively(username=username, password=password,
+                                                                  remotePath=remoteRoot, removeBlankLines=True)
 
-            if not path.exists(local_filePath):
-                dontExistLocally.append(local_filePath)
+        local_filePaths = []
+        if lines:
+            for line in lines:
+                remote_type = self.__megaTools.get_file_type_from_megals_line_data(line=line)
+                remote_fileExt = self.__megaTools.get_file_extension_from_megals_line_data(line=line)
+                remote_filePath = self.__megaTools.get_file_path_from_megals_line_data(line=line)
 
-        return dontExistLocally
+                if remote_type == '0' and remote_fileExt and remote_fileExt.lower() in extensions:
+                    file_subPath = sub(remoteRoot, '', remote_filePath)
+                    local_filePaths.append(localRoot_adj + file_subPath)
 
-    def _import_config_file_data(self):
+        return local_filePaths
+
+    def _get_encode_profile(self, pathMapping):
         """
-        Load config file.
+        Get encode profile to compress path mapping videos with. Encode profile given for the run takes precedence over
+        the path mapping encode profile.
+
+        Args:
+            pathMapping (PathMapping): Path mapping to get encode profile for.
+
+        Returns:
+            EncodeProfile: Encode profile to use.
         """
 
-        logger = getLogger('MegaManager._import_config_file_data')
+        logger = getLogger('MegaManager._get_encode_profile')
         logger.setLevel(self.__logLevel)
 
-        logger.debug(' Loading MEGA Manager config file.')
+        name = self.__encodeProfile or pathMapping.encodeProfile or DEFAULT_ENCODE_PROFILE
 
-        with open(self.__configPath, "r") as ins:
-            line = ins.readline()
-            while line:
-                if line.startswith('MEGATOOLS_DIR='):
-                    value = split('=', line)[1].strip()
+        if name not in self.__encodeProfiles:
+            logger.warning(' Encode profile "%s" does NOT exist! Using "%s".' % (name, DEFAULT_ENCODE_PROFILE))
+            name = DEFAULT_ENCODE_PROFILE
+
+        return self.__encodeProfiles[name]
+
+    def _get_failed_tasks(self, tasks):
+        """
+        Wait for tasks to finish and get those that failed. Tasks skipped because their account is parked, and tasks
+        depending on them, are told apart from failed ones, as they are left for a later sync.
+
+        Args:
+            tasks (list): Task objects.
+
+        Returns:
+            Tuple: of lists of failed tasks and skipped tasks.
+        """
+
+        failedTasks = []
+        skippedTasks = []
+        for task in tasks:
+            exception = task.exception()
+            if isinstance(exception, DependencyError):
+                exception = exception.cause
+            if isinstance(exception, TransferSkippedError):
+                skippedTasks.append(task)
+            elif exception:
+                failedTasks.append(task)
+        return failedTasks, skippedTasks
+
+    def _get_file_change(self, localFingerprint, syncedFingerprint, remoteFingerprint):
+        """
+        Work out which side of a file changed since it was last synced, from its fingerprints.
+
+        Args:
+            localFingerprint (str): Fingerprint of local file.
+            syncedFingerprint (str): Fingerprint file had when last uploaded or downloaded. None if never synced.
+            remoteFingerprint (str): Fingerprint of remote file. None if storage backend does not know it, in which case
+                remote file is taken as unchanged since last sync.
+
+        Returns:
+            String: "local" or "remote" if only that side changed, "both" if both sides changed or file was never
+                synced and differs. None if files are the same.
+        """
+
+        logger = getLogger('MegaManager._get_file_change')
+        logger.setLevel(self.__logLevel)
+
+        remoteFingerprint = remoteFingerprint or syncedFingerprint
+        if not remoteFingerprint or localFingerprint == remoteFingerprint:
+            return None
+        if syncedFingerprint == remoteFingerprint:
+            return 'local'
+        if syncedFingerprint == localFingerprint:
+            return 'remote'
+        return 'both'
+
+    def _get_path_mappings(self, local_filePath):
+        """
+        Get path mappings local file is under.
+
+        Args:
+            local_filePath (str): Local file or directory path.
+
+        Returns:
+            List: of (SyncProfile, PathMapping) tuples.
+        """
+
+        logger = getLogger('MegaManager._get_path_mappings')
+        logger.setLevel(self.__logLevel)
+
+        local_filePath = sub('\\\\', '/', local_filePath)
+        pathMappings = []
+        for profile in self.__syncProfiles:
+            for pathMapping in profile.pathMappings:
+                localRoot = sub('\\\\', '/', pathMapping.localPath).rstrip('/')
+                if local_filePath.startswith(localRoot + '/'):
+                    pathMappings.append((profile, pathMapping))
+        return pathMappings
+
+    def _get_prediction_key(self, encodeProfile=None):
+        """
+        Get key video compression predictions are cached under, so a prediction is only reused for the same settings.
+
+        Args:
+            encodeProfile (EncodeProfile): Encode settings prediction is made for. If None, MEGA Manager default
+                settings are used.
+
+        Returns:
+            String: Encode profile settings key.
+        """
+
+        logger = getLogger('MegaManager._get_prediction_key')
+        logger.setLevel(self.__logLevel)
+
+        if not encodeProfile:
+            encodeProfile = EncodeProfile(name=DEFAULT_ENCODE_PROFILE, logLevel=self.__logLevel)
+        return encodeProfile.settingsKey
+
+    def _get_profile_details(self, profile):
+        """
+        Creats dictionary of account data (remote size, local size, etc...) for self.__megaAccountsOutputPath file.
+
+        Args:
+            profile (SyncProfile): Profile to get data for.
+        """
+
+        profile = self._update_account_remote_details(account=profile.account)
+
+    def _get_remote_root_files(self, username, password, remoteRoot):
+        """
+        List files under remote root of path mapping. A remote root not created yet holds no files, which is told apart
+        from a listing that failed by listing the nearest parent directory that can be listed. Remote root is known to
+        exist once listed.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            remoteRoot (str): Remote root path of path mapping.
+
+        Returns:
+            List: of file data dictionaries. None if remote root could not be listed.
+        """
+
+        logger = getLogger('MegaManager._get_remote_root_files')
+        logger.setLevel(self.__logLevel)
+
+        remoteFiles = self.__storage.list_files(username=username, password=password, remotePath=remoteRoot)
+        if remoteFiles is not None:
+            with self.__remoteDirsLock:
+                self.__remoteDirs.add((username, remoteRoot))
+            return remoteFiles
+
+        dirPath = remoteRoot.rstrip('/')
+        while dirPath.count('/') > 1:
+            parentPath = dirPath.rsplit('/', 1)[0]
+            parentFiles = self.__storage.list_files(username=username, password=password, remotePath=parentPath,
+                                                    recursive=False)
+            if parentFiles is not None:
+                if dirPath in [fileData['path'] for fileData in parentFiles]:
+                    break
+                logger.debug(' Remote root "%s" does not exist yet.' % remoteRoot)
+                return []
+            dirPath = parentPath
+
+        logger.warning(' Error, could NOT list "%s"!' % remoteRoot)
+        return None
+
+    def _get_storage_backend(self):
+        """
+        Get storage backend to sync against, from STORAGE_BACKEND config setting.
+
+        Returns:
+            StorageBackend_Lib: "megatools" backend, "api" backend talking to MEGA's API in process, or "local" backend
+                keeping files under STORAGE_ROOT.
+        """
+
+        logger = getLogger('MegaManager._get_storage_backend')
+        logger.setLevel(self.__logLevel)
+
+        if self.__storageBackend == STORAGE_BACKEND_API:
+            logger.debug(' Using MEGA API storage backend, with its own transfer engines.')
+            sessionCache = SessionCache_Lib(filePath=self.__sessionCacheFilePath, logLevel=self.__logLevel)
+            remoteState = RemoteState_Lib(dirPath=self.__remoteStateDirPath, logLevel=self.__logLevel)
+            if self.__downloadConnections:
+                downloader = ChunkedDownload_Lib(connections=self.__downloadConnections, logLevel=self.__logLevel)
+            else:
+                downloader = ChunkedDownload_Lib(logLevel=self.__logLevel)
+            if self.__uploadConnections:
+                uploader = ChunkedUpload_Lib(connections=self.__uploadConnections, logLevel=self.__logLevel)
+            else:
+                uploader = ChunkedUpload_Lib(logLevel=self.__logLevel)
+            if self.__megaApiUrl:
+                return MegaApi_Lib(apiUrl=self.__megaApiUrl, transferBackend=self.__megaTools,
+                                   sessionCache=sessionCache, remoteState=remoteState, downloader=downloader,
+                                   uploader=uploader, logLevel=self.__logLevel)
+            return MegaApi_Lib(transferBackend=self.__megaTools, sessionCache=sessionCache, remoteState=remoteState,
+                               downloader=downloader, uploader=uploader, logLevel=self.__logLevel)
+
+        if self.__storageBackend == STORAGE_BACKEND_LOCAL:
+            if not self.__storageRoot:
+                raise ValueError('STORAGE_ROOT must be set for "%s" storage backend' % STORAGE_BACKEND_LOCAL)
+            logger.debug(' Using local storage backend in "%s".' % self.__storageRoot)
+            return LocalStorage_Lib(rootDir=self.__storageRoot, logLevel=self.__logLevel)
+
+        if self.__storageBackend != STORAGE_BACKEND_MEGATOOLS:
+            raise ValueError('Unknown storage backend "%s"' % self.__storageBackend)
+        return self.__megaTools
+
+    def _get_transfer_lanes(self, username, download):
+        """
+        Get pipeline transfer lanes of account, creating them on first use. Each account has its own download and
+        upload lanes, so their workers are tuned to the account's throughput and throttling.
+
+        Args:
+            username (str): username of account
+            download (bool): Whether to get download lanes, else upload lanes.
+
+        Returns:
+            TransferLanes_Lib: transfer lanes.
+        """
+
+        logger = getLogger('MegaManager._get_transfer_lanes')
+        logger.setLevel(self.__logLevel)
+
+        direction = 'download' if download else 'upload'
+        accountLanes = self.__pipelineDownloads if download else self.__pipelineUploads
+        with self.__pipelineLanesLock:
+            if username not in accountLanes:
+                # Transfers run in lanes by file size, so many small files aren't held up behind a few large ones.
+                accountLanes[username] = TransferLanes_Lib(lanes=self.__transferLanes,
+                                                           priorityRules=self.__priorityRules,
+                                                           recentSeconds=self.__priorityRecentSeconds,
+                                                           tuner=self.__concurrencyTuner,
+                                                           tunerKey='%s:%s' % (direction, username),
+                                                           logLevel=self.__logLevel)
+            return accountLanes[username]
+
+    def _get_video_file_expected_saving(self, filePath, encodeProfile=None):
+        """
+        Get expected saving of compressing video file. Cached sample encode prediction is preferred over the estimate
+        from probe data.
+
+        Args:
+            filePath (str): File path of video to get expected saving for.
+            encodeProfile (EncodeProfile): Encode settings video file would be compressed with.
+
+        Returns:
+            Float: Expected saving as percentage of file size. None if it could not be estimated.
+        """
+
+        logger = getLogger('MegaManager._get_video_file_expected_saving')
+        logger.setLevel(self.__logLevel)
+
+        probe = self._get_video_file_probe(filePath=filePath)
+        if not probe:
+            return None
+
+        prediction = probe.get('predictions', {}).get(self._get_prediction_key(encodeProfile=encodeProfile))
+        if prediction:
+            return prediction['saving']
+
+        return self.__ffmpeg.estimate_compression_saving(probe=probe, encodeProfile=encodeProfile)
+
+    def _get_video_file_probe(self, filePath):
+        """
+        Get video file probe data. Probe data is cached in self.__videoProbes and only refreshed when the file size or
+        modified time changed since it was last probed.
+
+        Args:
+            filePath (str): File path of video to get probe data for.
+
+        Returns:
+            Dictionary: Video probe data. None if video could not be probed.
+        """
+
+        logger = getLogger('MegaManager._get_video_file_probe')
+        logger.setLevel(self.__logLevel)
+
+        fileStat = stat(filePath)
+        probe = self.__videoProbes.get(filePath)
+
+        if probe and probe.get('fileSize') == fileStat.st_size and probe.get('modifiedTime') == fileStat.st_mtime:
+            logger.debug(' Using cached probe data for video file "%s".' % filePath)
+            return probe
+
+        probe = self.__ffmpeg.probe_video_file(filePath=filePath)
+        if probe:
+            probe['fileSize'] = fileStat.st_size
+            probe['modifiedTime'] = fileStat.st_mtime
+            self.__videoProbes[filePath] = probe
+
+        return probe
+
+    def _get_remote_files_that_dont_exist_locally(self, username, password):
+        """
+        Get remote files that don't exist locally.
+
+        Args:
+            username (str): username of account to upload to
+            password (str): Password of account to upload to
+
+        Returns:
+            list of remote files that don't exist locally
+        """
+
+        logger = getLogger('MegaManager._get_remote_files_that_dont_exist_locally')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Getting remote files that do not exist locally on %s - %s.' % (username, password))
+
+        localRoot_adj = sub('\\\\', '/', self.__localRoot)
+        chdir('%s' % self.__megaToolsDir)
+
+        remoteFiles = self.__megaTools.get_remote_file_paths_recursively(username=username, password=password,
+                                                                         remotePath=self.__remoteRoot)
+
+        dontExistLocally = []
+        for remote_filePath in remoteFiles:
+            file_subPath = sub(self.__remoteRoot, '', remote_filePath)
+            local_filePath = localRoot_adj + file_subPath
+
+            if not path.exists(local_filePath):
+                dontExistLocally.append(local_filePath)
+
+        return dontExistLocally
+
+    def _import_config_file_data(self):
+        """
+        Load config file.
+        """
+
+        logger = getLogger('MegaManager._import_config_file_data')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Loading MEGA Manager config file.')
+
+        with open(self.__configPath, "r") as ins:
+            line = ins.readline()
+            while line:
+                if line.startswith('MEGATOOLS_DIR='):
+                    value = split('=', line)[1].strip()
                     self.__megaToolsDir = value
                 elif line.startswith('FFMPEG_EXE_PATH='):
                     value = split('=', line)[1].strip()
                     self.__ffmpegExePath = value
+                elif line.startswith('FFPROBE_EXE_PATH='):
+                    value = split('=', line)[1].strip()
+                    self.__ffprobeExePath = value
                 elif line.startswith('MEGA_ACCOUNTS='):
                     value = split('=', line)[1].strip()
                     self.__megaAccountsPath = value
                 elif line.startswith('MEGA_ACCOUNTS_OUTPUT='):
                     value = split('=', line)[1].strip()
                     self.__megaAccountsOutputPath = value
+                elif line.startswith('STORAGE_BACKEND='):
+                    value = split('=', line)[1].strip()
+                    self.__storageBackend = value.lower() if value else STORAGE_BACKEND_MEGATOOLS
+                elif line.startswith('STORAGE_ROOT='):
+                    value = split('=', line)[1].strip()
+                    self.__storageRoot = value if value else None
+                elif line.startswith('MEGA_API_URL='):
+                    value = split('=', line, 1)[1].strip()
+                    self.__megaApiUrl = value if value else None
+                elif line.startswith('DOWNLOAD_CONNECTIONS='):
+                    value = split('=', line)[1].strip()
+                    self.__downloadConnections = int(value) if value else None
+                elif line.startswith('UPLOAD_CONNECTIONS='):
+                    value = split('=', line)[1].strip()
+                    self.__uploadConnections = int(value) if value else None
+                elif line.startswith('MIRROR_ROOT='):
+                    value = split('=', line)[1].strip()
+                    self.__mirrorRoot = value if value else None
+                elif line.startswith('DAEMON_REFRESH_SECONDS='):
+                    value = split('=', line)[1].strip()
+                    self.__daemonRefreshSeconds = int(value) if value else DAEMON_REFRESH_SECONDS
+                elif line.startswith('TRANSFER_LANES='):
+                    value = split('=', line, 1)[1].strip()
+                    self.__transferLanes = []
+                    for lane in value.split(',') if value else []:
+                        name, maxBytes, workers = [item.strip() for item in lane.split(':')]
+                        self.__transferLanes.append((name, int(maxBytes) if maxBytes else None, int(workers)))
+                elif line.startswith('PRIORITY_RULES='):
+                    value = split('=', line, 1)[1].strip()
+                    self.__priorityRules = []
+                    for rule in value.split(',') if value else []:
+                        pattern, priority = [item.strip() for item in rule.rsplit(':', 1)]
+                        self.__priorityRules.append((pattern, int(priority)))
+                elif line.startswith('PRIORITY_RECENT_DAYS='):
+                    value = split('=', line)[1].strip()
+                    self.__priorityRecentSeconds = float(value) * 24 * 60 * 60 if value else None
+                elif line.startswith('QUOTA_MAX_WAIT_SECONDS='):
+                    value = split('=', line)[1].strip()
+                    self.__quotaMaxWaitSeconds = int(value) if value else QUOTA_MAX_WAIT_SECONDS
+                elif line.startswith('PROCESS_STALL_SECONDS='):
+                    value = split('=', line)[1].strip()
+                    self.__processStallSeconds = float(value) if value else None
+                elif line.startswith('PROCESS_STALL_RETRIES='):
+                    value = split('=', line)[1].strip()
+                    self.__processStallRetries = int(value) if value else None
+                elif line.startswith('PLACEMENT_ROOTS='):
+                    value = split('=', line, 1)[1].strip()
+                    self.__placementRoots = [item.strip() for item in value.split(',') if item.strip()]
+                elif line.startswith('PLACEMENT_REMOTE_ROOT='):
+                    value = split('=', line, 1)[1].strip()
+                    self.__placementRemoteRoot = value if value else PLACEMENT_REMOTE_ROOT
                 elif line.startswith('[Profile'):
                     self.__syncProfiles.append(self._import_config_profile_data(fileObject=ins))
+                elif line.startswith('[EncodeProfile'):
+                    encodeProfile = self._import_config_encode_profile_data(fileObject=ins)
+                    self.__encodeProfiles[encodeProfile.name] = encodeProfile
 
                 elif line.startswith('LOCAL_ROOT='):
                     value = split('=', line)[1].strip()
@@ -681,9 +1924,59 @@ class MegaManager(object):
                 line = ins.readline()
         ins.close()
 
+    def _import_config_encode_profile_data(self, fileObject):
+        """
+        Load config encode profile data. Stops before the next section header.
+
+        Args:
+            fileObject (object): File object handle.
+
+        Returns:
+            EncodeProfile: Encode profile loaded from config.
+        """
+
+        logger = getLogger('MegaManager._import_config_encode_profile_data')
+        logger.setLevel(self.__logLevel)
+
+        settings = {}
+
+        position = fileObject.tell()
+        line = fileObject.readline()
+
+        while (not line.startswith('[')) and line:
+            if '=' in line:
+                key, value = [item.strip() for item in line.split('=', 1)]
+                if value == '':
+                    value = None
+
+                if key == 'Name':
+                    settings['name'] = value
+                elif key == 'Preset':
+                    settings['preset'] = value
+                elif key == 'CRF':
+                    settings['crf'] = int(value)
+                elif key == 'MaxWidth':
+                    settings['maxWidth'] = int(value) if value else None
+                elif key == 'MaxHeight':
+                    settings['maxHeight'] = int(value) if value else None
+                elif key == 'AudioCopy':
+                    settings['audioCopy'] = str(value).lower() in ['true', 'yes', '1']
+                elif key == 'Container':
+                    settings['container'] = value
+                elif key == 'Threads':
+                    settings['threads'] = int(value)
+
+            position = fileObject.tell()
+            line = fileObject.readline()
+
+        fileObject.seek(position)
+
+        logger.debug(' Loaded encode profile "%s".' % settings.get('name'))
+        return EncodeProfile(logLevel=self.__logLevel, **settings)
+
     def _import_config_profile_data(self, fileObject):
         """
-        Load config profile data.
+        Load config profile data. Stops before the next section header.
 
         Args:
             fileObject (object): File object handle.
@@ -697,9 +1990,10 @@ class MegaManager(object):
         password = None
         pathMappings = []
 
+        position = fileObject.tell()
         line = fileObject.readline()
 
-        while (not line.startswith('[Profile')) and line:
+        while (not line.startswith('[')) and line:
 
             if line.startswith('ProfileName='):
                 value = split('=', line)[1].strip()
@@ -717,13 +2011,674 @@ class MegaManager(object):
                     remotePath = split('=', line)[1].strip()
                     pathMappingObj = PathMapping(localPath=localPath, remotePath=remotePath, logLevel=self.__logLevel)
                     pathMappings.append(pathMappingObj)
+            elif line.startswith('EncodeProfile'):
+                index = int(findall('^EncodeProfile(\d+)=', line)[0]) - 1
+                value = split('=', line)[1].strip()
+                if index < len(pathMappings):
+                    pathMappings[index].encodeProfile = value
 
+            position = fileObject.tell()
             line = fileObject.readline()
 
+        fileObject.seek(position)
+
         syncProfileObj = SyncProfile(profileName=profileName, username=username, password=password,
                                      pathMappings=pathMappings)
         return syncProfileObj
 
+    def _is_video_file_worth_compressing(self, filePath, encodeProfile=None):
+        """
+        Check whether video file compression is expected to save at least self.__compressMinSaving percent of its size.
+        Saving is first estimated from probe data. Video files of at least self.__compressPredictMinSize megabytes that
+        pass the estimate then have a few short slices encoded to predict the saving. Video files predicted to miss the
+        minimum saving are added to self.__unableToCompressVideoFiles so they are not sampled again.
+
+        Args:
+            filePath (str): File path of video to check.
+            encodeProfile (EncodeProfile): Encode settings video file would be compressed with.
+
+        Returns:
+            Boolean: whether video file is worth compressing or not.
+        """
+
+        logger = getLogger('MegaManager._is_video_file_worth_compressing')
+        logger.setLevel(self.__logLevel)
+
+        probe = self._get_video_file_probe(filePath=filePath)
+        if not probe:
+            return True
+
+        saving = self.__ffmpeg.estimate_compression_saving(probe=probe, encodeProfile=encodeProfile)
+        if saving is not None and saving < self.__compressMinSaving:
+            logger.debug(' Skipping video file "%s", estimated saving %.1f%% is below minimum of %.1f%%.' % (
+                filePath, saving, self.__compressMinSaving))
+            return False
+
+        if probe['fileSize'] < self.__compressPredictMinSize * 1000000:
+            return True
+
+        predictionKey = self._get_prediction_key(encodeProfile=encodeProfile)
+        predictions = probe.setdefault('predictions', {})
+        prediction = predictions.get(predictionKey)
+
+        if not prediction:
+            container = encodeProfile.container if encodeProfile else 'mp4'
+            samplePath = filePath.rsplit(".", 1)[0] + '_SAMPLE.%s' % container
+            prediction = self.__ffmpeg.predict_compression(filePath=filePath, targetPath=samplePath, probe=probe,
+                                                           encodeProfile=encodeProfile)
+            if not prediction:
+                return True
+            predictions[predictionKey] = prediction
+
+        if prediction['saving'] >= self.__compressMinSaving:
+            logger.debug(' Video file "%s" predicted to save %.1f%% in %.0f seconds.' % (
+                filePath, prediction['saving'], prediction['encodeSeconds']))
+            return True
+
+        logger.debug(' Video file "%s" not worth compressing, predicted saving %.1f%% is below minimum of %.1f%%.' % (
+            filePath, prediction['saving'], self.__compressMinSaving))
+        self.__unableToCompressVideoFiles.add(filePath)
+        self.__lib.dump_set_into_file(itemSet=self.__unableToCompressVideoFiles,
+                                      filePath=self.__unableToCompressVideosFilePath)
+        return False
+
+    def _load_compression_state(self):
+        """
+        Load compressed and unable to compress file sets, and video probe data, for file types compressed this run.
+        """
+
+        logger = getLogger('MegaManager._load_compression_state')
+        logger.setLevel(self.__logLevel)
+
+        if self.__compressImages:
+            self.__compressedImageFiles = self.__lib.load_file_as_set(filePath=self.__compressedImagesFilePath)
+            self.__unableToCompressImageFiles = self.__lib.load_file_as_set(
+                filePath=self.__unableToCompressImagesFilePath)
+
+        if self.__compressVideos:
+            self.__compressedVideoFiles = self.__lib.load_file_as_set(filePath=self.__compressedVideosFilePath)
+            self.__unableToCompressVideoFiles = self.__lib.load_file_as_set(
+                filePath=self.__unableToCompressVideosFilePath)
+            self.__videoProbes = self.__lib.load_file_as_dict(filePath=self.__videoProbesFilePath)
+
+    def _log_transfer_stats(self):
+        """
+        Log files, bytes and throughput of each account's pipeline download and upload lanes so far.
+        """
+
+        logger = getLogger('MegaManager._log_transfer_stats')
+        logger.setLevel(self.__logLevel)
+
+        with self.__pipelineLanesLock:
+            downloadLanes = sorted(self.__pipelineDownloads.items())
+            uploadLanes = sorted(self.__pipelineUploads.items())
+        for username, transferLanes in downloadLanes:
+            transferLanes.log_stats(description='Download from "%s"' % username)
+        for username, transferLanes in uploadLanes:
+            transferLanes.log_stats(description='Upload to "%s"' % username)
+
+    def _pipeline_compress_file(self, filePath, fileType, encodeProfile):
+        """
+        Pipeline compression stage. Compress downloaded or local file.
+
+        Args:
+            filePath (str): File path of file to compress.
+            fileType (str): "image" or "video".
+            encodeProfile (EncodeProfile): Encode settings to compress video with.
+
+        Returns:
+            String: File path of compressed file. None if file was not compressed.
+        """
+
+        logger = getLogger('MegaManager._pipeline_compress_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Compressing %s file "%s".' % (fileType, filePath))
+
+        if fileType == 'image':
+            return filePath if self._compress_image_file(filePath=filePath) else None
+
+        if not self._is_video_file_worth_compressing(filePath=filePath, encodeProfile=encodeProfile):
+            return None
+        return self._compress_video_file(filePath=filePath, encodeProfile=encodeProfile)
+
+    def _pipeline_compress_duplicate_file(self, filePath, fileType, sourceTask):
+        """
+        Pipeline compression stage of file holding the same content as a file compressed by another task. File gets a
+        copy of the compressed file rather than being compressed again.
+
+        Args:
+            filePath (str): File path of file to compress.
+            fileType (str): "image" or "video".
+            sourceTask (Task): Compression stage task of file holding the same content.
+
+        Returns:
+            String: File path of compressed file. None if file was not compressed.
+        """
+
+        logger = getLogger('MegaManager._pipeline_compress_duplicate_file')
+        logger.setLevel(self.__logLevel)
+
+        compressed_filePath = sourceTask.result()
+        if not compressed_filePath:
+            logger.debug(' Duplicate of "%s" was not compressed, neither is "%s".' % (sourceTask.name, filePath))
+            return None
+        return self._copy_compressed_file(filePath=filePath, fileType=fileType, compressed_filePath=compressed_filePath)
+
+    def _pipeline_create_remote_dirs(self, username, password, remoteDirPath):
+        """
+        Create remote directory and any missing parent directories. Directories known to exist are not created again.
+
+        Args:
+            username (str): username of account to create directories in
+            password (str): password of account to create directories in
+            remoteDirPath (str): remote directory path to create.
+
+        Returns:
+            Boolean: whether remote directory exists or not.
+        """
+
+        logger = getLogger('MegaManager._pipeline_create_remote_dirs')
+        logger.setLevel(self.__logLevel)
+
+        # Top level directories, ie: "/Root", exist in every account.
+        parts = remoteDirPath.strip('/').split('/')
+        for index in range(2, len(parts) + 1):
+            dirPath = '/' + '/'.join(parts[:index])
+
+            # Lock is held while creating, so uploads don't take directories for created before they are.
+            with self.__remoteDirsLock:
+                if (username, dirPath) in self.__remoteDirs:
+                    continue
+                self.__storage.make_dir(username=username, password=password, remoteDirPath=dirPath)
+                self.__remoteDirs.add((username, dirPath))
+
+        return True
+
+    def _pipeline_download_file(self, username, password, local_filePath, remote_filePath):
+        """
+        Pipeline download stage. Download remote file that does not exist locally.
+
+        Args:
+            username (str): username of account to download from
+            password (str): password of account to download from
+            local_filePath (str): Local file path to download to.
+            remote_filePath (str): Remote file path to download.
+
+        Returns:
+            String: Local file path of downloaded file.
+        """
+
+        logger = getLogger('MegaManager._pipeline_download_file')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Downloading "%s" to "%s".' % (remote_filePath, local_filePath))
+
+        self._raise_if_parked(username=username, description='download of "%s"' % remote_filePath)
+        result = self.__storage.get_file(username=username, password=password, remoteFilePath=remote_filePath,
+                                         localFilePath=local_filePath)
+        if not result or not path.isfile(local_filePath):
+            self._raise_if_parked(username=username, description='download of "%s"' % remote_filePath)
+            raise IOError('Could not download "%s" to "%s"' % (remote_filePath, local_filePath))
+        self.__localIndex.set_synced_fingerprint(filePath=local_filePath)
+        return local_filePath
+
+    def _pipeline_move_remote_file(self, username, password, local_filePath, localRoot, remoteRoot,
+                                   old_remoteFilePath):
+        """
+        Pipeline move stage. Move remote file of local file that was moved or renamed since it was synced. If storage
+        backend can't move files, local file is uploaded instead.
+
+        Args:
+            username (str): username of account to move in
+            password (str): password of account to move in
+            local_filePath (str): Local file path file was moved to.
+            localRoot (str): Local root path of path mapping.
+            remoteRoot (str): Remote root path of path mapping.
+            old_remoteFilePath (str): Remote file path of file before it was moved.
+
+        Returns:
+            Boolean: whether remote file was moved or not.
+        """
+
+        logger = getLogger('MegaManager._pipeline_move_remote_file')
+        logger.setLevel(self.__logLevel)
+
+        remote_filePath = remoteRoot + local_filePath[len(localRoot):]
+
+        logger.debug(' Moving "%s" to "%s".' % (old_remoteFilePath, remote_filePath))
+
+        self._pipeline_create_remote_dirs(username=username, password=password,
+                                          remoteDirPath=remote_filePath.rsplit('/', 1)[0])
+        if not self.__storage.move_file(username=username, password=password, remoteFilePath=old_remoteFilePath,
+                                        newRemoteFilePath=remote_filePath):
+            logger.debug(' Could not move "%s", uploading "%s" instead.' % (old_remoteFilePath, local_filePath))
+            self._pipeline_upload_file(username=username, password=password, local_filePath=local_filePath,
+                                       localRoot=localRoot, remoteRoot=remoteRoot, existsRemotely=False)
+            if self.__removeRemote:
+                self._pipeline_prune_remote_files(username=username, password=password, localRoot=localRoot,
+                                                  remoteRoot=remoteRoot, remote_filePaths=[old_remoteFilePath])
+            return False
+
+        if self.__mirror:
+            self.__mirror.move_file(username=username, password=password, remoteFilePath=old_remoteFilePath,
+                                    newRemoteFilePath=remote_filePath)
+        self.__localIndex.set_synced_fingerprint(filePath=local_filePath)
+        self.__localIndex.remove_entries(filePaths=[localRoot + old_remoteFilePath[len(remoteRoot):]])
+        return True
+
+    def _pipeline_prune_remote_files(self, username, password, localRoot, remoteRoot, remote_filePaths):
+        """
+        Pipeline prune stage. Remove remote files that don't exist locally.
+
+        Args:
+            username (str): username of account to remove from
+            password (str): password of account to remove from
+            localRoot (str): Local root path of path mapping.
+            remoteRoot (str): Remote root path of path mapping.
+            remote_filePaths (list): Remote file paths that had no local file when pipeline was planned.
+
+        Returns:
+            Integer: number of remote files removed.
+        """
+
+        logger = getLogger('MegaManager._pipeline_prune_remote_files')
+        logger.setLevel(self.__logLevel)
+
+        # Files created locally since the pipeline was planned are kept.
+        remote_filePaths = [remote_filePath for remote_filePath in remote_filePaths
+                            if not path.exists(localRoot + remote_filePath[len(remoteRoot):])]
+
+        removedCount = self.__storage.remove_files(username=username, password=password,
+                                                   remoteFilePaths=remote_filePaths)
+        if self.__mirror:
+            self.__mirror.remove_files(username=username, password=password, remoteFilePaths=remote_filePaths)
+        self.__localIndex.remove_entries(filePaths=[localRoot + remote_filePath[len(remoteRoot):]
+                                                    for remote_filePath in remote_filePaths])
+        with self.__remoteDirsLock:
+            removed_dirPaths = [remote_filePath for remote_filePath in remote_filePaths
+                                if (username, remote_filePath) in self.__remoteDirs]
+            for remoteDir in [remoteDir for remoteDir in self.__remoteDirs if remoteDir[0] == username and any(
+                    remoteDir[1] == dirPath or remoteDir[1].startswith(dirPath + '/') for dirPath in removed_dirPaths)]:
+                self.__remoteDirs.discard(remoteDir)
+
+        logger.debug(' Removed %d remote files under "%s".' % (removedCount, remoteRoot))
+        return removedCount
+
+    def _pipeline_upload_file(self, username, password, local_filePath, localRoot, remoteRoot, existsRemotely,
+                              compressTask=None, modified=False, sourceTask=None):
+        """
+        Pipeline upload stage. Upload new local file, or replace remote file with its compressed or locally modified
+        local file. If a file holding the same content was uploaded to the account, it is copied remotely instead.
+        Remote file replaced is only removed once its replacement is uploaded. A replacement of the same path is
+        uploaded next to it first, then moved over it, or uploaded again by backends that can't move files.
+
+        Args:
+            username (str): username of account to upload to
+            password (str): password of account to upload to
+            local_filePath (str): Local file path to upload.
+            localRoot (str): Local root path of path mapping.
+            remoteRoot (str): Remote root path of path mapping.
+            existsRemotely (bool): Whether remote file exists already.
+            compressTask (Task): Compression stage task of file. None if file was not to be compressed.
+            modified (bool): Whether local file was modified since last sync, so it replaces remote file even if not
+                compressed.
+            sourceTask (Task): Upload stage task of file holding the same content in the same account. None if there
+                is none.
+
+        Returns:
+            String: remote file path file was uploaded to. None if file was not uploaded.
+        """
+
+        logger = getLogger('MegaManager._pipeline_upload_file')
+        logger.setLevel(self.__logLevel)
+
+        source_filePath = local_filePath
+        old_remoteFilePath = remoteRoot + source_filePath[len(localRoot):] if existsRemotely else None
+
+        if compressTask:
+            compressed_filePath = compressTask.result()
+            if not compressed_filePath and existsRemotely and not modified:
+                logger.debug(' "%s" was not compressed, remote file is kept.' % source_filePath)
+                return None
+            local_filePath = compressed_filePath if compressed_filePath else source_filePath
+
+        self._raise_if_parked(username=username, description='upload of "%s"' % local_filePath)
+
+        remote_filePath = remoteRoot + local_filePath[len(localRoot):]
+
+        # Mirror copy is staged first, so it is available before the slower storage upload finishes. It replaces a
+        # mirror copy of the same path, others are removed once it is staged.
+        if self.__mirror:
+            if not self.__mirror.put_file(username=username, password=password, localFilePath=local_filePath,
+                                          remoteFilePath=remote_filePath):
+                logger.warning(' Error, could NOT stage mirror copy of "%s"!' % local_filePath)
+            elif old_remoteFilePath and old_remoteFilePath != remote_filePath:
+                self.__mirror.remove_file(username=username, password=password, remoteFilePath=old_remoteFilePath)
+
+        self._pipeline_create_remote_dirs(username=username, password=password,
+                                          remoteDirPath=remote_filePath.rsplit('/', 1)[0])
+
+        staged_remoteFilePath = remote_filePath + UPLOAD_STAGING_SUFFIX if old_remoteFilePath == remote_filePath \
+            else remote_filePath
+        source_remoteFilePath = sourceTask.result() if sourceTask else None
+        if source_remoteFilePath and self.__storage.copy_file(username=username, password=password,
+                                                              remoteFilePath=source_remoteFilePath,
+                                                              newRemoteFilePath=staged_remoteFilePath):
+            logger.debug(' Copied "%s" to "%s" instead of uploading duplicate "%s".' % (
+                source_remoteFilePath, staged_remoteFilePath, local_filePath))
+        elif not self.__storage.put_file(username=username, password=password, localFilePath=local_filePath,
+                                         remoteFilePath=staged_remoteFilePath):
+            self._raise_if_parked(username=username, description='upload of "%s"' % local_filePath)
+            raise IOError('Could not upload "%s" to "%s"' % (local_filePath, staged_remoteFilePath))
+
+        if old_remoteFilePath:
+            self.__storage.remove_file(username=username, password=password, remoteFilePath=old_remoteFilePath)
+        if staged_remoteFilePath != remote_filePath and \
+                not self.__storage.move_file(username=username, password=password,
+                                             remoteFilePath=staged_remoteFilePath, newRemoteFilePath=remote_filePath):
+            # Staged copy is only removed once file is uploaded to its path, so one remote copy is kept throughout.
+            if not self.__storage.put_file(username=username, password=password, localFilePath=local_filePath,
+                                           remoteFilePath=remote_filePath):
+                raise IOError('Could not upload "%s" to "%s", it is kept at "%s"' % (
+                    local_filePath, remote_filePath, staged_remoteFilePath))
+            self.__storage.remove_file(username=username, password=password, remoteFilePath=staged_remoteFilePath)
+
+        self._set_uploaded_fingerprint(source_filePath=source_filePath, uploaded_filePath=local_filePath)
+        return remote_filePath
+
+    def _plan_placement(self):
+        """
+        Plan placement of new local directories onto accounts, and write plan to self.__placementPlanFilePath to be
+        reviewed, then applied with self._apply_placement(). New directories are sub directories of
+        self.__placementRoots that neither are in nor hold a path mapping. Their sizes come from the local index, which
+        indexes their files. Free space of accounts comes from their cached remote details, fetched if not cached yet,
+        bytes of mapped local files never synced counting as used already.
+
+        Returns:
+            Dictionary: plan. None if there is nothing to place.
+        """
+
+        logger = getLogger('MegaManager._plan_placement')
+        logger.setLevel(self.__logLevel)
+
+        if not self.__placementRoots:
+            logger.warning(' No PLACEMENT_ROOTS in config file, nothing to place!')
+            return None
+        if not self.__localIndex:
+            self.__localIndex = LocalIndex_Lib(filePath=self.__localIndexFilePath, logLevel=self.__logLevel)
+
+        mappedPaths = [sub('\\\\', '/', pathMapping.localPath).rstrip('/')
+                       for profile in self.__syncProfiles for pathMapping in profile.pathMappings]
+        dirs = []
+        for placementRoot in self.__placementRoots:
+            placementRoot = sub('\\\\', '/', placementRoot).rstrip('/')
+            if not path.isdir(placementRoot):
+                logger.warning(' Placement root "%s" does NOT exist!' % placementRoot)
+                continue
+            for name in sorted(listdir(placementRoot)):
+                localPath = placementRoot + '/' + name
+                if not path.isdir(localPath) or \
+                        any(mappedPath == localPath or mappedPath.startswith(localPath + '/') or
+                            localPath.startswith(mappedPath + '/') for mappedPath in mappedPaths):
+                    continue
+                local_filePaths = [sub('\\\\', '/', local_filePath) for local_filePath in
+                                   self.__lib.get_local_file_paths_recursively(localRoot=localPath)]
+                localEntries = self.__localIndex.get_entries(filePaths=local_filePaths)
+                dirs.append({'localPath': localPath, 'remotePath': self.__placementRemoteRoot.rstrip('/') + '/' + name,
+                             'bytes': sum(entry['size'] for entry in localEntries.values())})
+        self.__localIndex.save()
+        if not dirs:
+            logger.info(' No new directories to place.')
+            return None
+
+        accounts = {}
+        for profile in self.__syncProfiles:
+            account = profile.account
+            if account.username not in accounts:
+                if account.freeSpace is None:
+                    self._update_account_remote_details(account=account)
+                if account.freeSpace is None:
+                    logger.warning(' Could NOT get free space of account "%s", nothing placed on it!' %
+                                   account.username)
+                    continue
+                accounts[account.username] = {'freeBytes': int(account.freeSpace * 1024 ** 3),
+                                              'totalBytes': int(account.totalSpace * 1024 ** 3),
+                                              'pendingBytes': 0, 'remotePaths': []}
+            for pathMapping in profile.pathMappings:
+                localRoot = sub('\\\\', '/', pathMapping.localPath).rstrip('/')
+                accounts[account.username]['pendingBytes'] += self.__localIndex.get_unsynced_bytes(dirPath=localRoot)
+                accounts[account.username]['remotePaths'].append(pathMapping.remotePath)
+
+        placementPlanner = PlacementPlanner_Lib(planFilePath=self.__placementPlanFilePath, logLevel=self.__logLevel)
+        plan = placementPlanner.get_plan(dirs=dirs, accounts=accounts)
+        placementPlanner.save_plan(plan=plan)
+
+        for username in sorted(plan['accounts']):
+            logger.info(' Account "%s": %.2f GiB free, %.2f GiB placed.' % (
+                username, plan['accounts'][username]['freeBytes'] / float(1024 ** 3),
+                plan['accounts'][username]['plannedBytes'] / float(1024 ** 3)))
+        for assignment in plan['assignments']:
+            logger.info(' Place "%s" (%.2f GiB) on account "%s" as "%s".' % (
+                assignment['localPath'], assignment['bytes'] / float(1024 ** 3), assignment['username'],
+                assignment['remotePath']))
+        for unplaced in plan['unplaced']:
+            logger.warning(' No account has room for "%s" (%.2f GiB)!' % (unplaced['localPath'],
+                                                                          unplaced['bytes'] / float(1024 ** 3)))
+        logger.info(' Placement plan written to "%s", apply it with --applyPlacement.' % self.__placementPlanFilePath)
+        return plan
+
+    def _process_compression_queue(self):
+        """
+        Compress queued files in order of expected bytes saved until queue is empty or the compression budget is spent.
+        Budget is self.__compressMaxSeconds seconds of run time and self.__compressMaxBytes bytes of input files. Files
+        that don't fit the remaining budget are kept in the queue for the next run.
+        """
+
+        logger = getLogger('MegaManager._process_compression_queue')
+        logger.setLevel(self.__logLevel)
+
+        logger.debug(' Compressing %d queued files.' % len(self.__compressionQueue))
+
+        startTime = time()
+        processedBytes = 0
+        savedBytes = 0
+        deferred = []
+        # Compressed file path per content compressed this run, None if it could not be compressed, so duplicates of it
+        # are not compressed again.
+        compressedContent = {}
+
+        while True:
+            filePath, entry = self.__compressionQueue.pop()
+            if not filePath:
+                break
+
+            # Queue keeps files of types an earlier run compressed, which are left for a run compressing them again.
+            if not (self.__compressImages if entry['fileType'] == 'image' else self.__compressVideos):
+                deferred.append((filePath, entry))
+                continue
+
+            remainingSeconds = None
+            if self.__compressMaxSeconds:
+                remainingSeconds = self.__compressMaxSeconds - (time() - startTime)
+                if remainingSeconds <= 0:
+                    logger.info(' Compression time budget of %d seconds spent.' % self.__compressMaxSeconds)
+                    deferred.append((filePath, entry))
+                    break
+
+            if self.__compressMaxBytes and processedBytes + entry['fileSize'] > self.__compressMaxBytes:
+                logger.debug(' File "%s" does not fit remaining compression byte budget.' % filePath)
+                deferred.append((filePath, entry))
+                continue
+
+            if not path.isfile(filePath):
+                continue
+
+            fileSize = path.getsize(filePath)
+
+            contentHash = self.__duplicates.get(sub('\\\\', '/', filePath))
+            contentKey = (contentHash, entry['fileType'], entry['encodeProfile']) if contentHash else None
+            if contentKey in compressedContent:
+                if compressedContent[contentKey]:
+                    newFilePath = self._copy_compressed_file(filePath=filePath, fileType=entry['fileType'],
+                                                             compressed_filePath=compressedContent[contentKey])
+                    if newFilePath:
+                        savedBytes += fileSize - path.getsize(newFilePath)
+                self.__compressionQueue.save()
+                continue
+
+            if entry['fileType'] == 'image':
+                if filePath in self.__compressedImageFiles or filePath in self.__unableToCompressImageFiles:
+                    continue
+
+                newFilePath = filePath if self._compress_image_file(filePath=filePath) else None
+
+            else:
+                if filePath in self.__compressedVideoFiles or filePath in self.__unableToCompressVideoFiles:
+                    continue
+
+                encodeProfile = self.__encodeProfiles.get(entry['encodeProfile'],
+                                                          self.__encodeProfiles[DEFAULT_ENCODE_PROFILE])
+                if not self._is_video_file_worth_compressing(filePath=filePath, encodeProfile=encodeProfile):
+                    continue
+
+                predictionKey = self._get_prediction_key(encodeProfile=encodeProfile)
+                prediction = self.__videoProbes.get(filePath, {}).get('predictions', {}).get(predictionKey)
+                if remainingSeconds is not None and prediction and prediction['encodeSeconds'] > remainingSeconds:
+                    logger.debug(' File "%s" predicted to take longer than remaining compression time budget.' %
+                                 filePath)
+                    deferred.append((filePath, entry))
+                    continue
+
+                newFilePath = self._compress_video_file(filePath=filePath, encodeProfile=encodeProfile)
+
+            processedBytes += fileSize
+            if newFilePath and path.isfile(newFilePath):
+                savedBytes += fileSize - path.getsize(newFilePath)
+            if contentKey:
+                compressedContent[contentKey] = newFilePath
+
+            self.__compressionQueue.save()
+
+        for filePath, entry in deferred:
+            self.__compressionQueue.push(filePath=filePath, fileType=entry['fileType'], fileSize=entry['fileSize'],
+                                         ratio=entry['ratio'], encodeProfile=entry['encodeProfile'])
+        self.__compressionQueue.save()
+
+        if self.__compressVideos:
+            self.__lib.dump_dict_into_file(itemDict=self.__videoProbes, filePath=self.__videoProbesFilePath)
+
+        logger.info(' Compressed %s of files in %.0f seconds, saving %s. %d files left in queue.' % (
+            self.__lib.get_mb_size_from_bytes(processedBytes), time() - startTime,
+            self.__lib.get_mb_size_from_bytes(savedBytes), len(self.__compressionQueue)))
+
+    def _raise_if_parked(self, username, description):
+        """
+        Raise TransferSkippedError if account is parked, so transfer is left for a later sync rather than failing.
+
+        Args:
+            username (str): username of account transferring
+            description (str): Transfer skipped, ie: "upload of "/local/file.txt"".
+        """
+
+        parkedUntil = self.__parking.get_parked_until(username=username)
+        if parkedUntil:
+            raise TransferSkippedError('Account "%s" is parked until %s, %s skipped' % (
+                username, strftime('%Y-%m-%d %H:%M:%S', localtime(parkedUntil)), description))
+
+    def _run_daemon(self):
+        """
+        Run as daemon. Every path mapping is synced as a per-file pipeline, then local paths are watched and each local
+        file changed or removed is synced on its own, once its events settle. Every path mapping is synced whole again
+        every self.__daemonRefreshSeconds seconds, picking up remote changes, or sooner once a parked account's park
+        ends. Changes of files whose account is parked are kept until it is no longer parked. Runs until interrupted.
+        """
+
+        logger = getLogger('MegaManager._run_daemon')
+        logger.setLevel(self.__logLevel)
+
+        localRoots = sorted(set(sub('\\\\', '/', pathMapping.localPath).rstrip('/')
+                                for profile in self.__syncProfiles for pathMapping in profile.pathMappings))
+        watcher = LocalWatcher_Lib(localRoots=localRoots, ignoredPatterns=DAEMON_IGNORED_PATTERNS,
+                                   logLevel=self.__logLevel)
+        # Watching starts before the first sync, so files changed while it runs are synced after it.
+        usesInotify = watcher.start()
+        logger.info(' Daemon watching %d local paths with %s.' % (len(localRoots),
+                                                                   'inotify' if usesInotify else 'polling'))
+
+        pendingChanges = {}
+        # Tasks of files being synced, by file path without extension, so files renamed by compression are included.
+        inFlightTasks = {}
+        nextRefreshTime = 0
+        try:
+            while True:
+                if time() >= nextRefreshTime:
+                    for tasks in inFlightTasks.values():
+                        for task in tasks:
+                            task.exception()
+                    logger.info(' Syncing every path mapping.')
+                    for task in self._create_thread_pipeline():
+                        task.exception()
+                    self._log_transfer_stats()
+                    nextRefreshTime = time() + self.__daemonRefreshSeconds
+                    # Path mappings of parked accounts were left out, so they are synced once the park ends.
+                    parkedUntil = [self.__parking.get_parked_until(username=profile.account.username)
+                                   for profile in self.__syncProfiles]
+                    nextRefreshTime = min([nextRefreshTime] + [until for until in parkedUntil if until])
+
+                timeout = nextRefreshTime - time()
+                if pendingChanges:
+                    timeout = min(timeout, DAEMON_RETRY_SECONDS)
+                pendingChanges.update(watcher.get_changes(timeout=max(0, timeout)))
+
+                inFlightTasks = dict((filePath, tasks) for filePath, tasks in inFlightTasks.items()
+                                     if not all(task.done() for task in tasks))
+                for local_filePath, change in sorted(pendingChanges.items()):
+                    stem = path.splitext(local_filePath)[0]
+                    if stem in inFlightTasks:
+                        continue
+                    if change == CHANGE_RESCAN:
+                        del pendingChanges[local_filePath]
+                        nextRefreshTime = 0
+                        continue
+                    pathMappings = self._get_path_mappings(local_filePath=local_filePath)
+                    if any(self.__parking.get_parked_until(username=profile.account.username)
+                           for profile, pathMapping in pathMappings):
+                        continue
+                    del pendingChanges[local_filePath]
+                    for profile, pathMapping in pathMappings:
+                        tasks = self._create_local_change_tasks(profile=profile, pathMapping=pathMapping,
+                                                                local_filePath=sub('\\\\', '/', local_filePath),
+                                                                change=change)
+                        if tasks:
+                            inFlightTasks.setdefault(stem, []).extend(tasks)
+
+                self.__localIndex.save()
+
+        finally:
+            watcher.stop()
+            if self.__localIndex:
+                self.__localIndex.save()
+
+    def _set_uploaded_fingerprint(self, source_filePath, uploaded_filePath):
+        """
+        Record fingerprint local file was uploaded with. A compressed file replacing its source, ie: a video compressed
+        to another container, is recorded in place of the source, whose entry is removed.
+
+        Args:
+            source_filePath (str): Local file path upload was started for.
+            uploaded_filePath (str): Local file path uploaded, ie: its compressed file.
+        """
+
+        logger = getLogger('MegaManager._set_uploaded_fingerprint')
+        logger.setLevel(self.__logLevel)
+
+        if uploaded_filePath != source_filePath and not path.exists(source_filePath):
+            self.__localIndex.remove_entries(filePaths=[source_filePath])
+            self.__localIndex.set_synced_fingerprint(filePath=uploaded_filePath)
+        else:
+            self.__localIndex.set_synced_fingerprint(filePath=source_filePath)
+
     def _setup(self):
         """
         Setup MegaManager applicaiton.
@@ -731,13 +2686,23 @@ class MegaManager(object):
 
         try:
             self.__lib = Lib(logLevel=self.__logLevel)
+            self.__metrics = Metrics_Lib(logLevel=self.__logLevel)
+            self.__scheduler = TaskScheduler_Lib(logLevel=self.__logLevel)
             self._setup_logger(self.__megaManager_logFilePath)
             self._import_config_file_data()
+            ProcessWatchdog_Lib(logLevel=self.__logLevel).configure(stallSeconds=self.__processStallSeconds,
+                                                                    retries=self.__processStallRetries)
 
             self.__compressImages_lib = CompressImages_Lib(logLevel=self.__logLevel)
-            self.__ffmpeg = FFMPEG_Lib(ffmpegExePath=self.__ffmpegExePath, logLevel=self.__logLevel)
+            self.__ffmpeg = FFMPEG_Lib(ffmpegExePath=self.__ffmpegExePath, ffprobeExePath=self.__ffprobeExePath,
+                                       logLevel=self.__logLevel)
+            self.__parking = AccountParking_Lib(filePath=self.__parkedAccountsFilePath, logLevel=self.__logLevel)
             self.__megaTools = MegaTools_Lib(megaToolsDir=self.__megaToolsDir, downSpeedLimit=self.__downSpeed,
-                                             upSpeedLimit=self.__upSpeed, logLevel=self.__logLevel)
+                                             upSpeedLimit=self.__upSpeed, logLevel=self.__logLevel,
+                                             parking=self.__parking)
+            self.__storage = self._get_storage_backend()
+            if self.__mirrorRoot:
+                self.__mirror = LocalStorage_Lib(rootDir=self.__mirrorRoot, logLevel=self.__logLevel)
 
             # self.__foundUserPass = self._get_accounts_user_pass(file=self.__megaAccountsPath)
 
@@ -756,6 +2721,9 @@ class MegaManager(object):
         root = getLogger()
         root.setLevel(DEBUG)
 
+        if not path.isdir(path.dirname(logFile)):
+            makedirs(path.dirname(logFile))
+
         self.__handler = FileHandler(logFile)
         formatter = Formatter('%(levelname)s:%(name)s:%(message)s')
 
@@ -774,6 +2742,242 @@ class MegaManager(object):
         logger.setLevel(self.__logLevel)
         logger.info(' Logging to %s' % self.__megaManager_logFilePath)
 
+    def _sync_path_mapping_around_parked_account(self, profile, pathMapping, createTasks):
+        """
+        Sync path mapping as a per-file pipeline, unless its account is parked. Parked accounts' path mappings are
+        waited for, as are ones whose account is parked while syncing, up to self.__quotaMaxWaitSeconds, then planned
+        again, so only files not synced yet are transferred. Path mappings still parked after that, or parked in daemon
+        mode, are left for the next run or daemon refresh.
+
+        Args:
+            profile (SyncProfile): Profile path mapping belongs to.
+            pathMapping (PathMapping): Path mapping to sync.
+            createTasks (function): Plans path mapping sync and waits for it, ie: self._create_pipeline_tasks.
+
+        Returns:
+            Boolean: whether all tasks run succeeded or not.
+        """
+
+        logger = getLogger('MegaManager._sync_path_mapping_around_parked_account')
+        logger.setLevel(self.__logLevel)
+
+        username = profile.account.username
+        deadline = time() + self.__quotaMaxWaitSeconds
+        result = True
+        while True:
+            parkedUntil = self.__parking.get_parked_until(username=username)
+            if not parkedUntil:
+                result = createTasks(profile, pathMapping) and result
+                if not self.__parking.get_parked_until(username=username):
+                    return result
+            elif self.__daemon or parkedUntil > deadline:
+                logger.warning(' Account "%s" is parked, path mapping "%s" left for the next %s.' % (
+                    username, pathMapping.localPath, 'refresh' if self.__daemon else 'run'))
+                return result
+            else:
+                logger.info(' Waiting %d seconds for parked account "%s".' % (parkedUntil - time(), username))
+                sleep(max(0, parkedUntil - time()))
+
+    def _sync_path_mapping_shards(self, profile, pathMapping, download=False):
+        """
+        Sync path mapping as self.__shards parallel megacopy jobs, for first-time syncs of large trees. Files are listed
+        locally for uploads and remotely for downloads, then split into shards of about the same byte and file count.
+        The bandwidth limit is shared evenly between jobs. Units of each shard done are kept in the shard progress file,
+        so an interrupted sync skips them when run again.
+
+        Args:
+            profile (SyncProfile): Profile path mapping belongs to.
+            pathMapping (PathMapping): Path mapping to sync.
+            download (bool): Whether to download, else upload.
+
+        Returns:
+            Boolean: whether every shard succeeded or not.
+        """
+
+        logger = getLogger('MegaManager._sync_path_mapping_shards')
+        logger.setLevel(self.__logLevel)
+
+        username = profile.account.username
+        password = profile.account.password
+        localRoot = sub('\\\\', '/', pathMapping.localPath).rstrip('/')
+        remoteRoot = pathMapping.remotePath.rstrip('/')
+
+        files = {}
+        if download:
+            remoteFiles = self.__megaTools.list_files(username=username, password=password, remotePath=remoteRoot)
+            if remoteFiles is None:
+                logger.warning(' Error, could NOT list "%s"!' % remoteRoot)
+                return False
+            for remoteFile in remoteFiles:
+                if remoteFile['type'] == FILE_TYPE_FILE:
+                    files[remoteFile['path'][len(remoteRoot):]] = remoteFile['size'] or 0
+        else:
+            for local_filePath in self.__lib.get_local_file_paths_recursively(localRoot=localRoot):
+                try:
+                    files[sub('\\\\', '/', local_filePath)[len(localRoot):]] = path.getsize(local_filePath)
+                except OSError as e:
+                    logger.debug(' Exception: %s' % str(e))
+        if not files:
+            logger.debug(' No files to %s under "%s".' % ('download' if download else 'upload', localRoot))
+            return True
+
+        shardPlanner = ShardPlanner_Lib(shards=self.__shards, progressFilePath=self.__shardProgressFilePath,
+                                        logLevel=self.__logLevel)
+        shards = shardPlanner.get_shards(files=files)
+        transferKey = '%s:%s:%s:%s' % ('download' if download else 'upload', username, localRoot, remoteRoot)
+        completedUnits = shardPlanner.get_completed_units(transferKey=transferKey)
+
+        speedLimit = self.__downSpeed if download else self.__upSpeed
+        jobSpeedLimit = max(1, speedLimit // len(shards)) if speedLimit else None
+
+        logger.info(' Syncing "%s" with "%s" as %d shards, %d units done already.' % (
+            localRoot, remoteRoot, len(shards), len(completedUnits)))
+
+        if not download:
+            remoteDirPaths = set([remoteRoot])
+            for shard in shards:
+                for unit in shard['units']:
+                    if unit['path']:
+                        remoteDirPaths.add(remoteRoot + unit['path'])
+            # Parents are created before their subdirectories.
+            for remoteDirPath in list(remoteDirPaths):
+                parts = remoteDirPath[len(remoteRoot):].split('/')
+                remoteDirPaths.update(remoteRoot + '/'.join(parts[:index]) for index in range(2, len(parts)))
+            self.__megaTools.make_dirs(username=username, password=password, remoteDirPaths=sorted(remoteDirPaths))
+
+        scheduler = TaskScheduler_Lib(maxWorkers=len(shards), logLevel=self.__logLevel)
+        tasks = []
+        for index, shard in enumerate(shards):
+            tasks.append(scheduler.submit(target=self._sync_shard,
+                                          args=(username, password, localRoot, remoteRoot, shard, index, len(shards),
+                                                shardPlanner, transferKey, completedUnits, download, jobSpeedLimit),
+                                          name='thread_shard_%d' % index))
+        failedShards = [task for task in tasks if task.exception() or not task.result()]
+
+        if failedShards:
+            logger.warning(' %d of %d shards of "%s" failed, done units are skipped next run.' % (
+                len(failedShards), len(shards), localRoot))
+            return False
+
+        shardPlanner.clear_progress(transferKey=transferKey)
+        logger.info(' Success, synced "%s" with "%s" as %d shards.' % (localRoot, remoteRoot, len(shards)))
+        return True
+
+    def _sync_path_mappings_around_parked_accounts(self, download=False):
+        """
+        Sync path mappings of all profiles. Path mappings of accounts parked over quota or rate limit are skipped, so
+        other accounts' ones go on meanwhile, and synced again once their park ends. When only parked path mappings are
+        left, sync waits for the earliest park to end, up to self.__quotaMaxWaitSeconds from its start. Path mappings
+        still parked after that are left for the next run.
+
+        Args:
+            download (bool): Whether to download, else upload.
+        """
+
+        logger = getLogger('MegaManager._sync_path_mappings_around_parked_accounts')
+        logger.setLevel(self.__logLevel)
+
+        deadline = time() + self.__quotaMaxWaitSeconds
+        pending = [(profile, pathMapping) for profile in self.__syncProfiles for pathMapping in profile.pathMappings]
+        while pending:
+            parked = []
+            for profile, pathMapping in pending:
+                username = profile.account.username
+                if not self.__parking.get_parked_until(username=username):
+                    if self.__shards:
+                        self._sync_path_mapping_shards(profile=profile, pathMapping=pathMapping, download=download)
+                    elif download:
+                        self.__megaTools.download_all_files_from_account(username=username,
+                                                                         password=profile.account.password,
+                                                                         localRoot=pathMapping.localPath,
+                                                                         remoteRoot=pathMapping.remotePath)
+                    else:
+                        self.__megaTools.upload_to_account(username=username, password=profile.account.password,
+                                                           localRoot=pathMapping.localPath,
+                                                           remoteRoot=pathMapping.remotePath)
+                    # Account parked while syncing has only part of path mapping synced.
+                    if not self.__parking.get_parked_until(username=username):
+                        continue
+                parked.append((profile, pathMapping))
+
+            parkedUntil = [self.__parking.get_parked_until(username=profile.account.username)
+                           for profile, pathMapping in parked]
+            parkedUntil = [until for until in parkedUntil if until]
+            if parkedUntil and min(parkedUntil) > deadline:
+                logger.warning(' %d path mappings of parked accounts left for the next run.' % len(parked))
+                return
+            if parkedUntil:
+                logger.info(' Waiting %d seconds for parked account.' % (min(parkedUntil) - time()))
+                sleep(max(0, min(parkedUntil) - time()))
+            pending = parked
+
+    def _sync_shard(self, username, password, localRoot, remoteRoot, shard, index, shardCount, shardPlanner,
+                    transferKey, completedUnits, download, speedLimit):
+        """
+        Sync units of shard one after the other, logging progress of shard after each.
+
+        Args:
+            username (str): username of account
+            password (str): password of account
+            localRoot (str): Local root path of path mapping.
+            remoteRoot (str): Remote root path of path mapping.
+            shard (dict): Shard, from ShardPlanner_Lib.get_shards.
+            index (int): Index of shard.
+            shardCount (int): Number of shards of path mapping.
+            shardPlanner (ShardPlanner_Lib): Shard planner to record completed units with.
+            transferKey (str): Key of path mapping transfer.
+            completedUnits (set): Keys of units done by earlier runs, skipped.
+            download (bool): Whether to download, else upload.
+            speedLimit (int): Speed limit of shard's jobs. None for no limit.
+
+        Returns:
+            Boolean: whether every unit succeeded or not.
+        """
+
+        logger = getLogger('MegaManager._sync_shard')
+        logger.setLevel(self.__logLevel)
+
+        doneBytes = 0
+        failedCount = 0
+        for unit in shard['units']:
+            if unit['key'] not in completedUnits:
+                localPath = localRoot + unit['path']
+                remotePath = remoteRoot + unit['path']
+                if unit['type'] == UNIT_TYPE_DIR and download:
+                    result = self.__megaTools.download_dir(username=username, password=password, localDir=localPath,
+                                                           remoteDir=remotePath, speedLimit=speedLimit)
+                elif unit['type'] == UNIT_TYPE_DIR:
+                    result = self.__megaTools.upload_local_dir(username=username, password=password,
+                                                               localDir=localPath, remoteDir=remotePath,
+                                                               speedLimit=speedLimit)
+                else:
+                    result = True
+                    for subPath in unit['files']:
+                        if download:
+                            fileResult = self.__megaTools.download_file(username=username, password=password,
+                                                                        localFilePath=localRoot + subPath,
+                                                                        remoteFilePath=remoteRoot + subPath,
+                                                                        speedLimit=speedLimit)
+                        else:
+                            fileResult = self.__megaTools.upload_file(username=username, password=password,
+                                                                      localFilePath=localRoot + subPath,
+                                                                      remoteFilePath=remoteRoot + subPath,
+                                                                      speedLimit=speedLimit)
+                        result = result and fileResult
+
+                if not result:
+                    failedCount += 1
+                    logger.warning(' Shard %d/%d: could NOT sync "%s".' % (index + 1, shardCount, localPath))
+                    continue
+                shardPlanner.set_unit_completed(transferKey=transferKey, unitKey=unit['key'])
+
+            doneBytes += unit['bytes']
+            logger.info(' Shard %d/%d: %d of %d bytes done (%.1f%%).' % (
+                index + 1, shardCount, doneBytes, shard['bytes'],
+                100.0 * doneBytes / shard['bytes'] if shard['bytes'] else 100.0))
+
+        return not failedCount
+
     def _tear_down(self):
         """
         Tearing down of MEGA Manager.
@@ -797,6 +3001,7 @@ class MegaManager(object):
                                               filePath=self.__compressedVideosFilePath, )
                 self.__lib.dump_set_into_file(itemSet=self.__unableToCompressVideoFiles,
                                               filePath=self.__unableToCompressVideosFilePath)
+                self.__lib.dump_dict_into_file(itemDict=self.__videoProbes, filePath=self.__videoProbesFilePath)
 
             self.__lib.kill_running_processes_with_name('megacopy.exe')
             self.__lib.kill_running_processes_with_name('megals.exe')
@@ -824,11 +3029,11 @@ class MegaManager(object):
         username = account.username
         password = account.password
 
-        account.totalSpace = self.__megaTools.get_account_total_space(username=username, password=password)
-
-        account.freeSpace = self.__megaTools.get_account_free_space(username=username, password=password)
-
-        account.usedSpace = self.__megaTools.get_account_used_space(username=username, password=password)
+        quota = self.__storage.get_quota(username=username, password=password)
+        if quota:
+            account.totalSpace = quota['total'] / float(1024 ** 3)
+            account.freeSpace = quota['free'] / float(1024 ** 3)
+            account.usedSpace = quota['used'] / float(1024 ** 3)
         # accountDetails.append('REMOTE SIZE: ' + usedSpace)
         #
         # subDirs = self.__megaTools.get_remote_subdir_names_only(username=username, password=password, remotePath=self.__remoteRoot)
@@ -902,10 +3107,14 @@ class MegaManager(object):
 
     def _wait_for_threads_to_finish(self, timeout=99999):
         """
-        Wait for threads to finish.
+        Wait for threads to finish. Blocks until every scheduled task is done or timeout is reached, then logs the
+        outcome of each task.
 
         Args:
             timeout (int): Maximum time in seconds to wait for threads.
+
+        Returns:
+            Boolean: whether all threads finished without raising or not.
         """
 
         logger = getLogger('MegaManager._wait_for_threads_to_finish')
@@ -913,29 +3122,22 @@ class MegaManager(object):
         
         logger.debug(' Waiting for threads to finish.')
 
-        startTime = time()
-        megaFileFinished = False
-
-        while len(self.__threads) > 0:
-            megaFileThreads_found = False
-
-            if not time() - startTime > timeout:
-                for thread in self.__threads:
-                    if not thread.isAlive():
-                        self.__threads.remove(thread)
-                        logger.info(' Thread "%s" finished!' % thread.name)
-                        logger.debug(' Threads left: %d' % len(self.__threads))
-                    else:
-                        if 'megaFile' in thread.name:
-                            megaFileThreads_found = True
-
-                if not megaFileThreads_found and not megaFileFinished:
-                    self._export_accounts_details_dict()
-                    logger.info(' "%s" file creation complete!' % self.__megaAccountsOutputPath)
-                    megaFileFinished = True
+        finished = self.__scheduler.join(timeout=timeout)
+        if not finished:
+            logger.warning(' Waiting for threads to complete TIMED OUT! Timeout %d (seconds)' % timeout)
+
+        failed = False
+        for task in self.__scheduler.tasks:
+            if not task.done():
+                logger.warning(' Thread "%s" still running!' % task.name)
+            elif task.exception():
+                logger.error(' Thread "%s" failed after %.1f seconds: %s' % (task.name, task.runTime,
+                                                                           str(task.exception())))
+                failed = True
             else:
-                logger.debug(' Waiting for threads to complete TIMED OUT! Timeout %d (seconds)' % timeout)
-                return
+                logger.debug(' Thread "%s" finished in %.1f seconds.' % (task.name, task.runTime))
+
+        return finished and not failed
 
     def get_mega_manager_log_file(self):
         """
@@ -950,6 +3152,9 @@ class MegaManager(object):
     def run(self):
         """
         Run MegaManager tasks.
+
+        Returns:
+            Boolean: whether every task finished without raising or not.
         """
 
         logger = getLogger('MegaManager.run')
@@ -958,34 +3163,77 @@ class MegaManager(object):
 
         logger.debug(' Running MEGA Manager.')
 
+        succeeded = False
         try:
+            if self.__benchmarkProfiles:
+                self._benchmark_encode_profiles(samplePath=self.__benchmarkProfiles)
+                return True
+
+            if self.__findDuplicates:
+                self._find_duplicate_files()
+                return True
 
-            self._create_thread_create_profiles_data_file()
+            if self.__planPlacement:
+                self._plan_placement()
+                return True
+
+            if self.__applyPlacement:
+                self._apply_placement()
+                return True
+
+            if self.__compressAll:
+                self.__compressImages = True
+                self.__compressVideos = True
+
+            # Compressing scanned local files with no sync to do needs no account, so it works offline.
+            localOnly = self.__compressLocal and not (self.__download or self.__upload or self.__removeRemote or
+                                                      self.__daemon or self.__pipeline or self.__incremental)
+            # Whole account syncs use megacopy, other storage backends only support the per-file pipeline.
+            pipeline = not localOnly and (self.__pipeline or self.__incremental or
+                                          self.__storageBackend != STORAGE_BACKEND_MEGATOOLS)
+
+            # Pipeline compresses each file as it is synced, so only batch compression keeps to a budget.
+            if (self.__daemon or pipeline) and (self.__compressImages or self.__compressVideos) and \
+                    (self.__compressMaxBytes or self.__compressMaxSeconds):
+                logger.error(' Error, --compressMaxBytes and --compressMaxSeconds only apply to batch compression, '
+                             'NOT to pipeline or daemon syncs!')
+                return False
+
+            if not localOnly:
+                self._create_thread_create_profiles_data_file()
 
             if self.__removeIncomplete:
                 self._create_threads_local_unfinished_file_remover()
 
-            if self.__download:
-                self._create_thread_download()
-            if self.__upload:
-                self._create_thread_upload()
-            if self.__removeRemote:
-                self._create_threads_removed_remote_file_deletion()
+            if self.__daemon:
+                self._run_daemon()
+            elif pipeline:
+                self._create_thread_pipeline()
+            else:
+                if self.__download:
+                    self._create_thread_download()
+                if self.__upload:
+                    self._create_thread_upload()
+                if self.__removeRemote:
+                    self._create_threads_removed_remote_file_deletion()
 
-            if self.__compressAll:
-                self._create_thread_compress_image_files()
-                self._create_thread_compress_video_files()
-            elif self.__compressImages:
-                self._create_thread_compress_image_files()
-            elif self.__compressVideos:
-                self._create_thread_compress_video_files()
+                if self.__compressImages or self.__compressVideos:
+                    self._create_thread_compress_files()
 
-            self._wait_for_threads_to_finish()
+            succeeded = self._wait_for_threads_to_finish()
 
         except Exception as e:
             logger.debug(' Exception: ' + str(e))
             self._tear_down()
 
+        finally:
+            self._log_transfer_stats()
+            if self.__storage:
+                self.__storage.close()
+            self._export_command_metrics()
+
+        return succeeded
+
 
 
 def main():
@@ -14,7 +14,7 @@ __author__ = 'szmania'
 SCRIPT_DIR = path.dirname(path.realpath(__file__))
 
 class PathMapping(Account):
-    def __init__(self, localPath, remotePath, logLevel='DEBUG'):
+    def __init__(self, localPath, remotePath, encodeProfile=None, logLevel='DEBUG'):
         """
         Class used to keep track of local and remote path mappings. This correlates local locations with remote locations,
         for syncing purposes.
@@ -22,18 +22,48 @@ class PathMapping(Account):
         Args:
             localPath (str): Local path of path mapping.
             remotePath (str): Remote path of path mapping.
+            encodeProfile (str): Name of encode profile used to compress videos in path mapping. None for default.
             logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
         """
 
 
         self.__localPath = localPath
         self.__remotePath = remotePath
+        self.__encodeProfile = encodeProfile
         self.__logLevel = logLevel
 
         self.__localPath_freeSpace = None
         self.__localPath_usedSpace = None
         self.__remotePath_usedSpace = None
 
+    @property
+    def encodeProfile(self):
+        """
+        Getter for encode profile name.
+
+        Returns:
+            String: Returns encode profile name
+        """
+
+        logger = getLogger('SyncProfile.encodeProfile')
+        logger.setLevel(self.__logLevel)
+
+        return self.__encodeProfile
+
+    @encodeProfile.setter
+    def encodeProfile(self, value):
+        """
+        Setter for encode profile name.
+
+        Args:
+            value (str): value to set encode profile name to.
+        """
+
+        logger = getLogger('SyncProfile.encodeProfile')
+        logger.setLevel(self.__logLevel)
+
+        self.__encodeProfile = value
+
     @property
     def localPath(self):
         """
@@ -0,0 +1,102 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import path
+from shutil import rmtree
+from sys import path as sysPath
+from tempfile import mkdtemp
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import concurrencyTuner_lib, ConcurrencyTuner_Lib
+from libs.concurrencyTuner_lib import TUNER_INTERVAL_TRANSFERS, TUNER_PROBE_INTERVALS
+
+KEY = 'upload:test@fake.mega:all'
+LOG_LEVEL = 'WARNING'
+INTERVAL_SECONDS = 10
+
+
+class Clock(object):
+    """
+    Clock standing in for time(), only moving when told to.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ConcurrencyTuner_LibTest(TestCase):
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='concurrencyTunerTest_')
+        self.filePath = path.join(self.tempDir, 'concurrency_levels.json')
+        self.clock = Clock()
+        self.time = concurrencyTuner_lib.time
+        concurrencyTuner_lib.time = self.clock
+        self.tuner = ConcurrencyTuner_Lib(filePath=self.filePath, intervalSeconds=INTERVAL_SECONDS,
+                                          logLevel=LOG_LEVEL)
+
+    def tearDown(self):
+        concurrencyTuner_lib.time = self.time
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def run_interval(self, level, bytesPerSecond, failed=False, saturated=True):
+        """
+        Record one interval of transfers at level, lasting INTERVAL_SECONDS.
+
+        Args:
+            level (int): Concurrency transfers ran at.
+            bytesPerSecond (int): Throughput of interval.
+            failed (bool): Whether last transfer of interval failed.
+            saturated (bool): Whether transfers were waiting for a free worker.
+
+        Returns:
+            Integer: new concurrency level. None if unchanged.
+        """
+
+        count = level * TUNER_INTERVAL_TRANSFERS
+        size = bytesPerSecond * INTERVAL_SECONDS // count
+        for index in range(count - 1):
+            self.assertIsNone(self.tuner.record_transfer(key=KEY, level=level, size=size, failed=False,
+                                                         saturated=saturated))
+        self.clock.now += INTERVAL_SECONDS
+        return self.tuner.record_transfer(key=KEY, level=level, size=size, failed=failed, saturated=saturated)
+
+    def test_additive_increase_multiplicative_decrease(self):
+        # One more worker while throughput rises, one less once it stays the same.
+        self.assertEqual(self.run_interval(level=2, bytesPerSecond=1000), 3)
+        self.assertEqual(self.run_interval(level=3, bytesPerSecond=1500), 4)
+        self.assertEqual(self.run_interval(level=4, bytesPerSecond=1500), 3)
+
+        # Halved on failures, then the next interval only measures throughput at the lower level.
+        self.assertEqual(self.run_interval(level=3, bytesPerSecond=1500, failed=True), 1)
+        self.assertIsNone(self.run_interval(level=1, bytesPerSecond=500))
+
+        # One more worker is tried after steady intervals, and halved again when throughput falls.
+        for index in range(TUNER_PROBE_INTERVALS - 1):
+            self.assertIsNone(self.run_interval(level=1, bytesPerSecond=500))
+        self.assertEqual(self.run_interval(level=1, bytesPerSecond=500), 2)
+        self.assertEqual(self.run_interval(level=2, bytesPerSecond=200), 1)
+
+        tuner = ConcurrencyTuner_Lib(filePath=self.filePath, logLevel=LOG_LEVEL)
+        self.assertEqual(tuner.get_level(key=KEY, default=4), 1)
+
+    def test_unsaturated_intervals_only_count_failures(self):
+        self.assertEqual(self.run_interval(level=2, bytesPerSecond=1000), 3)
+        self.assertIsNone(self.run_interval(level=3, bytesPerSecond=100, saturated=False))
+        self.assertEqual(self.run_interval(level=3, bytesPerSecond=100, failed=True, saturated=False), 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import path, remove, utime
+from shutil import rmtree
+from sys import path as sysPath
+from tempfile import mkdtemp
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import LocalIndex_Lib
+
+LOG_LEVEL = 'WARNING'
+
+
+class LocalIndex_LibTest(TestCase):
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='localIndexTest_')
+        self.indexFilePath = path.join(self.tempDir, 'local_index.json')
+        self.localIndex = LocalIndex_Lib(filePath=self.indexFilePath, logLevel=LOG_LEVEL)
+        self.filePaths = [path.join(self.tempDir, name) for name in ['same.txt', 'changed.txt', 'touched.txt']]
+        for filePath in self.filePaths:
+            self.write_file(filePath=filePath, data=path.basename(filePath).encode('ascii') * 1000)
+
+    def tearDown(self):
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def write_file(self, filePath, data):
+        """
+        Write local file.
+
+        Args:
+            filePath (str): Local file path.
+            data (bytes): File content.
+        """
+
+        with open(filePath, 'wb') as localFile:
+            localFile.write(data)
+
+    def test_synced_fingerprints(self):
+        for filePath in self.filePaths:
+            self.assertIsNotNone(self.localIndex.set_synced_fingerprint(filePath=filePath))
+        self.localIndex.save()
+
+        sameFilePath, changedFilePath, touchedFilePath = self.filePaths
+        newFilePath = path.join(self.tempDir, 'new.txt')
+        self.write_file(filePath=changedFilePath, data=b'changed')
+        # Fingerprints hold modification time, as MEGA's do, so a touched file is synced again.
+        utime(touchedFilePath, (1000000000, 1000000000))
+        self.write_file(filePath=newFilePath, data=b'new')
+
+        localIndex = LocalIndex_Lib(filePath=self.indexFilePath, logLevel=LOG_LEVEL)
+        entries = localIndex.get_entries(filePaths=self.filePaths + [newFilePath])
+        self.assertEqual(entries[sameFilePath]['fingerprint'], entries[sameFilePath]['synced'])
+        self.assertNotEqual(entries[changedFilePath]['fingerprint'], entries[changedFilePath]['synced'])
+        self.assertNotEqual(entries[touchedFilePath]['fingerprint'], entries[touchedFilePath]['synced'])
+        self.assertIsNone(entries[newFilePath]['synced'])
+        self.assertEqual(localIndex.get_unsynced_bytes(dirPath=self.tempDir), len(b'new'))
+
+        # Entries of removed files are kept, with the fingerprint they were synced with, until removed.
+        remove(changedFilePath)
+        self.assertEqual(sorted(localIndex.get_synced_entries(dirPath=self.tempDir)), sorted(self.filePaths))
+        localIndex.remove_entries(filePaths=[changedFilePath])
+        self.assertEqual(sorted(localIndex.get_synced_entries(dirPath=self.tempDir)),
+                         sorted([sameFilePath, touchedFilePath]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import makedirs, path, remove
+from shutil import rmtree
+from sys import path as sysPath
+from tempfile import mkdtemp
+from time import time
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import CHANGE_CHANGED, CHANGE_REMOVED, LocalWatcher_Lib
+
+LOG_LEVEL = 'WARNING'
+DEBOUNCE_SECONDS = 0.3
+POLL_SECONDS = 0.2
+TIMEOUT_SECONDS = 10
+
+
+class LocalWatcher_LibTest(TestCase):
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='localWatcherTest_')
+        self.localRoot = path.join(self.tempDir, 'local')
+        makedirs(self.localRoot)
+        self.write_file(name='removed.txt')
+        self.watcher = LocalWatcher_Lib(localRoots=[self.localRoot], ignoredPatterns=['*.part'],
+                                        debounceSeconds=DEBOUNCE_SECONDS, pollSeconds=POLL_SECONDS,
+                                        logLevel=LOG_LEVEL)
+
+    def tearDown(self):
+        self.watcher.stop()
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def get_changes(self, expected):
+        """
+        Get changes until expected paths changed, or TIMEOUT_SECONDS passed.
+
+        Args:
+            expected (list): Local paths expected to change.
+
+        Returns:
+            Dictionary: of local path to last change.
+        """
+
+        changes = {}
+        endTime = time() + TIMEOUT_SECONDS
+        while not all(filePath in changes for filePath in expected) and time() < endTime:
+            changes.update(self.watcher.get_changes(timeout=endTime - time()))
+        return changes
+
+    def write_file(self, name, data=b'data'):
+        """
+        Write file under local root.
+
+        Args:
+            name (str): File path relative to local root.
+            data (bytes): File content.
+
+        Returns:
+            String: file path.
+        """
+
+        filePath = path.join(self.localRoot, name)
+        with open(filePath, 'wb') as localFile:
+            localFile.write(data)
+        return filePath
+
+    def test_changed_and_removed_files(self):
+        self.watcher.start()
+
+        changedFilePath = self.write_file(name='changed.txt')
+        for index in range(5):
+            self.write_file(name='changed.txt', data=b'data' * index)
+        makedirs(path.join(self.localRoot, 'sub'))
+        subFilePath = self.write_file(name=path.join('sub', 'new.txt'))
+        self.write_file(name='download.part')
+        removedFilePath = path.join(self.localRoot, 'removed.txt')
+        remove(removedFilePath)
+
+        changes = self.get_changes(expected=[changedFilePath, subFilePath, removedFilePath])
+        self.assertEqual(changes.get(changedFilePath), CHANGE_CHANGED)
+        self.assertEqual(changes.get(subFilePath), CHANGE_CHANGED)
+        self.assertEqual(changes.get(removedFilePath), CHANGE_REMOVED)
+        self.assertNotIn(path.join(self.localRoot, 'download.part'), changes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import makedirs, path
+from shutil import rmtree
+from sys import path as sysPath
+from tempfile import mkdtemp
+from time import sleep
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+FAKE_MEGA_API_DIR = path.join(MEGAMANAGER_DIR, 'tools', 'fakeMegaApi')
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+sysPath.insert(0, FAKE_MEGA_API_DIR)
+
+from fakeMegaApi import FakeMegaApi
+from libs import ChunkedDownload_Lib, ChunkedUpload_Lib, MegaApi_Lib, RemoteState_Lib
+
+USERNAME = 'test@fake.mega'
+PASSWORD = 'password'
+LOG_LEVEL = 'WARNING'
+
+
+class MegaApi_LibTest(TestCase):
+    """
+    MegaApi_Lib against FakeMegaApi, serving a directory account holding "/Root/a/g.txt" and "/Root/a/b/h.txt".
+    """
+
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='megaApiTest_')
+        self.rootDir = path.join(self.tempDir, 'fakeMega')
+        self.accountDir = path.join(self.rootDir, USERNAME)
+        self.write_remote_file('/Root/a/g.txt', b'g' * 1000)
+        self.write_remote_file('/Root/a/b/h.txt', b'h' * 300000)
+
+        self.fakeApis = []
+        self.megaApis = []
+
+    def tearDown(self):
+        for megaApi in self.megaApis:
+            megaApi.close()
+        for fakeApi in self.fakeApis:
+            fakeApi.stop()
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def get_mega_api(self, sessionSeconds=0, remoteState=None):
+        """
+        Start fake MEGA API server and get API client of it.
+
+        Args:
+            sessionSeconds (int): Seconds sessions last before requests fail with ESID. 0 for no expiry.
+            remoteState (RemoteState_Lib): Store node trees are kept in. None to fetch trees every time.
+
+        Returns:
+            Tuple: of fake MEGA API server and MegaApi_Lib client.
+        """
+
+        fakeApi = FakeMegaApi(rootDir=self.rootDir, password=PASSWORD, sessionSeconds=sessionSeconds)
+        self.fakeApis.append(fakeApi)
+        megaApi = MegaApi_Lib(apiUrl=fakeApi.start(), remoteState=remoteState,
+                              downloader=ChunkedDownload_Lib(logLevel=LOG_LEVEL),
+                              uploader=ChunkedUpload_Lib(logLevel=LOG_LEVEL), logLevel=LOG_LEVEL)
+        self.megaApis.append(megaApi)
+        return fakeApi, megaApi
+
+    def list_paths(self, megaApi, remotePath='/Root'):
+        """
+        List remote paths under remote directory.
+
+        Args:
+            megaApi (MegaApi_Lib): API client.
+            remotePath (str): Remote directory path to list.
+
+        Returns:
+            List: of sorted remote paths.
+        """
+
+        return sorted(fileData['path'] for fileData in megaApi.list_files(username=USERNAME, password=PASSWORD,
+                                                                          remotePath=remotePath))
+
+    def write_remote_file(self, remoteFilePath, content):
+        """
+        Write file straight into the simulated account, as fake megatools or another client would.
+
+        Args:
+            remoteFilePath (str): Remote file path, ie: "/Root/a/g.txt".
+            content (bytes): File content.
+        """
+
+        filePath = path.join(self.accountDir, *remoteFilePath.strip('/').split('/'))
+        if not path.isdir(path.dirname(filePath)):
+            makedirs(path.dirname(filePath))
+        with open(filePath, 'wb') as remoteFile:
+            remoteFile.write(content)
+
+    def test_list_and_stat(self):
+        fakeApi, megaApi = self.get_mega_api()
+
+        self.assertEqual(self.list_paths(megaApi), ['/Root/a', '/Root/a/b', '/Root/a/b/h.txt', '/Root/a/g.txt'])
+        self.assertEqual(sorted(fileData['path'] for fileData in megaApi.list_files(
+            username=USERNAME, password=PASSWORD, remotePath='/Root/a', recursive=False)),
+            ['/Root/a/b', '/Root/a/g.txt'])
+        self.assertIsNone(megaApi.list_files(username=USERNAME, password=PASSWORD, remotePath='/Root/missing'))
+
+        fileData = megaApi.stat_file(username=USERNAME, password=PASSWORD, remoteFilePath='/Root/a/b/h.txt')
+        self.assertEqual(fileData['size'], 300000)
+        self.assertIsNone(megaApi.stat_file(username=USERNAME, password=PASSWORD, remoteFilePath='/Root/a/none.txt'))
+        self.assertEqual(fakeApi.get_stats()['logins'], 1)
+
+    def test_make_dirs(self):
+        fakeApi, megaApi = self.get_mega_api()
+
+        self.assertTrue(megaApi.make_dir(username=USERNAME, password=PASSWORD, remoteDirPath='/Root/a/new'))
+        self.assertFalse(megaApi.make_dir(username=USERNAME, password=PASSWORD, remoteDirPath='/Root/a/new'))
+        self.assertFalse(megaApi.make_dir(username=USERNAME, password=PASSWORD, remoteDirPath='/Root/x/y'))
+
+        existing = megaApi.make_dirs(username=USERNAME, password=PASSWORD,
+                                     remoteDirPaths=['/Root/c/d/e', '/Root/c/f', '/Root/a', '/Root/a/g.txt/i'])
+        self.assertEqual(existing, ['/Root', '/Root/a', '/Root/c', '/Root/c/d', '/Root/c/d/e', '/Root/c/f'])
+        self.assertTrue(path.isdir(path.join(self.accountDir, 'Root', 'c', 'd', 'e')))
+        self.assertEqual(megaApi.stat_file(username=USERNAME, password=PASSWORD, remoteFilePath='/Root/c/f')['type'],
+                         megaApi.stat_file(username=USERNAME, password=PASSWORD, remoteFilePath='/Root/a')['type'])
+
+    def test_put_and_get_file(self):
+        fakeApi, megaApi = self.get_mega_api()
+
+        localFilePath = path.join(self.tempDir, 'local.bin')
+        content = bytes(bytearray(index % 251 for index in range(1500000)))
+        with open(localFilePath, 'wb') as localFile:
+            localFile.write(content)
+
+        self.assertTrue(megaApi.put_file(username=USERNAME, password=PASSWORD, localFilePath=localFilePath,
+                                         remoteFilePath='/Root/a/local.bin'))
+        with open(path.join(self.accountDir, 'Root', 'a', 'local.bin'), 'rb') as remoteFile:
+            self.assertEqual(remoteFile.read(), content)
+        self.assertFalse(megaApi.put_file(username=USERNAME, password=PASSWORD, localFilePath=localFilePath,
+                                          remoteFilePath='/Root/a/local.bin'))
+
+        downloadFilePath = path.join(self.tempDir, 'h.txt')
+        self.assertTrue(megaApi.get_file(username=USERNAME, password=PASSWORD, remoteFilePath='/Root/a/b/h.txt',
+                                         localFilePath=downloadFilePath))
+        with open(downloadFilePath, 'rb') as downloadFile:
+            self.assertEqual(downloadFile.read(), b'h' * 300000)
+
+    def test_move_copy_and_remove(self):
+        fakeApi, megaApi = self.get_mega_api()
+
+        self.assertTrue(megaApi.move_file(username=USERNAME, password=PASSWORD, remoteFilePath='/Root/a/g.txt',
+                                          newRemoteFilePath='/Root/a/b/moved.txt'))
+        self.assertTrue(megaApi.copy_file(username=USERNAME, password=PASSWORD, remoteFilePath='/Root/a/b/h.txt',
+                                          newRemoteFilePath='/Root/a/copy.txt'))
+        self.assertFalse(megaApi.copy_file(username=USERNAME, password=PASSWORD, remoteFilePath='/Root/a/none.txt',
+                                           newRemoteFilePath='/Root/a/none2.txt'))
+        self.assertEqual(self.list_paths(megaApi),
+                         ['/Root/a', '/Root/a/b', '/Root/a/b/h.txt', '/Root/a/b/moved.txt', '/Root/a/copy.txt'])
+        with open(path.join(self.accountDir, 'Root', 'a', 'copy.txt'), 'rb') as remoteFile:
+            self.assertEqual(remoteFile.read(), b'h' * 300000)
+
+        removed = megaApi.remove_files(username=USERNAME, password=PASSWORD,
+                                       remoteFilePaths=['/Root/a/copy.txt', '/Root/a/b', '/Root/none'])
+        self.assertEqual(removed, 2)
+        self.assertEqual(self.list_paths(megaApi), ['/Root/a'])
+        self.assertFalse(path.exists(path.join(self.accountDir, 'Root', 'a', 'b')))
+
+    def test_external_changes_are_picked_up(self):
+        fakeApi, megaApi = self.get_mega_api()
+        self.list_paths(megaApi)
+
+        self.write_remote_file('/Root/a/external.txt', b'e' * 10)
+        self.assertIn('/Root/a/external.txt', self.list_paths(megaApi))
+        self.assertGreaterEqual(fakeApi.get_stats()['polls'], 1)
+
+    def test_expired_changes_fetch_whole_tree(self):
+        remoteState = RemoteState_Lib(dirPath=path.join(self.tempDir, 'remote_state'), logLevel=LOG_LEVEL)
+        fakeApi, megaApi = self.get_mega_api(remoteState=remoteState)
+        self.list_paths(megaApi)
+        megaApi.close()
+        fakeApi.stop()
+        self.assertIsNotNone(remoteState.load_tree(username=USERNAME))
+
+        # A restarted server has no changes logged since the saved tree's sequence number, so it answers ETOOMANY.
+        self.write_remote_file('/Root/a/later.txt', b'l' * 10)
+        fakeApi, megaApi = self.get_mega_api(remoteState=remoteState)
+        self.assertEqual(self.list_paths(megaApi),
+                         ['/Root/a', '/Root/a/b', '/Root/a/b/h.txt', '/Root/a/g.txt', '/Root/a/later.txt'])
+        self.assertGreaterEqual(fakeApi.get_stats()['polls'], 1)
+
+    def test_expired_session_logs_in_again(self):
+        fakeApi, megaApi = self.get_mega_api(sessionSeconds=1)
+        self.list_paths(megaApi)
+
+        sleep(1.5)
+        self.assertEqual(self.list_paths(megaApi), ['/Root/a', '/Root/a/b', '/Root/a/b/h.txt', '/Root/a/g.txt'])
+        self.assertTrue(megaApi.make_dir(username=USERNAME, password=PASSWORD, remoteDirPath='/Root/a/new'))
+        self.assertEqual(fakeApi.get_stats()['logins'], 2)
+
+
+if __name__ == '__main__':
+    main()
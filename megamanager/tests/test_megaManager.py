@@ -0,0 +1,220 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import environ, listdir, makedirs, path, remove, rename, stat
+from shutil import rmtree
+from sys import executable, path as sysPath
+from tempfile import mkdtemp
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+FAKE_MEGA_TOOLS_DIR = path.join(MEGAMANAGER_DIR, 'tools', 'fakeMegaTools')
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import LocalIndex_Lib, LocalStorage_Lib, MegaTools_Lib
+from megaManager import MegaManager
+
+USERNAME = 'test@fake.mega'
+PASSWORD = 'password'
+LOG_LEVEL = 'WARNING'
+REMOTE_ROOT = '/Root/sync'
+
+
+def create_mega_manager(dataDir, localDir, config='', **kwargs):
+    """
+    Create MegaManager syncing local directory to REMOTE_ROOT of one account, keeping its data files in data directory.
+
+    Args:
+        dataDir (str): Directory to keep config and data files in.
+        localDir (str): Local path of path mapping.
+        config (str): Config file lines added before profile.
+        kwargs (dict): MegaManager arguments, ie: "upload".
+
+    Returns:
+        MegaManager: MEGA Manager.
+    """
+
+    configPath = path.join(dataDir, 'megaManager.cfg')
+    with open(configPath, 'w') as configFile:
+        configFile.write('MEGATOOLS_DIR=%s\nFFMPEG_EXE_PATH=%s\nMEGA_ACCOUNTS_OUTPUT=%s\n%s[Profile1]\n'
+                         'ProfileName=test\nUsername=%s\nPassword=%s\nLocalPath1=%s\nRemotePath1=%s\n' % (
+                             FAKE_MEGA_TOOLS_DIR, path.join(dataDir, 'ffmpeg'), path.join(dataDir, 'accounts.txt'),
+                             config, USERNAME, PASSWORD, localDir, REMOTE_ROOT))
+    for name, fileName in [('commandMetricsFilePath', 'command_metrics.json'),
+                           ('duplicateIndexFilePath', 'duplicates.json'), ('localIndexFilePath', 'local_index.json'),
+                           ('megaManager_logFilePath', 'megaManager.log'), ('metricsTextfile', 'metrics.prom'),
+                           ('parkedAccountsFilePath', 'parked_accounts.json'), ('remoteStateDirPath', 'remote_state'),
+                           ('sessionCacheFilePath', 'sessions.json')]:
+        kwargs.setdefault(name, path.join(dataDir, fileName))
+    return MegaManager(configPath=configPath, logLevel=LOG_LEVEL, **kwargs)
+
+
+class FailingStorage(LocalStorage_Lib):
+    """
+    Local storage failing every upload.
+    """
+
+    def put_file(self, username, password, localFilePath, remoteFilePath):
+        return False
+
+
+class MegaManagerPipelineUploadTest(TestCase):
+    """
+    Pipeline upload stage replacing remote file "/Root/sync/f.txt" of a directory account with its modified local file.
+    """
+
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='megaManagerTest_')
+        self.rootDir = path.join(self.tempDir, 'fakeMega')
+        self.localDir = path.join(self.tempDir, 'local')
+        self.dataDir = path.join(self.tempDir, 'data')
+        for dirPath in [path.join(self.rootDir, USERNAME, 'Root', 'sync'), self.localDir, self.dataDir]:
+            makedirs(dirPath)
+        self.remoteFilePath = path.join(self.rootDir, USERNAME, 'Root', 'sync', 'f.txt')
+        with open(self.remoteFilePath, 'wb') as remoteFile:
+            remoteFile.write(b'old')
+        self.localFilePath = path.join(self.localDir, 'f.txt')
+        with open(self.localFilePath, 'wb') as localFile:
+            localFile.write(b'modified')
+
+        self.environ = dict(environ)
+        environ.update({'FAKE_MEGA_ROOT': self.rootDir, 'FAKE_MEGA_PYTHON': executable})
+
+        self.megaManager = create_mega_manager(dataDir=self.dataDir, localDir=self.localDir)
+        self.localIndex = LocalIndex_Lib(filePath=path.join(self.dataDir, 'local_index.json'), logLevel=LOG_LEVEL)
+        self.megaManager._MegaManager__localIndex = self.localIndex
+
+    def tearDown(self):
+        environ.clear()
+        environ.update(self.environ)
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def upload(self, storage):
+        """
+        Replace remote file with modified local file.
+
+        Args:
+            storage (StorageBackend_Lib): Storage backend to upload to.
+
+        Returns:
+            String: remote file path file was uploaded to.
+        """
+
+        self.megaManager._MegaManager__storage = storage
+        return self.megaManager._pipeline_upload_file(username=USERNAME, password=PASSWORD,
+                                                      local_filePath=self.localFilePath, localRoot=self.localDir,
+                                                      remoteRoot=REMOTE_ROOT, existsRemotely=True, modified=True)
+
+    def test_failed_upload_keeps_remote_file(self):
+        self.assertRaises(IOError, self.upload, FailingStorage(rootDir=self.rootDir, logLevel=LOG_LEVEL))
+
+        with open(self.remoteFilePath, 'rb') as remoteFile:
+            self.assertEqual(remoteFile.read(), b'old')
+        self.assertIsNone(self.localIndex.get_synced_fingerprint(filePath=self.localFilePath))
+
+    def test_replaces_remote_file_by_moving(self):
+        self.assertEqual(self.upload(LocalStorage_Lib(rootDir=self.rootDir, logLevel=LOG_LEVEL)),
+                         REMOTE_ROOT + '/f.txt')
+
+        with open(self.remoteFilePath, 'rb') as remoteFile:
+            self.assertEqual(remoteFile.read(), b'modified')
+        self.assertEqual(listdir(path.dirname(self.remoteFilePath)), ['f.txt'])
+        self.assertIsNotNone(self.localIndex.get_synced_fingerprint(filePath=self.localFilePath))
+
+    def test_replaces_remote_file_without_moving(self):
+        megaTools = MegaTools_Lib(megaToolsDir=FAKE_MEGA_TOOLS_DIR, logLevel=LOG_LEVEL,
+                                  logFilePath=path.join(self.tempDir, 'megaTools.log'))
+        self.assertEqual(self.upload(megaTools), REMOTE_ROOT + '/f.txt')
+
+        with open(self.remoteFilePath, 'rb') as remoteFile:
+            self.assertEqual(remoteFile.read(), b'modified')
+        self.assertEqual(listdir(path.dirname(self.remoteFilePath)), ['f.txt'])
+
+
+class MegaManagerIncrementalTest(TestCase):
+    """
+    Incremental upload to local storage backend, after local files were modified, moved, removed and added.
+    """
+
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='megaManagerTest_')
+        self.storageDir = path.join(self.tempDir, 'storage')
+        self.localDir = path.join(self.tempDir, 'local')
+        self.dataDir = path.join(self.tempDir, 'data')
+        for dirPath in [path.join(self.storageDir, USERNAME, 'Root'), path.join(self.localDir, 'old'),
+                        path.join(self.localDir, 'new'), self.dataDir]:
+            makedirs(dirPath)
+        for name in ['same.txt', 'changed.txt', 'removed.txt', path.join('old', 'moved.txt')]:
+            self.write_local_file(name=name, data=name.encode('ascii') * 100)
+
+    def tearDown(self):
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def get_remote_path(self, name):
+        """
+        Get local path remote file of local file is kept at by local storage backend.
+
+        Args:
+            name (str): Local file path relative to local directory.
+
+        Returns:
+            String: path.
+        """
+
+        return path.join(self.storageDir, USERNAME, REMOTE_ROOT.strip('/'), name)
+
+    def sync(self):
+        """
+        Run incremental upload, with remote removal.
+
+        Returns:
+            Boolean: whether sync succeeded or not.
+        """
+
+        megaManager = create_mega_manager(dataDir=self.dataDir, localDir=self.localDir,
+                                          config='STORAGE_BACKEND=local\nSTORAGE_ROOT=%s\n' % self.storageDir,
+                                          upload=True, incremental=True, removeRemote=True)
+        return megaManager.run()
+
+    def write_local_file(self, name, data):
+        """
+        Write local file.
+
+        Args:
+            name (str): Local file path relative to local directory.
+            data (bytes): File content.
+        """
+
+        with open(path.join(self.localDir, name), 'wb') as localFile:
+            localFile.write(data)
+
+    def test_unchanged_modified_and_moved_files(self):
+        self.assertTrue(self.sync())
+        sameInode = stat(self.get_remote_path('same.txt')).st_ino
+        movedInode = stat(self.get_remote_path(path.join('old', 'moved.txt'))).st_ino
+
+        self.write_local_file(name='changed.txt', data=b'changed')
+        rename(path.join(self.localDir, 'old', 'moved.txt'), path.join(self.localDir, 'new', 'moved.txt'))
+        remove(path.join(self.localDir, 'removed.txt'))
+        self.write_local_file(name='added.txt', data=b'added')
+        self.assertTrue(self.sync())
+
+        # Unchanged file is not uploaded again, and moved file is moved remotely rather than uploaded.
+        self.assertEqual(stat(self.get_remote_path('same.txt')).st_ino, sameInode)
+        self.assertEqual(stat(self.get_remote_path(path.join('new', 'moved.txt'))).st_ino, movedInode)
+        self.assertFalse(path.exists(self.get_remote_path(path.join('old', 'moved.txt'))))
+        self.assertFalse(path.exists(self.get_remote_path('removed.txt')))
+        for name, data in [('changed.txt', b'changed'), ('added.txt', b'added')]:
+            with open(self.get_remote_path(name), 'rb') as remoteFile:
+                self.assertEqual(remoteFile.read(), data)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from json import load
+from os import environ, makedirs, path
+from shutil import rmtree
+from sys import executable, path as sysPath
+from tempfile import mkdtemp
+from time import time
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+FAKE_MEGA_TOOLS_DIR = path.join(MEGAMANAGER_DIR, 'tools', 'fakeMegaTools')
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import AccountParking_Lib, MegaTools_Lib
+
+USERNAME = 'test@fake.mega'
+OTHER_USERNAME = 'other@fake.mega'
+PASSWORD = 'password'
+LOG_LEVEL = 'WARNING'
+FILE_BYTES = 1000
+QUOTA_BYTES = 2500
+QUOTA_SECONDS = 60
+
+
+class MegaTools_LibParkingTest(TestCase):
+    """
+    MegaTools_Lib against fake megatools, with a transfer quota of QUOTA_BYTES per account, serving directory accounts
+    holding "/Root/f0" to "/Root/f3" of FILE_BYTES bytes each.
+    """
+
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='megaToolsTest_')
+        self.rootDir = path.join(self.tempDir, 'fakeMega')
+        self.localDir = path.join(self.tempDir, 'local')
+        for username in [USERNAME, OTHER_USERNAME]:
+            makedirs(path.join(self.rootDir, username, 'Root'))
+            for index in range(4):
+                with open(path.join(self.rootDir, username, 'Root', 'f%d' % index), 'wb') as remoteFile:
+                    remoteFile.write(b'f' * FILE_BYTES)
+
+        self.environ = dict(environ)
+        environ.update({'FAKE_MEGA_ROOT': self.rootDir, 'FAKE_MEGA_PYTHON': executable,
+                        'FAKE_MEGA_QUOTA_BYTES': str(QUOTA_BYTES), 'FAKE_MEGA_QUOTA_SECONDS': str(QUOTA_SECONDS)})
+
+        self.parkedFilePath = path.join(self.tempDir, 'parked_accounts.json')
+        self.parking = AccountParking_Lib(filePath=self.parkedFilePath, logLevel=LOG_LEVEL)
+        self.megaTools = MegaTools_Lib(megaToolsDir=FAKE_MEGA_TOOLS_DIR, logLevel=LOG_LEVEL,
+                                       logFilePath=path.join(self.tempDir, 'megaTools.log'), parking=self.parking)
+
+    def tearDown(self):
+        environ.clear()
+        environ.update(self.environ)
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def get_file(self, username, name):
+        """
+        Download remote file of account to local directory.
+
+        Args:
+            username (str): username of account
+            name (str): File name under "/Root".
+
+        Returns:
+            Boolean: whether successful or not.
+        """
+
+        return self.megaTools.get_file(username=username, password=PASSWORD, remoteFilePath='/Root/%s' % name,
+                                       localFilePath=path.join(self.localDir, username, name))
+
+    def test_over_quota_parks_account(self):
+        self.assertTrue(self.get_file(USERNAME, 'f0'))
+        self.assertTrue(self.get_file(USERNAME, 'f1'))
+        self.assertIsNone(self.parking.get_parked_until(username=USERNAME))
+
+        self.assertFalse(self.get_file(USERNAME, 'f2'))
+        parkedUntil = self.parking.get_parked_until(username=USERNAME)
+        self.assertIsNotNone(parkedUntil)
+        self.assertGreater(parkedUntil, time() + QUOTA_SECONDS / 2)
+        with open(self.parkedFilePath, 'r') as parkedFile:
+            self.assertEqual(load(parkedFile)[USERNAME]['reason'], 'transfer quota exceeded')
+
+        # Parked account's transfers are not run, other accounts' go on.
+        logSize = path.getsize(path.join(self.tempDir, 'megaTools.log'))
+        self.assertFalse(self.get_file(USERNAME, 'f3'))
+        self.assertEqual(path.getsize(path.join(self.tempDir, 'megaTools.log')), logSize)
+        self.assertTrue(self.get_file(OTHER_USERNAME, 'f0'))
+        self.assertIsNone(self.parking.get_parked_until(username=OTHER_USERNAME))
+
+    def test_parked_account_is_kept_by_next_run(self):
+        self.get_file(USERNAME, 'f0')
+        self.get_file(USERNAME, 'f1')
+        self.get_file(USERNAME, 'f2')
+
+        parking = AccountParking_Lib(filePath=self.parkedFilePath, logLevel=LOG_LEVEL)
+        self.assertEqual(parking.get_parked_until(username=USERNAME),
+                         self.parking.get_parked_until(username=USERNAME))
+
+
+class MegaTools_LibListTest(TestCase):
+    """
+    MegaTools_Lib listing against fake megatools, serving a directory account holding "/Root/a/g.txt".
+    """
+
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='megaToolsTest_')
+        self.rootDir = path.join(self.tempDir, 'fakeMega')
+        makedirs(path.join(self.rootDir, USERNAME, 'Root', 'a'))
+        with open(path.join(self.rootDir, USERNAME, 'Root', 'a', 'g.txt'), 'wb') as remoteFile:
+            remoteFile.write(b'g' * FILE_BYTES)
+
+        self.environ = dict(environ)
+        environ.update({'FAKE_MEGA_ROOT': self.rootDir, 'FAKE_MEGA_PYTHON': executable, 'FAKE_MEGA_PASSWORD': PASSWORD})
+
+        self.megaTools = MegaTools_Lib(megaToolsDir=FAKE_MEGA_TOOLS_DIR, logLevel=LOG_LEVEL,
+                                       logFilePath=path.join(self.tempDir, 'megaTools.log'))
+
+    def tearDown(self):
+        environ.clear()
+        environ.update(self.environ)
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def test_list_and_stat(self):
+        self.assertEqual([fileData['path'] for fileData in self.megaTools.list_files(
+            username=USERNAME, password=PASSWORD, remotePath='/Root')], ['/Root/a', '/Root/a/g.txt'])
+        self.assertEqual(self.megaTools.stat_file(username=USERNAME, password=PASSWORD,
+                                                  remoteFilePath='/Root/a/g.txt')['size'], FILE_BYTES)
+
+    def test_failed_listing_is_not_empty(self):
+        self.assertIsNone(self.megaTools.list_files(username=USERNAME, password=PASSWORD, remotePath='/Root/missing'))
+        self.assertIsNone(self.megaTools.list_files(username=USERNAME, password='wrong', remotePath='/Root'))
+        self.assertIsNone(self.megaTools.stat_file(username=USERNAME, password='wrong',
+                                                   remoteFilePath='/Root/a/g.txt'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import path
+from shutil import rmtree
+from sys import path as sysPath
+from tempfile import mkdtemp
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import PlacementPlanner_Lib
+
+LOG_LEVEL = 'WARNING'
+TOTAL_BYTES = 1000
+
+
+def get_account(freeBytes, pendingBytes=0, remotePaths=None):
+    """
+    Get account details of account holding TOTAL_BYTES.
+
+    Args:
+        freeBytes (int): Free bytes of account.
+        pendingBytes (int): Bytes mapped to account locally but not synced yet.
+        remotePaths (list): Remote paths of account's path mappings.
+
+    Returns:
+        Dictionary: account details.
+    """
+
+    return {'freeBytes': freeBytes, 'totalBytes': TOTAL_BYTES, 'pendingBytes': pendingBytes,
+            'remotePaths': remotePaths if remotePaths else []}
+
+
+def get_dir(name, size):
+    """
+    Get new directory details.
+
+    Args:
+        name (str): Directory name.
+        size (int): Directory size in bytes.
+
+    Returns:
+        Dictionary: directory details.
+    """
+
+    return {'localPath': '/media/%s' % name, 'remotePath': '/Root/%s' % name, 'bytes': size}
+
+
+class PlacementPlanner_LibTest(TestCase):
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='placementPlannerTest_')
+        self.planner = PlacementPlanner_Lib(planFilePath=path.join(self.tempDir, 'placement_plan.json'),
+                                            reserveFraction=0.1, logLevel=LOG_LEVEL)
+
+    def tearDown(self):
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def get_assignments(self, plan):
+        """
+        Get account of each placed directory.
+
+        Args:
+            plan (dict): Plan, as returned by get_plan.
+
+        Returns:
+            Dictionary: directory name to username.
+        """
+
+        return dict((assignment['localPath'].rsplit('/', 1)[1], assignment['username'])
+                    for assignment in plan['assignments'])
+
+    def test_full_account_gets_nothing(self):
+        # Free space of "full" is taken up by bytes pending and the reserve.
+        plan = self.planner.get_plan(dirs=[get_dir('a', 300), get_dir('b', 200), get_dir('c', 100)],
+                                     accounts={'full': get_account(freeBytes=250, pendingBytes=150),
+                                               'empty': get_account(freeBytes=900)})
+
+        self.assertEqual(self.get_assignments(plan), {'a': 'empty', 'b': 'empty', 'c': 'empty'})
+        self.assertEqual(plan['unplaced'], [])
+        self.assertEqual(plan['accounts']['full']['plannedBytes'], 0)
+        self.assertEqual(plan['accounts']['empty']['plannedBytes'], 600)
+
+    def test_largest_first_onto_most_space_left(self):
+        plan = self.planner.get_plan(dirs=[get_dir('a', 400), get_dir('b', 100), get_dir('c', 200),
+                                           get_dir('d', 600)],
+                                     accounts={'one': get_account(freeBytes=900),
+                                               'two': get_account(freeBytes=600, remotePaths=['/Root/b/'])})
+
+        # "b", placed last, only fits on "two", which already has its remote path.
+        self.assertEqual(self.get_assignments(plan), {'d': 'one', 'a': 'two', 'c': 'one'})
+        self.assertEqual([unplaced['localPath'] for unplaced in plan['unplaced']], ['/media/b'])
+        self.assertEqual(plan['accounts']['one']['plannedBytes'], 800)
+
+    def test_plan_file(self):
+        plan = self.planner.get_plan(dirs=[get_dir('a', 100)], accounts={'one': get_account(freeBytes=900)})
+        self.planner.save_plan(plan=plan)
+
+        self.assertEqual(self.planner.load_plan(), plan)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import path
+from shutil import rmtree
+from sys import executable, path as sysPath
+from tempfile import mkdtemp
+from time import time
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import ProcessWatchdog_Lib
+from libs.processWatchdog_lib import PROCESS_STALL_RETRIES, PROCESS_STALL_SECONDS
+
+LOG_LEVEL = 'WARNING'
+# Script writing a line every 0.2 seconds for 3 seconds.
+WRITING_SCRIPT = 'import sys, time\nfor index in range(15):\n    sys.stdout.write("line\\n")\n    sys.stdout.flush()\n' \
+                 '    time.sleep(0.2)\n'
+# Script writing 40 lines of 10000 bytes, then "done".
+SCRIPT = 'import sys\nfor index in range(40):\n    sys.stdout.write("x" * 9999 + "\\n")\nsys.stdout.write("done\\n")\n'
+
+
+class TreeCountingWatchdog(ProcessWatchdog_Lib):
+    """
+    Watchdog counting the times it walks the process tree.
+    """
+
+    def __init__(self, logLevel='DEBUG'):
+        super(TreeCountingWatchdog, self).__init__(logLevel=logLevel)
+        self.treeWalks = 0
+
+    def _get_process_tree(self, pid):
+        self.treeWalks += 1
+        return super(TreeCountingWatchdog, self)._get_process_tree(pid=pid)
+
+
+class ProcessWatchdog_LibTest(TestCase):
+    def setUp(self):
+        self.tempDir = mkdtemp(prefix='processWatchdogTest_')
+        self.watchdog = ProcessWatchdog_Lib(logLevel=LOG_LEVEL)
+
+        self.command = self.get_command(script=SCRIPT, name='write_output.py')
+
+    def tearDown(self):
+        ProcessWatchdog_Lib(logLevel=LOG_LEVEL).configure(stallSeconds=PROCESS_STALL_SECONDS,
+                                                          retries=PROCESS_STALL_RETRIES)
+        rmtree(self.tempDir, ignore_errors=True)
+
+    def get_command(self, script, name):
+        """
+        Get command running Python script.
+
+        Args:
+            script (str): Python source.
+            name (str): Script file name.
+
+        Returns:
+            String: command.
+        """
+
+        scriptPath = path.join(self.tempDir, name)
+        with open(scriptPath, 'w') as scriptFile:
+            scriptFile.write(script)
+        return '"%s" "%s"' % (executable, scriptPath)
+
+    def test_keeps_all_output(self):
+        exitCode, out, outputBytes = self.watchdog.run(command=self.command)
+
+        self.assertEqual(exitCode, 0)
+        self.assertEqual(len(out), outputBytes)
+        self.assertEqual(outputBytes, 40 * 10000 + 5)
+
+    def test_keeps_end_of_output(self):
+        outputFilePath = path.join(self.tempDir, 'output.log')
+        exitCode, out, outputBytes = self.watchdog.run(command=self.command, outputFilePath=outputFilePath,
+                                                       keepBytes=1024)
+
+        self.assertEqual(exitCode, 0)
+        self.assertEqual(len(out), 1024)
+        self.assertTrue(out.endswith(b'x\ndone\n'))
+        self.assertEqual(outputBytes, 40 * 10000 + 5)
+        self.assertEqual(path.getsize(outputFilePath), outputBytes)
+
+    def test_process_tree_not_walked_while_output_moves(self):
+        watchdog = TreeCountingWatchdog(logLevel=LOG_LEVEL)
+        watchdog.configure(stallSeconds=5, retries=0)
+        exitCode, out, outputBytes = watchdog.run(command=self.get_command(script=WRITING_SCRIPT, name='write.py'))
+
+        self.assertEqual(exitCode, 0)
+        self.assertEqual(out.count(b'line'), 15)
+        self.assertLessEqual(watchdog.treeWalks, 1)
+
+    def test_stalled_process_is_killed(self):
+        self.watchdog.configure(stallSeconds=2, retries=0)
+        startTime = time()
+        exitCode, out, outputBytes = self.watchdog.run(command=self.get_command(script='import time\ntime.sleep(30)\n',
+                                                                                name='sleep.py'))
+
+        self.assertNotEqual(exitCode, 0)
+        self.assertLess(time() - startTime, 15)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import path
+from sys import path as sysPath
+from threading import currentThread, enumerate as enumerateThreads, Event, Lock
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import TaskScheduler_Lib
+from libs.taskScheduler_lib import WORKER_THREAD_NAME
+
+LOG_LEVEL = 'WARNING'
+
+
+class TaskScheduler_LibTest(TestCase):
+    def setUp(self):
+        self.lock = Lock()
+        self.running = 0
+        self.maxRunning = 0
+        self.threads = set()
+        self.order = []
+
+    def tearDown(self):
+        # Workers exit once idle for WORKER_IDLE_SECONDS, so they are waited for rather than left running at exit.
+        for thread in enumerateThreads():
+            if thread.name == WORKER_THREAD_NAME:
+                thread.join()
+
+    def run_task(self, name, event=None):
+        """
+        Task recording its thread and the number of tasks running with it, waiting for event if given.
+
+        Args:
+            name (str): Task name.
+            event (Event): Event to wait for before finishing.
+
+        Returns:
+            String: task name.
+        """
+
+        with self.lock:
+            self.running += 1
+            self.maxRunning = max(self.maxRunning, self.running)
+            self.threads.add(currentThread().ident)
+            self.order.append(name)
+        if event:
+            event.wait(10)
+        with self.lock:
+            self.running -= 1
+        return name
+
+    def test_workers_run_many_tasks(self):
+        scheduler = TaskScheduler_Lib(maxWorkers=2, logLevel=LOG_LEVEL)
+        tasks = [scheduler.submit(target=self.run_task, args=('t%d' % index, ), name='t%d' % index)
+                 for index in range(20)]
+
+        self.assertTrue(scheduler.join(timeout=10))
+        self.assertEqual([task.result() for task in tasks], ['t%d' % index for index in range(20)])
+        self.assertLessEqual(self.maxRunning, 2)
+        self.assertLessEqual(len(self.threads), 2)
+
+    def test_priority_and_max_workers(self):
+        scheduler = TaskScheduler_Lib(maxWorkers=1, logLevel=LOG_LEVEL)
+        event = Event()
+        first = scheduler.submit(target=self.run_task, args=('first', event), name='first')
+        scheduler.submit(target=self.run_task, args=('low', event), name='low', priority=5)
+        scheduler.submit(target=self.run_task, args=('high', event), name='high', priority=1)
+        self.assertFalse(scheduler.wait(tasks=[first], timeout=0.2))
+
+        scheduler.set_max_workers(maxWorkers=2)
+        self.assertFalse(scheduler.join(timeout=0.5))
+        self.assertEqual(self.maxRunning, 2)
+        self.assertEqual(self.order, ['first', 'high'])
+
+        event.set()
+        self.assertTrue(scheduler.join(timeout=10))
+        self.assertEqual(self.order, ['first', 'high', 'low'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from os import path
+from sys import path as sysPath
+from threading import enumerate as enumerateThreads
+from unittest import main, TestCase
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(SCRIPT_DIR)
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+
+from libs import TransferLanes_Lib, TransferSkippedError
+from libs.taskScheduler_lib import WORKER_THREAD_NAME
+
+LOG_LEVEL = 'WARNING'
+
+
+class RecordingTuner(object):
+    """
+    Tuner recording transfers it is told of, keeping every level.
+    """
+
+    def __init__(self):
+        self.transfers = []
+
+    def get_level(self, key, default):
+        return default
+
+    def record_transfer(self, key, level, size, failed, saturated):
+        self.transfers.append((key, size, failed))
+        return None
+
+
+class TransferLanes_LibTest(TestCase):
+    def setUp(self):
+        self.tuner = RecordingTuner()
+        self.lanes = TransferLanes_Lib(lanes=[('all', None, 2)], tuner=self.tuner, tunerKey='up:test',
+                                       logLevel=LOG_LEVEL)
+
+    def tearDown(self):
+        # Workers exit once idle for WORKER_IDLE_SECONDS, so they are waited for rather than left running at exit.
+        for thread in enumerateThreads():
+            if thread.name == WORKER_THREAD_NAME:
+                thread.join()
+
+    def test_skipped_transfers_are_not_tuned(self):
+        def transfer(skip):
+            if skip:
+                raise TransferSkippedError('Account is parked')
+            return True
+
+        done = self.lanes.submit(target=transfer, args=(False, ), name='done', size=100)
+        skipped = self.lanes.submit(target=transfer, args=(True, ), name='skipped', size=200)
+        self.assertTrue(done.result())
+        self.assertIsInstance(skipped.exception(), TransferSkippedError)
+
+        self.assertEqual(self.tuner.transfers, [('up:test:all', 100, False)])
+        stats = self.lanes.get_stats()[0]
+        self.assertEqual((stats['files'], stats['bytes']), (1, 100))
+
+    def test_failed_transfers_are_tuned(self):
+        def transfer():
+            raise IOError('Could not upload')
+
+        self.assertIsInstance(self.lanes.submit(target=transfer, name='failed', size=300).exception(), IOError)
+        self.assertEqual(self.tuner.transfers, [('up:test:all', 300, True)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,568 @@
+#!/usr/bin/env python
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from argparse import ArgumentParser
+from datetime import datetime
+from json import dumps, loads
+from logging import getLogger
+from os import environ, makedirs, path, urandom
+from platform import python_version
+from shutil import rmtree
+from subprocess import PIPE, Popen
+from sys import executable, path as sysPath, stdout
+from tempfile import mkdtemp
+from time import time
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(path.dirname(SCRIPT_DIR))
+FAKE_MEGATOOLS_DIR = path.join(MEGAMANAGER_DIR, 'tools', 'fakeMegaTools')
+FAKE_MEGA_API_DIR = path.join(MEGAMANAGER_DIR, 'tools', 'fakeMegaApi')
+
+sysPath.insert(0, MEGAMANAGER_DIR)
+sysPath.insert(0, FAKE_MEGATOOLS_DIR)
+sysPath.insert(0, FAKE_MEGA_API_DIR)
+
+from fakeMegaApi import FakeMegaApi
+from fakeMegaTools import generate_tree
+from libs import ChunkedUpload_Lib, Lib, MegaApi_Lib, MegaTools_Lib, Metrics_Lib
+from megaManager import MegaManager
+from version import __version__
+
+RESULTS_FILE = path.join(MEGAMANAGER_DIR, 'data', 'benchmark_results.jsonl')
+BENCHMARK_USERNAME = 'benchmark@fake.mega'
+BENCHMARK_PASSWORD = 'benchmark'
+# Directory account of upload phase, so uploaded content is really stored.
+UPLOAD_USERNAME = 'upload@fake.mega'
+PHASES = ['generate', 'listing', 'planning', 'removal', 'compression', 'upload']
+
+
+class Benchmark(object):
+    def __init__(self, nodes=10000, fanout=10, localFraction=0.9, latency=0.0, throughput=0.0, images=20,
+                 videos=0, ffmpegExePath='ffmpeg', uploadBytes=256 * 1024 * 1024, seed=0, workDir=None,
+                 logLevel='WARNING'):
+        """
+        End to end benchmark of MEGA Manager against fake megatools. Times remote listing, sync planning, remote
+        removal and compression phases over a generated remote tree, and upload of one large file with megacopy and
+        with the upload engine.
+
+        Args:
+            nodes (int): Number of remote nodes to generate.
+            fanout (int): Number of sub directories per generated directory.
+            localFraction (float): Fraction of remote files that also exist locally. The rest are removed remotely
+                during removal phase.
+            latency (float): Simulated seconds of latency per megatools command.
+            throughput (float): Simulated transfer bytes per second. 0 for unlimited.
+            images (int): Number of images to generate for compression phase. Needs PIL.
+            videos (int): Number of videos to generate for compression phase. Needs ffmpeg.
+            ffmpegExePath (str): Path to ffmpeg executable.
+            uploadBytes (int): Size of file uploaded in upload phase.
+            seed (int): Random seed of generated tree.
+            workDir (str): Directory to create benchmark files in. Temporary directory if None, removed afterwards.
+            logLevel (str): Logging level setting ie: "DEBUG" or "WARN"
+        """
+
+        self.__nodes = nodes
+        self.__fanout = fanout
+        self.__localFraction = localFraction
+        self.__latency = latency
+        self.__throughput = throughput
+        self.__images = images
+        self.__videos = videos
+        self.__ffmpegExePath = ffmpegExePath
+        self.__uploadBytes = uploadBytes
+        self.__seed = seed
+        self.__keepWorkDir = workDir is not None
+        self.__workDir = workDir if workDir else mkdtemp(prefix='megaManager_benchmark_')
+        self.__logLevel = logLevel
+
+        self.__fakeRoot = path.join(self.__workDir, 'fakeMega')
+        self.__localRoot = path.join(self.__workDir, 'local')
+        self.__mediaRoot = path.join(self.__workDir, 'media')
+        self.__uploadRoot = path.join(self.__workDir, 'upload')
+        self.__dataDir = path.join(self.__workDir, 'data')
+
+        self.__lib = Lib(logLevel=logLevel)
+        self.__metrics = Metrics_Lib(logLevel=logLevel)
+        self.__megaTools = MegaTools_Lib(megaToolsDir=FAKE_MEGATOOLS_DIR, logLevel=logLevel,
+                                         logFilePath=path.join(self.__dataDir, 'megaTools.log'))
+
+    def _create_media_files(self):
+        """
+        Create image and video files to compress.
+
+        Returns:
+            Integer: number of media files created.
+        """
+
+        logger = getLogger('Benchmark._create_media_files')
+        logger.setLevel(self.__logLevel)
+
+        if not path.isdir(self.__mediaRoot):
+            makedirs(self.__mediaRoot)
+
+        created = 0
+        if self.__images:
+            try:
+                from PIL import Image
+            except ImportError:
+                logger.warning(' PIL is not installed, no images created.')
+                Image = None
+
+            for index in range(self.__images if Image else 0):
+                image = Image.effect_noise((1600, 1200), 32 + index % 64).convert('RGB')
+                image.save(path.join(self.__mediaRoot, 'image%04d.jpg' % index), quality=95)
+                created += 1
+
+        for index in range(self.__videos):
+            cmd = '"%s" -y -f lavfi -i testsrc=duration=10:size=1280x720:rate=30 -c:v libx264 -crf 10 "%s"' % \
+                  (self.__ffmpegExePath, path.join(self.__mediaRoot, 'video%04d.mp4' % index))
+            if self.__lib.exec_cmd(command=cmd, outputFile=path.join(self.__dataDir, 'ffmpeg.log')):
+                created += 1
+            else:
+                logger.warning(' Could not create video with "%s".' % self.__ffmpegExePath)
+                break
+
+        return created
+
+    def _get_command_metrics_delta(self, before, after):
+        """
+        Get command counts and times recorded between two metrics summaries.
+
+        Args:
+            before (dict): Metrics summary before phase.
+            after (dict): Metrics summary after phase.
+
+        Returns:
+            Dictionary: of command type to "count" and "seconds" of phase.
+        """
+
+        logger = getLogger('Benchmark._get_command_metrics_delta')
+        logger.setLevel(self.__logLevel)
+
+        delta = {}
+        for commandType, metrics in after.items():
+            previous = before.get(commandType, {'count': 0, 'seconds': 0.0})
+            if metrics['count'] > previous['count']:
+                delta[commandType] = {'count': metrics['count'] - previous['count'],
+                                      'seconds': round(metrics['seconds'] - previous['seconds'], 3)}
+        return delta
+
+    def _run_mega_manager(self, localPath, remotePath, **kwargs):
+        """
+        Run MEGA Manager with one profile mapping local path to remote path, keeping its data files in work directory.
+
+        Args:
+            localPath (str): Local path of profile path mapping.
+            remotePath (str): Remote path of profile path mapping.
+            kwargs (dict): MEGA Manager arguments, ie: removeRemote=True.
+
+        Returns:
+            Boolean: whether every MEGA Manager task finished without raising or not.
+        """
+
+        logger = getLogger('Benchmark._run_mega_manager')
+        logger.setLevel(self.__logLevel)
+
+        configPath = path.join(self.__workDir, 'megaManager.cfg')
+        with open(configPath, 'w') as config:
+            config.write('MEGATOOLS_DIR=%s\n' % FAKE_MEGATOOLS_DIR)
+            config.write('FFMPEG_EXE_PATH=%s\n' % self.__ffmpegExePath)
+            config.write('MEGA_ACCOUNTS_OUTPUT=%s\n' % path.join(self.__dataDir, 'mega_accounts_output.txt'))
+            config.write('[Profile1]\n')
+            config.write('ProfileName=benchmark\n')
+            config.write('Username=%s\n' % BENCHMARK_USERNAME)
+            config.write('Password=%s\n' % BENCHMARK_PASSWORD)
+            config.write('LocalPath1=%s\n' % localPath)
+            config.write('RemotePath1=%s\n' % remotePath)
+
+        dataFiles = {
+            'commandMetricsFilePath': 'command_metrics.json',
+            'compressedImagesFilePath': 'compressed_images.npz',
+            'compressedVideosFilePath': 'compressed_videos.npz',
+            'compressionQueueFilePath': 'compression_queue.npz',
+            'concurrencyLevelsFilePath': 'concurrency_levels.json',
+            'duplicateIndexFilePath': 'duplicate_index.json',
+            'encodeBenchmarkFilePath': 'encode_benchmark.txt',
+            'localIndexFilePath': 'local_index.json',
+            'megaManager_logFilePath': 'megaManager_log.log',
+            'metricsTextfile': 'command_metrics.prom',
+            'parkedAccountsFilePath': 'parked_accounts.json',
+            'placementPlanFilePath': 'placement_plan.json',
+            'remoteStateDirPath': 'remote_state',
+            'removedRemoteFilePath': 'removed_remote_files.npz',
+            'sessionCacheFilePath': 'session_cache.json',
+            'shardProgressFilePath': 'shard_progress.json',
+            'unableToCompressImagesFilePath': 'unable_to_compress_images.npz',
+            'unableToCompressVideosFilePath': 'unable_to_compress_videos.npz',
+            'videoProbesFilePath': 'video_probes.npz'
+        }
+        for key, fileName in dataFiles.items():
+            kwargs[key] = path.join(self.__dataDir, fileName)
+
+        megaManager = MegaManager(configPath=configPath, logLevel=self.__logLevel, **kwargs)
+        return megaManager.run()
+
+    def _run_phase(self, name, target):
+        """
+        Run and time benchmark phase.
+
+        Args:
+            name (str): Phase name.
+            target (function): Phase function. Returns dictionary of phase results, with "error" set if the phase did
+                not do its work, so its time is not comparable.
+
+        Returns:
+            Dictionary: phase results with "seconds" and "commands" added.
+        """
+
+        logger = getLogger('Benchmark._run_phase')
+        logger.setLevel(self.__logLevel)
+
+        stdout.write('Running %s phase...' % name)
+        stdout.flush()
+
+        before = self.__metrics.get_summary()
+        startTime = time()
+        result = target()
+        seconds = time() - startTime
+
+        result['seconds'] = round(seconds, 3)
+        result['commands'] = self._get_command_metrics_delta(before=before, after=self.__metrics.get_summary())
+
+        if result.get('error'):
+            stdout.write(' %.3f seconds, INVALID: %s\n' % (seconds, result['error']))
+        else:
+            stdout.write(' %.3f seconds\n' % seconds)
+        return result
+
+    def phase_compression(self):
+        """
+        Compress generated images and videos with MEGA Manager, scanning local files.
+
+        Returns:
+            Dictionary: of "mediaFiles" to compress, "compressedFiles", and "bytesBefore" and "bytesAfter"
+                compression. "error" is set if a MEGA Manager task raised or not every media file was compressed.
+        """
+
+        logger = getLogger('Benchmark.phase_compression')
+        logger.setLevel(self.__logLevel)
+
+        mediaFiles = len(self.__lib.get_local_file_paths_recursively(localRoot=self.__mediaRoot))
+        bytesBefore = self.__lib.size_of_dir(dirPath=self.__mediaRoot)
+        succeeded = self._run_mega_manager(localPath=self.__mediaRoot, remotePath='/Root/media', compressImages=True,
+                                           compressVideos=self.__videos > 0, compressLocal=True)
+        bytesAfter = self.__lib.size_of_dir(dirPath=self.__mediaRoot)
+
+        compressedFiles = 0
+        for fileName in ['compressed_images.npz', 'compressed_videos.npz']:
+            compressedFiles += len(self.__lib.load_file_as_set(filePath=path.join(self.__dataDir, fileName)))
+
+        result = {'mediaFiles': mediaFiles, 'compressedFiles': compressedFiles, 'bytesBefore': bytesBefore,
+                  'bytesAfter': bytesAfter}
+        if not succeeded:
+            result['error'] = 'MEGA Manager task failed'
+        elif compressedFiles < mediaFiles:
+            result['error'] = 'compressed %d of %d media files' % (compressedFiles, mediaFiles)
+        return result
+
+    def phase_generate(self):
+        """
+        Generate remote tree, its partial local copy and media files to compress.
+
+        Returns:
+            Dictionary: of generated "dirs", "files", "bytes", "localFiles" and "mediaFiles".
+        """
+
+        logger = getLogger('Benchmark.phase_generate')
+        logger.setLevel(self.__logLevel)
+
+        for dirPath in [self.__localRoot, self.__dataDir]:
+            if not path.isdir(dirPath):
+                makedirs(dirPath)
+
+        result = generate_tree(rootDir=self.__fakeRoot, username=BENCHMARK_USERNAME, nodeCount=self.__nodes,
+                               fanout=self.__fanout, seed=self.__seed, localRoot=self.__localRoot,
+                               localFraction=self.__localFraction)
+        result['mediaFiles'] = self._create_media_files()
+        return result
+
+    def phase_listing(self):
+        """
+        List whole remote tree.
+
+        Returns:
+            Dictionary: of "lines" listed.
+        """
+
+        logger = getLogger('Benchmark.phase_listing')
+        logger.setLevel(self.__logLevel)
+
+        lines = self.__megaTools.get_remote_file_data_recursively(username=BENCHMARK_USERNAME,
+                                                                  password=BENCHMARK_PASSWORD, remotePath='/Root',
+                                                                  removeBlankLines=True)
+        return {'lines': len(lines) if lines else 0}
+
+    def phase_planning(self):
+        """
+        Plan sync of local tree with remote tree, from remote listing and local scan.
+
+        Returns:
+            Dictionary: of "remoteFiles", "localFiles", "toDownload" and "toUpload".
+        """
+
+        logger = getLogger('Benchmark.phase_planning')
+        logger.setLevel(self.__logLevel)
+
+        remoteFiles = set()
+        lines = self.__megaTools.get_remote_file_data_recursively(username=BENCHMARK_USERNAME,
+                                                                  password=BENCHMARK_PASSWORD, remotePath='/Root',
+                                                                  removeBlankLines=True)
+        for line in lines if lines else []:
+            if self.__megaTools.get_file_type_from_megals_line_data(line=line) == '0':
+                remoteFiles.add(self.__megaTools.get_file_path_from_megals_line_data(line=line)[len('/Root'):])
+
+        localFiles = set()
+        for localFilePath in self.__lib.get_local_file_paths_recursively(localRoot=self.__localRoot):
+            localFiles.add(localFilePath[len(self.__localRoot):].replace('\\', '/'))
+
+        return {'remoteFiles': len(remoteFiles), 'localFiles': len(localFiles),
+                'toDownload': len(remoteFiles - localFiles), 'toUpload': len(localFiles - remoteFiles)}
+
+    def phase_removal(self):
+        """
+        Remove remote files that don't exist locally, with MEGA Manager sync pipeline.
+
+        Returns:
+            Dictionary: of "removed" remote nodes. "error" is set if a MEGA Manager task raised.
+        """
+
+        logger = getLogger('Benchmark.phase_removal')
+        logger.setLevel(self.__logLevel)
+
+        before = len(self.__megaTools.get_remote_file_paths_recursively(
+            username=BENCHMARK_USERNAME, password=BENCHMARK_PASSWORD, remotePath='/Root') or [])
+        succeeded = self._run_mega_manager(localPath=self.__localRoot, remotePath='/Root', pipeline=True,
+                                           removeRemote=True)
+        after = len(self.__megaTools.get_remote_file_paths_recursively(
+            username=BENCHMARK_USERNAME, password=BENCHMARK_PASSWORD, remotePath='/Root') or [])
+
+        result = {'removed': before - after}
+        if not succeeded:
+            result['error'] = 'MEGA Manager task failed'
+        return result
+
+    def phase_upload(self):
+        """
+        Upload one large file with megacopy, then with the upload engine through the fake MEGA API. Both run at
+        unlimited simulated throughput, so times are the client side cost of reading, encrypting and sending.
+
+        Returns:
+            Dictionary: of "bytes" uploaded, and "megacopySeconds" and "engineSeconds" each upload took.
+        """
+
+        logger = getLogger('Benchmark.phase_upload')
+        logger.setLevel(self.__logLevel)
+
+        if not path.isdir(self.__uploadRoot):
+            makedirs(self.__uploadRoot)
+        localFilePath = path.join(self.__uploadRoot, 'large.bin')
+        block = urandom(8 * 1024 * 1024)
+        with open(localFilePath, 'wb') as localFile:
+            for offset in range(0, self.__uploadBytes, len(block)):
+                localFile.write(block[:self.__uploadBytes - offset])
+
+        throughput = environ['FAKE_MEGA_THROUGHPUT']
+        environ['FAKE_MEGA_THROUGHPUT'] = '0'
+        try:
+            startTime = time()
+            self.__megaTools.upload_local_dir(username=UPLOAD_USERNAME, password=BENCHMARK_PASSWORD,
+                                              localDir=self.__uploadRoot, remoteDir='/Root/megacopy')
+            megacopySeconds = time() - startTime
+        finally:
+            environ['FAKE_MEGA_THROUGHPUT'] = throughput
+
+        fakeApi = FakeMegaApi(rootDir=self.__fakeRoot, password=BENCHMARK_PASSWORD)
+        megaApi = MegaApi_Lib(apiUrl=fakeApi.start(), uploader=ChunkedUpload_Lib(logLevel=self.__logLevel),
+                              logLevel=self.__logLevel)
+        try:
+            # Login and node tree fetch are not part of the upload.
+            megaApi.make_dir(username=UPLOAD_USERNAME, password=BENCHMARK_PASSWORD, remoteDirPath='/Root/engine')
+            startTime = time()
+            uploaded = megaApi.put_file(username=UPLOAD_USERNAME, password=BENCHMARK_PASSWORD,
+                                        localFilePath=localFilePath, remoteFilePath='/Root/engine/large.bin')
+            engineSeconds = time() - startTime
+        finally:
+            megaApi.close()
+            fakeApi.stop()
+
+        if not uploaded:
+            logger.warning(' Upload engine could not upload "%s".' % localFilePath)
+        return {'bytes': self.__uploadBytes, 'megacopySeconds': round(megacopySeconds, 3),
+                'engineSeconds': round(engineSeconds, 3) if uploaded else None}
+
+    def run(self, phases=None):
+        """
+        Run benchmark phases.
+
+        Args:
+            phases (list): Names of phases to run after "generate". All phases if None.
+
+        Returns:
+            Dictionary: benchmark record with version, settings and phase results. "valid" is false if any phase has
+                an "error".
+        """
+
+        logger = getLogger('Benchmark.run')
+        logger.setLevel(self.__logLevel)
+
+        environ['FAKE_MEGA_ROOT'] = self.__fakeRoot
+        environ['FAKE_MEGA_LATENCY'] = str(self.__latency)
+        environ['FAKE_MEGA_THROUGHPUT'] = str(self.__throughput)
+        environ['FAKE_MEGA_PYTHON'] = executable
+
+        record = {
+            'version': __version__,
+            'commit': get_git_commit(),
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'python': python_version(),
+            'settings': {'nodes': self.__nodes, 'fanout': self.__fanout, 'localFraction': self.__localFraction,
+                         'latency': self.__latency, 'throughput': self.__throughput, 'images': self.__images,
+                         'videos': self.__videos, 'uploadBytes': self.__uploadBytes, 'seed': self.__seed},
+            'phases': {}
+        }
+
+        try:
+            for name in PHASES:
+                if name == 'generate' or phases is None or name in phases:
+                    record['phases'][name] = self._run_phase(name=name, target=getattr(self, 'phase_%s' % name))
+        finally:
+            if not self.__keepWorkDir:
+                rmtree(self.__workDir, ignore_errors=True)
+
+        record['valid'] = not any(phase.get('error') for phase in record['phases'].values())
+        return record
+
+
+def compare_results(resultsFile=RESULTS_FILE, nodes=None):
+    """
+    Print table of recorded benchmark phase times, one row per run. Phases that did not do their work are marked
+    with "!", and runs having any are marked invalid.
+
+    Args:
+        resultsFile (str): Benchmark results file.
+        nodes (int): Only show runs with this number of nodes. All runs if None.
+    """
+
+    records = []
+    if path.isfile(resultsFile):
+        with open(resultsFile, 'r') as results:
+            records = [loads(line) for line in results if line.strip()]
+    if nodes:
+        records = [record for record in records if record['settings']['nodes'] == nodes]
+
+    stdout.write('%-10s %-9s %-19s %9s' % ('version', 'commit', 'date', 'nodes') +
+                 ''.join(' %12s' % phase for phase in PHASES) + '\n')
+    for record in records:
+        phaseColumns = []
+        for phase in PHASES:
+            if phase not in record['phases']:
+                phaseColumns.append(' %12s' % '-')
+            else:
+                phaseColumns.append(' %12s' % ('%.3f%s' % (record['phases'][phase]['seconds'],
+                                                           '!' if record['phases'][phase].get('error') else '')))
+        stdout.write('%-10s %-9s %-19s %9d' % (record['version'], record['commit'] or '-', record['date'],
+                                              record['settings']['nodes']) + ''.join(phaseColumns) +
+                     ('' if record.get('valid', True) else '  INVALID') + '\n')
+
+
+def get_git_commit():
+    """
+    Get short commit hash of MEGA Manager checkout.
+
+    Returns:
+        String: commit hash. None if not a git checkout.
+    """
+
+    try:
+        proc = Popen(['git', 'rev-parse', '--short', 'HEAD'], stdout=PIPE, stderr=PIPE, cwd=MEGAMANAGER_DIR)
+        out, err = proc.communicate()
+        return out.decode('utf-8').strip() if proc.returncode == 0 else None
+    except OSError:
+        return None
+
+
+def get_args():
+    """
+    Get arguments from command line, and returns them as dictionary.
+
+    Returns:
+        Dictionary: Dictionary of arguments for benchmark.
+    """
+
+    parser = ArgumentParser(description='Benchmark MEGA Manager against fake megatools and record results.')
+
+    parser.add_argument('--compare', dest='compare', action='store_true', default=False,
+                        help='Print recorded results instead of running benchmark.')
+    parser.add_argument('--fanout', dest='fanout', type=int, default=10,
+                        help='Number of sub directories per generated directory.')
+    parser.add_argument('--ffmpeg', dest='ffmpegExePath', default='ffmpeg',
+                        help='Path to ffmpeg executable, used to create and compress videos.')
+    parser.add_argument('--images', dest='images', type=int, default=20,
+                        help='Number of images to create and compress. Needs PIL.')
+    parser.add_argument('--latency', dest='latency', type=float, default=0.0,
+                        help='Simulated seconds of latency per megatools command.')
+    parser.add_argument('--localFraction', dest='localFraction', type=float, default=0.9,
+                        help='Fraction of remote files that exist locally. The rest are removed remotely.')
+    parser.add_argument('--log', dest='logLevel', default='WARNING',
+                        help='Logging level setting ie: "DEBUG" or "WARNING".')
+    parser.add_argument('--nodes', dest='nodes', type=int, default=10000,
+                        help='Number of remote files and directories to generate, up to millions.')
+    parser.add_argument('--phases', dest='phases', nargs='+', choices=PHASES[1:], default=None,
+                        help='Phases to run. All phases by default.')
+    parser.add_argument('--results', dest='resultsFile', default=RESULTS_FILE,
+                        help='File to append results to, one JSON record per line.')
+    parser.add_argument('--seed', dest='seed', type=int, default=0,
+                        help='Random seed of generated tree.')
+    parser.add_argument('--throughput', dest='throughput', type=float, default=0.0,
+                        help='Simulated transfer bytes per second. 0 for unlimited.')
+    parser.add_argument('--uploadBytes', dest='uploadBytes', type=int, default=256 * 1024 * 1024,
+                        help='Size of file uploaded in upload phase, ie: 10737418240 for 10 GiB.')
+    parser.add_argument('--videos', dest='videos', type=int, default=0,
+                        help='Number of videos to create and compress. Needs ffmpeg.')
+    parser.add_argument('--workDir', dest='workDir', default=None,
+                        help='Directory to keep benchmark files in. Temporary directory removed afterwards if not set.')
+
+    args = parser.parse_args()
+    return args.__dict__
+
+
+def main():
+
+    kwargs = get_args()
+
+    resultsFile = kwargs.pop('resultsFile')
+    if kwargs.pop('compare'):
+        compare_results(resultsFile=resultsFile)
+        return
+
+    phases = kwargs.pop('phases')
+    record = Benchmark(**kwargs).run(phases=phases)
+
+    if not path.isdir(path.dirname(resultsFile)):
+        makedirs(path.dirname(resultsFile))
+    with open(resultsFile, 'a') as results:
+        results.write(dumps(record, sort_keys=True) + '\n')
+
+    stdout.write('Results appended to "%s".\n' % resultsFile)
+    compare_results(resultsFile=resultsFile, nodes=record['settings']['nodes'])
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,839 @@
+#!/usr/bin/env python
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from argparse import ArgumentParser
+from hashlib import sha256
+from json import dumps, loads
+from os import close, environ, makedirs, path, remove, urandom
+from random import random
+from struct import error as StructError, pack, unpack
+from sys import path as sysPath
+from tempfile import mkstemp
+from threading import Lock, Thread
+from time import sleep, time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlsplit
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlsplit
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+MEGAMANAGER_DIR = path.dirname(path.dirname(SCRIPT_DIR))
+FAKE_MEGATOOLS_DIR = path.join(MEGAMANAGER_DIR, 'tools', 'fakeMegaTools')
+
+# Libraries are imported as modules, so the server runs without MEGA Manager's other dependencies.
+sysPath.insert(0, path.join(MEGAMANAGER_DIR, 'libs'))
+sysPath.insert(0, FAKE_MEGATOOLS_DIR)
+
+from fakeMegaTools import DEFAULT_ROOT, DEFAULT_TOTAL_BYTES, FakeRemote, _get_handle
+from megaCrypto_lib import CHUNK_SIZE_MAX, MegaCrypto_Lib
+
+DEFAULT_PASSWORD = 'password'
+DEFAULT_PORT = 8089
+SYSTEM_NODE_TYPES = [2, 3, 4]
+
+# Change batches kept per account. Clients polling from an older sequence number get ETOOMANY and must fetch again.
+ACTION_LOG_SIZE = 1000
+
+ERROR_EARGS = -2
+ERROR_EAGAIN = -3
+ERROR_ETOOMANY = -6
+ERROR_ENOENT = -9
+ERROR_EEXIST = -12
+ERROR_ESID = -15
+
+
+class FakeMegaApi(object):
+    def __init__(self, rootDir=DEFAULT_ROOT, password=DEFAULT_PASSWORD, totalBytes=DEFAULT_TOTAL_BYTES, latency=0.0,
+                 eagainRate=0.0, sessionSeconds=0):
+        """
+        Simulated MEGA JSON API serving fake megatools accounts, so API clients can be tested without MEGA accounts.
+        Supports login ("us0", "us"), user ("ug"), fetch nodes ("f"), quota ("uq"), remove ("d"), new folder or
+        uploaded or copied file ("p"), move ("m"), set attributes ("a"), download URL ("g") and upload URL ("u")
+        commands. Keys, attributes and transferred content are really encrypted, with keys of stored nodes derived from
+        account username and the path they were created at.
+
+        Server change notifications ("sc" requests) are worked out by comparing the account tree with the tree of the
+        last fetch or poll, so changes made by fake megatools are notified too.
+
+        Args:
+            rootDir (str): Directory holding simulated accounts, as FAKE_MEGA_ROOT of fake megatools.
+            password (str): Password of every account. Needed to encrypt account master keys.
+            totalBytes (int): Account size reported by "uq".
+            latency (float): Seconds every request waits before it is handled.
+            eagainRate (float): Fraction of requests answered with EAGAIN, to test retries.
+            sessionSeconds (int): Seconds sessions last before requests fail with ESID. 0 for no expiry.
+        """
+
+        self.__rootDir = rootDir
+        self.__password = password
+        self.__totalBytes = totalBytes
+        self.__latency = latency
+        self.__eagainRate = eagainRate
+        self.__sessionSeconds = sessionSeconds
+
+        self.__crypto = MegaCrypto_Lib(logLevel='WARNING')
+        self.__accounts = {}
+        self.__sessions = {}
+        self.__lock = Lock()
+        self.__stats = {'requests': 0, 'commands': 0, 'connections': 0, 'logins': 0, 'polls': 0, 'downloads': 0,
+                        'uploads': 0}
+        self.__downloads = {}
+        self.__uploads = {}
+        self.__completedUploads = {}
+        self.__server = None
+        self.__url = None
+        # Sequence numbers start from server start time, so trees fetched from an earlier server get ETOOMANY.
+        self.__sequenceStart = int(time() * 1000)
+
+        if not path.isdir(rootDir):
+            makedirs(rootDir)
+
+    def _get_account(self, username):
+        """
+        Get simulated account, creating its keys the first time it is used.
+
+        Args:
+            username (str): Account username.
+
+        Returns:
+            Dictionary: account with "remote", "masterKey", "salt", "userHandle", node "handles", node "entries", node
+                "attributes" set by clients besides name, "origins" of moved nodes and change log.
+        """
+
+        with self.__lock:
+            account = self.__accounts.get(username)
+            if account:
+                return account
+
+        digest = sha256(('master:' + username).encode('utf-8')).digest()
+        account = {
+            'username': username,
+            'remote': FakeRemote(rootDir=self.__rootDir, username=username),
+            'masterKey': self.__crypto.bytes_to_a32(digest[:16]),
+            'salt': sha256(('salt:' + username).encode('utf-8')).digest(),
+            'userHandle': self.__crypto.base64_url_encode(digest[16:24])[:11],
+            'passwordKey': None,
+            'userHash': None,
+            'handles': {},
+            'entries': {},
+            'attributes': {},
+            'origins': {},
+            'sequence': self.__sequenceStart,
+            'actions': [],
+            'snapshot': None,
+            'lock': Lock()
+        }
+        with self.__lock:
+            return self.__accounts.setdefault(username, account)
+
+    def _get_node_entry(self, account, node):
+        """
+        Get node as returned by "f" API command. Entries are cached, as encrypting them is slow without pycryptodome.
+
+        Args:
+            account (dict): Simulated account.
+            node (tuple): (path, type, size, mtime) node of fake megatools remote.
+
+        Returns:
+            Dictionary: API node.
+        """
+
+        remotePath, nodeType, size, mtime = node
+        cached = account['entries'].get(remotePath)
+        if cached and cached[0] == node:
+            return cached[1]
+
+        parentPath = remotePath.rsplit('/', 1)[0]
+        entry = {'h': _get_handle(self._get_origin_path(account, remotePath)),
+                 'p': _get_handle(self._get_origin_path(account, parentPath)) if parentPath else '',
+                 'u': account['userHandle'], 't': nodeType, 'ts': mtime}
+
+        if nodeType not in SYSTEM_NODE_TYPES:
+            digest = sha256(('node:%s:%s' % (account['username'], self._get_origin_path(account, remotePath)))
+                            .encode('utf-8')).digest()
+            aesKey = self.__crypto.bytes_to_a32(digest[:16])
+            if nodeType == 0:
+                nonce = self.__crypto.bytes_to_a32(digest[16:24])
+                metaMac = self._get_meta_mac(account, remotePath, size, aesKey, nonce) \
+                    if not account['remote'].is_manifest() else self.__crypto.bytes_to_a32(digest[24:32])
+                extra = tuple(nonce) + tuple(metaMac)
+                key = tuple(word ^ extraWord for word, extraWord in zip(aesKey, extra)) + extra
+                entry['s'] = size
+            else:
+                key = aesKey
+            attributes = dict(account['attributes'].get(remotePath, {}), n=remotePath.rsplit('/', 1)[1])
+            attributes = self.__crypto.encrypt_attributes(attributes, aesKey)
+            entry['a'] = self.__crypto.base64_url_encode(attributes)
+            entry['k'] = '%s:%s' % (account['userHandle'],
+                                    self.__crypto.a32_to_base64(self.__crypto.encrypt_key(key, account['masterKey'])))
+
+        account['entries'][remotePath] = (node, entry)
+        account['handles'][entry['h']] = remotePath
+        return entry
+
+    def _get_meta_mac(self, account, remotePath, size, aesKey, nonce):
+        """
+        Work out meta MAC of file content, kept in file key so clients can check downloads.
+
+        Args:
+            account (dict): Simulated account.
+            remotePath (str): Remote file path.
+            size (int): File size.
+            aesKey (tuple): File AES key.
+            nonce (tuple): File nonce.
+
+        Returns:
+            Tuple: meta MAC as two 32 bit words.
+        """
+
+        chunkMacs = [self.__crypto.get_chunk_mac(aesKey, nonce, account['remote'].read_bytes(remotePath, start, end))
+                      for start, end in self.__crypto.get_chunks(size)]
+        return self.__crypto.get_meta_mac(aesKey, chunkMacs)
+
+    def _get_node_path(self, account, handle):
+        """
+        Get remote path of node handle.
+
+        Args:
+            account (dict): Simulated account.
+            handle (str): Node handle.
+
+        Returns:
+            String: remote path. None if handle is unknown.
+        """
+
+        if handle not in account['handles']:
+            for node in account['remote'].iter_nodes():
+                account['handles'][_get_handle(self._get_origin_path(account, node[0]))] = node[0]
+        return account['handles'].get(handle)
+
+    def _get_origin_path(self, account, remotePath):
+        """
+        Get path node handle and key are worked out from. It is the path node was created at, so moved nodes keep their
+        handle and key like MEGA nodes do. Old paths of moved nodes keep it too, so their removal can be notified.
+
+        Args:
+            account (dict): Simulated account.
+            remotePath (str): Remote path.
+
+        Returns:
+            String: origin path.
+        """
+
+        return account['origins'].get(remotePath, remotePath)
+
+    def _get_sequence_number(self, sequence):
+        """
+        Get sequence number handed to clients, as URL safe base64 of eight bytes like MEGA's.
+
+        Args:
+            sequence (int): Change batch counter of account.
+
+        Returns:
+            String: sequence number.
+        """
+
+        return self.__crypto.base64_url_encode(pack('>Q', sequence))
+
+    def _move_node(self, account, remotePath, newRemotePath):
+        """
+        Move file node, with the attributes clients set on it. Must be called with account lock held.
+
+        Args:
+            account (dict): Simulated account.
+            remotePath (str): Remote path of file.
+            newRemotePath (str): Remote path to move file to.
+
+        Returns:
+            Integer: 0 if moved, EEXIST if new path is taken.
+        """
+
+        if account['remote'].get_node(newRemotePath):
+            return ERROR_EEXIST
+        originPath = self._get_origin_path(account, remotePath)
+        account['remote'].move(remotePath, newRemotePath)
+        account['origins'][remotePath] = originPath
+        account['origins'][newRemotePath] = originPath
+        account['handles'][_get_handle(originPath)] = newRemotePath
+        account['entries'].pop(newRemotePath, None)
+        if remotePath in account['attributes']:
+            account['attributes'][newRemotePath] = account['attributes'].pop(remotePath)
+        return 0
+
+    def _run_command(self, command, account):
+        """
+        Run one API command.
+
+        Args:
+            command (dict): API command.
+            account (dict): Simulated account of session. None for login commands.
+
+        Returns:
+            Object: command result, negative integer error code if command failed.
+        """
+
+        action = command.get('a')
+
+        if action == 'us0':
+            return {'v': 2, 's': self.__crypto.base64_url_encode(self._get_account(command.get('user', ''))['salt'])}
+
+        if action == 'us':
+            return self._run_login(username=command.get('user', ''), userHash=command.get('uh'))
+
+        if account is None:
+            return ERROR_ESID
+
+        remote = account['remote']
+        with account['lock']:
+            if action == 'ug':
+                return {'u': account['userHandle'], 'email': account['username']}
+
+            if action == 'uq':
+                return {'mstrg': self.__totalBytes, 'cstrg': remote.get_used_bytes(), 'mxfer': 0, 'caxfer': 0}
+
+            if action == 'f':
+                self._update_actions(account)
+                return {'f': [self._get_node_entry(account, node) for node in remote.iter_nodes()], 'ok': [], 's': [],
+                        'sn': self._get_sequence_number(account['sequence'])}
+
+            if action == 'g':
+                remotePath = self._get_node_path(account, command.get('n'))
+                node = remote.get_node(remotePath) if remotePath else None
+                if not node or node[1] != 0:
+                    return ERROR_ENOENT
+                entry = self._get_node_entry(account, node)
+                token = self.__crypto.base64_url_encode(urandom(12))
+                with self.__lock:
+                    self.__downloads[token] = (account['username'], remotePath)
+                return {'g': '%s/dl/%s' % (self.__url, token), 's': node[2], 'at': entry['a']}
+
+            if action == 'u':
+                size = command.get('s')
+                if not isinstance(size, int) or size < 0:
+                    return ERROR_EARGS
+                fileHandle, filePath = mkstemp(prefix='fakeMegaUpload_')
+                close(fileHandle)
+                token = self.__crypto.base64_url_encode(urandom(12))
+                with self.__lock:
+                    self.__uploads[token] = {'username': account['username'], 'size': size, 'filePath': filePath,
+                                             'parts': {}, 'lock': Lock()}
+                return {'p': '%s/ul/%s' % (self.__url, token)}
+
+            if action == 'd':
+                remotePath = self._get_node_path(account, command.get('n'))
+                node = remote.get_node(remotePath) if remotePath else None
+                if not node:
+                    return ERROR_ENOENT
+                if node[1] in SYSTEM_NODE_TYPES:
+                    return ERROR_EARGS
+                remote.remove(remotePath)
+                account['entries'].pop(remotePath, None)
+                for attributesPath in list(account['attributes']):
+                    if attributesPath == remotePath or attributesPath.startswith(remotePath + '/'):
+                        del account['attributes'][attributesPath]
+                return 0
+
+            if action == 'm':
+                remotePath = self._get_node_path(account, command.get('n'))
+                node = remote.get_node(remotePath) if remotePath else None
+                parentPath = self._get_node_path(account, command.get('t'))
+                parent = remote.get_node(parentPath) if parentPath else None
+                if not node or not parent or parent[1] == 0:
+                    return ERROR_ENOENT
+                if node[1] != 0:
+                    return ERROR_EARGS
+                return self._move_node(account, remotePath, parentPath + '/' + remotePath.rsplit('/', 1)[1])
+
+            if action == 'a':
+                remotePath = self._get_node_path(account, command.get('n'))
+                node = remote.get_node(remotePath) if remotePath else None
+                if not node or node[1] in SYSTEM_NODE_TYPES:
+                    return ERROR_ENOENT
+                entry = self._get_node_entry(account, node)
+                key = self.__crypto.decrypt_key(self.__crypto.base64_to_a32(entry['k'].split(':', 1)[1]),
+                                                account['masterKey'])
+                attributes = self.__crypto.decrypt_attributes(self.__crypto.base64_url_decode(command.get('at', '')),
+                                                              self.__crypto.get_node_key(key))
+                if not attributes or not attributes.get('n') or '/' in attributes['n']:
+                    return ERROR_EARGS
+                account['attributes'][remotePath] = dict((name, value) for name, value in attributes.items()
+                                                         if name != 'n')
+                account['entries'].pop(remotePath, None)
+                newRemotePath = remotePath.rsplit('/', 1)[0] + '/' + attributes['n']
+                if newRemotePath == remotePath:
+                    return 0
+                if node[1] != 0:
+                    return ERROR_EARGS
+                return self._move_node(account, remotePath, newRemotePath)
+
+            if action == 'p':
+                parentPath = self._get_node_path(account, command.get('t'))
+                parent = remote.get_node(parentPath) if parentPath else None
+                if not parent or parent[1] == 0:
+                    return ERROR_ENOENT
+
+                entries = []
+                for newNode in command.get('n', []):
+                    if newNode.get('t') not in [0, 1]:
+                        return ERROR_EARGS
+                    key = self.__crypto.decrypt_key(self.__crypto.base64_to_a32(newNode['k']), account['masterKey'])
+                    attributes = self.__crypto.decrypt_attributes(self.__crypto.base64_url_decode(newNode['a']),
+                                                                  self.__crypto.get_node_key(key))
+                    if not attributes or not attributes.get('n') or '/' in attributes['n']:
+                        return ERROR_EARGS
+                    remotePath = parentPath + '/' + attributes['n']
+                    if remote.get_node(remotePath):
+                        return ERROR_EEXIST
+                    originPath = self._get_origin_path(account, remotePath)
+                    if account['handles'].get(_get_handle(originPath), remotePath) != remotePath:
+                        # Handle of path is kept by a node moved away from it, so new node gets a handle of its own.
+                        account['origins'][remotePath] = '%s:%s' % (remotePath,
+                                                                    self.__crypto.base64_url_encode(urandom(6)))
+                    sourcePath = account['handles'].get(newNode.get('h'))
+                    if newNode['t'] == 0 and sourcePath:
+                        # Handle of an existing file node copies it, as MEGA does, instead of storing an upload.
+                        source = remote.get_node(sourcePath)
+                        if not source or source[1] != 0:
+                            return ERROR_ENOENT
+                        remote.copy(sourcePath, remotePath)
+                    elif newNode['t'] == 0:
+                        result = self._store_upload(account, remotePath, newNode.get('h'), key)
+                        if result:
+                            return result
+                    else:
+                        remote.add(remotePath, 1)
+                    if newNode['t'] == 0:
+                        account['attributes'][remotePath] = dict((name, value) for name, value in attributes.items()
+                                                                 if name != 'n')
+                    entries.append(self._get_node_entry(account, remote.get_node(remotePath)))
+                return {'f': entries}
+
+        return ERROR_EARGS
+
+    def _run_login(self, username, userHash):
+        """
+        Check user hash of login and start session.
+
+        Args:
+            username (str): Account username.
+            userHash (str): User hash derived from password by client.
+
+        Returns:
+            Object: login result with encrypted master key and session id, ENOENT if user hash is wrong.
+        """
+
+        account = self._get_account(username)
+        with account['lock']:
+            if account['userHash'] is None:
+                account['passwordKey'], account['userHash'] = self.__crypto.get_password_key_v2(
+                    password=self.__password, salt=self.__crypto.base64_url_encode(account['salt']))
+
+        if userHash != account['userHash']:
+            return ERROR_ENOENT
+
+        sessionData = urandom(16)
+        sessionCheck = self.__crypto.encrypt_key(self.__crypto.bytes_to_a32(sessionData), account['masterKey'])
+        sessionId = self.__crypto.base64_url_encode(sessionData + self.__crypto.a32_to_bytes(sessionCheck))
+
+        with self.__lock:
+            self.__sessions[sessionId] = (username, time())
+            self.__stats['logins'] += 1
+
+        return {'k': self.__crypto.a32_to_base64(self.__crypto.encrypt_key(account['masterKey'],
+                                                                             account['passwordKey'])),
+                'tsid': sessionId, 'u': account['userHandle']}
+
+    def _store_upload(self, account, remotePath, completionHandle, key):
+        """
+        Decrypt completed upload with file key and store it as file node. Must be called with account lock held.
+
+        Args:
+            account (dict): Simulated account.
+            remotePath (str): Remote path of new file.
+            completionHandle (str): Completion handle of upload, returned by its last part.
+            key (tuple): Decrypted eight word file key.
+
+        Returns:
+            Integer: 0 if stored, negative error code otherwise. ENOENT if completion handle is unknown.
+        """
+
+        with self.__lock:
+            upload = self.__completedUploads.pop(completionHandle, None)
+        if not upload or upload['username'] != account['username'] or len(key) != 8:
+            return ERROR_ENOENT
+
+        fileHandle, plainFilePath = mkstemp(prefix='fakeMegaUpload_')
+        close(fileHandle)
+        try:
+            with open(upload['filePath'], 'rb') as encryptedFile, open(plainFilePath, 'wb') as plainFile:
+                offset = 0
+                while True:
+                    data = encryptedFile.read(CHUNK_SIZE_MAX)
+                    if not data:
+                        break
+                    plainFile.write(self.__crypto.aes_ctr_crypt(self.__crypto.get_node_key(key), key[4:6], data,
+                                                                offset=offset))
+                    offset += len(data)
+            account['remote'].add(remotePath, 0, localFilePath=plainFilePath)
+        finally:
+            for filePath in [upload['filePath'], plainFilePath]:
+                if path.exists(filePath):
+                    remove(filePath)
+        return 0
+
+    def _update_actions(self, account):
+        """
+        Log changes of account tree since last fetch or poll as one batch of action packets. Must be called with
+        account lock held.
+
+        Args:
+            account (dict): Simulated account.
+        """
+
+        nodes = dict((node[0], node) for node in account['remote'].iter_nodes())
+        snapshot = account['snapshot']
+        account['snapshot'] = nodes
+        if snapshot is None:
+            return
+
+        packets = []
+        removedPaths = set(snapshot) - set(nodes)
+        for remotePath in sorted(removedPaths):
+            # Removing a directory removes everything under it, so only the top removed node is notified.
+            if remotePath.rsplit('/', 1)[0] not in removedPaths:
+                packets.append({'a': 'd', 'n': _get_handle(self._get_origin_path(account, remotePath))})
+                account['entries'].pop(remotePath, None)
+
+        # Sorted by path, so parents come before their children.
+        changedNodes = [nodes[remotePath] for remotePath in sorted(nodes)
+                        if snapshot.get(remotePath) != nodes[remotePath]]
+        if changedNodes:
+            packets.append({'a': 't', 't': {'f': [self._get_node_entry(account, node) for node in changedNodes]}})
+
+        if packets:
+            account['sequence'] += 1
+            account['actions'].append((account['sequence'], packets))
+            del account['actions'][:-ACTION_LOG_SIZE]
+
+    def add_connection(self):
+        """
+        Count new client connection.
+        """
+
+        with self.__lock:
+            self.__stats['connections'] += 1
+
+    def get_stats(self):
+        """
+        Get server statistics.
+
+        Returns:
+            Dictionary: with "requests", "commands", "connections", "logins", "polls", "downloads" and "uploads"
+                counts.
+        """
+
+        with self.__lock:
+            return dict(self.__stats)
+
+    def handle_download(self, token, start, end):
+        """
+        Handle download of byte range of file, encrypted with AES-CTR under file key.
+
+        Args:
+            token (str): Token of download URL handed out by "g" command.
+            start (int): First byte.
+            end (int): Last byte, inclusive.
+
+        Returns:
+            Bytes: encrypted content in range. None if download URL is unknown.
+        """
+
+        sleep(self.__latency)
+
+        with self.__lock:
+            self.__stats['downloads'] += 1
+            download = self.__downloads.get(token)
+        if not download:
+            return None
+
+        account = self._get_account(download[0])
+        with account['lock']:
+            node = account['remote'].get_node(download[1])
+            if not node:
+                return None
+            entry = self._get_node_entry(account, node)
+        key = self.__crypto.decrypt_key(self.__crypto.base64_to_a32(entry['k'].split(':', 1)[1]), account['masterKey'])
+        data = account['remote'].read_bytes(download[1], start, min(end + 1, node[2]))
+        return self.__crypto.aes_ctr_crypt(self.__crypto.get_node_key(key), key[4:6], data, offset=start)
+
+    def handle_poll(self, sessionId, sequenceNumber):
+        """
+        Handle server change notification ("sc") request.
+
+        Args:
+            sessionId (str): Session id of request.
+            sequenceNumber (str): Sequence number of client tree.
+
+        Returns:
+            Object: action packets since sequence number and new sequence number, wait URL if there are no changes, or
+                negative integer error code. ETOOMANY if changes since sequence number are no longer logged.
+        """
+
+        sleep(self.__latency)
+
+        with self.__lock:
+            self.__stats['requests'] += 1
+            self.__stats['polls'] += 1
+            session = self.__sessions.get(sessionId) if sessionId else None
+
+        if self.__eagainRate and random() < self.__eagainRate:
+            return ERROR_EAGAIN
+        if not session or (self.__sessionSeconds and time() - session[1] > self.__sessionSeconds):
+            return ERROR_ESID
+
+        try:
+            sequence = unpack('>Q', self.__crypto.base64_url_decode(sequenceNumber or ''))[0]
+        except (StructError, TypeError, ValueError):
+            return ERROR_EARGS
+
+        account = self._get_account(session[0])
+        with account['lock']:
+            self._update_actions(account)
+            actions = account['actions']
+            if sequence > account['sequence'] or (actions and sequence < actions[0][0] - 1) or \
+                    (not actions and sequence != account['sequence']):
+                return ERROR_ETOOMANY
+            packets = [packet for actionSequence, batch in actions if actionSequence > sequence for packet in batch]
+            if not packets:
+                return {'w': 'http://127.0.0.1/wsc/%s' % sequenceNumber}
+            return {'a': packets, 'sn': self._get_sequence_number(account['sequence'])}
+
+    def handle_request(self, sessionId, commands):
+        """
+        Handle API request.
+
+        Args:
+            sessionId (str): Session id of request. None for login requests.
+            commands (list): API commands.
+
+        Returns:
+            Object: list of command results, or negative integer error code if whole request failed.
+        """
+
+        sleep(self.__latency)
+
+        with self.__lock:
+            self.__stats['requests'] += 1
+            self.__stats['commands'] += len(commands) if isinstance(commands, list) else 0
+            session = self.__sessions.get(sessionId) if sessionId else None
+
+        if not isinstance(commands, list):
+            return ERROR_EARGS
+        if self.__eagainRate and random() < self.__eagainRate:
+            return ERROR_EAGAIN
+
+        account = None
+        if sessionId:
+            if not session or (self.__sessionSeconds and time() - session[1] > self.__sessionSeconds):
+                return ERROR_ESID
+            account = self._get_account(session[0])
+
+        return [self._run_command(command=command, account=account) for command in commands]
+
+    def handle_upload(self, token, offset, data):
+        """
+        Handle encrypted part of upload. Parts may arrive in any order; the part completing the upload gets its
+        completion handle.
+
+        Args:
+            token (str): Token of upload URL handed out by "u" command.
+            offset (int): Byte offset of part in file.
+            data (bytes): Encrypted part.
+
+        Returns:
+            Object: completion handle if upload is complete, empty string if parts are missing, negative integer error
+                code if upload URL is unknown or part is out of range.
+        """
+
+        sleep(self.__latency)
+
+        with self.__lock:
+            self.__stats['uploads'] += 1
+            upload = self.__uploads.get(token)
+        if not upload:
+            return ERROR_ENOENT
+        if offset < 0 or offset + len(data) > upload['size']:
+            return ERROR_EARGS
+
+        with upload['lock']:
+            with open(upload['filePath'], 'r+b') as uploadFile:
+                uploadFile.seek(offset)
+                uploadFile.write(data)
+            upload['parts'][offset] = len(data)
+            if sum(upload['parts'].values()) < upload['size']:
+                return ''
+
+        completionHandle = self.__crypto.base64_url_encode(urandom(27))
+        with self.__lock:
+            if self.__uploads.pop(token, None):
+                self.__completedUploads[completionHandle] = upload
+        return completionHandle
+
+    def start(self, host='127.0.0.1', port=0):
+        """
+        Start serving in background thread.
+
+        Args:
+            host (str): Host to listen on.
+            port (int): Port to listen on, 0 for any free port.
+
+        Returns:
+            String: API URL to give clients, ie: "http://127.0.0.1:8089".
+        """
+
+        self.__server = _FakeMegaApiServer((host, port), _FakeMegaApiHandler)
+        self.__server.api = self
+        thread = Thread(target=self.__server.serve_forever, name='fakeMegaApi')
+        thread.daemon = True
+        thread.start()
+        self.__url = 'http://%s:%d' % self.__server.server_address[:2]
+        return self.__url
+
+    def stop(self):
+        """
+        Stop serving.
+        """
+
+        if self.__server:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+
+class _FakeMegaApiHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler of fake MEGA API. Speaks HTTP/1.1 so clients can keep connections alive.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, data):
+        body = dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.api.add_connection()
+
+    def do_GET(self):
+        urlPath = urlsplit(self.path).path
+        if urlPath == '/stats':
+            self._send_json(self.server.api.get_stats())
+            return
+
+        pathParts = urlPath.split('/')
+        if len(pathParts) == 4 and pathParts[1] == 'dl':
+            try:
+                start, end = [int(number) for number in pathParts[3].split('-')]
+            except ValueError:
+                start, end = None, None
+            data = self.server.api.handle_download(token=pathParts[2], start=start, end=end) \
+                if start is not None else None
+            if data is not None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+        self.send_error(404)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        parameters = parse_qs(url.query)
+        pathParts = url.path.split('/')
+        if len(pathParts) == 4 and pathParts[1] == 'ul':
+            try:
+                offset = int(pathParts[3])
+            except ValueError:
+                offset = -1
+            result = str(self.server.api.handle_upload(token=pathParts[2], offset=offset, data=body)).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(result)))
+            self.end_headers()
+            self.wfile.write(result)
+            return
+        if url.path == '/sc':
+            self._send_json(self.server.api.handle_poll(sessionId=parameters.get('sid', [None])[0],
+                                                        sequenceNumber=parameters.get('sn', [None])[0]))
+            return
+        if url.path != '/cs':
+            self.send_error(404)
+            return
+
+        try:
+            commands = loads(body.decode('utf-8'))
+        except ValueError:
+            commands = None
+        sessionId = parameters.get('sid', [None])[0]
+        self._send_json(self.server.api.handle_request(sessionId=sessionId, commands=commands))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _FakeMegaApiServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def get_args():
+    """
+    Get command line arguments.
+
+    Returns:
+        Namespace: parsed arguments.
+    """
+
+    parser = ArgumentParser(description='Simulated MEGA API server serving fake megatools accounts.')
+    parser.add_argument('--host', dest='host', type=str, default='127.0.0.1', help='Host to listen on.')
+    parser.add_argument('--port', dest='port', type=int, default=DEFAULT_PORT, help='Port to listen on.')
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    api = FakeMegaApi(rootDir=environ.get('FAKE_MEGA_ROOT', DEFAULT_ROOT),
+                      password=environ.get('FAKE_MEGA_PASSWORD', DEFAULT_PASSWORD),
+                      totalBytes=int(environ.get('FAKE_MEGA_TOTAL_BYTES', DEFAULT_TOTAL_BYTES)),
+                      latency=float(environ.get('FAKE_MEGA_LATENCY', 0)),
+                      eagainRate=float(environ.get('FAKE_MEGA_API_EAGAIN_RATE', 0)),
+                      sessionSeconds=int(environ.get('FAKE_MEGA_API_SESSION_SECONDS', 0)))
+    url = api.start(host=args.host, port=args.port)
+    print('Fake MEGA API serving "%s" at %s' % (environ.get('FAKE_MEGA_ROOT', DEFAULT_ROOT), url))
+    try:
+        while True:
+            sleep(3600)
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,968 @@
+#!/usr/bin/env python
+##
+# Created by: Curtis Szmania
+# Date: 10/18/2026
+# Initial Creation.
+###
+
+from argparse import ArgumentParser
+from os import close, environ, makedirs, open as openFile, path, remove, rename, stat, O_CREAT, \
+    O_EXCL, O_WRONLY, walk
+from random import Random
+from shutil import copyfile, rmtree
+from sys import argv, exit, stderr, stdout
+from tempfile import gettempdir
+from time import localtime, sleep, strftime, time
+from zlib import crc32
+
+__author__ = 'szmania'
+
+SCRIPT_DIR = path.dirname(path.realpath(__file__))
+
+DEFAULT_ROOT = path.join(gettempdir(), 'fakeMega')
+DEFAULT_TOTAL_BYTES = 50 * 1024 ** 3
+MANIFEST_EXTENSION = '.manifest'
+JOURNAL_EXTENSION = '.journal'
+QUOTA_EXTENSION = '.quota'
+MANIFEST_HEADER = '# fakeMegaTools manifest: type<TAB>size<TAB>mtime<TAB>path'
+LOCK_TIMEOUT = 60.0
+DIR_HANDLES = {}
+SYSTEM_NODES = [('/Root', 2), ('/Inbox', 3), ('/Rubbish', 4)]
+GENERATED_EXTENSIONS = ['.jpg', '.jpg', '.png', '.mp4', '.avi', '.txt', '.pdf']
+
+
+class FakeRemote(object):
+    def __init__(self, rootDir, username):
+        """
+        Simulated remote of one MEGA account. Account is either a directory "<rootDir>/<username>" whose "Root"
+        sub directory is "/Root", or a generated tree listed in manifest "<rootDir>/<username>.manifest". Manifest
+        nodes have no content; downloaded manifest files are sparse files of the listed size. Manifest is sorted by
+        path so nodes are found by binary search, and changes are appended to a journal so large trees are never
+        rewritten.
+
+        Args:
+            rootDir (str): Directory holding simulated accounts.
+            username (str): Account username.
+        """
+
+        self.__accountDir = path.join(rootDir, username)
+        self.__manifestPath = path.join(rootDir, username + MANIFEST_EXTENSION)
+        self.__journalPath = path.join(rootDir, username + JOURNAL_EXTENSION)
+        self.__lockPath = path.join(rootDir, username + '.lock')
+        self.__quotaPath = path.join(rootDir, username + QUOTA_EXTENSION)
+        self.__journal = None
+
+        if not self.is_manifest() and not path.isdir(path.join(self.__accountDir, 'Root')):
+            makedirs(path.join(self.__accountDir, 'Root'))
+
+    def _append_journal(self, line):
+        """
+        Append change to manifest journal.
+
+        Args:
+            line (str): Journal line, "+<TAB>type<TAB>size<TAB>mtime<TAB>path" or "-<TAB>path".
+        """
+
+        self._lock()
+        try:
+            with open(self.__journalPath, 'a') as journal:
+                journal.write(line + '\n')
+        finally:
+            self._unlock()
+        self.__journal = None
+
+    def _get_journal(self):
+        """
+        Get manifest changes recorded in journal.
+
+        Returns:
+            Tuple: of added nodes dictionary of path to node, and set of removed paths.
+        """
+
+        if self.__journal is not None:
+            return self.__journal
+
+        added = {}
+        removed = set()
+        if path.isfile(self.__journalPath):
+            with open(self.__journalPath, 'r') as journal:
+                for line in journal:
+                    fields = line.rstrip('\n').split('\t')
+                    if fields[0] == '+':
+                        added[fields[4]] = (fields[4], int(fields[1]), int(fields[2]), int(fields[3]))
+                    elif fields[0] == '-':
+                        prefix = fields[1] + '/'
+                        for addedPath in [addedPath for addedPath in added
+                                          if addedPath == fields[1] or addedPath.startswith(prefix)]:
+                            del added[addedPath]
+                        removed.add(fields[1])
+
+        self.__journal = (added, removed)
+        return self.__journal
+
+    def _get_local_path(self, remotePath):
+        """
+        Get path in account directory of remote path.
+
+        Args:
+            remotePath (str): Remote path ie: "/Root/dir/file.jpg".
+
+        Returns:
+            String: local path backing remote path.
+        """
+
+        return path.join(self.__accountDir, *remotePath.strip('/').split('/'))
+
+    def _is_removed(self, remotePath, removed):
+        """
+        Get whether manifest node, or one of its parent directories, was removed.
+
+        Args:
+            remotePath (str): Remote path of node.
+            removed (set): Removed paths from journal.
+
+        Returns:
+            Boolean: whether node was removed or not.
+        """
+
+        if not removed:
+            return False
+
+        while remotePath:
+            if remotePath in removed:
+                return True
+            remotePath = remotePath.rsplit('/', 1)[0]
+        return False
+
+    def _iter_directory_nodes(self):
+        """
+        Iterate nodes of directory account, sorted by path.
+
+        Returns:
+            Generator: of (path, type, size, mtime) tuples.
+        """
+
+        for remotePath, nodeType in SYSTEM_NODES:
+            localPath = self._get_local_path(remotePath)
+            if not path.isdir(localPath):
+                continue
+            yield remotePath, nodeType, 0, int(stat(localPath).st_mtime)
+
+            for dirPath, dirNames, fileNames in walk(localPath):
+                dirNames.sort()
+                remoteDir = remotePath + dirPath[len(localPath):].replace('\\', '/')
+                items = [(name, 1) for name in dirNames] + [(name, 0) for name in fileNames]
+                for name, itemType in sorted(items):
+                    itemStat = stat(path.join(dirPath, name))
+                    yield remoteDir + '/' + name, itemType, itemStat.st_size if itemType == 0 else 0, \
+                        int(itemStat.st_mtime)
+
+    def _iter_manifest_nodes(self, prefix=None):
+        """
+        Iterate nodes of manifest account, with journal changes applied.
+
+        Args:
+            prefix (str): Only iterate nodes whose path starts with prefix. None for all nodes.
+
+        Returns:
+            Generator: of (path, type, size, mtime) tuples.
+        """
+
+        added, removed = self._get_journal()
+
+        with open(self.__manifestPath, 'rb') as manifest:
+            if prefix:
+                self._seek_manifest(manifest, prefix)
+            for line in manifest:
+                if line.startswith(b'#'):
+                    continue
+                nodeType, size, mtime, remotePath = line.decode('utf-8').rstrip('\n').split('\t', 3)
+                if prefix and not remotePath.startswith(prefix):
+                    break
+                if not self._is_removed(remotePath, removed):
+                    yield remotePath, int(nodeType), int(size), int(mtime)
+
+        for remotePath in sorted(added):
+            if not prefix or remotePath.startswith(prefix):
+                yield added[remotePath]
+
+    def _lock(self):
+        """
+        Take account lock so concurrent fake commands don't write the journal at the same time.
+        """
+
+        startTime = time()
+        while True:
+            try:
+                close(openFile(self.__lockPath, O_CREAT | O_EXCL | O_WRONLY))
+                return
+            except OSError:
+                if time() - startTime > LOCK_TIMEOUT:
+                    remove(self.__lockPath)
+                sleep(0.01)
+
+    def _seek_manifest(self, manifest, remotePath):
+        """
+        Binary search sorted manifest, leaving it positioned at first line whose path is not less than remote path.
+
+        Args:
+            manifest (file): Manifest file opened in binary mode.
+            remotePath (str): Remote path to search for.
+        """
+
+        target = remotePath.encode('utf-8')
+
+        def line_start(position):
+            if position == 0:
+                return 0
+            manifest.seek(position - 1)
+            manifest.readline()
+            return manifest.tell()
+
+        def is_after(position):
+            manifest.seek(line_start(position))
+            line = manifest.readline()
+            return not line or (not line.startswith(b'#') and line.rstrip(b'\n').split(b'\t', 3)[3] >= target)
+
+        manifest.seek(0, 2)
+        low, high = 0, manifest.tell()
+        while low < high:
+            middle = (low + high) // 2
+            if is_after(middle):
+                high = middle
+            else:
+                low = middle + 1
+        manifest.seek(line_start(low))
+
+    def _unlock(self):
+        """
+        Release account lock.
+        """
+
+        if path.exists(self.__lockPath):
+            remove(self.__lockPath)
+
+    def add(self, remotePath, nodeType, localFilePath=None):
+        """
+        Add file or directory node.
+
+        Args:
+            remotePath (str): Remote path of node.
+            nodeType (int): 0 for file, 1 for directory.
+            localFilePath (str): Local file to store as file node.
+        """
+
+        if not self.is_manifest():
+            localPath = self._get_local_path(remotePath)
+            if nodeType == 1:
+                makedirs(localPath)
+            else:
+                copyfile(localFilePath, localPath)
+            return
+
+        size = path.getsize(localFilePath) if nodeType == 0 else 0
+        self._append_journal('+\t%d\t%d\t%d\t%s' % (nodeType, size, int(time()), remotePath))
+
+    def copy(self, remotePath, newRemotePath):
+        """
+        Copy file node.
+
+        Args:
+            remotePath (str): Remote path of file to copy.
+            newRemotePath (str): Remote path to copy file to.
+        """
+
+        if not self.is_manifest():
+            copyfile(self._get_local_path(remotePath), self._get_local_path(newRemotePath))
+            return
+
+        node = self.get_node(remotePath)
+        self._append_journal('+\t%d\t%d\t%d\t%s' % (node[1], node[2], int(time()), newRemotePath))
+
+    def get_node(self, remotePath):
+        """
+        Get node of remote path.
+
+        Args:
+            remotePath (str): Remote path of node.
+
+        Returns:
+            Tuple: (path, type, size, mtime). None if node does not exist.
+        """
+
+        remotePath = remotePath.rstrip('/') or '/'
+        if not self.is_manifest():
+            for systemPath, nodeType in SYSTEM_NODES:
+                if remotePath == systemPath and path.isdir(self._get_local_path(systemPath)):
+                    return systemPath, nodeType, 0, int(stat(self._get_local_path(systemPath)).st_mtime)
+
+            localPath = self._get_local_path(remotePath)
+            if not path.exists(localPath):
+                return None
+            isDir = path.isdir(localPath)
+            return remotePath, 1 if isDir else 0, 0 if isDir else path.getsize(localPath), \
+                int(stat(localPath).st_mtime)
+
+        added, removed = self._get_journal()
+        if remotePath in added:
+            return added[remotePath]
+
+        for node in self._iter_manifest_nodes(prefix=remotePath):
+            if node[0] == remotePath:
+                return node
+            if node[0] > remotePath:
+                break
+        return None
+
+    def get_used_bytes(self):
+        """
+        Get bytes used by account files.
+
+        Returns:
+            Integer: total size of file nodes.
+        """
+
+        return sum(node[2] for node in self.iter_nodes() if node[1] == 0)
+
+    def is_manifest(self):
+        """
+        Get whether account is a generated manifest tree.
+
+        Returns:
+            Boolean: whether account is listed in a manifest or not.
+        """
+
+        return path.isfile(self.__manifestPath)
+
+    def iter_nodes(self, remotePath=None):
+        """
+        Iterate nodes under remote path.
+
+        Args:
+            remotePath (str): Remote path to iterate nodes under, including node itself. None for all nodes.
+
+        Returns:
+            Generator: of (path, type, size, mtime) tuples.
+        """
+
+        if remotePath is None:
+            nodes = self._iter_manifest_nodes() if self.is_manifest() else self._iter_directory_nodes()
+            for node in nodes:
+                yield node
+            return
+
+        remotePath = remotePath.rstrip('/') or '/'
+        node = self.get_node(remotePath)
+        if node is None:
+            return
+        yield node
+
+        prefix = remotePath + '/'
+        if self.is_manifest():
+            nodes = self._iter_manifest_nodes(prefix=prefix)
+        else:
+            nodes = self._iter_directory_nodes()
+        for node in nodes:
+            if node[0].startswith(prefix):
+                yield node
+
+    def move(self, remotePath, newRemotePath):
+        """
+        Move or rename file node, keeping its size and modification time.
+
+        Args:
+            remotePath (str): Remote path of file to move.
+            newRemotePath (str): Remote path to move file to.
+        """
+
+        if not self.is_manifest():
+            rename(self._get_local_path(remotePath), self._get_local_path(newRemotePath))
+            return
+
+        node = self.get_node(remotePath)
+        self._append_journal('-\t%s' % remotePath.rstrip('/'))
+        self._append_journal('+\t%d\t%d\t%d\t%s' % (node[1], node[2], node[3], newRemotePath))
+
+    def read(self, remotePath, localFilePath):
+        """
+        Write content of remote file to local file.
+
+        Args:
+            remotePath (str): Remote file path.
+            localFilePath (str): Local file path to write.
+        """
+
+        if not self.is_manifest():
+            copyfile(self._get_local_path(remotePath), localFilePath)
+            return
+
+        node = self.get_node(remotePath)
+        with open(localFilePath, 'wb') as localFile:
+            localFile.truncate(node[2])
+
+    def read_bytes(self, remotePath, start, end):
+        """
+        Read byte range of remote file. Manifest files read as zero bytes.
+
+        Args:
+            remotePath (str): Remote file path.
+            start (int): First byte to read.
+            end (int): Byte to stop reading at, exclusive.
+
+        Returns:
+            Bytes: file content in range.
+        """
+
+        if self.is_manifest():
+            node = self.get_node(remotePath)
+            return b'\0' * max(0, min(end, node[2]) - start)
+
+        with open(self._get_local_path(remotePath), 'rb') as remoteFile:
+            remoteFile.seek(start)
+            return remoteFile.read(max(0, end - start))
+
+    def remove(self, remotePath):
+        """
+        Remove node and everything under it.
+
+        Args:
+            remotePath (str): Remote path of node to remove.
+        """
+
+        if not self.is_manifest():
+            localPath = self._get_local_path(remotePath)
+            if path.isdir(localPath):
+                rmtree(localPath)
+            else:
+                remove(localPath)
+            return
+
+        self._append_journal('-\t%s' % remotePath.rstrip('/'))
+
+    def use_quota(self, size, quotaBytes, quotaSeconds):
+        """
+        Count downloaded bytes against transfer quota, which allows quota bytes per window of quota seconds. Window
+        start and bytes used are kept in "<rootDir>/<username>.quota", shared by all commands of account.
+
+        Args:
+            size (int): Bytes to download.
+            quotaBytes (int): Bytes allowed per window.
+            quotaSeconds (float): Window length in seconds.
+
+        Returns:
+            Integer: seconds until window ends if download is over quota, else 0.
+        """
+
+        self._lock()
+        try:
+            windowStart, usedBytes = time(), 0
+            if path.isfile(self.__quotaPath):
+                with open(self.__quotaPath, 'r') as quotaFile:
+                    values = quotaFile.read().split()
+                if len(values) == 2 and time() - float(values[0]) < quotaSeconds:
+                    windowStart, usedBytes = float(values[0]), int(values[1])
+            if usedBytes + size > quotaBytes:
+                return max(1, int(windowStart + quotaSeconds - time() + 0.5))
+            with open(self.__quotaPath, 'w') as quotaFile:
+                quotaFile.write('%f %d\n' % (windowStart, usedBytes + size))
+            return 0
+        finally:
+            self._unlock()
+
+
+def _get_handle(remotePath):
+    """
+    Get stable 8 character node handle for remote path.
+
+    Args:
+        remotePath (str): Remote path of node.
+
+    Returns:
+        String: node handle.
+    """
+
+    return '%08x' % (crc32(remotePath.encode('utf-8')) & 0xffffffff)
+
+
+def _get_settings():
+    """
+    Get simulation settings from environment.
+
+    Returns:
+        Dictionary: of "root", "latency", "throughput", "totalBytes", "password", "quotaBytes" and "quotaSeconds".
+    """
+
+    return {
+        'root': environ.get('FAKE_MEGA_ROOT', DEFAULT_ROOT),
+        'latency': float(environ.get('FAKE_MEGA_LATENCY', 0)),
+        'throughput': float(environ.get('FAKE_MEGA_THROUGHPUT', 0)),
+        'totalBytes': int(environ.get('FAKE_MEGA_TOTAL_BYTES', DEFAULT_TOTAL_BYTES)),
+        'password': environ.get('FAKE_MEGA_PASSWORD'),
+        'quotaBytes': int(environ.get('FAKE_MEGA_QUOTA_BYTES', 0)),
+        'quotaSeconds': float(environ.get('FAKE_MEGA_QUOTA_SECONDS', 3600))
+    }
+
+
+def _get_transfer_seconds(size, settings, limitSpeed=None):
+    """
+    Get simulated transfer time of size bytes.
+
+    Args:
+        size (int): Bytes transferred.
+        settings (dict): Simulation settings.
+        limitSpeed (int): Speed limit in KB/s given on command line. None or 0 for no limit.
+
+    Returns:
+        Float: transfer time in seconds.
+    """
+
+    throughputs = [speed for speed in [settings['throughput'], (limitSpeed or 0) * 1024.0] if speed > 0]
+    return size / min(throughputs) if throughputs else 0.0
+
+
+def _is_over_quota(remote, remotePath, size, settings):
+    """
+    Check download against transfer quota, and write megatools' over quota error if it is over.
+
+    Args:
+        remote (FakeRemote): Account remote.
+        remotePath (str): Remote path of file downloaded.
+        size (int): Bytes to download.
+        settings (dict): Simulation settings.
+
+    Returns:
+        Boolean: whether download is over quota.
+    """
+
+    if not settings['quotaBytes']:
+        return False
+    retrySeconds = remote.use_quota(size, settings['quotaBytes'], settings['quotaSeconds'])
+    if retrySeconds:
+        stderr.write("ERROR: Download failed for '%s': Server returned error EOVERQUOTA (retry in %d seconds)\n" % (
+            remotePath, retrySeconds))
+    return retrySeconds > 0
+
+
+def _login(args, settings):
+    """
+    Simulate login latency and password check, then open account remote.
+
+    Args:
+        args (Namespace): Parsed command arguments.
+        settings (dict): Simulation settings.
+
+    Returns:
+        FakeRemote: account remote. None if login failed.
+    """
+
+    sleep(settings['latency'])
+
+    if not args.username:
+        stderr.write('ERROR: No username given\n')
+        return None
+    if settings['password'] is not None and args.password != settings['password']:
+        stderr.write("ERROR: Can't login to mega.nz: API call 'us' failed: Server returned error ENOENT\n")
+        return None
+
+    if not path.isdir(settings['root']):
+        makedirs(settings['root'])
+    return FakeRemote(rootDir=settings['root'], username=args.username)
+
+
+def _write_node(node, longFormat, namesOnly):
+    """
+    Write node as megals output line.
+
+    Args:
+        node (tuple): (path, type, size, mtime) of node.
+        longFormat (bool): Write handles, type, size and modified time too.
+        namesOnly (bool): Write node name instead of full path.
+    """
+
+    remotePath, nodeType, size, mtime = node
+    name = remotePath.rsplit('/', 1)[1] if namesOnly else remotePath
+    if not longFormat:
+        stdout.write(name + '\n')
+        return
+
+    parentPath = remotePath.rsplit('/', 1)[0]
+    parentHandle = DIR_HANDLES.get(parentPath)
+    if parentHandle is None:
+        parentHandle = DIR_HANDLES[parentPath] = _get_handle(parentPath) if parentPath else ''
+    sizeText = str(size) if nodeType == 0 else '-'
+    stdout.write('%-11s %-11s %d %12s %s %s\n' % (_get_handle(remotePath), parentHandle, nodeType, sizeText,
+                                                   strftime('%Y-%m-%d %H:%M:%S', localtime(mtime)), name))
+
+
+def generate_tree(rootDir, username, nodeCount, fanout=10, seed=0, localRoot=None, localFraction=1.0):
+    """
+    Generate manifest tree account with given number of nodes under "/Root". Optionally materialize part of its files
+    as sparse local files, to sync against.
+
+    Args:
+        rootDir (str): Directory holding simulated accounts.
+        username (str): Account username.
+        nodeCount (int): Number of file and directory nodes to generate.
+        fanout (int): Number of sub directories per directory.
+        seed (int): Random seed, so trees can be regenerated identically.
+        localRoot (str): Local directory "/Root" maps to. None to not create local files.
+        localFraction (float): Fraction of files to create locally, the rest only exist remotely.
+
+    Returns:
+        Dictionary: of "dirs", "files", "bytes" and "localFiles" generated.
+    """
+
+    random = Random(seed)
+    baseTime = 1500000000
+
+    dirCount = max(1, nodeCount // (fanout + 1))
+    dirPaths = ['/Root']
+    for index in range(1, dirCount):
+        dirPaths.append('%s/d%d' % (dirPaths[(index - 1) // fanout], index))
+
+    nodes = [(remotePath, nodeType, 0, baseTime) for remotePath, nodeType in SYSTEM_NODES]
+    nodes.extend((dirPath, 1, 0, baseTime) for dirPath in dirPaths[1:])
+
+    totalBytes = 0
+    for index in range(max(0, nodeCount - len(dirPaths) + 1)):
+        extension = GENERATED_EXTENSIONS[random.randrange(len(GENERATED_EXTENSIONS))]
+        size = int(min(random.lognormvariate(11, 2), 4 * 1024 ** 3))
+        totalBytes += size
+        nodes.append(('%s/f%07d%s' % (dirPaths[index % len(dirPaths)], index, extension), 0, size,
+                      baseTime + random.randrange(10 ** 8)))
+    nodes.sort()
+
+    if not path.isdir(rootDir):
+        makedirs(rootDir)
+    accountDir = path.join(rootDir, username)
+    if path.isdir(accountDir):
+        rmtree(accountDir)
+
+    tempPath = path.join(rootDir, username + MANIFEST_EXTENSION + '.tmp')
+    with open(tempPath, 'w') as manifest:
+        manifest.write(MANIFEST_HEADER + '\n')
+        for remotePath, nodeType, size, mtime in nodes:
+            manifest.write('%d\t%d\t%d\t%s\n' % (nodeType, size, mtime, remotePath))
+    manifestPath = path.join(rootDir, username + MANIFEST_EXTENSION)
+    if path.exists(manifestPath):
+        remove(manifestPath)
+    journalPath = path.join(rootDir, username + JOURNAL_EXTENSION)
+    if path.exists(journalPath):
+        remove(journalPath)
+    rename(tempPath, manifestPath)
+
+    localFiles = 0
+    if localRoot:
+        for remotePath, nodeType, size, mtime in nodes:
+            if not remotePath.startswith('/Root/'):
+                continue
+            localPath = path.join(localRoot, *remotePath[len('/Root/'):].split('/'))
+            if nodeType == 1:
+                if not path.isdir(localPath):
+                    makedirs(localPath)
+            elif random.random() < localFraction:
+                with open(localPath, 'wb') as localFile:
+                    localFile.truncate(size)
+                localFiles += 1
+
+    return {'dirs': len(dirPaths) - 1, 'files': len(nodes) - len(dirPaths) - len(SYSTEM_NODES) + 1,
+            'bytes': totalBytes, 'localFiles': localFiles}
+
+
+def megacopy(args, settings):
+    """
+    Simulate megacopy. Copies files missing on the other side, uploading unless "--download" is given.
+    """
+
+    remote = _login(args, settings)
+    if not remote:
+        return 1
+
+    remoteDir = args.remote.rstrip('/')
+    if args.download:
+        for remotePath, nodeType, size, mtime in list(remote.iter_nodes(remoteDir)):
+            localPath = path.join(args.local, *remotePath[len(remoteDir):].strip('/').split('/'))
+            if nodeType == 1 and not path.isdir(localPath):
+                makedirs(localPath)
+            elif nodeType == 0 and not path.exists(localPath):
+                if _is_over_quota(remote, remotePath, size, settings):
+                    return 1
+                sleep(_get_transfer_seconds(size, settings, args.limitSpeed))
+                remote.read(remotePath, localPath)
+                stdout.write('F %s\n' % localPath)
+        return 0
+
+    if remote.get_node(remoteDir) is None:
+        remote.add(remoteDir, 1)
+    for dirPath, dirNames, fileNames in walk(args.local):
+        dirNames.sort()
+        remoteSubDir = remoteDir + dirPath[len(args.local.rstrip('/\\')):].replace('\\', '/')
+        for name in dirNames:
+            if remote.get_node(remoteSubDir + '/' + name) is None:
+                remote.add(remoteSubDir + '/' + name, 1)
+                stdout.write('D %s/%s\n' % (remoteSubDir, name))
+        for name in sorted(fileNames):
+            if remote.get_node(remoteSubDir + '/' + name) is None:
+                localPath = path.join(dirPath, name)
+                sleep(_get_transfer_seconds(path.getsize(localPath), settings, args.limitSpeed))
+                remote.add(remoteSubDir + '/' + name, 0, localFilePath=localPath)
+                stdout.write('F %s/%s\n' % (remoteSubDir, name))
+    return 0
+
+
+def megadf(args, settings):
+    """
+    Simulate megadf. Prints total, used and/or free account space.
+    """
+
+    remote = _login(args, settings)
+    if not remote:
+        return 1
+
+    usedBytes = remote.get_used_bytes()
+    values = [('Total', settings['totalBytes']), ('Used', usedBytes),
+              ('Free', max(0, settings['totalBytes'] - usedBytes))]
+    selected = [(name, value) for name, value in values if getattr(args, name.lower())]
+    divisor = 1024 ** 3 if args.gb else 1024 ** 2 if args.mb else 1
+
+    for name, value in selected if selected else values:
+        text = '%d' % (value // divisor)
+        stdout.write(text + '\n' if selected else '%s: %s\n' % (name, text))
+    return 0
+
+
+def megaget(args, settings):
+    """
+    Simulate megaget. Downloads remote files to "--path" or working directory.
+    """
+
+    remote = _login(args, settings)
+    if not remote:
+        return 1
+
+    exitCode = 0
+    for remotePath in args.paths:
+        node = remote.get_node(remotePath)
+        if not node or node[1] != 0:
+            stderr.write('ERROR: File not found: %s\n' % remotePath)
+            exitCode = 1
+            continue
+
+        localPath = args.path if args.path else remotePath.rsplit('/', 1)[1]
+        if path.isdir(localPath):
+            localPath = path.join(localPath, remotePath.rsplit('/', 1)[1])
+        if path.exists(localPath):
+            stderr.write('ERROR: Local file already exists: %s\n' % localPath)
+            exitCode = 1
+            continue
+        if _is_over_quota(remote, remotePath, node[2], settings):
+            return 1
+
+        sleep(_get_transfer_seconds(node[2], settings, args.limitSpeed))
+        remote.read(remotePath, localPath)
+    return exitCode
+
+
+def megals(args, settings):
+    """
+    Simulate megals. Lists given remote paths, or all nodes when none are given.
+    """
+
+    remote = _login(args, settings)
+    if not remote:
+        return 1
+
+    if not args.paths:
+        for node in remote.iter_nodes():
+            _write_node(node, args.long, args.names)
+        return 0
+
+    exitCode = 0
+    for remotePath in args.paths:
+        remotePath = remotePath.rstrip('/') or '/'
+        node = remote.get_node(remotePath)
+        if node is None:
+            stderr.write('ERROR: Remote path not found: %s\n' % remotePath)
+            exitCode = 1
+            continue
+
+        if node[1] == 0:
+            _write_node(node, args.long, args.names)
+            continue
+
+        depth = remotePath.count('/') + 1
+        for child in remote.iter_nodes(remotePath):
+            if child[0] != remotePath and (args.recursive or child[0].count('/') == depth):
+                _write_node(child, args.long, args.names)
+    return exitCode
+
+
+def megamkdir(args, settings):
+    """
+    Simulate megamkdir. Creates remote directories whose parent exists.
+    """
+
+    remote = _login(args, settings)
+    if not remote:
+        return 1
+
+    exitCode = 0
+    for remotePath in args.paths:
+        remotePath = remotePath.rstrip('/')
+        if remote.get_node(remotePath) is not None:
+            stderr.write('ERROR: File already exists at %s\n' % remotePath)
+            exitCode = 1
+        elif remote.get_node(remotePath.rsplit('/', 1)[0]) is None:
+            stderr.write('ERROR: Parent directory doesn\'t exist: %s\n' % remotePath)
+            exitCode = 1
+        else:
+            remote.add(remotePath, 1)
+    return exitCode
+
+
+def megaput(args, settings):
+    """
+    Simulate megaput. Uploads local files to "--path" remote file or directory.
+    """
+
+    remote = _login(args, settings)
+    if not remote:
+        return 1
+
+    exitCode = 0
+    for localPath in args.paths:
+        remotePath = (args.path or '/Root').rstrip('/')
+        node = remote.get_node(remotePath)
+        if node is not None and node[1] != 0:
+            remotePath = remotePath + '/' + path.basename(localPath)
+            node = remote.get_node(remotePath)
+
+        if not path.isfile(localPath):
+            stderr.write('ERROR: Local file not found: %s\n' % localPath)
+            exitCode = 1
+        elif node is not None:
+            stderr.write('ERROR: File already exists at %s\n' % remotePath)
+            exitCode = 1
+        elif remote.get_node(remotePath.rsplit('/', 1)[0]) is None:
+            stderr.write('ERROR: Parent directory doesn\'t exist: %s\n' % remotePath)
+            exitCode = 1
+        else:
+            sleep(_get_transfer_seconds(path.getsize(localPath), settings, args.limitSpeed))
+            remote.add(remotePath, 0, localFilePath=localPath)
+    return exitCode
+
+
+def megarm(args, settings):
+    """
+    Simulate megarm. Removes remote files and directories.
+    """
+
+    remote = _login(args, settings)
+    if not remote:
+        return 1
+
+    exitCode = 0
+    for remotePath in args.paths:
+        remotePath = remotePath.rstrip('/')
+        if remotePath in [systemPath for systemPath, nodeType in SYSTEM_NODES]:
+            stderr.write('ERROR: Can\'t remove system dir %s\n' % remotePath)
+            exitCode = 1
+        elif remote.get_node(remotePath) is None:
+            stderr.write('ERROR: File not found: %s\n' % remotePath)
+            exitCode = 1
+        else:
+            remote.remove(remotePath)
+    return exitCode
+
+
+COMMANDS = {
+    'megacopy': megacopy,
+    'megadf': megadf,
+    'megaget': megaget,
+    'megals': megals,
+    'megamkdir': megamkdir,
+    'megaput': megaput,
+    'megarm': megarm
+}
+
+
+def get_args(commandName, commandArgs):
+    """
+    Parse megatools style arguments of command.
+
+    Args:
+        commandName (str): Simulated command name, ie: "megals".
+        commandArgs (list): Command line arguments.
+
+    Returns:
+        Namespace: parsed arguments.
+    """
+
+    # megadf uses -h for human readable sizes, not help.
+    parser = ArgumentParser(prog=commandName, add_help=commandName != 'megadf')
+    parser.add_argument('-u', '--username', dest='username', default=None)
+    parser.add_argument('-p', '--password', dest='password', default=None)
+    parser.add_argument('--limit-speed', dest='limitSpeed', type=int, default=None)
+    parser.add_argument('--no-progress', dest='noProgress', action='store_true', default=False)
+
+    if commandName == 'megals':
+        parser.add_argument('-l', '--long', dest='long', action='store_true', default=False)
+        parser.add_argument('-R', '--recursive', dest='recursive', action='store_true', default=False)
+        parser.add_argument('-n', '--names', dest='names', action='store_true', default=False)
+    elif commandName == 'megadf':
+        for option in ['total', 'used', 'free', 'mb', 'gb']:
+            parser.add_argument('--%s' % option, dest=option, action='store_true', default=False)
+        parser.add_argument('-h', '--human', dest='human', action='store_true', default=False)
+    elif commandName == 'megacopy':
+        parser.add_argument('--local', dest='local', required=True)
+        parser.add_argument('--remote', dest='remote', required=True)
+        parser.add_argument('-d', '--download', dest='download', action='store_true', default=False)
+    elif commandName in ['megaget', 'megaput']:
+        parser.add_argument('--path', dest='path', default=None)
+
+    if commandName not in ['megacopy', 'megadf']:
+        parser.add_argument('paths', nargs='*')
+
+    args, unknown = parser.parse_known_args(commandArgs)
+    return args
+
+
+def main(commandArgs):
+    """
+    Run simulated megatools command.
+
+    Args:
+        commandArgs (list): Command name followed by its arguments, ie: ["megals", "-lR", "-u", "me", "/Root"].
+            "generate" creates a manifest tree instead.
+
+    Returns:
+        Integer: exit code.
+    """
+
+    if commandArgs and commandArgs[0] == 'generate':
+        parser = ArgumentParser(prog='generate', description='Generate simulated account tree.')
+        parser.add_argument('--username', dest='username', required=True)
+        parser.add_argument('--nodes', dest='nodes', type=int, default=10000)
+        parser.add_argument('--fanout', dest='fanout', type=int, default=10)
+        parser.add_argument('--seed', dest='seed', type=int, default=0)
+        parser.add_argument('--local', dest='localRoot', default=None)
+        parser.add_argument('--localFraction', dest='localFraction', type=float, default=1.0)
+        args = parser.parse_args(commandArgs[1:])
+        result = generate_tree(rootDir=_get_settings()['root'], username=args.username, nodeCount=args.nodes,
+                               fanout=args.fanout, seed=args.seed, localRoot=args.localRoot,
+                               localFraction=args.localFraction)
+        stdout.write('Generated %(dirs)d directories and %(files)d files of %(bytes)d bytes, '
+                     '%(localFiles)d created locally.\n' % result)
+        return 0
+
+    commandName = path.splitext(path.basename(commandArgs[0]))[0] if commandArgs else ''
+    if commandName not in COMMANDS:
+        stderr.write('Usage: fakeMegaTools.py {%s,generate} [args...]\n' % ','.join(sorted(COMMANDS)))
+        return 2
+
+    return COMMANDS[commandName](get_args(commandName, commandArgs[1:]), _get_settings())
+
+
+if __name__ == "__main__":
+
+    exit(main(argv[1:]))
@@ -0,0 +1,4 @@
+@echo off
+rem Simulated megamkdir, see README.md.
+if not defined FAKE_MEGA_PYTHON set FAKE_MEGA_PYTHON=python
+"%FAKE_MEGA_PYTHON%" "%~dp0fakeMegaTools.py" megamkdir %*